@@ -0,0 +1,75 @@
+"""
+Premium analytics.
+
+customer_api fetches the book's premium lines as columns (one SELECT) and
+hands them here. Every statistic is computed with NumPy over all lines at
+once: keys are encoded to integer group codes, and counts, totals,
+percentiles and year-over-year totals come from bincount / one sort rather
+than a loop per group.
+
+  encode_keys()   (codes, labels) for a column of group keys
+  group_stats()   per-group count / total / mean / percentiles / YoY
+
+Kept free of model imports.
+"""
+
+import numpy as np
+
+PERCENTILES = (25, 50, 75, 90)
+
+
+def encode_keys(keys):
+    """(codes, labels): codes[i] indexes labels, in order of first appearance.
+
+    A dict lookup per key: factorizing strings this way is several times
+    faster than np.unique, which has to sort them.
+    """
+    index = {}
+    codes = np.fromiter((index.setdefault(k, len(index)) for k in keys), dtype=np.int64, count=len(keys))
+    return codes, list(index)
+
+
+def group_stats(codes, labels, premiums, years, year):
+    """One dict per label, largest total first.
+
+    premiums: float64 array; years: int array of each line's renewal year
+    (0 when unknown). year_total / prior_year_total sum the lines renewing
+    in `year` and `year - 1`; yoy_pct is None when the prior year is 0.
+    Percentiles interpolate linearly, as np.percentile does.
+    """
+    n_groups = len(labels)
+    if not len(premiums):
+        return []
+    counts = np.bincount(codes, minlength=n_groups)
+    totals = np.bincount(codes, weights=premiums, minlength=n_groups)
+    means = totals / np.maximum(counts, 1)
+
+    # Sorted by group, then premium: group g's values are one contiguous run.
+    ordered = premiums[np.lexsort((premiums, codes))]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    percentiles = {}
+    for q in PERCENTILES:
+        position = (counts - 1) * (q / 100)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        low, high = ordered[starts + lower], ordered[starts + upper]
+        percentiles[f'p{q}'] = low + (high - low) * (position - lower)
+
+    current = np.bincount(codes, weights=np.where(years == year, premiums, 0), minlength=n_groups)
+    prior = np.bincount(codes, weights=np.where(years == year - 1, premiums, 0), minlength=n_groups)
+    delta = current - prior
+
+    rows = []
+    for i, label in enumerate(labels):
+        row = {'key': label, 'count': int(counts[i]), 'total': round(float(totals[i]), 2),
+               'mean': round(float(means[i]), 2)}
+        row.update({name: round(float(values[i]), 2) for name, values in percentiles.items()})
+        row.update({
+            'year_total': round(float(current[i]), 2),
+            'prior_year_total': round(float(prior[i]), 2),
+            'yoy_delta': round(float(delta[i]), 2),
+            'yoy_pct': round(float(delta[i] / prior[i] * 100), 2) if prior[i] else None,
+        })
+        rows.append(row)
+    rows.sort(key=lambda r: (-r['total'], r['key'] is None, str(r['key'])))
+    return rows
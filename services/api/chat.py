@@ -8,10 +8,15 @@ import json
 import logging
 import requests as http_requests
 from datetime import datetime
+from sqlalchemy.orm import joinedload
 
 OLLAMA_URL = os.environ.get('OLLAMA_URL', 'http://localhost:11434')
 OLLAMA_MODEL = os.environ.get('OLLAMA_MODEL', 'qwen3:30b-a3b')
 
+# Whole-table tool scans (renewals, cross-sell) read this many rows at a time
+# via yield_per instead of materialising every record with .all().
+TOOL_SCAN_BATCH_ROWS = 1000
+
 SYSTEM_PROMPT = """You are an AI assistant for Edison General Insurance Service, an insurance brokerage located at 22 Meridian Road, Suite 16, Edison, NJ 08820.
 
 You help internal staff (agents and brokers) look up client data, find policy information, check upcoming renewals, identify cross-sell opportunities, and draft professional communications.
@@ -220,7 +225,10 @@ def execute_tool(tool_name, arguments, session, models):
             renewals = []
 
             # Benefits renewals
-            for b in session.query(EmployeeBenefit).all():
+            benefits = (session.query(EmployeeBenefit)
+                        .options(joinedload(EmployeeBenefit.client))
+                        .yield_per(TOOL_SCAN_BATCH_ROWS))
+            for b in benefits:
                 client_name = b.client.client_name if b.client else 'Unknown'
                 for field, label in [
                     ('renewal_date', 'Medical'), ('dental_renewal_date', 'Dental'),
@@ -245,7 +253,10 @@ def execute_tool(tool_name, arguments, session, models):
                 ('directors_officers', 'D&O'), ('fiduciary', 'Fiduciary'),
                 ('inland_marine', 'Inland Marine'),
             ]
-            for c in session.query(CommercialInsurance).all():
+            commercial = (session.query(CommercialInsurance)
+                          .options(joinedload(CommercialInsurance.client))
+                          .yield_per(TOOL_SCAN_BATCH_ROWS))
+            for c in commercial:
                 client_name = c.client.client_name if c.client else 'Unknown'
                 for prefix, label in comm_types:
                     rd = getattr(c, f'{prefix}_renewal_date')
@@ -260,8 +271,10 @@ def execute_tool(tool_name, arguments, session, models):
             return renewals[:100]
 
         elif tool_name == 'get_cross_sell':
-            benefit_tax_ids = set(b.tax_id for b in session.query(EmployeeBenefit).all())
-            commercial_tax_ids = set(c.tax_id for c in session.query(CommercialInsurance).all())
+            benefit_tax_ids = {tax_id for (tax_id,) in
+                               session.query(EmployeeBenefit.tax_id).yield_per(TOOL_SCAN_BATCH_ROWS)}
+            commercial_tax_ids = {tax_id for (tax_id,) in
+                                  session.query(CommercialInsurance.tax_id).yield_per(TOOL_SCAN_BATCH_ROWS)}
 
             benefits_only_ids = benefit_tax_ids - commercial_tax_ids
             commercial_only_ids = commercial_tax_ids - benefit_tax_ids
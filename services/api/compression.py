@@ -0,0 +1,182 @@
+"""
+Response compression.
+
+customer_api compresses /api/ JSON bodies and the React build with these
+helpers, using whichever of brotli and gzip the client's Accept-Encoding
+prefers. brotli is optional; without it only gzip is offered.
+
+  compress()             one body, in memory
+  compress_chunks()      a streamed body, chunk by chunk
+  send_compressed_file() a static file, from a .br / .gz sibling written
+                         next to it on first request (kept in memory
+                         instead when the directory is read-only)
+  CompressionCache       compressed bodies by key, so a payload served
+                         again (same ETag or same bytes) isn't recompressed
+
+Kept free of model imports.
+"""
+
+import gzip
+import io
+import logging
+import mimetypes
+import os
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+
+from flask import send_file
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this go out as-is; the headers would eat the saving.
+COMPRESS_MIN_BYTES = 1024
+
+# Dynamic bodies trade ratio for speed; static files are compressed once.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+STATIC_GZIP_LEVEL = 9
+STATIC_BROTLI_QUALITY = 11
+
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+COMPRESSIBLE_TYPES = frozenset({
+    'application/json', 'application/javascript', 'application/manifest+json',
+    'application/xml', 'image/svg+xml', 'image/x-icon', 'image/vnd.microsoft.icon',
+    'text/css', 'text/html', 'text/javascript', 'text/plain', 'text/xml',
+})
+
+
+def negotiate(request):
+    """The preferred encoding the client accepts, or None."""
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def compress(data, encoding, static=False):
+    if encoding == 'br':
+        return brotli.compress(data, quality=STATIC_BROTLI_QUALITY if static else BROTLI_QUALITY)
+    return gzip.compress(data, STATIC_GZIP_LEVEL if static else GZIP_LEVEL, mtime=0)
+
+
+def compress_chunks(chunks, encoding, cache=None, key=None):
+    """Compress an iterable of str/bytes chunks, yielding compressed bytes.
+
+    With a cache, the complete output is stored under key once the last
+    chunk is through (unless it outgrew the cache's entry limit). Closes
+    chunks when done, so a generator's cleanup still runs.
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        process, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        process, finish = compressor.compress, compressor.flush
+    parts = [] if cache is not None else None
+    size = 0
+    try:
+        for chunk in chunks:
+            out = process(chunk.encode() if isinstance(chunk, str) else chunk)
+            if out:
+                if parts is not None:
+                    size += len(out)
+                    if size > cache.max_entry_bytes:
+                        parts = None
+                    else:
+                        parts.append(out)
+                yield out
+        out = finish()
+        if parts is not None:
+            parts.append(out)
+            cache.put(key, b''.join(parts))
+        yield out
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+class CompressionCache:
+    """Compressed bodies by key, least recently used evicted past max_bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes // 4
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_entry_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+def _write_sibling(path, sibling, encoding):
+    with open(path, 'rb') as f:
+        data = compress(f.read(), encoding, static=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.precompress-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, sibling)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def send_compressed_file(path, encoding, cache):
+    """send_file(path), served from a compressed sibling when that pays off.
+
+    path.br / path.gz is used if it is at least as new as path, and written
+    otherwise. If it can't be written the compressed bytes live in cache.
+    """
+    mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    stat = os.stat(path)
+    if mimetype not in COMPRESSIBLE_TYPES or stat.st_size < COMPRESS_MIN_BYTES:
+        return send_file(path, mimetype=mimetype)
+    if encoding is None:
+        response = send_file(path, mimetype=mimetype)
+    else:
+        sibling = path + SUFFIXES[encoding]
+        try:
+            if not os.path.isfile(sibling) or os.path.getmtime(sibling) < stat.st_mtime:
+                _write_sibling(path, sibling, encoding)
+            response = send_file(sibling, mimetype=mimetype, download_name=os.path.basename(path))
+        except OSError as e:
+            key = (path, stat.st_mtime_ns, encoding)
+            data = cache.get(key)
+            if data is None:
+                logging.warning(f"Could not precompress {path}: {e}")
+                with open(path, 'rb') as f:
+                    data = compress(f.read(), encoding, static=True)
+                cache.put(key, data)
+            response = send_file(io.BytesIO(data), mimetype=mimetype, download_name=os.path.basename(path),
+                                 last_modified=stat.st_mtime, etag=f'{stat.st_mtime_ns}-{stat.st_size}-{encoding}')
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
@@ -1,20 +1,36 @@
 import os
 import io
 import re
+import json
 import base64
+import itertools
 import logging
 import ipaddress
 import hashlib
 import secrets
+import threading
+import time
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from fnmatch import fnmatch
 from functools import wraps
-from flask import Flask, jsonify, request, send_file, abort, session as flask_session
+from flask import Flask, jsonify, request, send_file, abort, make_response, session as flask_session
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import generate_password_hash, check_password_hash, safe_join
 from datetime import datetime, date, timedelta, timezone
+from decimal import Decimal
+import numpy as np
 _EST = timezone(timedelta(hours=-5))
-from sqlalchemy.orm import sessionmaker, subqueryload
-from sqlalchemy import create_engine, func, or_
+from sqlalchemy.orm import (
+    sessionmaker, selectinload, joinedload, load_only, aliased,
+    column_property, undefer_group, Session as OrmSession,
+)
+from sqlalchemy import (
+    Engine, create_engine, event, select, func, or_, and_, exists, case, cast, literal,
+    type_coerce, inspect as sa_inspect,
+)
 from dateutil.parser import parse
+from dateutil.relativedelta import relativedelta
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 import smtplib
@@ -30,6 +46,40 @@ try:
     from api.chat import chat_with_ollama
 except ImportError:
     from chat import chat_with_ollama
+try:
+    from api.serializers import compile_attr_encoder, compile_row_encoder
+except ImportError:
+    from serializers import compile_attr_encoder, compile_row_encoder
+try:
+    from api.json_provider import FastJSONProvider, NATIVE_DATES
+except ImportError:
+    from json_provider import FastJSONProvider, NATIVE_DATES
+try:
+    from api import analytics
+except ImportError:
+    import analytics
+try:
+    from api import importer
+    from api.importer import format_limit, import_header_rows, import_sheet_rows, is_valid_carrier
+except ImportError:
+    import importer
+    from importer import format_limit, import_header_rows, import_sheet_rows, is_valid_carrier
+try:
+    from api.result_cache import ResultCache
+except ImportError:
+    from result_cache import ResultCache
+try:
+    from api.import_jobs import ImportCancelled, ImportJob, ImportJobConflict, ImportJobQueue
+except ImportError:
+    from import_jobs import ImportCancelled, ImportJob, ImportJobConflict, ImportJobQueue
+try:
+    from api.compression import (
+        COMPRESS_MIN_BYTES, CompressionCache, compress, compress_chunks, negotiate, send_compressed_file,
+    )
+except ImportError:
+    from compression import (
+        COMPRESS_MIN_BYTES, CompressionCache, compress, compress_chunks, negotiate, send_compressed_file,
+    )
 
 from logging.handlers import RotatingFileHandler
 
@@ -53,6 +103,7 @@ if os.path.isdir(static_folder):
     app = Flask(__name__, static_folder=static_folder, static_url_path='')
 else:
     app = Flask(__name__)
+app.json = FastJSONProvider(app)
 
 # ===========================================================================
 # NETWORK ACCESS CONTROL — Local network only
@@ -353,19 +404,24 @@ def api_logout():
     return jsonify({'message': 'Logged out'}), 200
 
 
-@app.route('/api/me', methods=['GET'])
-def api_me():
+def me_payload():
+    """Body of GET /api/me (also part of /api/bootstrap)."""
     if AUTH_DISABLED:
-        return jsonify({
+        return {
             'user': _SyntheticAdmin.to_dict(),
             'login_enabled': True,
             'auth_disabled': True,
-        }), 200
+        }
     user = _current_user()
     login_enabled = is_login_enabled()
     if not user or not user.is_active:
-        return jsonify({'user': None, 'login_enabled': login_enabled, 'auth_disabled': False}), 200
-    return jsonify({'user': user.to_dict(), 'login_enabled': login_enabled, 'auth_disabled': False}), 200
+        return {'user': None, 'login_enabled': login_enabled, 'auth_disabled': False}
+    return {'user': user.to_dict(), 'login_enabled': login_enabled, 'auth_disabled': False}
+
+
+@app.route('/api/me', methods=['GET'])
+def api_me():
+    return jsonify(me_payload()), 200
 
 
 # ===========================================================================
@@ -701,6 +757,62 @@ def after_request(response):
         response.headers['Access-Control-Allow-Credentials'] = 'true'
     return response
 
+# ===========================================================================
+# RESPONSE COMPRESSION
+# ===========================================================================
+# /api/ JSON bodies of COMPRESS_MIN_BYTES or more go out gzip- or
+# brotli-encoded per Accept-Encoding; streamed lists are compressed batch by
+# batch. Compressed bodies are cached by ETag (list endpoints) or by a hash
+# of the body, so the same payload isn't compressed twice. A compressed
+# response's ETag is marked weak, as the bytes differ from the identity
+# encoding; conditional_list compares weakly. Static files: see
+# SERVE REACT APP.
+API_COMPRESSION_CACHE = CompressionCache(max_bytes=64 * 1024 * 1024)
+STATIC_COMPRESSION_CACHE = CompressionCache(max_bytes=32 * 1024 * 1024)
+
+
+@app.after_request
+def compress_response(response):
+    if (not request.path.startswith('/api/') or response.direct_passthrough
+            or 'Content-Encoding' in response.headers):
+        return response
+    if response.status_code == 304:
+        etag, weak = response.get_etag()
+        if etag and not weak and negotiate(request):
+            response.set_etag(etag, weak=True)
+        response.vary.add('Accept-Encoding')
+        return response
+    if response.status_code != 200 or response.mimetype != 'application/json':
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate(request)
+    if encoding is None:
+        return response
+
+    etag, _ = response.get_etag()
+    if response.is_sequence:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_BYTES:
+            return response
+        key = (etag or hashlib.sha1(data).hexdigest(), encoding)
+        body = API_COMPRESSION_CACHE.get(key)
+        if body is None:
+            body = compress(data, encoding)
+            API_COMPRESSION_CACHE.put(key, body)
+        response.set_data(body)
+    else:
+        key = (etag, encoding)
+        body = API_COMPRESSION_CACHE.get(key) if etag else None
+        if body is not None:
+            response.set_data(body)
+        else:
+            response.response = compress_chunks(
+                response.response, encoding, API_COMPRESSION_CACHE if etag else None, key)
+    response.headers['Content-Encoding'] = encoding
+    if etag:
+        response.set_etag(etag, weak=True)
+    return response
+
 # ===========================================================================
 # DATABASE CONFIGURATION
 # ===========================================================================
@@ -779,6 +891,68 @@ class SystemSetting(db.Model):
     updated_by_user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
 
 
+class TableVersion(db.Model):
+    """Change counter per table; see CHANGE VERSIONS AND CONDITIONAL GET."""
+    __tablename__ = 'table_versions'
+
+    table_name = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+class DeletionLog(db.Model):
+    """Tombstones for /api/sync; row_id NULL means the whole table was cleared."""
+    __tablename__ = 'deletion_log'
+
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(100), nullable=False)
+    row_id = db.Column(db.Integer)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+
+_OUTSTANDING_OPEN = "outstanding_item IS NOT NULL AND outstanding_item NOT IN ('', 'None', 'Complete')"
+
+
+class PolicyLine(db.Model):
+    """One row per coverage line, derived from the policy tables; see POLICY LINES."""
+    __tablename__ = 'policy_lines'
+    __table_args__ = (
+        db.Index('ix_policy_lines_owner', 'line_of_business', 'owner_id'),
+        # The list endpoints' carrier / renewal filters (see _has_policy_line).
+        db.Index('ix_policy_lines_lob_carrier', 'line_of_business', 'carrier'),
+        db.Index('ix_policy_lines_lob_renewal', 'line_of_business', 'renewal_date'),
+        # The Actions tab's open items in its due-date order. Partial rather
+        # than an index on outstanding_item itself: it is free text, and
+        # Postgres rejects btree entries past ~2.7 kB, which would fail the
+        # owner's save. The predicate repeats OUTSTANDING_CLEARED.
+        db.Index('ix_policy_lines_outstanding', 'outstanding_item_due_date', 'id',
+                 postgresql_where=db.text(_OUTSTANDING_OPEN), sqlite_where=db.text(_OUTSTANDING_OPEN)),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    line_of_business = db.Column(db.String(20), nullable=False)  # benefits | commercial | personal
+    source = db.Column(db.String(50), nullable=False)            # table the line is stored in
+    source_id = db.Column(db.Integer, nullable=False)            # row id in that table
+    owner_id = db.Column(db.Integer, nullable=False)             # benefits / commercial / personal record id
+    owner_key = db.Column(db.String(50), index=True)             # tax_id, or individual_id for personal
+    policy_type = db.Column(db.String(50), nullable=False)       # flat column prefix or plan_type
+    plan_number = db.Column(db.Integer, nullable=False, default=1)
+    carrier = db.Column(db.String(200))
+    premium = db.Column(db.Numeric(12, 2))
+    renewal_date = db.Column(db.Date, index=True)
+    outstanding_item = db.Column(db.Text)
+    outstanding_item_due_date = db.Column(db.Date)
+
+
+class DashboardSnapshot(db.Model):
+    """A dashboard payload computed ahead of time; see DASHBOARD SNAPSHOTS."""
+    __tablename__ = 'dashboard_snapshots'
+
+    key = db.Column(db.String(255), primary_key=True)   # the DASHBOARD_CACHE key, as JSON
+    payload = db.Column(db.Text, nullable=False)         # response body, as JSON
+    versions = db.Column(db.Text, nullable=False)        # {table: version} it was computed at
+    refreshed_at = db.Column(db.DateTime, nullable=False)
+
+
 def get_setting(key, default=None):
     s = db.session.get(SystemSetting, key)
     return s.value if s and s.value is not None else default
@@ -841,7 +1015,7 @@ class Client(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     tax_id = db.Column(db.String(50), unique=True, nullable=False)
-    client_name = db.Column(db.String(200))
+    client_name = db.Column(db.String(200), index=True)
     dba = db.Column(db.String(200))
     contact_person = db.Column(db.String(200))
     email = db.Column(db.String(200))
@@ -851,12 +1025,12 @@ class Client(db.Model):
     city = db.Column(db.String(100))
     state = db.Column(db.String(50))
     zip_code = db.Column(db.String(20))
-    status = db.Column(db.String(50), default='Active')
+    status = db.Column(db.String(50), default='Active', index=True)
     gross_revenue = db.Column(db.Numeric(15, 2))
     total_ees = db.Column(db.Integer)
     industry = db.Column(db.String(200))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Relationships
     employee_benefits = db.relationship('EmployeeBenefit', back_populates='client', cascade='all, delete-orphan')
@@ -864,38 +1038,14 @@ class Client(db.Model):
     contacts = db.relationship('ClientContact', back_populates='client', cascade='all, delete-orphan', order_by='ClientContact.sort_order')
 
     def to_dict(self):
-        contacts_list = [c.to_dict() for c in self.contacts] if self.contacts else []
-        # For backward compatibility, populate flat contact fields from first contact
-        first_contact = contacts_list[0] if contacts_list else {}
-        return {
-            'id': self.id,
-            'tax_id': self.tax_id,
-            'client_name': self.client_name,
-            'dba': self.dba,
-            'industry': self.industry,
-            'contact_person': first_contact.get('contact_person', self.contact_person or ''),
-            'email': first_contact.get('email', self.email or ''),
-            'phone_number': first_contact.get('phone_number', self.phone_number or ''),
-            'phone_extension': first_contact.get('phone_extension', ''),
-            'address_line_1': first_contact.get('address_line_1', self.address_line_1 or ''),
-            'address_line_2': first_contact.get('address_line_2', self.address_line_2 or ''),
-            'city': first_contact.get('city', self.city or ''),
-            'state': first_contact.get('state', self.state or ''),
-            'zip_code': first_contact.get('zip_code', self.zip_code or ''),
-            'status': self.status,
-            'gross_revenue': float(self.gross_revenue) if self.gross_revenue else None,
-            'total_ees': self.total_ees,
-            'has_employee_benefits': len(self.employee_benefits) > 0,
-            'has_commercial_insurance': len(self.commercial_insurance) > 0,
-            'contacts': contacts_list
-        }
+        return FIELD_SPECS[Client].encode(self)
 
 
 class ClientContact(db.Model):
     __tablename__ = 'client_contacts'
 
     id = db.Column(db.Integer, primary_key=True)
-    client_id = db.Column(db.Integer, db.ForeignKey('clients.id'), nullable=False)
+    client_id = db.Column(db.Integer, db.ForeignKey('clients.id'), nullable=False, index=True)
     contact_person = db.Column(db.String(200))
     email = db.Column(db.String(200))
     phone_number = db.Column(db.String(50))
@@ -911,19 +1061,7 @@ class ClientContact(db.Model):
     client = db.relationship('Client', back_populates='contacts')
 
     def to_dict(self):
-        return {
-            'id': self.id,
-            'contact_person': self.contact_person or '',
-            'email': self.email or '',
-            'phone_number': self.phone_number or '',
-            'phone_extension': self.phone_extension or '',
-            'address_line_1': self.address_line_1 or '',
-            'address_line_2': self.address_line_2 or '',
-            'city': self.city or '',
-            'state': self.state or '',
-            'zip_code': self.zip_code or '',
-            'sort_order': self.sort_order
-        }
+        return FIELD_SPECS[ClientContact].encode(self)
 
 
 class Individual(db.Model):
@@ -932,7 +1070,7 @@ class Individual(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     individual_id = db.Column(db.String(50), unique=True, nullable=False)
     first_name = db.Column(db.String(200))
-    last_name = db.Column(db.String(200))
+    last_name = db.Column(db.String(200), index=True)
     email = db.Column(db.String(200))
     phone_number = db.Column(db.String(50))
     address_line_1 = db.Column(db.String(200))
@@ -940,29 +1078,15 @@ class Individual(db.Model):
     city = db.Column(db.String(100))
     state = db.Column(db.String(50))
     zip_code = db.Column(db.String(20))
-    status = db.Column(db.String(50), default='Active')
+    status = db.Column(db.String(50), default='Active', index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Relationships
     personal_insurance = db.relationship('PersonalInsurance', back_populates='individual', cascade='all, delete-orphan')
 
     def to_dict(self):
-        return {
-            'id': self.id,
-            'individual_id': self.individual_id,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'full_name': f"{self.first_name or ''} {self.last_name or ''}".strip(),
-            'email': self.email,
-            'phone_number': self.phone_number,
-            'address_line_1': self.address_line_1,
-            'address_line_2': self.address_line_2,
-            'city': self.city,
-            'state': self.state,
-            'zip_code': self.zip_code,
-            'status': self.status
-        }
+        return FIELD_SPECS[Individual].encode(self)
 
 
 class EmployeeBenefit(db.Model):
@@ -975,12 +1099,12 @@ class EmployeeBenefit(db.Model):
     parent_client = db.Column(db.String(200))
 
     # Core fields
-    status = db.Column(db.String(50))
+    status = db.Column(db.String(50), index=True)
     outstanding_item = db.Column(db.String(50))
     remarks = db.Column(db.Text)
     form_fire_code = db.Column(db.String(100))
-    enrollment_poc = db.Column(db.String(200))
-    renewal_date = db.Column(db.Date)
+    enrollment_poc = db.Column(db.String(200), index=True)
+    renewal_date = db.Column(db.Date, index=True)
     funding = db.Column(db.String(100))
     current_carrier = db.Column(db.String(200))
     num_employees_at_renewal = db.Column(db.Integer)
@@ -1068,85 +1192,14 @@ class EmployeeBenefit(db.Model):
     voluntary_life_outstanding_item_due_date = db.Column(db.Date)
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Relationships
     client = db.relationship('Client', back_populates='employee_benefits')
     plans = db.relationship('BenefitPlan', back_populates='employee_benefit', cascade='all, delete-orphan')
 
     def to_dict(self):
-        return {
-            'id': self.id,
-            'tax_id': self.tax_id,
-            'client_name': self.client.client_name if self.client else None,
-            'client_status': self.client.status if self.client else None,
-            'parent_client': self.parent_client,
-            'form_fire_code': self.form_fire_code,
-            'enrollment_poc': self.enrollment_poc,
-            'renewal_date': self.renewal_date.isoformat() if self.renewal_date else None,
-            'outstanding_item_due_date': self.outstanding_item_due_date.isoformat() if self.outstanding_item_due_date else None,
-            'funding': self.funding,
-            'current_carrier': self.current_carrier,
-            'num_employees_at_renewal': self.num_employees_at_renewal,
-            'enrolled_ees': self.enrolled_ees,
-            'waiting_period': self.waiting_period,
-            'deductible_accumulation': self.deductible_accumulation,
-            'previous_carrier': self.previous_carrier,
-            'cobra_carrier': self.cobra_carrier,
-            'employee_contribution': self.employee_contribution,
-            'dental_renewal_date': self.dental_renewal_date.isoformat() if self.dental_renewal_date else None,
-            'dental_carrier': self.dental_carrier,
-            'vision_renewal_date': self.vision_renewal_date.isoformat() if self.vision_renewal_date else None,
-            'vision_carrier': self.vision_carrier,
-            'life_adnd_renewal_date': self.life_adnd_renewal_date.isoformat() if self.life_adnd_renewal_date else None,
-            'life_adnd_carrier': self.life_adnd_carrier,
-            'ltd_renewal_date': self.ltd_renewal_date.isoformat() if self.ltd_renewal_date else None,
-            'ltd_carrier': self.ltd_carrier,
-            'ltd_remarks': self.ltd_remarks,
-            'ltd_outstanding_item': self.ltd_outstanding_item,
-            'ltd_outstanding_item_due_date': self.ltd_outstanding_item_due_date.isoformat() if self.ltd_outstanding_item_due_date else None,
-            'std_renewal_date': self.std_renewal_date.isoformat() if self.std_renewal_date else None,
-            'std_carrier': self.std_carrier,
-            'std_remarks': self.std_remarks,
-            'std_outstanding_item': self.std_outstanding_item,
-            'std_outstanding_item_due_date': self.std_outstanding_item_due_date.isoformat() if self.std_outstanding_item_due_date else None,
-            'k401_renewal_date': self.k401_renewal_date.isoformat() if self.k401_renewal_date else None,
-            'k401_carrier': self.k401_carrier,
-            'k401_remarks': self.k401_remarks,
-            'k401_outstanding_item': self.k401_outstanding_item,
-            'k401_outstanding_item_due_date': self.k401_outstanding_item_due_date.isoformat() if self.k401_outstanding_item_due_date else None,
-            'critical_illness_renewal_date': self.critical_illness_renewal_date.isoformat() if self.critical_illness_renewal_date else None,
-            'critical_illness_carrier': self.critical_illness_carrier,
-            'critical_illness_remarks': self.critical_illness_remarks,
-            'critical_illness_outstanding_item': self.critical_illness_outstanding_item,
-            'critical_illness_outstanding_item_due_date': self.critical_illness_outstanding_item_due_date.isoformat() if self.critical_illness_outstanding_item_due_date else None,
-            'accident_renewal_date': self.accident_renewal_date.isoformat() if self.accident_renewal_date else None,
-            'accident_carrier': self.accident_carrier,
-            'accident_remarks': self.accident_remarks,
-            'accident_outstanding_item': self.accident_outstanding_item,
-            'accident_outstanding_item_due_date': self.accident_outstanding_item_due_date.isoformat() if self.accident_outstanding_item_due_date else None,
-            'hospital_renewal_date': self.hospital_renewal_date.isoformat() if self.hospital_renewal_date else None,
-            'hospital_carrier': self.hospital_carrier,
-            'hospital_remarks': self.hospital_remarks,
-            'hospital_outstanding_item': self.hospital_outstanding_item,
-            'hospital_outstanding_item_due_date': self.hospital_outstanding_item_due_date.isoformat() if self.hospital_outstanding_item_due_date else None,
-            'voluntary_life_renewal_date': self.voluntary_life_renewal_date.isoformat() if self.voluntary_life_renewal_date else None,
-            'voluntary_life_carrier': self.voluntary_life_carrier,
-            'voluntary_life_remarks': self.voluntary_life_remarks,
-            'voluntary_life_outstanding_item': self.voluntary_life_outstanding_item,
-            'voluntary_life_outstanding_item_due_date': self.voluntary_life_outstanding_item_due_date.isoformat() if self.voluntary_life_outstanding_item_due_date else None,
-            'plans': self._get_plans_dict()
-        }
-
-    def _get_plans_dict(self):
-        """Group child BenefitPlan records by type."""
-        plans_dict = {'medical': [], 'dental': [], 'vision': [], 'life_adnd': []}
-        for plan in (self.plans or []):
-            if plan.plan_type in plans_dict:
-                plans_dict[plan.plan_type].append(plan.to_dict())
-        for pt in plans_dict:
-            plans_dict[pt].sort(key=lambda p: p['plan_number'])
-        return plans_dict
+        return FIELD_SPECS[EmployeeBenefit].encode(self)
 
 
 MULTI_PLAN_TYPES = ['medical', 'dental', 'vision', 'life_adnd']
@@ -1156,11 +1209,11 @@ class BenefitPlan(db.Model):
     __tablename__ = 'benefit_plans'
 
     id = db.Column(db.Integer, primary_key=True)
-    employee_benefit_id = db.Column(db.Integer, db.ForeignKey('employee_benefits.id'), nullable=False)
+    employee_benefit_id = db.Column(db.Integer, db.ForeignKey('employee_benefits.id'), nullable=False, index=True)
     plan_type = db.Column(db.String(50), nullable=False)
     plan_number = db.Column(db.Integer, nullable=False, default=1)
-    carrier = db.Column(db.String(200))
-    renewal_date = db.Column(db.Date)
+    carrier = db.Column(db.String(200), index=True)
+    renewal_date = db.Column(db.Date, index=True)
     flag = db.Column(db.Boolean, default=False)
     waiting_period = db.Column(db.String(100))
     remarks = db.Column(db.Text)
@@ -1170,16 +1223,7 @@ class BenefitPlan(db.Model):
     employee_benefit = db.relationship('EmployeeBenefit', back_populates='plans')
 
     def to_dict(self):
-        return {
-            'id': self.id,
-            'plan_type': self.plan_type,
-            'plan_number': self.plan_number,
-            'carrier': self.carrier,
-            'renewal_date': self.renewal_date.isoformat() if self.renewal_date else None,
-            'waiting_period': self.waiting_period,
-            'remarks': self.remarks,
-            'outstanding_item': self.outstanding_item
-        }
+        return FIELD_SPECS[BenefitPlan].encode(self)
 
 
 class CommercialInsurance(db.Model):
@@ -1192,11 +1236,11 @@ class CommercialInsurance(db.Model):
     tax_id = db.Column(db.String(50), db.ForeignKey('clients.tax_id'), nullable=False, unique=True)
 
     parent_client = db.Column(db.String(200))
-    assigned_to = db.Column(db.String(200))
+    assigned_to = db.Column(db.String(200), index=True)
 
     # Core fields
     remarks = db.Column(db.Text)
-    status = db.Column(db.String(50))
+    status = db.Column(db.String(50), index=True)
     outstanding_item = db.Column(db.String(50))
 
     # 1. Commercial General Liability
@@ -1363,7 +1407,7 @@ class CommercialInsurance(db.Model):
     inland_marine_renewal_date = db.Column(db.Date)
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Flag columns for single-plan types (deprecated, kept for backward compat)
     general_liability_flag = db.Column(db.Boolean, default=False)
@@ -1444,244 +1488,7 @@ class CommercialInsurance(db.Model):
     commercial_plans = db.relationship('CommercialPlan', back_populates='commercial_insurance', cascade='all, delete-orphan')
 
     def to_dict(self):
-        def format_premium(val):
-            return float(val) if val else None
-
-        result = {
-            'id': self.id,
-            'tax_id': self.tax_id,
-            'client_name': self.client.client_name if self.client else None,
-            'client_status': self.client.status if self.client else None,
-            'parent_client': self.parent_client,
-            'assigned_to': self.assigned_to,
-            'general_liability_carrier': self.general_liability_carrier,
-            'general_liability_agency': self.general_liability_agency,
-            'general_liability_policy_number': self.general_liability_policy_number,
-            'general_liability_occ_limit': self.general_liability_occ_limit,
-            'general_liability_agg_limit': self.general_liability_agg_limit,
-            'general_liability_premium': format_premium(self.general_liability_premium),
-            'general_liability_renewal_date': self.general_liability_renewal_date.isoformat() if self.general_liability_renewal_date else None,
-            'general_liability_remarks': self.general_liability_remarks,
-            'general_liability_outstanding_item': self.general_liability_outstanding_item,
-            'general_liability_outstanding_item_due_date': self.general_liability_outstanding_item_due_date.isoformat() if self.general_liability_outstanding_item_due_date else None,
-            'general_liability_endorsement_bop': self.general_liability_endorsement_bop or False,
-            'general_liability_endorsement_marine': self.general_liability_endorsement_marine or False,
-            'general_liability_endorsement_foreign': self.general_liability_endorsement_foreign or False,
-            'general_liability_endorsement_molestation': self.general_liability_endorsement_molestation or False,
-            'general_liability_endorsement_staffing': self.general_liability_endorsement_staffing or False,
-            'general_liability_endorsement_accidental_medical': self.general_liability_endorsement_accidental_medical or False,
-            'general_liability_endorsement_liquor_liability': self.general_liability_endorsement_liquor_liability or False,
-            'property_carrier': self.property_carrier,
-            'property_agency': self.property_agency,
-            'property_policy_number': self.property_policy_number,
-            'property_occ_limit': self.property_occ_limit,
-            'property_agg_limit': self.property_agg_limit,
-            'property_premium': format_premium(self.property_premium),
-            'property_renewal_date': self.property_renewal_date.isoformat() if self.property_renewal_date else None,
-            'property_remarks': self.property_remarks,
-            'property_outstanding_item': self.property_outstanding_item,
-            'property_outstanding_item_due_date': self.property_outstanding_item_due_date.isoformat() if self.property_outstanding_item_due_date else None,
-            'bop_carrier': self.bop_carrier,
-            'bop_agency': self.bop_agency,
-            'bop_policy_number': self.bop_policy_number,
-            'bop_occ_limit': self.bop_occ_limit,
-            'bop_agg_limit': self.bop_agg_limit,
-            'bop_premium': format_premium(self.bop_premium),
-            'bop_renewal_date': self.bop_renewal_date.isoformat() if self.bop_renewal_date else None,
-            'bop_building_limit': format_premium(self.bop_building_limit),
-            'bop_personal_property': format_premium(self.bop_personal_property),
-            'bop_remarks': self.bop_remarks,
-            'bop_outstanding_item': self.bop_outstanding_item,
-            'bop_outstanding_item_due_date': self.bop_outstanding_item_due_date.isoformat() if self.bop_outstanding_item_due_date else None,
-            'umbrella_carrier': self.umbrella_carrier,
-            'umbrella_agency': self.umbrella_agency,
-            'umbrella_policy_number': self.umbrella_policy_number,
-            'umbrella_occ_limit': self.umbrella_occ_limit,
-            'umbrella_agg_limit': self.umbrella_agg_limit,
-            'umbrella_premium': format_premium(self.umbrella_premium),
-            'umbrella_renewal_date': self.umbrella_renewal_date.isoformat() if self.umbrella_renewal_date else None,
-            'workers_comp_carrier': self.workers_comp_carrier,
-            'workers_comp_agency': self.workers_comp_agency,
-            'workers_comp_policy_number': self.workers_comp_policy_number,
-            'workers_comp_occ_limit': self.workers_comp_occ_limit,
-            'workers_comp_agg_limit': self.workers_comp_agg_limit,
-            'workers_comp_premium': format_premium(self.workers_comp_premium),
-            'workers_comp_renewal_date': self.workers_comp_renewal_date.isoformat() if self.workers_comp_renewal_date else None,
-            'workers_comp_remarks': self.workers_comp_remarks,
-            'workers_comp_outstanding_item': self.workers_comp_outstanding_item,
-            'workers_comp_outstanding_item_due_date': self.workers_comp_outstanding_item_due_date.isoformat() if self.workers_comp_outstanding_item_due_date else None,
-            'professional_eo_carrier': self.professional_eo_carrier,
-            'professional_eo_agency': self.professional_eo_agency,
-            'professional_eo_policy_number': self.professional_eo_policy_number,
-            'professional_eo_occ_limit': self.professional_eo_occ_limit,
-            'professional_eo_agg_limit': self.professional_eo_agg_limit,
-            'professional_eo_premium': format_premium(self.professional_eo_premium),
-            'professional_eo_renewal_date': self.professional_eo_renewal_date.isoformat() if self.professional_eo_renewal_date else None,
-            'cyber_carrier': self.cyber_carrier,
-            'cyber_agency': self.cyber_agency,
-            'cyber_policy_number': self.cyber_policy_number,
-            'cyber_occ_limit': self.cyber_occ_limit,
-            'cyber_agg_limit': self.cyber_agg_limit,
-            'cyber_premium': format_premium(self.cyber_premium),
-            'cyber_renewal_date': self.cyber_renewal_date.isoformat() if self.cyber_renewal_date else None,
-            'auto_carrier': self.auto_carrier,
-            'auto_agency': self.auto_agency,
-            'auto_policy_number': self.auto_policy_number,
-            'auto_occ_limit': self.auto_occ_limit,
-            'auto_agg_limit': self.auto_agg_limit,
-            'auto_premium': format_premium(self.auto_premium),
-            'auto_renewal_date': self.auto_renewal_date.isoformat() if self.auto_renewal_date else None,
-            'auto_type': self.auto_type,
-            'auto_remarks': self.auto_remarks,
-            'auto_outstanding_item': self.auto_outstanding_item,
-            'auto_outstanding_item_due_date': self.auto_outstanding_item_due_date.isoformat() if self.auto_outstanding_item_due_date else None,
-            'epli_carrier': self.epli_carrier,
-            'epli_agency': self.epli_agency,
-            'epli_policy_number': self.epli_policy_number,
-            'epli_occ_limit': self.epli_occ_limit,
-            'epli_agg_limit': self.epli_agg_limit,
-            'epli_premium': format_premium(self.epli_premium),
-            'epli_renewal_date': self.epli_renewal_date.isoformat() if self.epli_renewal_date else None,
-            'epli_remarks': self.epli_remarks,
-            'epli_outstanding_item': self.epli_outstanding_item,
-            'epli_outstanding_item_due_date': self.epli_outstanding_item_due_date.isoformat() if self.epli_outstanding_item_due_date else None,
-            'nydbl_carrier': self.nydbl_carrier,
-            'nydbl_agency': self.nydbl_agency,
-            'nydbl_policy_number': self.nydbl_policy_number,
-            'nydbl_occ_limit': self.nydbl_occ_limit,
-            'nydbl_agg_limit': self.nydbl_agg_limit,
-            'nydbl_premium': format_premium(self.nydbl_premium),
-            'nydbl_renewal_date': self.nydbl_renewal_date.isoformat() if self.nydbl_renewal_date else None,
-            'nydbl_remarks': self.nydbl_remarks,
-            'nydbl_outstanding_item': self.nydbl_outstanding_item,
-            'nydbl_outstanding_item_due_date': self.nydbl_outstanding_item_due_date.isoformat() if self.nydbl_outstanding_item_due_date else None,
-            'surety_carrier': self.surety_carrier,
-            'surety_agency': self.surety_agency,
-            'surety_policy_number': self.surety_policy_number,
-            'surety_occ_limit': self.surety_occ_limit,
-            'surety_agg_limit': self.surety_agg_limit,
-            'surety_premium': format_premium(self.surety_premium),
-            'surety_renewal_date': self.surety_renewal_date.isoformat() if self.surety_renewal_date else None,
-            'surety_remarks': self.surety_remarks,
-            'surety_outstanding_item': self.surety_outstanding_item,
-            'surety_outstanding_item_due_date': self.surety_outstanding_item_due_date.isoformat() if self.surety_outstanding_item_due_date else None,
-            'product_liability_carrier': self.product_liability_carrier,
-            'product_liability_agency': self.product_liability_agency,
-            'product_liability_policy_number': self.product_liability_policy_number,
-            'product_liability_occ_limit': self.product_liability_occ_limit,
-            'product_liability_agg_limit': self.product_liability_agg_limit,
-            'product_liability_premium': format_premium(self.product_liability_premium),
-            'product_liability_renewal_date': self.product_liability_renewal_date.isoformat() if self.product_liability_renewal_date else None,
-            'product_liability_remarks': self.product_liability_remarks,
-            'product_liability_outstanding_item': self.product_liability_outstanding_item,
-            'product_liability_outstanding_item_due_date': self.product_liability_outstanding_item_due_date.isoformat() if self.product_liability_outstanding_item_due_date else None,
-            'flood_carrier': self.flood_carrier,
-            'flood_agency': self.flood_agency,
-            'flood_policy_number': self.flood_policy_number,
-            'flood_occ_limit': self.flood_occ_limit,
-            'flood_agg_limit': self.flood_agg_limit,
-            'flood_premium': format_premium(self.flood_premium),
-            'flood_renewal_date': self.flood_renewal_date.isoformat() if self.flood_renewal_date else None,
-            'flood_remarks': self.flood_remarks,
-            'flood_outstanding_item': self.flood_outstanding_item,
-            'flood_outstanding_item_due_date': self.flood_outstanding_item_due_date.isoformat() if self.flood_outstanding_item_due_date else None,
-            'crime_carrier': self.crime_carrier,
-            'crime_agency': self.crime_agency,
-            'crime_policy_number': self.crime_policy_number,
-            'crime_occ_limit': self.crime_occ_limit,
-            'crime_agg_limit': self.crime_agg_limit,
-            'crime_premium': format_premium(self.crime_premium),
-            'crime_renewal_date': self.crime_renewal_date.isoformat() if self.crime_renewal_date else None,
-            'directors_officers_carrier': self.directors_officers_carrier,
-            'directors_officers_agency': self.directors_officers_agency,
-            'directors_officers_policy_number': self.directors_officers_policy_number,
-            'directors_officers_occ_limit': self.directors_officers_occ_limit,
-            'directors_officers_agg_limit': self.directors_officers_agg_limit,
-            'directors_officers_premium': format_premium(self.directors_officers_premium),
-            'directors_officers_renewal_date': self.directors_officers_renewal_date.isoformat() if self.directors_officers_renewal_date else None,
-            'directors_officers_remarks': self.directors_officers_remarks,
-            'directors_officers_outstanding_item': self.directors_officers_outstanding_item,
-            'directors_officers_outstanding_item_due_date': self.directors_officers_outstanding_item_due_date.isoformat() if self.directors_officers_outstanding_item_due_date else None,
-            'fiduciary_carrier': self.fiduciary_carrier,
-            'fiduciary_agency': self.fiduciary_agency,
-            'fiduciary_policy_number': self.fiduciary_policy_number,
-            'fiduciary_occ_limit': self.fiduciary_occ_limit,
-            'fiduciary_agg_limit': self.fiduciary_agg_limit,
-            'fiduciary_premium': format_premium(self.fiduciary_premium),
-            'fiduciary_renewal_date': self.fiduciary_renewal_date.isoformat() if self.fiduciary_renewal_date else None,
-            'fiduciary_remarks': self.fiduciary_remarks,
-            'fiduciary_outstanding_item': self.fiduciary_outstanding_item,
-            'fiduciary_outstanding_item_due_date': self.fiduciary_outstanding_item_due_date.isoformat() if self.fiduciary_outstanding_item_due_date else None,
-            'inland_marine_carrier': self.inland_marine_carrier,
-            'inland_marine_agency': self.inland_marine_agency,
-            'inland_marine_policy_number': self.inland_marine_policy_number,
-            'inland_marine_occ_limit': self.inland_marine_occ_limit,
-            'inland_marine_agg_limit': self.inland_marine_agg_limit,
-            'inland_marine_premium': format_premium(self.inland_marine_premium),
-            'inland_marine_renewal_date': self.inland_marine_renewal_date.isoformat() if self.inland_marine_renewal_date else None,
-            'inland_marine_remarks': self.inland_marine_remarks,
-            'inland_marine_outstanding_item': self.inland_marine_outstanding_item,
-            'inland_marine_outstanding_item_due_date': self.inland_marine_outstanding_item_due_date.isoformat() if self.inland_marine_outstanding_item_due_date else None,
-            'general_liability_insured_entities': self.general_liability_insured_entities,
-            'property_insured_entities': self.property_insured_entities,
-            'bop_insured_entities': self.bop_insured_entities,
-            'auto_insured_entities': self.auto_insured_entities,
-            'epli_insured_entities': self.epli_insured_entities,
-            'nydbl_insured_entities': self.nydbl_insured_entities,
-            'surety_insured_entities': self.surety_insured_entities,
-            'product_liability_insured_entities': self.product_liability_insured_entities,
-            'flood_insured_entities': self.flood_insured_entities,
-            'directors_officers_insured_entities': self.directors_officers_insured_entities,
-            'fiduciary_insured_entities': self.fiduciary_insured_entities,
-            'inland_marine_insured_entities': self.inland_marine_insured_entities,
-            'plans': self._get_commercial_plans_dict()
-        }
-        return result
-
-    def _get_commercial_plans_dict(self):
-        """Group child CommercialPlan records by type.
-
-        For workers_comp: if the record has no CommercialPlan WC rows but
-        still holds legacy flat workers_comp_* data, synthesize a single
-        plan entry so the client renders WC uniformly as a multi-plan list.
-        The flat columns are treated as read-only fallback; the next save
-        promotes the synthesized entry into a real CommercialPlan row.
-        """
-        plans_dict = {'umbrella': [], 'professional_eo': [], 'cyber': [], 'crime': [], 'workers_comp': []}
-        for plan in (self.commercial_plans or []):
-            if plan.plan_type in plans_dict:
-                plans_dict[plan.plan_type].append(plan.to_dict())
-        for pt in plans_dict:
-            plans_dict[pt].sort(key=lambda p: p['plan_number'])
-
-        if not plans_dict['workers_comp'] and (
-            self.workers_comp_carrier or self.workers_comp_policy_number
-            or self.workers_comp_premium or self.workers_comp_renewal_date
-        ):
-            plans_dict['workers_comp'].append({
-                'id': None,
-                'plan_type': 'workers_comp',
-                'plan_number': 1,
-                'carrier': self.workers_comp_carrier,
-                'agency': self.workers_comp_agency,
-                'policy_number': self.workers_comp_policy_number,
-                'occ_limit': self.workers_comp_occ_limit,
-                'agg_limit': self.workers_comp_agg_limit,
-                'premium': float(self.workers_comp_premium) if self.workers_comp_premium else None,
-                'renewal_date': self.workers_comp_renewal_date.isoformat() if self.workers_comp_renewal_date else None,
-                'remarks': self.workers_comp_remarks,
-                'outstanding_item': self.workers_comp_outstanding_item,
-                'outstanding_item_due_date': (
-                    self.workers_comp_outstanding_item_due_date.isoformat()
-                    if self.workers_comp_outstanding_item_due_date else None
-                ),
-                'insured_entities': None,
-                'endorsement_tech_eo': False,
-                'endorsement_allied_healthcare': False,
-                'endorsement_staffing': False,
-                'endorsement_medical_malpractice': False,
-            })
-        return plans_dict
+        return FIELD_SPECS[CommercialInsurance].encode(self)
 
 MULTI_PLAN_COMMERCIAL_TYPES = ['umbrella', 'professional_eo', 'cyber', 'crime', 'workers_comp']
 
@@ -1690,16 +1497,16 @@ class CommercialPlan(db.Model):
     __tablename__ = 'commercial_plans'
 
     id = db.Column(db.Integer, primary_key=True)
-    commercial_insurance_id = db.Column(db.Integer, db.ForeignKey('commercial_insurance.id'), nullable=False)
+    commercial_insurance_id = db.Column(db.Integer, db.ForeignKey('commercial_insurance.id'), nullable=False, index=True)
     plan_type = db.Column(db.String(50), nullable=False)
     plan_number = db.Column(db.Integer, nullable=False, default=1)
-    carrier = db.Column(db.String(200))
+    carrier = db.Column(db.String(200), index=True)
     agency = db.Column(db.String(200))
     policy_number = db.Column(db.String(100))
     coverage_occ_limit = db.Column(db.String(100))
     coverage_agg_limit = db.Column(db.String(100))
     premium = db.Column(db.Numeric(12, 2))
-    renewal_date = db.Column(db.Date)
+    renewal_date = db.Column(db.Date, index=True)
     flag = db.Column(db.Boolean, default=False)
     remarks = db.Column(db.Text)
     outstanding_item = db.Column(db.Text)
@@ -1716,39 +1523,20 @@ class CommercialPlan(db.Model):
     commercial_insurance = db.relationship('CommercialInsurance', back_populates='commercial_plans')
 
     def to_dict(self):
-        return {
-            'id': self.id,
-            'plan_type': self.plan_type,
-            'plan_number': self.plan_number,
-            'carrier': self.carrier,
-            'agency': self.agency,
-            'policy_number': self.policy_number,
-            'occ_limit': self.coverage_occ_limit,
-            'agg_limit': self.coverage_agg_limit,
-            'premium': float(self.premium) if self.premium else None,
-            'renewal_date': self.renewal_date.isoformat() if self.renewal_date else None,
-            'remarks': self.remarks,
-            'outstanding_item': self.outstanding_item,
-            'outstanding_item_due_date': self.outstanding_item_due_date.isoformat() if self.outstanding_item_due_date else None,
-            'insured_entities': self.insured_entities,
-            'endorsement_tech_eo': self.endorsement_tech_eo or False,
-            'endorsement_allied_healthcare': self.endorsement_allied_healthcare or False,
-            'endorsement_staffing': self.endorsement_staffing or False,
-            'endorsement_medical_malpractice': self.endorsement_medical_malpractice or False
-        }
+        return FIELD_SPECS[CommercialPlan].encode(self)
 
 
 class HomeownersPolicy(db.Model):
     __tablename__ = 'homeowners_policies'
 
     id = db.Column(db.Integer, primary_key=True)
-    personal_insurance_id = db.Column(db.Integer, db.ForeignKey('personal_insurance.id'), nullable=False)
+    personal_insurance_id = db.Column(db.Integer, db.ForeignKey('personal_insurance.id'), nullable=False, index=True)
     policy_number = db.Column(db.Integer, nullable=False, default=1)
-    carrier = db.Column(db.String(200))
+    carrier = db.Column(db.String(200), index=True)
     dwelling_limit = db.Column(db.String(100))
     liability_limit = db.Column(db.String(100))
     premium = db.Column(db.Numeric(12, 2))
-    renewal_date = db.Column(db.Date)
+    renewal_date = db.Column(db.Date, index=True)
     remarks = db.Column(db.Text)
     outstanding_item = db.Column(db.Text)
     outstanding_item_due_date = db.Column(db.Date)
@@ -1762,24 +1550,7 @@ class HomeownersPolicy(db.Model):
     personal_insurance = db.relationship('PersonalInsurance', back_populates='homeowners_policies')
 
     def to_dict(self):
-        return {
-            'id': self.id,
-            'policy_number': self.policy_number,
-            'carrier': self.carrier,
-            'dwelling_limit': self.dwelling_limit,
-            'liability_limit': self.liability_limit,
-            'premium': float(self.premium) if self.premium else None,
-            'renewal_date': self.renewal_date.isoformat() if self.renewal_date else None,
-            'remarks': self.remarks,
-            'outstanding_item': self.outstanding_item,
-            'outstanding_item_due_date': self.outstanding_item_due_date.isoformat() if self.outstanding_item_due_date else None,
-            'property_address_line_1': self.property_address_line_1,
-            'property_address_line_2': self.property_address_line_2,
-            'property_city': self.property_city,
-            'property_state': self.property_state,
-            'property_zip': self.property_zip,
-            'is_primary_residence': self.is_primary_residence or False
-        }
+        return FIELD_SPECS[HomeownersPolicy].encode(self)
 
 
 class PersonalInsurance(db.Model):
@@ -1842,67 +1613,14 @@ class PersonalInsurance(db.Model):
     visitors_medical_remarks = db.Column(db.Text)
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Relationships
     individual = db.relationship('Individual', back_populates='personal_insurance')
     homeowners_policies = db.relationship('HomeownersPolicy', back_populates='personal_insurance', cascade='all, delete-orphan')
 
     def to_dict(self):
-        def format_premium(val):
-            return float(val) if val else None
-
-        return {
-            'id': self.id,
-            'individual_id': self.individual_id,
-            'individual_name': f"{self.individual.first_name or ''} {self.individual.last_name or ''}".strip() if self.individual else None,
-            'individual_status': self.individual.status if self.individual else None,
-            # Personal Auto
-            'personal_auto_carrier': self.personal_auto_carrier,
-            'personal_auto_bi_occ_limit': self.personal_auto_bi_occ_limit,
-            'personal_auto_bi_agg_limit': self.personal_auto_bi_agg_limit,
-            'personal_auto_pd_limit': self.personal_auto_pd_limit,
-            'personal_auto_renewal_date': self.personal_auto_renewal_date.isoformat() if self.personal_auto_renewal_date else None,
-            'personal_auto_premium': format_premium(self.personal_auto_premium),
-            'personal_auto_outstanding_item': self.personal_auto_outstanding_item,
-            'personal_auto_remarks': self.personal_auto_remarks,
-            # Homeowners
-            'homeowners_carrier': self.homeowners_carrier,
-            'homeowners_dwelling_limit': self.homeowners_dwelling_limit,
-            'homeowners_liability_limit': self.homeowners_liability_limit,
-            'homeowners_renewal_date': self.homeowners_renewal_date.isoformat() if self.homeowners_renewal_date else None,
-            'homeowners_premium': format_premium(self.homeowners_premium),
-            'homeowners_outstanding_item': self.homeowners_outstanding_item,
-            'homeowners_remarks': self.homeowners_remarks,
-            'homeowners_policies_list': [p.to_dict() for p in sorted(self.homeowners_policies, key=lambda x: x.policy_number)],
-            # Personal Umbrella
-            'personal_umbrella_carrier': self.personal_umbrella_carrier,
-            'personal_umbrella_liability_limit': self.personal_umbrella_liability_limit,
-            'personal_umbrella_deductible': format_premium(self.personal_umbrella_deductible),
-            'personal_umbrella_renewal_date': self.personal_umbrella_renewal_date.isoformat() if self.personal_umbrella_renewal_date else None,
-            'personal_umbrella_premium': format_premium(self.personal_umbrella_premium),
-            'personal_umbrella_outstanding_item': self.personal_umbrella_outstanding_item,
-            'personal_umbrella_remarks': self.personal_umbrella_remarks,
-            # Event Insurance
-            'event_carrier': self.event_carrier,
-            'event_type': self.event_type,
-            'event_location': self.event_location,
-            'event_start_date': self.event_start_date.isoformat() if self.event_start_date else None,
-            'event_end_date': self.event_end_date.isoformat() if self.event_end_date else None,
-            'event_entry_fee': format_premium(self.event_entry_fee),
-            'event_audience_count': self.event_audience_count,
-            'event_premium': format_premium(self.event_premium),
-            'event_outstanding_item': self.event_outstanding_item,
-            'event_remarks': self.event_remarks,
-            # Visitors Medical
-            'visitors_medical_carrier': self.visitors_medical_carrier,
-            'visitors_medical_start_date': self.visitors_medical_start_date.isoformat() if self.visitors_medical_start_date else None,
-            'visitors_medical_end_date': self.visitors_medical_end_date.isoformat() if self.visitors_medical_end_date else None,
-            'visitors_medical_destination_country': self.visitors_medical_destination_country,
-            'visitors_medical_premium': format_premium(self.visitors_medical_premium),
-            'visitors_medical_outstanding_item': self.visitors_medical_outstanding_item,
-            'visitors_medical_remarks': self.visitors_medical_remarks,
-        }
+        return FIELD_SPECS[PersonalInsurance].encode(self)
 
 
 PERSONAL_INSURANCE_PRODUCTS = [
@@ -1938,13 +1656,13 @@ class Invoice(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     invoice_number = db.Column(db.Integer, unique=True, nullable=False)
-    tax_id = db.Column(db.String(50), db.ForeignKey('clients.tax_id'), nullable=False)
+    tax_id = db.Column(db.String(50), db.ForeignKey('clients.tax_id'), nullable=False, index=True)
     commercial_id = db.Column(db.Integer, db.ForeignKey('commercial_insurance.id'))
-    invoice_date = db.Column(db.Date, nullable=False)
+    invoice_date = db.Column(db.Date, nullable=False, index=True)
     amount = db.Column(db.Numeric(12, 2))
     recipient_email = db.Column(db.String(200))
     cc_email = db.Column(db.String(200))
-    status = db.Column(db.String(50), default='pending')
+    status = db.Column(db.String(50), default='pending', index=True)
     payment_date = db.Column(db.Date)
     payment_notes = db.Column(db.Text)
     policies_description = db.Column(db.Text)
@@ -1954,23 +1672,7 @@ class Invoice(db.Model):
     client = db.relationship('Client', backref='invoices')
 
     def to_dict(self):
-        return {
-            'id': self.id,
-            'invoice_number': self.invoice_number,
-            'tax_id': self.tax_id,
-            'client_name': self.client.client_name if self.client else None,
-            'commercial_id': self.commercial_id,
-            'invoice_date': self.invoice_date.isoformat() if self.invoice_date else None,
-            'amount': float(self.amount) if self.amount else None,
-            'recipient_email': self.recipient_email,
-            'cc_email': self.cc_email,
-            'status': self.status,
-            'payment_date': self.payment_date.isoformat() if self.payment_date else None,
-            'payment_notes': self.payment_notes,
-            'policies_description': self.policies_description,
-            'is_binding': self.is_binding,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-        }
+        return FIELD_SPECS[Invoice].encode(self)
 
 
 class InvoiceSequence(db.Model):
@@ -1998,46 +1700,22 @@ class CobraCoverage(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     first_name = db.Column(db.String(200), nullable=False)
     last_name = db.Column(db.String(200), nullable=False)
-    tax_id = db.Column(db.String(50), db.ForeignKey('clients.tax_id'))
+    tax_id = db.Column(db.String(50), db.ForeignKey('clients.tax_id'), index=True)
     state = db.Column(db.String(50))
     start_date = db.Column(db.Date)
     end_date = db.Column(db.Date)
-    status = db.Column(db.String(50), default='active')
+    status = db.Column(db.String(50), default='active', index=True)
     termination_date = db.Column(db.Date)
     termination_reason = db.Column(db.Text)
     # 'employer' or 'carrier'. Nullable so pre-existing rows stay valid.
     administration_type = db.Column(db.String(20))
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(_EST))
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(_EST), index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     client = db.relationship('Client', backref='cobra_coverages')
 
     def to_dict(self):
-        # "Assigned to" on a cobra row comes from the client's group-benefits
-        # record - enrollment_poc is the person at the broker responsible
-        # for the client's health benefits, which is who owns COBRA follow-
-        # up too. Falls back to None if the client has no benefits record.
-        assigned_to = None
-        if self.client and getattr(self.client, 'employee_benefits', None):
-            for eb in self.client.employee_benefits:
-                if getattr(eb, 'enrollment_poc', None):
-                    assigned_to = eb.enrollment_poc
-                    break
-        return {
-            'id': self.id,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'tax_id': self.tax_id,
-            'client_name': self.client.client_name if self.client else None,
-            'assigned_to': assigned_to,
-            'state': self.state,
-            'start_date': self.start_date.isoformat() if self.start_date else None,
-            'end_date': self.end_date.isoformat() if self.end_date else None,
-            'status': self.status,
-            'termination_date': self.termination_date.isoformat() if self.termination_date else None,
-            'termination_reason': self.termination_reason,
-            'administration_type': self.administration_type,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-        }
+        return FIELD_SPECS[CobraCoverage].encode(self)
 
 
 TASK_STATUSES = ('Open', 'In Progress', 'Blocked', 'Done')
@@ -2058,7 +1736,7 @@ class Task(db.Model):
     # cascade-delete the task — just null the reference.
     client_id = db.Column(db.Integer, db.ForeignKey('clients.id', ondelete='SET NULL'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     completed_at = db.Column(db.DateTime)
     # Notification bookkeeping: NULL means the current assignee hasn't seen
     # this task yet (either it was just created for them, or someone
@@ -2126,198 +1804,1756 @@ class TaskComment(db.Model):
 
 
 # ===========================================================================
-# UTILITY FUNCTIONS
+# QUERY LOADER PROFILES
 # ===========================================================================
+# to_dict() walks relationships. Left to the default lazy loader that is one
+# SELECT per row per relationship, so a few thousand records turn a page
+# load into tens of thousands of queries. Each profile below eager-loads
+# exactly what the model's to_dict() touches, for the endpoints that still
+# build ORM instances (tasks, detail GETs, the chat tools; the main list
+# endpoints read Core rows instead, see RECORD SERIALIZATION):
+#   joinedload   — many-to-one parents folded into the main SELECT
+#   selectinload — one extra SELECT ... WHERE fk IN (...) per collection
+
+# Client.to_dict() only needs to know whether the child records exist, so
+# these are correlated EXISTS subqueries rather than whole collections. They
+# are deferred as a group so clients joined in from other tables (benefits,
+# invoices, cobra) don't pay for them; the Client profile undefers them.
+Client.has_employee_benefits = column_property(
+    exists().where(EmployeeBenefit.tax_id == Client.tax_id),
+    deferred=True, group='coverage_flags',
+)
+Client.has_commercial_insurance = column_property(
+    exists().where(CommercialInsurance.tax_id == Client.tax_id),
+    deferred=True, group='coverage_flags',
+)
 
-def parse_date(date_str):
-    """Parse date string to date object."""
-    if not date_str or date_str == '':
-        return None
-    try:
-        return parse(date_str).date()
-    except (ValueError, TypeError, AttributeError, OverflowError):
-        return None
+LOADER_PROFILES = {
+    Client: (
+        undefer_group('coverage_flags'),
+        selectinload(Client.contacts),
+    ),
+    EmployeeBenefit: (
+        joinedload(EmployeeBenefit.client),
+        selectinload(EmployeeBenefit.plans),
+    ),
+    CommercialInsurance: (
+        joinedload(CommercialInsurance.client),
+        selectinload(CommercialInsurance.commercial_plans),
+    ),
+    PersonalInsurance: (
+        joinedload(PersonalInsurance.individual),
+        selectinload(PersonalInsurance.homeowners_policies),
+    ),
+    CobraCoverage: (
+        # assigned_to comes from the client's benefits record(s)
+        joinedload(CobraCoverage.client).selectinload(Client.employee_benefits),
+    ),
+    Invoice: (
+        joinedload(Invoice.client),
+    ),
+    Task: (
+        joinedload(Task.assignee),
+        joinedload(Task.created_by),
+        joinedload(Task.client),
+        selectinload(Task.comments),
+    ),
+}
 
 
-def parse_int(value):
-    """Coerce form value to int, or None. Empty strings on int columns otherwise
-    raise InvalidTextRepresentation in Postgres."""
-    if value is None or value == '':
-        return None
+def list_query(session, model):
+    """session.query(model) with the model's loader profile applied."""
+    return session.query(model).options(*LOADER_PROFILES.get(model, ()))
+
+
+# ===========================================================================
+# LIST FILTERING, SORTING AND PAGINATION
+# ===========================================================================
+# The collection endpoints share a set of optional query params:
+#   ?<filter>=value               — only the names whitelisted in LIST_SPECS
+#   ?renewal_from=&renewal_to=    — YYYY-MM-DD window over any renewal date
+#   ?sort=key / ?sort=-key        — whitelisted sort keys, '-' = descending
+#   ?limit=N&after=<cursor>       — keyset pagination
+# Without ?limit an endpoint returns every matching row in its original
+# response shape. With ?limit the response also carries next_cursor (null on
+# the last page), total and total_is_estimate.
+#
+# Pages are keyset, not OFFSET: the cursor holds the last row's (sort value,
+# id), so page 500 costs the same as page 1 and rows inserted mid-scroll
+# don't shift the pages. NULL sort values sort last in both directions.
+
+LIST_PAGE_MAX = 500
+# Rows per yield_per batch when an unpaginated list is streamed.
+STREAM_BATCH_ROWS = 1000
+# Unfiltered totals on Postgres use the planner's row estimate once a table
+# is larger than this; below it an exact COUNT(*) is cheap enough.
+EXACT_COUNT_THRESHOLD = 10000
+
+PERSONAL_RENEWAL_FIELDS = [
+    'personal_auto_renewal_date',
+    'homeowners_renewal_date',
+    'personal_umbrella_renewal_date',
+    'event_start_date',
+    'visitors_medical_start_date',
+]
+
+
+class QueryParamError(ValueError):
+    """Invalid filter, sort, paging or fields parameter on a GET endpoint."""
+
+
+def parse_limit(value, maximum=LIST_PAGE_MAX):
+    """?limit= as an int in 1..maximum; QueryParamError otherwise."""
     try:
-        return int(value)
-    except (TypeError, ValueError):
-        return None
+        limit = int(value)
+    except ValueError:
+        raise QueryParamError('limit must be an integer')
+    if not 1 <= limit <= maximum:
+        raise QueryParamError(f'limit must be between 1 and {maximum}')
+    return limit
 
 
-def save_benefit_plans(session, benefit, plans_data):
-    """Save multi-plan child records for a benefit. Deletes existing plans first."""
-    # Delete existing plans for this benefit
-    session.query(BenefitPlan).filter_by(employee_benefit_id=benefit.id).delete()
-    session.flush()
+def _in_window(col, start, end):
+    bounds = [col.isnot(None)]
+    if start:
+        bounds.append(col >= start)
+    if end:
+        bounds.append(col <= end)
+    return and_(*bounds)
 
-    for plan_type in MULTI_PLAN_TYPES:
-        for idx, plan_info in enumerate(plans_data.get(plan_type, []), 1):
-            carrier = plan_info.get('carrier')
-            if is_valid_carrier(carrier):
-                plan = BenefitPlan(
-                    employee_benefit_id=benefit.id,
-                    plan_type=plan_type,
-                    plan_number=idx,
-                    carrier=carrier,
-                    renewal_date=parse_date(plan_info.get('renewal_date')),
-                    waiting_period=plan_info.get('waiting_period') or None,
-                    remarks=plan_info.get('remarks') or None,
-                    outstanding_item=plan_info.get('outstanding_item') or None
-                )
-                session.add(plan)
 
-    # Also update flat fields from first plan for backward compat
-    for plan_type in MULTI_PLAN_TYPES:
-        plans_for_type = plans_data.get(plan_type, [])
-        first = plans_for_type[0] if plans_for_type else {}
-        if plan_type == 'medical':
-            benefit.current_carrier = first.get('carrier') or None
-            benefit.renewal_date = parse_date(first.get('renewal_date'))
-        else:
-            setattr(benefit, f'{plan_type}_carrier', first.get('carrier') or None)
-            setattr(benefit, f'{plan_type}_renewal_date', parse_date(first.get('renewal_date')))
+# Carrier and renewal filters match a record if ANY of its policies match —
+# the multi-plan child rows or one of the flat single-plan columns. Both
+# have a row in policy_lines (see POLICY LINES), so each filter is one
+# lookup on its indexed carrier / renewal_date instead of an OR over a
+# dozen unindexed flat columns. Uncorrelated IN rather than EXISTS: SQLite
+# runs a correlated EXISTS once per record, scanning the whole table.
+def _has_policy_line(model, line_of_business, clause):
+    return model.id.in_(select(PolicyLine.owner_id).where(
+        PolicyLine.line_of_business == line_of_business, clause))
 
 
-def save_commercial_plans(session, commercial, plans_data):
-    """Save multi-plan child records for commercial insurance. Deletes existing plans first."""
-    session.query(CommercialPlan).filter_by(commercial_insurance_id=commercial.id).delete()
-    session.flush()
+def _benefit_carrier(value):
+    return _has_policy_line(EmployeeBenefit, 'benefits', PolicyLine.carrier == value)
 
-    for plan_type in MULTI_PLAN_COMMERCIAL_TYPES:
-        for idx, plan_info in enumerate(plans_data.get(plan_type, []), 1):
-            carrier = plan_info.get('carrier')
-            agency = plan_info.get('agency')
-            policy_number = plan_info.get('policy_number')
-            renewal = plan_info.get('renewal_date')
-            occ_limit_val = plan_info.get('occ_limit')
-            agg_limit_val = plan_info.get('agg_limit')
-            premium_val = plan_info.get('premium')
-            if is_valid_carrier(carrier):
-                plan = CommercialPlan(
-                    commercial_insurance_id=commercial.id,
-                    plan_type=plan_type,
-                    plan_number=idx,
-                    carrier=carrier,
-                    agency=agency,
-                    policy_number=policy_number or None,
-                    coverage_occ_limit=occ_limit_val,
-                    coverage_agg_limit=agg_limit_val,
-                    premium=parse_premium(premium_val),
-                    renewal_date=parse_date(renewal),
-                    remarks=plan_info.get('remarks') or None,
-                    outstanding_item=plan_info.get('outstanding_item') or None,
-                    outstanding_item_due_date=parse_date(plan_info.get('outstanding_item_due_date')),
-                    endorsement_tech_eo=bool(plan_info.get('endorsement_tech_eo')),
-                    endorsement_allied_healthcare=bool(plan_info.get('endorsement_allied_healthcare')),
-                    endorsement_staffing=bool(plan_info.get('endorsement_staffing')),
-                    endorsement_medical_malpractice=bool(plan_info.get('endorsement_medical_malpractice')),
-                    insured_entities=plan_info.get('insured_entities') or None,
-                )
-                session.add(plan)
 
-    # Also update flat fields from first plan for backward compat
-    for plan_type in MULTI_PLAN_COMMERCIAL_TYPES:
-        plans_for_type = plans_data.get(plan_type, [])
-        first = plans_for_type[0] if plans_for_type else {}
-        setattr(commercial, f'{plan_type}_carrier', first.get('carrier') or None)
-        setattr(commercial, f'{plan_type}_agency', first.get('agency') or None)
-        setattr(commercial, f'{plan_type}_policy_number', first.get('policy_number') or None)
-        setattr(commercial, f'{plan_type}_occ_limit', first.get('occ_limit') or None)
-        setattr(commercial, f'{plan_type}_agg_limit', first.get('agg_limit') or None)
-        setattr(commercial, f'{plan_type}_premium', parse_premium(first.get('premium')))
-        setattr(commercial, f'{plan_type}_renewal_date', parse_date(first.get('renewal_date')))
+def _benefit_renewal(start, end):
+    return _has_policy_line(EmployeeBenefit, 'benefits', _in_window(PolicyLine.renewal_date, start, end))
 
 
-def save_homeowners_policies(session, personal, policies_data):
-    """Save homeowners policy child records. Deletes existing first."""
-    session.query(HomeownersPolicy).filter_by(personal_insurance_id=personal.id).delete()
-    session.flush()
-    for idx, p in enumerate(policies_data or [], 1):
-        carrier = p.get('carrier')
-        dwelling = p.get('dwelling_limit')
-        liability = p.get('liability_limit')
-        premium = p.get('premium')
-        renewal = p.get('renewal_date')
-        if carrier or dwelling or liability or premium or renewal:
-            policy = HomeownersPolicy(
-                personal_insurance_id=personal.id,
-                policy_number=idx,
-                carrier=carrier,
-                dwelling_limit=dwelling,
-                liability_limit=liability,
-                premium=parse_premium(premium),
-                renewal_date=parse_date(renewal),
-                remarks=p.get('remarks') or None,
-                outstanding_item=p.get('outstanding_item') or None,
-                outstanding_item_due_date=parse_date(p.get('outstanding_item_due_date')),
-                property_address_line_1=p.get('property_address_line_1') or None,
-                property_address_line_2=p.get('property_address_line_2') or None,
-                property_city=p.get('property_city') or None,
-                property_state=p.get('property_state') or None,
-                property_zip=p.get('property_zip') or None,
-                is_primary_residence=bool(p.get('is_primary_residence'))
-            )
-            session.add(policy)
-    # Update flat fields from first policy for backward compat
-    first = policies_data[0] if policies_data else {}
-    personal.homeowners_carrier = first.get('carrier') or None
-    personal.homeowners_dwelling_limit = first.get('dwelling_limit') or None
-    personal.homeowners_liability_limit = first.get('liability_limit') or None
-    personal.homeowners_premium = parse_premium(first.get('premium'))
-    personal.homeowners_renewal_date = parse_date(first.get('renewal_date'))
-    personal.homeowners_remarks = first.get('remarks') or None
-    personal.homeowners_outstanding_item = first.get('outstanding_item') or None
+def _commercial_carrier(value):
+    return _has_policy_line(CommercialInsurance, 'commercial', PolicyLine.carrier == value)
 
 
-def is_valid_carrier(val):
-    """Check if a carrier value is a real name, not empty/None/'None'."""
-    if val is None:
-        return False
-    s = str(val).strip()
-    return bool(s) and s.lower() != 'none'
+def _commercial_renewal(start, end):
+    return _has_policy_line(CommercialInsurance, 'commercial',
+                               _in_window(PolicyLine.renewal_date, start, end))
 
 
-def parse_premium(val):
-    """Parse premium value to float, returning None for empty/invalid values."""
-    if val is None or val == '':
-        return None
+def _personal_carrier(value):
+    return _has_policy_line(PersonalInsurance, 'personal', PolicyLine.carrier == value)
+
+
+def _personal_renewal(start, end):
+    return _has_policy_line(PersonalInsurance, 'personal', _in_window(PolicyLine.renewal_date, start, end))
+
+
+def _cobra_assigned_to(value):
+    # Mirrors CobraCoverage.to_dict(): assigned_to is the client's enrollment_poc.
+    return exists().where(
+        EmployeeBenefit.tax_id == CobraCoverage.tax_id,
+        EmployeeBenefit.enrollment_poc == value,
+    )
+
+
+def _invoice_month(value):
+    year, mon = value.split('-')
+    return and_(
+        db.extract('year', Invoice.invoice_date) == int(year),
+        db.extract('month', Invoice.invoice_date) == int(mon),
+    )
+
+
+# Per-model whitelists. 'sorts' values are a column, or (column, relationship)
+# when the column lives on a joined table.
+LIST_SPECS = {
+    Client: {
+        'filters': {
+            'status': lambda v: Client.status == v,
+        },
+        'sorts': {
+            'id': Client.id,
+            'client_name': Client.client_name,
+            'tax_id': Client.tax_id,
+            'status': Client.status,
+            'updated_at': Client.updated_at,
+        },
+        'default_sort': 'id',
+    },
+    Individual: {
+        'filters': {
+            'status': lambda v: Individual.status == v,
+        },
+        'sorts': {
+            'id': Individual.id,
+            'individual_id': Individual.individual_id,
+            'last_name': Individual.last_name,
+            'first_name': Individual.first_name,
+            'status': Individual.status,
+            'updated_at': Individual.updated_at,
+        },
+        'default_sort': 'id',
+    },
+    EmployeeBenefit: {
+        'filters': {
+            'status': lambda v: EmployeeBenefit.status == v,
+            'enrollment_poc': lambda v: EmployeeBenefit.enrollment_poc == v,
+            'carrier': _benefit_carrier,
+        },
+        'renewal': _benefit_renewal,
+        'sorts': {
+            'id': EmployeeBenefit.id,
+            'client_name': (Client.client_name, EmployeeBenefit.client),
+            'tax_id': EmployeeBenefit.tax_id,
+            'status': EmployeeBenefit.status,
+            'enrollment_poc': EmployeeBenefit.enrollment_poc,
+            'renewal_date': EmployeeBenefit.renewal_date,
+            'updated_at': EmployeeBenefit.updated_at,
+        },
+        'default_sort': 'id',
+    },
+    CommercialInsurance: {
+        'filters': {
+            'status': lambda v: CommercialInsurance.status == v,
+            'assigned_to': lambda v: CommercialInsurance.assigned_to == v,
+            'carrier': _commercial_carrier,
+        },
+        'renewal': _commercial_renewal,
+        'sorts': {
+            'id': CommercialInsurance.id,
+            'client_name': (Client.client_name, CommercialInsurance.client),
+            'tax_id': CommercialInsurance.tax_id,
+            'status': CommercialInsurance.status,
+            'assigned_to': CommercialInsurance.assigned_to,
+            'updated_at': CommercialInsurance.updated_at,
+        },
+        'default_sort': 'id',
+    },
+    PersonalInsurance: {
+        'filters': {
+            'carrier': _personal_carrier,
+        },
+        'renewal': _personal_renewal,
+        'sorts': {
+            'id': PersonalInsurance.id,
+            'individual_id': PersonalInsurance.individual_id,
+            'last_name': (Individual.last_name, PersonalInsurance.individual),
+            'updated_at': PersonalInsurance.updated_at,
+        },
+        'default_sort': 'id',
+    },
+    CobraCoverage: {
+        'filters': {
+            'status': lambda v: CobraCoverage.status == v,
+            'tax_id': lambda v: CobraCoverage.tax_id == v,
+            'assigned_to': _cobra_assigned_to,
+        },
+        'sorts': {
+            'id': CobraCoverage.id,
+            'created_at': CobraCoverage.created_at,
+            'last_name': CobraCoverage.last_name,
+            'start_date': CobraCoverage.start_date,
+            'end_date': CobraCoverage.end_date,
+            'status': CobraCoverage.status,
+        },
+        'default_sort': '-created_at',
+    },
+    Invoice: {
+        'filters': {
+            'status': lambda v: Invoice.status == v,
+            'tax_id': lambda v: Invoice.tax_id == v,
+            'month': _invoice_month,
+        },
+        'sorts': {
+            'id': Invoice.id,
+            'invoice_date': Invoice.invoice_date,
+            'invoice_number': Invoice.invoice_number,
+            'amount': Invoice.amount,
+            'status': Invoice.status,
+        },
+        'default_sort': '-invoice_date',
+    },
+}
+
+
+def _encode_cursor(value, row_id):
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    elif isinstance(value, Decimal):
+        value = str(value)
+    raw = json.dumps([value, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_cursor(token, sort_col):
     try:
-        return float(val)
+        padded = token + '=' * (-len(token) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        row_id = int(row_id)
+        if value is not None:
+            if isinstance(sort_col.type, db.DateTime):
+                value = datetime.fromisoformat(value)
+            elif isinstance(sort_col.type, db.Date):
+                value = date.fromisoformat(value)
+            elif isinstance(sort_col.type, db.Numeric):
+                value = Decimal(value)
+        return value, row_id
     except (ValueError, TypeError):
+        raise QueryParamError('Invalid cursor')
+
+
+def _keyset_clause(sort_col, pk, descending, value, last_id):
+    """Rows strictly after (value, last_id) in ORDER BY sort_col NULLS LAST, pk."""
+    after_id = pk < last_id if descending else pk > last_id
+    if value is None:
+        return and_(sort_col.is_(None), after_id)
+    beyond = sort_col < value if descending else sort_col > value
+    return or_(beyond, and_(sort_col == value, after_id), sort_col.is_(None))
+
+
+def _count_rows(session, model, clauses):
+    """(total, is_estimate) for the filtered list."""
+    if not clauses and session.get_bind().dialect.name == 'postgresql':
+        estimate = session.execute(
+            db.text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:t AS regclass)"),
+            {'t': model.__tablename__},
+        ).scalar()
+        if estimate and estimate >= EXACT_COUNT_THRESHOLD:
+            return int(estimate), True
+    return session.query(func.count(model.id)).filter(*clauses).scalar(), False
+
+
+def _list_select(session, model, args, fields):
+    """Build the list query for `args`: (query, plan, sort_col, descending, clauses).
+
+    Row layout: the row plan's columns, then the keyset (id, sort value).
+    Raises QueryParamError on bad filter/sort params.
+    """
+    spec = LIST_SPECS[model]
+
+    clauses = []
+    for name, build in spec['filters'].items():
+        value = args.get(name)
+        if value:
+            try:
+                clauses.append(build(value))
+            except ValueError:
+                raise QueryParamError(f"Invalid value for '{name}': {value}")
+    if 'renewal' in spec:
+        try:
+            start = parse(args['renewal_from']).date() if args.get('renewal_from') else None
+            end = parse(args['renewal_to']).date() if args.get('renewal_to') else None
+        except (ValueError, OverflowError):
+            raise QueryParamError('renewal_from / renewal_to must be dates (YYYY-MM-DD)')
+        if start or end:
+            clauses.append(spec['renewal'](start, end))
+
+    sort = args.get('sort') or spec['default_sort']
+    descending = sort.startswith('-')
+    sort_key = sort.lstrip('-')
+    if sort_key not in spec['sorts']:
+        raise QueryParamError(f"Unsupported sort '{sort_key}'. Allowed: {', '.join(spec['sorts'])}")
+    sort_col, join = spec['sorts'][sort_key], None
+    if isinstance(sort_col, tuple):
+        sort_col, join = sort_col
+
+    pk = model.id
+    field_spec = FIELD_SPECS[model]
+    plan = field_spec.row_plan(field_spec.keys_for(fields))
+    query = session.query(*plan.columns, pk, sort_col).select_from(model)
+    for target, onclause in plan.joins:
+        query = query.outerjoin(target, onclause)
+    if join is not None:
+        query = query.outerjoin(join)
+    query = query.filter(*clauses)
+    order = sort_col.desc() if descending else sort_col.asc()
+    query = query.order_by(order.nulls_last(), pk.desc() if descending else pk.asc())
+    return query, plan, sort_col, descending, clauses
+
+
+def fetch_list(session, model, args, fields=None):
+    """Load and serialize a list endpoint's rows honouring the filter/sort/page params.
+
+    Rows are read as Core tuples and encoded by the model's compiled row
+    plan (see FIELD_SPECS); with parsed ?fields= only those keys' columns
+    are selected. Returns (items, page). page is None when no ?limit was
+    given (every matching row is returned); otherwise a dict of paging
+    metadata for list_payload(). Raises QueryParamError on bad params.
+    """
+    query, plan, sort_col, descending, clauses = _list_select(session, model, args, fields)
+
+    def encode(rows):
+        return [apply_nested(item, fields) for item in plan.encode_rows(session, rows)]
+
+    if not args.get('limit'):
+        return encode(query.all()), None
+
+    limit = parse_limit(args['limit'])
+    if args.get('after'):
+        value, last_id = _decode_cursor(args['after'], sort_col)
+        query = query.filter(_keyset_clause(sort_col, model.id, descending, value, last_id))
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1][-1], rows[-1][-2])
+    total, estimated = _count_rows(session, model, clauses)
+    return encode(rows), {
+        'next_cursor': next_cursor,
+        'total': total,
+        'total_is_estimate': estimated,
+    }
+
+
+def iter_list(session, model, args, fields=None):
+    """Unpaginated fetch_list() as a generator of serialized batches.
+
+    The query runs with yield_per (a server-side cursor on Postgres), so
+    only STREAM_BATCH_ROWS rows and their children are in memory at once.
+    """
+    query, plan, _, _, _ = _list_select(session, model, args, fields)
+    result = session.execute(query.statement, execution_options={'yield_per': STREAM_BATCH_ROWS})
+    for rows in result.partitions():
+        yield [apply_nested(item, fields) for item in plan.encode_rows(session, rows)]
+
+
+def stream_list(model, key, args, fields=None):
+    """Streamed response for an unpaginated list request.
+
+    Same body as jsonify(list_payload(key, items, None)) — or of the bare
+    list when key is None — written one batch at a time. The first batch
+    is fetched before returning, so bad params and query errors still
+    raise here rather than truncating a 200. Owns its session: the
+    generator closes it once the body is sent (or the client goes away).
+    """
+    session = Session()
+    try:
+        batches = iter_list(session, model, args, fields)
+        first = next(batches, [])
+    except Exception:
+        session.close()
+        raise
+
+    def generate():
+        dumps = app.json.dumps
+
+        try:
+            yield '[' if key is None else '{%s:[' % dumps(key)
+            total = 0
+            for batch in itertools.chain((first,), batches):
+                if batch:
+                    yield (',' if total else '') + ','.join(map(dumps, batch))
+                    total += len(batch)
+            yield ']\n' if key is None else '],"total":%d}\n' % total
+        except Exception as e:
+            logging.error(f"Error streaming {model.__tablename__}: {e}")
+            raise
+        finally:
+            session.close()
+
+    response = app.response_class(generate(), mimetype='application/json')
+    # Also closes the session when the body is replaced before it is read
+    # (a cached compressed copy, see compress_response).
+    response.call_on_close(session.close)
+    return response
+
+
+def list_payload(key, items, page):
+    """Response body for a list endpoint: {key: items, 'total': ...} plus paging metadata."""
+    payload = {key: items, 'total': len(items)}
+    if page is not None:
+        payload.update(page)
+    return payload
+
+
+# ===========================================================================
+# RECORD SERIALIZATION
+# ===========================================================================
+# FIELD_SPECS describes every key a model serializes to and where it comes
+# from. Column keys are derived from the mapper (dates → ISO string, money →
+# float or None, booleans → `or False`); everything else is a Computed entry.
+# api/serializers.py compiles each spec, once, into specialised encoders:
+#   spec.encode(obj)      — the model's to_dict(), on an ORM instance
+#   spec.row_plan(keys)   — SELECT list + encoder over Core rows, used by the
+#                           list endpoints so no ORM instances are built; it
+#                           leaves dates to the JSON provider when that
+#                           encodes them natively (orjson)
+#
+# ?fields=a,b,c on the list and detail endpoints returns only those keys,
+# and only the columns behind them are SELECTed — the grid views need a
+# dozen of the 60-190 keys, and skipping the Text remarks columns is most of
+# the transfer. Nested selectors narrow the child lists: plans.medical (one
+# plan type), plans.carrier (one key per plan), contacts.email,
+# homeowners_policies_list.carrier.
+
+# Encoders compiled per distinct ?fields= selection are cached per spec;
+# the cache is reset past this size.
+FIELD_ENCODER_CACHE_MAX = 256
+
+WC_LEGACY_FIELDS = ('carrier', 'agency', 'policy_number', 'occ_limit', 'agg_limit', 'premium',
+                    'renewal_date', 'remarks', 'outstanding_item', 'outstanding_item_due_date')
+
+
+def _column_kind(column):
+    if isinstance(column.type, (db.Date, db.DateTime)):
+        return 'date'
+    if isinstance(column.type, db.Numeric):
+        return 'money'
+    if isinstance(column.type, db.Boolean):
+        return 'flag'
+    return 'raw'
+
+
+def group_plans(plan_dicts, plan_types):
+    """{plan_type: [plan dicts sorted by plan_number]} for the given types."""
+    grouped = {pt: [] for pt in plan_types}
+    for plan in plan_dicts:
+        if plan['plan_type'] in grouped:
+            grouped[plan['plan_type']].append(plan)
+    for plans in grouped.values():
+        plans.sort(key=lambda p: p['plan_number'])
+    return grouped
+
+
+def commercial_plans_dict(plan_dicts, wc):
+    """Group commercial plan dicts by type; wc holds the flat workers_comp_* values.
+
+    For workers_comp: if the record has no CommercialPlan WC rows but
+    still holds legacy flat workers_comp_* data, synthesize a single
+    plan entry so the client renders WC uniformly as a multi-plan list.
+    The flat columns are treated as read-only fallback; the next save
+    promotes the synthesized entry into a real CommercialPlan row.
+    """
+    grouped = group_plans(plan_dicts, MULTI_PLAN_COMMERCIAL_TYPES)
+    if not grouped['workers_comp'] and (
+        wc['carrier'] or wc['policy_number'] or wc['premium'] or wc['renewal_date']
+    ):
+        grouped['workers_comp'].append({
+            'id': None,
+            'plan_type': 'workers_comp',
+            'plan_number': 1,
+            'carrier': wc['carrier'],
+            'agency': wc['agency'],
+            'policy_number': wc['policy_number'],
+            'occ_limit': wc['occ_limit'],
+            'agg_limit': wc['agg_limit'],
+            'premium': float(wc['premium']) if wc['premium'] else None,
+            'renewal_date': wc['renewal_date'].isoformat() if wc['renewal_date'] else None,
+            'remarks': wc['remarks'],
+            'outstanding_item': wc['outstanding_item'],
+            'outstanding_item_due_date': (
+                wc['outstanding_item_due_date'].isoformat()
+                if wc['outstanding_item_due_date'] else None
+            ),
+            'insured_entities': None,
+            'endorsement_tech_eo': False,
+            'endorsement_allied_healthcare': False,
+            'endorsement_staffing': False,
+            'endorsement_medical_malpractice': False,
+        })
+    return grouped
+
+
+class Computed:
+    """A serialized key that isn't a straight copy of one column.
+
+    Instance path: get(obj). columns and relations name what it reads, so a
+    sparse detail query can load exactly that.
+
+    Row path: inputs are SQL expressions added to the SELECT, outer-joined
+    through joins — (target, onclause) pairs — and from_row(*values) builds
+    the value. With children=<relationship> the page's child rows are
+    loaded in one extra query and passed first: from_row(child_dicts, *values).
+
+    nested lists the selectors allowed after 'key.'.
+    """
+
+    def __init__(self, get, columns=(), relations=(), nested=(),
+                 inputs=(), joins=(), children=None, from_row=None):
+        self.get = get
+        self.columns = tuple(columns)
+        self.relations = tuple(relations)
+        self.nested = frozenset(nested)
+        self.inputs = tuple(inputs)
+        self.joins = tuple(joins)
+        self.children = children
+        self.from_row = from_row
+
+
+class FieldSpec:
+    """Every key a model serializes to and how to produce it.
+
+    exclude:  column keys (fnmatch patterns) left out of the output
+    kinds:    converter overrides, {key: 'date'|'money'|'flag'|'text'|'raw'}
+    renames:  keys emitted under a different name, {key: column_key}
+    computed: {key: Computed}
+    """
+
+    def __init__(self, model, exclude=(), kinds=None, renames=None, computed=None):
+        self.model = model
+        renames = renames or {}
+        computed = computed or {}
+        kinds = kinds or {}
+        sources = {column: key for key, column in renames.items()}
+        self.fields = {}
+        for attr in sa_inspect(model).column_attrs:
+            column = attr.columns[0]
+            if not isinstance(column, db.Column) or attr.key in computed:
+                continue
+            if any(fnmatch(attr.key, pattern) for pattern in exclude):
+                continue
+            key = sources.get(attr.key, attr.key)
+            self.fields[key] = (kinds.get(key, _column_kind(column)), attr.key)
+        self.fields.update((key, ('computed', c)) for key, c in computed.items())
+        self._attr_encoders = {}
+        self._row_plans = {}
+        self.encode = self.attr_encoder(tuple(self.fields))
+
+    def requires(self, key):
+        """(column keys, relationship paths) needed to produce key."""
+        kind, source = self.fields[key]
+        if kind == 'computed':
+            return source.columns, source.relations
+        return (source,), ()
+
+    def nested(self, key):
+        kind, source = self.fields[key]
+        return source.nested if kind == 'computed' else frozenset()
+
+    def keys_for(self, fields):
+        """Spec-ordered key tuple for parsed ?fields= (None = every key)."""
+        if fields is None:
+            return tuple(self.fields)
+        return tuple(key for key in self.fields if key in fields)
+
+    def attr_encoder(self, keys):
+        encoder = self._attr_encoders.get(keys)
+        if encoder is None:
+            if len(self._attr_encoders) >= FIELD_ENCODER_CACHE_MAX:
+                self._attr_encoders.clear()
+            fields = []
+            for key in keys:
+                kind, source = self.fields[key]
+                fields.append((key, kind, source.get if kind == 'computed' else source))
+            encoder = compile_attr_encoder(self.model.__name__, fields)
+            self._attr_encoders[keys] = encoder
+        return encoder
+
+    def row_plan(self, keys):
+        plan = self._row_plans.get(keys)
+        if plan is None:
+            if len(self._row_plans) >= FIELD_ENCODER_CACHE_MAX:
+                self._row_plans.clear()
+            plan = self._row_plans[keys] = RowPlan(self, keys)
+        return plan
+
+
+class RowPlan:
+    """SELECT list, outer joins, child loaders and row encoder for one key set."""
+
+    def __init__(self, spec, keys):
+        self.columns = []
+        self.joins = []
+        self.children = []
+        fields = []
+        for key in keys:
+            kind, source = spec.fields[key]
+            if kind == 'computed':
+                fields.append((key, kind, self._computed(source)))
+            else:
+                fields.append((key, kind, self._column(getattr(spec.model, source))))
+        self.encode = compile_row_encoder(spec.model.__name__, fields, native_dates=NATIVE_DATES)
+
+    def _column(self, expr):
+        for i, existing in enumerate(self.columns):
+            if existing is expr:
+                return i
+        self.columns.append(expr)
+        return len(self.columns) - 1
+
+    def _computed(self, c):
+        for target, onclause in c.joins:
+            if not any(existing is target for existing, _ in self.joins):
+                self.joins.append((target, onclause))
+        idx = [self._column(expr) for expr in c.inputs]
+        from_row = c.from_row
+        if c.children is None:
+            return lambda r, ch: from_row(*[r[i] for i in idx])
+        slot = self._child_slot(c.children)
+        parent_index = self.children[slot][1]
+        return lambda r, ch: from_row(ch[slot].get(r[parent_index], []), *[r[i] for i in idx])
+
+    def _child_slot(self, rel):
+        for slot, (existing, _, _) in enumerate(self.children):
+            if existing is rel:
+                return slot
+        (parent_col, child_col), = rel.property.local_remote_pairs
+        self.children.append((rel, self._column(parent_col), child_col))
+        return len(self.children) - 1
+
+    def encode_rows(self, session, rows):
+        """Encode fetched rows, loading each child collection in one query."""
+        children = [self._load_children(session, rows, *child) for child in self.children]
+        encode = self.encode
+        return [encode(r, children) for r in rows]
+
+    @staticmethod
+    def _load_children(session, rows, rel, parent_index, child_col):
+        child_model = rel.property.mapper.class_
+        child_spec = FIELD_SPECS[child_model]
+        plan = child_spec.row_plan(child_spec.keys_for(None))
+        order = list(rel.property.order_by or ()) + list(sa_inspect(child_model).primary_key)
+        parent_keys = sorted({r[parent_index] for r in rows} - {None})
+        grouped = {}
+        for start in range(0, len(parent_keys), 500):
+            chunk = parent_keys[start:start + 500]
+            query = (session.query(*plan.columns, child_col)
+                     .filter(child_col.in_(chunk))
+                     .order_by(*order))
+            for row in query:
+                grouped.setdefault(row[-1], []).append(plan.encode(row, ()))
+        return grouped
+
+
+def _client_contact_field(key, fallback=True):
+    # The flat contact fields mirror the first contact, falling back to the
+    # legacy client column when there are no contacts.
+    def get(client):
+        if client.contacts:
+            return getattr(client.contacts[0], key) or ''
+        return (getattr(client, key) or '') if fallback else ''
+
+    if fallback:
+        def from_row(contacts, own):
+            return contacts[0][key] if contacts else (own or '')
+    else:
+        def from_row(contacts):
+            return contacts[0][key] if contacts else ''
+    return Computed(get, columns=(key,) if fallback else (), relations=('contacts',),
+                    inputs=(getattr(Client, key),) if fallback else (),
+                    children=Client.contacts, from_row=from_row)
+
+
+_RefClient = aliased(Client, name='ref_client')
+_RefIndividual = aliased(Individual, name='ref_individual')
+_RefBenefits = aliased(EmployeeBenefit, name='ref_benefits')
+
+
+def _client_ref(attr, fk):
+    """The joined client's column, or None when there is no client."""
+    return Computed(lambda o: getattr(o.client, attr) if o.client else None,
+                    relations=('client',),
+                    inputs=(getattr(_RefClient, attr),),
+                    joins=((_RefClient, _RefClient.tax_id == fk),),
+                    from_row=lambda v: v)
+
+
+def _full_name(first, last):
+    return f"{first or ''} {last or ''}".strip()
+
+
+def _cobra_poc(coverage):
+    # The client's enrollment_poc owns COBRA follow-up too.
+    if coverage.client and coverage.client.employee_benefits:
+        for eb in coverage.client.employee_benefits:
+            if eb.enrollment_poc:
+                return eb.enrollment_poc
+    return None
+
+
+def _wc_legacy(o):
+    return {f: getattr(o, 'workers_comp_' + f) for f in WC_LEGACY_FIELDS}
+
+
+_CONTACT_FIELDS = ('contact_person', 'email', 'phone_number', 'address_line_1', 'address_line_2',
+                   'city', 'state', 'zip_code')
+
+FIELD_SPECS = {}
+for _spec in (
+    FieldSpec(ClientContact, exclude=('client_id', 'created_at'),
+              kinds={k: 'text' for k in _CONTACT_FIELDS + ('phone_extension',)}),
+    FieldSpec(BenefitPlan, exclude=('employee_benefit_id', 'flag')),
+    FieldSpec(CommercialPlan, exclude=('commercial_insurance_id', 'flag'),
+              renames={'occ_limit': 'coverage_occ_limit', 'agg_limit': 'coverage_agg_limit'}),
+    FieldSpec(HomeownersPolicy, exclude=('personal_insurance_id',)),
+):
+    FIELD_SPECS[_spec.model] = _spec
+
+FIELD_SPECS[Client] = FieldSpec(
+    Client,
+    exclude=('created_at', 'updated_at'),
+    computed={
+        **{k: _client_contact_field(k) for k in _CONTACT_FIELDS},
+        'phone_extension': _client_contact_field('phone_extension', fallback=False),
+        'has_employee_benefits': Computed(lambda c: bool(c.has_employee_benefits),
+                                          columns=('has_employee_benefits',),
+                                          inputs=(Client.has_employee_benefits,), from_row=bool),
+        'has_commercial_insurance': Computed(lambda c: bool(c.has_commercial_insurance),
+                                             columns=('has_commercial_insurance',),
+                                             inputs=(Client.has_commercial_insurance,), from_row=bool),
+        'contacts': Computed(lambda c: [x.to_dict() for x in c.contacts] if c.contacts else [],
+                             relations=('contacts',), nested=FIELD_SPECS[ClientContact].fields,
+                             children=Client.contacts, from_row=lambda contacts: contacts),
+    },
+)
+FIELD_SPECS[Individual] = FieldSpec(
+    Individual,
+    exclude=('created_at', 'updated_at'),
+    computed={
+        'full_name': Computed(lambda o: _full_name(o.first_name, o.last_name),
+                              columns=('first_name', 'last_name'),
+                              inputs=(Individual.first_name, Individual.last_name), from_row=_full_name),
+    },
+)
+FIELD_SPECS[EmployeeBenefit] = FieldSpec(
+    EmployeeBenefit,
+    exclude=('status', 'outstanding_item', 'remarks', 'employer_contribution', '*_flag',
+             'created_at', 'updated_at'),
+    computed={
+        'client_name': _client_ref('client_name', EmployeeBenefit.tax_id),
+        'client_status': _client_ref('status', EmployeeBenefit.tax_id),
+        'plans': Computed(lambda o: group_plans([p.to_dict() for p in o.plans or []], MULTI_PLAN_TYPES),
+                          relations=('plans',),
+                          nested=set(MULTI_PLAN_TYPES) | set(FIELD_SPECS[BenefitPlan].fields),
+                          children=EmployeeBenefit.plans,
+                          from_row=lambda plans: group_plans(plans, MULTI_PLAN_TYPES)),
+    },
+)
+FIELD_SPECS[CommercialInsurance] = FieldSpec(
+    CommercialInsurance,
+    exclude=('remarks', 'status', 'outstanding_item', '*_flag', 'created_at', 'updated_at'),
+    computed={
+        'client_name': _client_ref('client_name', CommercialInsurance.tax_id),
+        'client_status': _client_ref('status', CommercialInsurance.tax_id),
+        'plans': Computed(
+            lambda o: commercial_plans_dict([p.to_dict() for p in o.commercial_plans or []], _wc_legacy(o)),
+            columns=['workers_comp_' + f for f in WC_LEGACY_FIELDS],
+            relations=('commercial_plans',),
+            nested=set(MULTI_PLAN_COMMERCIAL_TYPES) | set(FIELD_SPECS[CommercialPlan].fields),
+            inputs=[getattr(CommercialInsurance, 'workers_comp_' + f) for f in WC_LEGACY_FIELDS],
+            children=CommercialInsurance.commercial_plans,
+            from_row=lambda plans, *wc: commercial_plans_dict(plans, dict(zip(WC_LEGACY_FIELDS, wc)))),
+    },
+)
+FIELD_SPECS[PersonalInsurance] = FieldSpec(
+    PersonalInsurance,
+    exclude=('created_at', 'updated_at'),
+    computed={
+        'individual_name': Computed(
+            lambda o: _full_name(o.individual.first_name, o.individual.last_name) if o.individual else None,
+            relations=('individual',),
+            inputs=(_RefIndividual.id, _RefIndividual.first_name, _RefIndividual.last_name),
+            joins=((_RefIndividual, _RefIndividual.individual_id == PersonalInsurance.individual_id),),
+            from_row=lambda ind_id, first, last: _full_name(first, last) if ind_id is not None else None),
+        'individual_status': Computed(
+            lambda o: o.individual.status if o.individual else None,
+            relations=('individual',),
+            inputs=(_RefIndividual.status,),
+            joins=((_RefIndividual, _RefIndividual.individual_id == PersonalInsurance.individual_id),),
+            from_row=lambda v: v),
+        'homeowners_policies_list': Computed(
+            lambda o: [p.to_dict() for p in sorted(o.homeowners_policies, key=lambda x: x.policy_number)],
+            relations=('homeowners_policies',), nested=FIELD_SPECS[HomeownersPolicy].fields,
+            children=PersonalInsurance.homeowners_policies,
+            from_row=lambda policies: sorted(policies, key=lambda p: p['policy_number'])),
+    },
+)
+FIELD_SPECS[CobraCoverage] = FieldSpec(
+    CobraCoverage,
+    exclude=('updated_at',),
+    computed={
+        'client_name': _client_ref('client_name', CobraCoverage.tax_id),
+        'assigned_to': Computed(_cobra_poc, relations=('client.employee_benefits',),
+                                inputs=(_RefBenefits.enrollment_poc,),
+                                joins=((_RefBenefits, _RefBenefits.tax_id == CobraCoverage.tax_id),),
+                                from_row=lambda poc: poc or None),
+    },
+)
+FIELD_SPECS[Invoice] = FieldSpec(
+    Invoice,
+    kinds={'is_binding': 'raw'},
+    computed={
+        'client_name': _client_ref('client_name', Invoice.tax_id),
+    },
+)
+
+
+def parse_fields(model, args):
+    """Parse ?fields= into {key: None | set of nested selectors}, or None if absent."""
+    raw = args.get('fields')
+    if not raw:
         return None
+    spec = FIELD_SPECS[model]
+    fields = {}
+    for item in raw.split(','):
+        key, _, sub = item.strip().partition('.')
+        if not key:
+            continue
+        if key not in spec.fields:
+            raise QueryParamError(f"Unknown field '{key}'")
+        if not sub:
+            fields[key] = None
+            continue
+        if sub not in spec.nested(key):
+            raise QueryParamError(f"Unknown field '{key}.{sub}'")
+        if key not in fields:
+            fields[key] = set()
+        if fields[key] is not None:
+            fields[key].add(sub)
+    if not fields:
+        raise QueryParamError('fields must name at least one field')
+    return fields
+
+
+def _relation_loader(model, path):
+    loader, parent = None, model
+    for name in path.split('.'):
+        attr = getattr(parent, name)
+        strategy = selectinload if attr.property.uselist else joinedload
+        loader = strategy(attr) if loader is None else getattr(loader, strategy.__name__)(attr)
+        parent = attr.property.mapper.class_
+    return loader
+
+
+def field_options(model, fields):
+    """load_only() plus the relationship loaders the requested fields need."""
+    spec = FIELD_SPECS[model]
+    columns, relations = [], []
+    for key in fields:
+        needed_columns, needed_relations = spec.requires(key)
+        columns.extend(c for c in needed_columns if c not in columns)
+        relations.extend(r for r in needed_relations if r not in relations)
+    options = [load_only(*(getattr(model, c) for c in columns or ('id',)))]
+    options.extend(_relation_loader(model, path) for path in relations)
+    return options
+
+
+def _narrow(value, selectors):
+    """Apply nested selectors to a child list, or to a {plan_type: [plans]} dict."""
+    if isinstance(value, list):
+        return [{k: v for k, v in item.items() if k in selectors} for item in value]
+    types = selectors & value.keys()
+    keys = selectors - types
+    return {t: _narrow(plans, keys) if keys else plans
+            for t, plans in value.items() if not types or t in types}
+
+
+def apply_nested(item, fields):
+    """Narrow item's child collections by the nested ?fields= selectors, in place."""
+    if fields:
+        for key, selectors in fields.items():
+            if selectors:
+                item[key] = _narrow(item[key], selectors)
+    return item
+
+
+def serialize(obj, fields=None):
+    """obj.to_dict(), or just the parsed ?fields= subset of it."""
+    if fields is None:
+        return obj.to_dict()
+    spec = FIELD_SPECS[type(obj)]
+    return apply_nested(spec.attr_encoder(spec.keys_for(fields))(obj), fields)
+
+
+# ===========================================================================
+# CHANGE VERSIONS AND CONDITIONAL GET
+# ===========================================================================
+# Every write bumps a per-table counter in table_versions, inside the writing
+# transaction, so a rollback takes the bump with it. The written tables are
+# only noted on the connection as the transaction goes; they are bumped once,
+# at commit, by one UPDATE taking the rows in name order. Bumping at each
+# write would hold the rows' locks from the first write on, queueing every
+# writer to a table behind the others, and two transactions bumping in
+# different orders could deadlock. List responses carry a
+# strong ETag built from the counters of the tables they read; a refetch
+# with a matching If-None-Match costs one primary-key SELECT and gets a 304
+# without the list query or serialization running.
+#
+# Seen: ORM flushes (after_flush) and insert/update/delete statements run
+# through a session (do_orm_execute, which covers Query.delete()/update()).
+# Not seen: text() SQL and writes on a bare engine connection — call
+# bump_table_versions() next to those. ON UPDATE CASCADE from clients.tax_id
+# needs nothing extra: every list that shows a tax_id also depends on clients.
+#
+# A session bumps in before_commit, after its last flush; a bare connection
+# when it commits. The bumped names are then published to this process's
+# dashboard cache (see DASHBOARD RESULT CACHE); a rollback discards them.
+
+UNVERSIONED_TABLES = {TableVersion.__tablename__}
+WRITTEN_TABLES_KEY = 'written_tables'
+BUMPED_TABLES_KEY = 'bumped_tables'
+
+# Tables each list endpoint's rows are built from (see FIELD_SPECS).
+LIST_DEPENDENCIES = {
+    Client: (Client, ClientContact, EmployeeBenefit, CommercialInsurance),
+    EmployeeBenefit: (EmployeeBenefit, BenefitPlan, Client),
+    CommercialInsurance: (CommercialInsurance, CommercialPlan, Client),
+    PersonalInsurance: (PersonalInsurance, HomeownersPolicy, Individual),
+    CobraCoverage: (CobraCoverage, Client, EmployeeBenefit),
+    Invoice: (Invoice, Client),
+}
+
+
+def bump_table_versions(connection, tables):
+    """Bump the change counter of each named table when `connection` commits."""
+    names = set(tables) - UNVERSIONED_TABLES
+    if names:
+        connection.info.setdefault(WRITTEN_TABLES_KEY, set()).update(names)
+
+
+def write_table_versions(connection):
+    """Apply the bumps noted on `connection`, in one UPDATE."""
+    names = sorted(connection.info.pop(WRITTEN_TABLES_KEY, ()))
+    if not names:
+        return
+    connection.info.setdefault(BUMPED_TABLES_KEY, set()).update(names)
+    versions = TableVersion.__table__
+    result = connection.execute(
+        versions.update()
+        .where(versions.c.table_name.in_(names))
+        .values(version=versions.c.version + 1)
+    )
+    if result.rowcount != len(names):
+        # First write to a table whose row the startup seeding didn't create.
+        existing = set(connection.execute(
+            select(versions.c.table_name).where(versions.c.table_name.in_(names))
+        ).scalars())
+        connection.execute(versions.insert(), [
+            {'table_name': name, 'version': 1} for name in names if name not in existing
+        ])
+
+
+@event.listens_for(OrmSession, 'after_flush')
+def _bump_flushed_tables(session, flush_context):
+    # new/dirty/deleted still hold the pre-flush state here.
+    tables = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        tables.update(table.name for table in sa_inspect(obj).mapper.tables)
+    if tables:
+        bump_table_versions(session.connection(), tables)
+
+
+@event.listens_for(OrmSession, 'do_orm_execute')
+def _bump_statement_table(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, 'table', None)
+    if table is not None:
+        bump_table_versions(orm_execute_state.session.connection(), [table.name])
+
+
+@event.listens_for(OrmSession, 'before_commit')
+def _write_session_table_versions(session):
+    session.flush()
+    write_table_versions(session.connection())
+
+
+def read_table_versions(names):
+    """{table name: version} for `names`; tables never written to read as 0."""
+    versions = TableVersion.__table__
+    found = dict(db.session.execute(
+        select(versions.c.table_name, versions.c.version).where(versions.c.table_name.in_(names))
+    ).all())
+    return {name: found.get(name, 0) for name in names}
+
+
+def conditional_list(model):
+    """Decorator for a list view: ETag from LIST_DEPENDENCIES[model], 304 on a match.
+
+    The tag also covers the query string (filters, ?fields=, paging) and the
+    model's serialized key set, so a deploy that changes the shape of the
+    rows doesn't validate a cached body.
+    """
+    names = sorted({m.__table__.name for m in LIST_DEPENDENCIES[model]})
+    shape = ','.join(FIELD_SPECS[model].fields)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                versions = read_table_versions(names)
+            except Exception as e:
+                logging.warning(f"Could not read table versions for {request.path}: {e}")
+                return view(*args, **kwargs)
+            digest = hashlib.sha1(shape.encode())
+            digest.update(repr(sorted(versions.items())).encode())
+            digest.update(request.query_string)
+            etag = digest.hexdigest()
+
+            if request.if_none_match.contains_weak(etag):
+                response = app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
+
+# ===========================================================================
+# DASHBOARD RESULT CACHE
+# ===========================================================================
+# The dashboard endpoints rescan the whole book, so their payloads are kept
+# in DASHBOARD_CACHE keyed by endpoint and parameters, each tagged with the
+# tables it reads and stamped with their table_versions. A lookup reads the
+# current versions (one primary-key SELECT) and recomputes on a mismatch,
+# which is how a write committed by another worker reaches this one.
+# Writes committed here are also published straight to the cache by the
+# connection's commit event, which drops just the entries tagged with the
+# written tables. GET /api/admin/dashboard-cache reports the counters.
+
+DASHBOARD_CACHE = ResultCache(max_entries=256)
+
+
+@event.listens_for(Engine, 'commit')
+def _publish_written_tables(connection):
+    write_table_versions(connection)
+    tables = connection.info.pop(BUMPED_TABLES_KEY, None)
+    if tables:
+        DASHBOARD_CACHE.invalidate(tables)
+
+
+@event.listens_for(Engine, 'rollback')
+def _discard_written_tables(connection):
+    connection.info.pop(WRITTEN_TABLES_KEY, None)
+    connection.info.pop(BUMPED_TABLES_KEY, None)
+
+
+def dashboard_payload(key, tables, compute):
+    """compute()'s payload for `key`, reused until one of `tables` changes."""
+    try:
+        versions = read_table_versions(tables)
+    except Exception as e:
+        logging.warning(f"Could not read table versions for {key[0]}: {e}")
+        return compute()
+    return DASHBOARD_CACHE.get_or_compute(key, versions, compute)
+
+
+@app.route('/api/admin/dashboard-cache', methods=['GET'])
+@require_admin
+def get_dashboard_cache_stats():
+    """Hit / miss / invalidation counters of the dashboard result cache."""
+    return jsonify(DASHBOARD_CACHE.stats()), 200
+
+
+# ===========================================================================
+# DELTA SYNC
+# ===========================================================================
+# GET /api/sync?since=<token> returns, per entity, the rows created or
+# updated since the token (serialized like the list endpoints), the ids
+# deleted since, and a new token. Without a token, or with one older than
+# the deletion log keeps, every entity comes back whole with reset=true and
+# the client replaces its copy.
+#
+# "Changed" means updated_at, so whatever alters a row's JSON must move it:
+#   - child rows serialized inside a parent (plans, contacts, homeowners
+#     policies, task comments) touch the parent, and so does creating or
+#     deleting the benefits / commercial record behind a client's coverage
+#     flags (SYNC_PARENTS, before_flush);
+#   - keys copied from another table (client_name, individual_name, cobra
+#     assigned_to) match on that table's updated_at (SYNC_DEPENDENCIES).
+# Deleted rows go to deletion_log in the same flush; a bulk DELETE (the
+# Excel import) logs a whole-table reset instead.
+#
+# Stamps are taken at flush time, not commit time, so a sync looks back
+# SYNC_OVERLAP before its token to catch transactions that committed late.
+# Rows in that window are sent again; clients upsert by id.
+
+SYNC_ENTITIES = {
+    'clients': Client,
+    'individuals': Individual,
+    'benefits': EmployeeBenefit,
+    'commercial': CommercialInsurance,
+    'personal': PersonalInsurance,
+    'cobra': CobraCoverage,
+    'tasks': Task,
+}
+SYNC_TABLES = {model.__tablename__ for model in SYNC_ENTITIES.values()}
+SYNC_OVERLAP = timedelta(minutes=10)
+DELETION_LOG_RETENTION = timedelta(days=90)
+
+# model: ((relationship to parent, touch on update too?), ...)
+SYNC_PARENTS = {
+    BenefitPlan: (('employee_benefit', True),),
+    CommercialPlan: (('commercial_insurance', True),),
+    HomeownersPolicy: (('personal_insurance', True),),
+    ClientContact: (('client', True),),
+    TaskComment: (('task', True),),
+    EmployeeBenefit: (('client', False),),       # has_employee_benefits
+    CommercialInsurance: (('client', False),),   # has_commercial_insurance
+}
+
+SYNC_DEPENDENCIES = {
+    EmployeeBenefit: (_RefClient.updated_at,),
+    CommercialInsurance: (_RefClient.updated_at,),
+    PersonalInsurance: (_RefIndividual.updated_at,),
+    CobraCoverage: (_RefClient.updated_at, _RefBenefits.updated_at),
+}
+
+
+def _sync_parents(session, refs):
+    """Parent rows for [(child, relationship name)], skipping children without one."""
+    parents, lookups = [], {}
+    for obj, rel_name in refs:
+        parent = getattr(obj, rel_name)
+        if parent is not None:
+            parents.append(parent)
+            continue
+        # Pending rows built with a bare foreign key don't load the
+        # relationship; look those parents up in one IN query per table.
+        rel = sa_inspect(type(obj)).relationships[rel_name]
+        (local, remote), = rel.local_remote_pairs
+        value = getattr(obj, rel.parent.get_property_by_column(local).key)
+        if value is not None:
+            lookups.setdefault((rel.mapper.class_, remote), set()).add(value)
+    for (model, remote), values in lookups.items():
+        values = sorted(values)
+        for start in range(0, len(values), 500):
+            parents.extend(session.query(model).filter(remote.in_(values[start:start + 500])))
+    return parents
+
+
+@event.listens_for(OrmSession, 'before_flush')
+def _touch_sync_parents(session, flush_context, instances):
+    new, dirty, deleted = session.new, session.dirty, session.deleted
+    # Collection-only changes issue no UPDATE, so onupdate alone misses them.
+    touched = [obj for obj in dirty
+               if obj.__tablename__ in SYNC_TABLES and session.is_modified(obj)]
+    refs = []
+    for objs, is_update in ((new, False), (dirty, True), (deleted, False)):
+        for obj in objs:
+            for rel_name, on_update in SYNC_PARENTS.get(type(obj), ()):
+                if on_update or not is_update:
+                    refs.append((obj, rel_name))
+    if refs:
+        touched.extend(_sync_parents(session, refs))
+    deleted_client_ids = [obj.id for obj in deleted if isinstance(obj, Client)]
+    if deleted_client_ids:
+        # tasks.client_id is nulled by ON DELETE SET NULL, out of the ORM's sight.
+        touched.extend(session.query(Task).filter(Task.client_id.in_(deleted_client_ids)))
+
+    now = datetime.utcnow()
+    for obj in touched:
+        if obj not in new and obj not in deleted:
+            obj.updated_at = now
+
+
+@event.listens_for(OrmSession, 'after_flush')
+def _log_sync_deletions(session, flush_context):
+    now = datetime.utcnow()
+    rows = [{'table_name': obj.__tablename__, 'row_id': obj.id, 'deleted_at': now}
+            for obj in session.deleted if obj.__tablename__ in SYNC_TABLES]
+    if rows:
+        session.connection().execute(DeletionLog.__table__.insert(), rows)
+
+
+@event.listens_for(OrmSession, 'do_orm_execute')
+def _log_sync_bulk_delete(orm_execute_state):
+    if not orm_execute_state.is_delete:
+        return
+    table = getattr(orm_execute_state.statement, 'table', None)
+    if table is not None and table.name in SYNC_TABLES:
+        orm_execute_state.session.connection().execute(
+            DeletionLog.__table__.insert(),
+            {'table_name': table.name, 'row_id': None, 'deleted_at': datetime.utcnow()},
+        )
+
+
+def _encode_sync_token(moment):
+    return base64.urlsafe_b64encode(moment.isoformat().encode()).decode().rstrip('=')
+
+
+def _decode_sync_token(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        return datetime.fromisoformat(base64.urlsafe_b64decode(padded).decode())
+    except ValueError:
+        raise QueryParamError('Invalid sync token')
+
+
+def _sync_rows(session, model, since):
+    """Serialized rows of `model` changed after `since` (every row when None)."""
+    spec = FIELD_SPECS[model]
+    plan = spec.row_plan(spec.keys_for(None))
+    query = session.query(*plan.columns).select_from(model)
+    for target, onclause in plan.joins:
+        query = query.outerjoin(target, onclause)
+    if since is not None:
+        stamps = (model.updated_at, *SYNC_DEPENDENCIES.get(model, ()))
+        query = query.filter(or_(*(stamp > since for stamp in stamps)))
+    return plan.encode_rows(session, query.order_by(model.id).all())
+
+
+def _sync_tasks(session, since, user):
+    """(changed tasks, ids to drop). Non-managers only see their own tasks,
+    so tasks changed away from them come back as deletions."""
+    def changed(query):
+        if since is None:
+            return query
+        return (query.outerjoin(_RefClient, _RefClient.id == Task.client_id)
+                .filter(or_(Task.updated_at > since, _RefClient.updated_at > since)))
+
+    visible = list_query(session, Task)
+    if _can_manage_tasks(user):
+        return [t.to_dict() for t in changed(visible).order_by(Task.id)], []
+    mine = Task.assignee_id == user.id
+    tasks = [t.to_dict() for t in changed(visible.filter(mine)).order_by(Task.id)]
+    hidden = []
+    if since is not None:
+        hidden = [task_id for (task_id,) in
+                  changed(session.query(Task.id)).filter(or_(~mine, Task.assignee_id.is_(None)))]
+    return tasks, hidden
+
+
+# ===========================================================================
+# POLICY LINES
+# ===========================================================================
+# policy_lines holds every coverage line in one shape, so dashboards can
+# filter, group and sort coverage in SQL instead of walking some 25 flat
+# column groups and three plan tables per record in Python:
+#   - one line per row of benefit_plans, commercial_plans and
+#     homeowners_policies;
+#   - one line per single-plan flat column group (<prefix>_carrier,
+#     <prefix>_renewal_date, ...) holding any value. Flat columns that only
+#     mirror a type's first plan row (current_carrier, dental_*, umbrella_*,
+#     ...) get no line. workers_comp_* and homeowners_* do: older records
+#     have them without plan rows, so filter on `source` to pick one side
+#     (superseded_policy_lines() leaves out the flat line of a record that
+#     has plan rows).
+#
+# Lines are derived data, rewritten per owner (the benefits, commercial or
+# personal record) inside the flush that changes it:
+#   - ORM flushes of an owner or of its plan rows (after_flush);
+#   - a client's tax_id / an individual's individual_id changing, which
+#     the database cascades to the owners;
+#   - a bulk DELETE of a whole table (the Excel import) clears that
+#     table's lines (do_orm_execute).
+# A bulk DELETE with a WHERE clause (save_benefit_plans and friends) relies
+# on the caller touching the owner, as /api/sync already requires. Not seen:
+# bulk UPDATEs of line columns and text() SQL — call sync_policy_lines()
+# next to those. To recompute everything:
+#     flask --app api.customer_api rebuild-policy-lines
+# or POST /api/admin/policy-lines/rebuild.
+
+LINE_FIELDS = ('carrier', 'premium', 'renewal_date', 'outstanding_item', 'outstanding_item_due_date')
+
+BENEFIT_LINE_PREFIXES = ('ltd', 'std', 'k401', 'critical_illness', 'accident', 'hospital', 'voluntary_life')
+COMMERCIAL_LINE_PREFIXES = (
+    'general_liability', 'property', 'bop', 'workers_comp', 'auto', 'epli', 'nydbl', 'surety',
+    'product_liability', 'flood', 'directors_officers', 'fiduciary', 'inland_marine',
+)
+
+
+def _flat_line_columns(model, prefix, renewal_field=None):
+    """{line field: <prefix>_<field> column, or None where the model has none}."""
+    columns = {f: getattr(model, f'{prefix}_{f}', None) for f in LINE_FIELDS}
+    if renewal_field:
+        columns['renewal_date'] = getattr(model, renewal_field)
+    return columns
+
+
+class PolicyLineSource:
+    """Where one line of business keeps its coverage lines.
+
+    flat: [(policy_type, {line field: column or None})] on the owner model.
+    plan_columns: {line field: column or None} on plan_model, whose rows
+    point at their owner through plan_fk. plan_type is a column, or a
+    string when the plan table holds a single type.
+    """
+
+    def __init__(self, line_of_business, model, owner_key, flat,
+                 plan_model, plan_fk, plan_type, plan_number, plan_columns):
+        self.line_of_business = line_of_business
+        self.model = model
+        self.owner_key = owner_key
+        self.flat = flat
+        self.plan_model = plan_model
+        self.plan_fk = plan_fk
+        self.plan_type = plan_type
+        self.plan_number = plan_number
+        self.plan_columns = plan_columns
+
+    def lines(self, connection, owner_ids=None):
+        """policy_lines rows for owner_ids (every owner when None)."""
+        yield from self._flat_lines(connection, owner_ids)
+        yield from self._plan_lines(connection, owner_ids)
+
+    def _flat_lines(self, connection, owner_ids):
+        table = self.model.__tablename__
+        columns = [c for _, cols in self.flat for c in cols.values() if c is not None]
+        query = select(self.model.id, self.owner_key, *columns)
+        if owner_ids is not None:
+            query = query.where(self.model.id.in_(owner_ids))
+        for owner_id, owner_key, *values in connection.execute(query):
+            values = iter(values)
+            for policy_type, cols in self.flat:
+                line = {f: next(values) if c is not None else None for f, c in cols.items()}
+                if all(v is None or v == '' for v in line.values()):
+                    continue
+                yield {'line_of_business': self.line_of_business, 'source': table,
+                       'source_id': owner_id, 'owner_id': owner_id, 'owner_key': owner_key,
+                       'policy_type': policy_type, 'plan_number': 1, **line}
+
+    def _plan_lines(self, connection, owner_ids):
+        table = self.plan_model.__tablename__
+        fields = [f for f, c in self.plan_columns.items() if c is not None]
+        fixed_type = isinstance(self.plan_type, str)
+        query = (
+            select(self.plan_model.id, self.plan_fk, self.owner_key, self.plan_number,
+                   *(() if fixed_type else (self.plan_type,)),
+                   *(self.plan_columns[f] for f in fields))
+            .join(self.model, self.model.id == self.plan_fk)
+        )
+        if owner_ids is not None:
+            query = query.where(self.plan_fk.in_(owner_ids))
+        for source_id, owner_id, owner_key, plan_number, *values in connection.execute(query):
+            policy_type = self.plan_type if fixed_type else values.pop(0)
+            line = dict.fromkeys(LINE_FIELDS)
+            line.update(zip(fields, values))
+            yield {'line_of_business': self.line_of_business, 'source': table,
+                   'source_id': source_id, 'owner_id': owner_id, 'owner_key': owner_key,
+                   'policy_type': policy_type, 'plan_number': plan_number or 1, **line}
+
+
+POLICY_LINE_SOURCES = {
+    'benefits': PolicyLineSource(
+        'benefits', EmployeeBenefit, EmployeeBenefit.tax_id,
+        [(p, _flat_line_columns(EmployeeBenefit, p)) for p in BENEFIT_LINE_PREFIXES],
+        BenefitPlan, BenefitPlan.employee_benefit_id, BenefitPlan.plan_type, BenefitPlan.plan_number,
+        {f: getattr(BenefitPlan, f, None) for f in LINE_FIELDS},
+    ),
+    'commercial': PolicyLineSource(
+        'commercial', CommercialInsurance, CommercialInsurance.tax_id,
+        [(p, _flat_line_columns(CommercialInsurance, p)) for p in COMMERCIAL_LINE_PREFIXES],
+        CommercialPlan, CommercialPlan.commercial_insurance_id, CommercialPlan.plan_type,
+        CommercialPlan.plan_number, {f: getattr(CommercialPlan, f) for f in LINE_FIELDS},
+    ),
+    'personal': PolicyLineSource(
+        'personal', PersonalInsurance, PersonalInsurance.individual_id,
+        [(p, _flat_line_columns(PersonalInsurance, p, renewal_field))
+         for p, renewal_field in zip(PERSONAL_INSURANCE_PRODUCTS, PERSONAL_RENEWAL_FIELDS)],
+        HomeownersPolicy, HomeownersPolicy.personal_insurance_id, 'homeowners',
+        HomeownersPolicy.policy_number, {f: getattr(HomeownersPolicy, f) for f in LINE_FIELDS},
+    ),
+}
+
+# model: (line of business, attribute holding the owner's id)
+POLICY_LINE_OWNERS = {
+    EmployeeBenefit: ('benefits', 'id'),
+    BenefitPlan: ('benefits', 'employee_benefit_id'),
+    CommercialInsurance: ('commercial', 'id'),
+    CommercialPlan: ('commercial', 'commercial_insurance_id'),
+    PersonalInsurance: ('personal', 'id'),
+    HomeownersPolicy: ('personal', 'personal_insurance_id'),
+}
+# model: (key attribute copied into owner_key, lines of business it keys)
+POLICY_LINE_KEY_PARENTS = {
+    Client: ('tax_id', ('benefits', 'commercial')),
+    Individual: ('individual_id', ('personal',)),
+}
+
+
+def sync_policy_lines(connection, owners):
+    """Rewrite the policy_lines of {line of business: owner ids} from the policy tables."""
+    lines = PolicyLine.__table__
+    for lob, owner_ids in owners.items():
+        owner_ids = sorted(owner_ids)
+        for start in range(0, len(owner_ids), 500):
+            chunk = owner_ids[start:start + 500]
+            connection.execute(lines.delete().where(
+                lines.c.line_of_business == lob, lines.c.owner_id.in_(chunk)))
+            rows = list(POLICY_LINE_SOURCES[lob].lines(connection, chunk))
+            if rows:
+                connection.execute(lines.insert(), rows)
+    bump_table_versions(connection, [lines.name])
+
+
+def rebuild_policy_lines(connection):
+    """Recompute the whole policy_lines table. Returns the number of lines."""
+    lines = PolicyLine.__table__
+    connection.execute(lines.delete())
+    count = 0
+    for source in POLICY_LINE_SOURCES.values():
+        rows = source.lines(connection)
+        while batch := list(itertools.islice(rows, 1000)):
+            connection.execute(lines.insert(), batch)
+            count += len(batch)
+    bump_table_versions(connection, [lines.name])
+    return count
+
+
+def superseded_policy_lines():
+    """SQL clause matching flat workers_comp / homeowners lines of records that have plan rows."""
+    return or_(
+        and_(PolicyLine.source == CommercialInsurance.__tablename__,
+             PolicyLine.policy_type == 'workers_comp',
+             exists().where(CommercialPlan.commercial_insurance_id == PolicyLine.owner_id,
+                            CommercialPlan.plan_type == 'workers_comp')),
+        and_(PolicyLine.source == PersonalInsurance.__tablename__,
+             PolicyLine.policy_type == 'homeowners',
+             exists().where(HomeownersPolicy.personal_insurance_id == PolicyLine.owner_id)),
+    )
+
+
+@event.listens_for(OrmSession, 'after_flush')
+def _sync_flushed_policy_lines(session, flush_context):
+    owners = {}
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        spec = POLICY_LINE_OWNERS.get(type(obj))
+        if spec is None:
+            continue
+        lob, attr = spec
+        # Current and previous owner, should a plan row have moved.
+        for owner_id in sa_inspect(obj).attrs[attr].history.sum():
+            if owner_id is not None:
+                owners.setdefault(lob, set()).add(owner_id)
+
+    lines = PolicyLine.__table__
+    for obj in session.dirty:
+        spec = POLICY_LINE_KEY_PARENTS.get(type(obj))
+        if spec is None:
+            continue
+        key, lobs = spec
+        old_keys = sa_inspect(obj).attrs[key].history.deleted
+        if not old_keys:
+            continue
+        renamed = session.connection().execute(
+            select(lines.c.line_of_business, lines.c.owner_id)
+            .where(lines.c.line_of_business.in_(lobs), lines.c.owner_key.in_(old_keys))
+        )
+        for lob, owner_id in renamed:
+            owners.setdefault(lob, set()).add(owner_id)
+
+    if owners:
+        sync_policy_lines(session.connection(), owners)
+
+
+# table name: (line of business, whether it is the owner table)
+_POLICY_LINE_TABLES = {}
+for _source in POLICY_LINE_SOURCES.values():
+    _POLICY_LINE_TABLES[_source.model.__tablename__] = (_source.line_of_business, True)
+    _POLICY_LINE_TABLES[_source.plan_model.__tablename__] = (_source.line_of_business, False)
+
+
+@event.listens_for(OrmSession, 'do_orm_execute')
+def _clear_bulk_deleted_policy_lines(orm_execute_state):
+    if not orm_execute_state.is_delete:
+        return
+    statement = orm_execute_state.statement
+    table = getattr(statement, 'table', None)
+    if table is None or table.name not in _POLICY_LINE_TABLES or statement.whereclause is not None:
+        return
+    lob, is_owner = _POLICY_LINE_TABLES[table.name]
+    lines = PolicyLine.__table__
+    clause = lines.c.line_of_business == lob
+    if not is_owner:
+        clause = and_(clause, lines.c.source == table.name)
+    connection = orm_execute_state.session.connection()
+    connection.execute(lines.delete().where(clause))
+    bump_table_versions(connection, [lines.name])
+
+
+@app.cli.command('rebuild-policy-lines')
+def rebuild_policy_lines_command():
+    """Recompute the policy_lines table from the policy tables."""
+    with db.engine.begin() as conn:
+        count = rebuild_policy_lines(conn)
+    print(f'Rebuilt {count} policy lines.')
+
+
+@app.route('/api/admin/policy-lines/rebuild', methods=['POST'])
+@require_admin
+def rebuild_policy_lines_endpoint():
+    """Recompute policy_lines, e.g. after editing policy tables with raw SQL."""
+    session = Session()
+    try:
+        count = rebuild_policy_lines(session.connection())
+        session.commit()
+        return jsonify({'rebuilt': count}), 200
+    except Exception as e:
+        session.rollback()
+        logging.error(f"Error rebuilding policy lines: {e}")
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
+
+
+# ===========================================================================
+# UTILITY FUNCTIONS
+# ===========================================================================
+
+def parse_date(date_str):
+    """Parse date string to date object."""
+    if not date_str or date_str == '':
+        return None
+    try:
+        return parse(date_str).date()
+    except (ValueError, TypeError, AttributeError, OverflowError):
+        return None
+
+
+def parse_int(value):
+    """Coerce form value to int, or None. Empty strings on int columns otherwise
+    raise InvalidTextRepresentation in Postgres."""
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def save_benefit_plans(session, benefit, plans_data):
+    """Save multi-plan child records for a benefit. Deletes existing plans first."""
+    # Delete existing plans for this benefit. A bulk delete isn't seen by the
+    # sync hooks, so mark the benefit itself as changed.
+    benefit.updated_at = datetime.utcnow()
+    session.query(BenefitPlan).filter_by(employee_benefit_id=benefit.id).delete()
+    session.flush()
+
+    for plan_type in MULTI_PLAN_TYPES:
+        for idx, plan_info in enumerate(plans_data.get(plan_type, []), 1):
+            carrier = plan_info.get('carrier')
+            if is_valid_carrier(carrier):
+                plan = BenefitPlan(
+                    employee_benefit_id=benefit.id,
+                    plan_type=plan_type,
+                    plan_number=idx,
+                    carrier=carrier,
+                    renewal_date=parse_date(plan_info.get('renewal_date')),
+                    waiting_period=plan_info.get('waiting_period') or None,
+                    remarks=plan_info.get('remarks') or None,
+                    outstanding_item=plan_info.get('outstanding_item') or None
+                )
+                session.add(plan)
+
+    # Also update flat fields from first plan for backward compat
+    for plan_type in MULTI_PLAN_TYPES:
+        plans_for_type = plans_data.get(plan_type, [])
+        first = plans_for_type[0] if plans_for_type else {}
+        if plan_type == 'medical':
+            benefit.current_carrier = first.get('carrier') or None
+            benefit.renewal_date = parse_date(first.get('renewal_date'))
+        else:
+            setattr(benefit, f'{plan_type}_carrier', first.get('carrier') or None)
+            setattr(benefit, f'{plan_type}_renewal_date', parse_date(first.get('renewal_date')))
+
+
+def save_commercial_plans(session, commercial, plans_data):
+    """Save multi-plan child records for commercial insurance. Deletes existing plans first."""
+    commercial.updated_at = datetime.utcnow()  # bulk delete below bypasses the sync hooks
+    session.query(CommercialPlan).filter_by(commercial_insurance_id=commercial.id).delete()
+    session.flush()
+
+    for plan_type in MULTI_PLAN_COMMERCIAL_TYPES:
+        for idx, plan_info in enumerate(plans_data.get(plan_type, []), 1):
+            carrier = plan_info.get('carrier')
+            agency = plan_info.get('agency')
+            policy_number = plan_info.get('policy_number')
+            renewal = plan_info.get('renewal_date')
+            occ_limit_val = plan_info.get('occ_limit')
+            agg_limit_val = plan_info.get('agg_limit')
+            premium_val = plan_info.get('premium')
+            if is_valid_carrier(carrier):
+                plan = CommercialPlan(
+                    commercial_insurance_id=commercial.id,
+                    plan_type=plan_type,
+                    plan_number=idx,
+                    carrier=carrier,
+                    agency=agency,
+                    policy_number=policy_number or None,
+                    coverage_occ_limit=occ_limit_val,
+                    coverage_agg_limit=agg_limit_val,
+                    premium=parse_premium(premium_val),
+                    renewal_date=parse_date(renewal),
+                    remarks=plan_info.get('remarks') or None,
+                    outstanding_item=plan_info.get('outstanding_item') or None,
+                    outstanding_item_due_date=parse_date(plan_info.get('outstanding_item_due_date')),
+                    endorsement_tech_eo=bool(plan_info.get('endorsement_tech_eo')),
+                    endorsement_allied_healthcare=bool(plan_info.get('endorsement_allied_healthcare')),
+                    endorsement_staffing=bool(plan_info.get('endorsement_staffing')),
+                    endorsement_medical_malpractice=bool(plan_info.get('endorsement_medical_malpractice')),
+                    insured_entities=plan_info.get('insured_entities') or None,
+                )
+                session.add(plan)
+
+    # Also update flat fields from first plan for backward compat
+    for plan_type in MULTI_PLAN_COMMERCIAL_TYPES:
+        plans_for_type = plans_data.get(plan_type, [])
+        first = plans_for_type[0] if plans_for_type else {}
+        setattr(commercial, f'{plan_type}_carrier', first.get('carrier') or None)
+        setattr(commercial, f'{plan_type}_agency', first.get('agency') or None)
+        setattr(commercial, f'{plan_type}_policy_number', first.get('policy_number') or None)
+        setattr(commercial, f'{plan_type}_occ_limit', first.get('occ_limit') or None)
+        setattr(commercial, f'{plan_type}_agg_limit', first.get('agg_limit') or None)
+        setattr(commercial, f'{plan_type}_premium', parse_premium(first.get('premium')))
+        setattr(commercial, f'{plan_type}_renewal_date', parse_date(first.get('renewal_date')))
+
+
+def save_homeowners_policies(session, personal, policies_data):
+    """Save homeowners policy child records. Deletes existing first."""
+    personal.updated_at = datetime.utcnow()  # bulk delete below bypasses the sync hooks
+    session.query(HomeownersPolicy).filter_by(personal_insurance_id=personal.id).delete()
+    session.flush()
+    for idx, p in enumerate(policies_data or [], 1):
+        carrier = p.get('carrier')
+        dwelling = p.get('dwelling_limit')
+        liability = p.get('liability_limit')
+        premium = p.get('premium')
+        renewal = p.get('renewal_date')
+        if carrier or dwelling or liability or premium or renewal:
+            policy = HomeownersPolicy(
+                personal_insurance_id=personal.id,
+                policy_number=idx,
+                carrier=carrier,
+                dwelling_limit=dwelling,
+                liability_limit=liability,
+                premium=parse_premium(premium),
+                renewal_date=parse_date(renewal),
+                remarks=p.get('remarks') or None,
+                outstanding_item=p.get('outstanding_item') or None,
+                outstanding_item_due_date=parse_date(p.get('outstanding_item_due_date')),
+                property_address_line_1=p.get('property_address_line_1') or None,
+                property_address_line_2=p.get('property_address_line_2') or None,
+                property_city=p.get('property_city') or None,
+                property_state=p.get('property_state') or None,
+                property_zip=p.get('property_zip') or None,
+                is_primary_residence=bool(p.get('is_primary_residence'))
+            )
+            session.add(policy)
+    # Update flat fields from first policy for backward compat
+    first = policies_data[0] if policies_data else {}
+    personal.homeowners_carrier = first.get('carrier') or None
+    personal.homeowners_dwelling_limit = first.get('dwelling_limit') or None
+    personal.homeowners_liability_limit = first.get('liability_limit') or None
+    personal.homeowners_premium = parse_premium(first.get('premium'))
+    personal.homeowners_renewal_date = parse_date(first.get('renewal_date'))
+    personal.homeowners_remarks = first.get('remarks') or None
+    personal.homeowners_outstanding_item = first.get('outstanding_item') or None
 
 
-def format_limit(val):
-    """Convert a limit value to millions for storage.
-    '1,000,000' or 1000000 → '1'
-    '2,000,000' or 2000000 → '2'
-    '5,000,000' or 5000000 → '5'
-    '500,000' or 500000 → '0.5'
-    Already in millions (e.g. '1', '2', '5') → kept as-is.
-    Non-numeric strings (e.g. 'N/A') → kept as-is."""
+def parse_premium(val):
+    """Parse premium value to float, returning None for empty/invalid values."""
     if val is None or val == '':
         return None
-    s = str(val).strip()
-    if s.upper() == 'N/A':
-        return None
-    # Remove commas to get raw number
-    raw = s.replace(',', '')
     try:
-        num = float(raw)
-        # If >= 100000, assume it's in raw dollars — convert to millions
-        if num >= 100000:
-            m = num / 1000000
-            return str(int(m)) if m == int(m) else str(m)
-        # Otherwise already in millions or a small value — keep as-is
-        return str(int(num)) if num == int(num) else str(num)
+        return float(val)
     except (ValueError, TypeError):
-        return s
+        return None
 
 
 # ===========================================================================
@@ -2325,15 +3561,18 @@ def format_limit(val):
 # ===========================================================================
 
 @app.route('/api/clients', methods=['GET'])
+@conditional_list(Client)
 def get_clients():
-    """Get all clients."""
+    """Get clients. Supports the LIST_SPECS filter/sort/page params and ?fields=."""
     session = Session()
     try:
-        clients = session.query(Client).all()
-        return jsonify({
-            'clients': [client.to_dict() for client in clients],
-            'total': len(clients)
-        }), 200
+        fields = parse_fields(Client, request.args)
+        if not request.args.get('limit'):
+            return stream_list(Client, 'clients', request.args, fields)
+        clients, page = fetch_list(session, Client, request.args, fields)
+        return jsonify(list_payload('clients', clients, page)), 200
+    except QueryParamError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error fetching clients: {e}")
         return jsonify({'error': str(e)}), 500
@@ -2473,7 +3712,9 @@ def update_client(client_id):
 
         # Update contacts if provided
         if 'contacts' in data:
-            # Remove existing contacts
+            # Remove existing contacts (a bulk delete, so mark the client
+            # changed for /api/sync ourselves)
+            client.updated_at = datetime.utcnow()
             session.query(ClientContact).filter_by(client_id=client.id).delete()
             # Add new contacts
             for i, c in enumerate(data['contacts']):
@@ -2722,15 +3963,18 @@ def clone_client(client_id):
 # ===========================================================================
 
 @app.route('/api/benefits', methods=['GET'])
+@conditional_list(EmployeeBenefit)
 def get_benefits():
-    """Get all employee benefits with client info."""
+    """Get employee benefits with client info. Supports the LIST_SPECS filter/sort/page params and ?fields=."""
     session = Session()
     try:
-        benefits = session.query(EmployeeBenefit).all()
-        return jsonify({
-            'benefits': [benefit.to_dict() for benefit in benefits],
-            'total': len(benefits)
-        }), 200
+        fields = parse_fields(EmployeeBenefit, request.args)
+        if not request.args.get('limit'):
+            return stream_list(EmployeeBenefit, 'benefits', request.args, fields)
+        benefits, page = fetch_list(session, EmployeeBenefit, request.args, fields)
+        return jsonify(list_payload('benefits', benefits, page)), 200
+    except QueryParamError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error fetching benefits: {e}")
         return jsonify({'error': str(e)}), 500
@@ -2740,13 +3984,19 @@ def get_benefits():
 
 @app.route('/api/benefits/<int:benefit_id>', methods=['GET'])
 def get_benefit(benefit_id):
-    """Get a single benefit record."""
+    """Get a single benefit record. Supports ?fields= (see FIELD_SPECS)."""
     session = Session()
     try:
-        benefit = session.query(EmployeeBenefit).filter_by(id=benefit_id).first()
+        fields = parse_fields(EmployeeBenefit, request.args)
+        query = session.query(EmployeeBenefit)
+        if fields is not None:
+            query = query.options(*field_options(EmployeeBenefit, fields))
+        benefit = query.filter_by(id=benefit_id).first()
         if not benefit:
             return jsonify({'error': 'Benefit not found'}), 404
-        return jsonify(benefit.to_dict()), 200
+        return jsonify(serialize(benefit, fields)), 200
+    except QueryParamError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error fetching benefit: {e}")
         return jsonify({'error': str(e)}), 500
@@ -3068,15 +4318,18 @@ def clone_benefit(benefit_id):
 # ===========================================================================
 
 @app.route('/api/commercial', methods=['GET'])
+@conditional_list(CommercialInsurance)
 def get_commercial():
-    """Get all commercial insurance records with client info."""
+    """Get commercial insurance records with client info. Supports the LIST_SPECS filter/sort/page params and ?fields=."""
     session = Session()
     try:
-        commercial = session.query(CommercialInsurance).all()
-        return jsonify({
-            'commercial': [c.to_dict() for c in commercial],
-            'total': len(commercial)
-        }), 200
+        fields = parse_fields(CommercialInsurance, request.args)
+        if not request.args.get('limit'):
+            return stream_list(CommercialInsurance, 'commercial', request.args, fields)
+        commercial, page = fetch_list(session, CommercialInsurance, request.args, fields)
+        return jsonify(list_payload('commercial', commercial, page)), 200
+    except QueryParamError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error fetching commercial: {e}")
         return jsonify({'error': str(e)}), 500
@@ -3086,13 +4339,19 @@ def get_commercial():
 
 @app.route('/api/commercial/<int:commercial_id>', methods=['GET'])
 def get_commercial_single(commercial_id):
-    """Get a single commercial insurance record."""
+    """Get a single commercial insurance record. Supports ?fields= (see FIELD_SPECS)."""
     session = Session()
     try:
-        commercial = session.query(CommercialInsurance).filter_by(id=commercial_id).first()
+        fields = parse_fields(CommercialInsurance, request.args)
+        query = session.query(CommercialInsurance)
+        if fields is not None:
+            query = query.options(*field_options(CommercialInsurance, fields))
+        commercial = query.filter_by(id=commercial_id).first()
         if not commercial:
             return jsonify({'error': 'Commercial insurance not found'}), 404
-        return jsonify(commercial.to_dict()), 200
+        return jsonify(serialize(commercial, fields)), 200
+    except QueryParamError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error fetching commercial: {e}")
         return jsonify({'error': str(e)}), 500
@@ -3775,23 +5034,22 @@ def create_invoice():
 
 
 @app.route('/api/invoices', methods=['GET'])
+@conditional_list(Invoice)
 def get_invoices():
-    """Get all invoices, optionally filtered by status and month."""
+    """Get invoices, optionally filtered by status and month (YYYY-MM).
+
+    Supports the LIST_SPECS filter/sort/page params and ?fields=.
+    """
     session = Session()
     try:
-        query = session.query(Invoice)
-        status = request.args.get('status')
-        if status:
-            query = query.filter(Invoice.status == status)
-        month = request.args.get('month')
-        if month:
-            year, mon = month.split('-')
-            query = query.filter(
-                db.extract('year', Invoice.invoice_date) == int(year),
-                db.extract('month', Invoice.invoice_date) == int(mon)
-            )
-        invoices = query.order_by(Invoice.invoice_date.desc()).all()
-        return jsonify([inv.to_dict() for inv in invoices]), 200
+        fields = parse_fields(Invoice, request.args)
+        # Bare list unless paginated, for backward compatibility.
+        if not request.args.get('limit'):
+            return stream_list(Invoice, None, request.args, fields)
+        items, page = fetch_list(session, Invoice, request.args, fields)
+        return jsonify(list_payload('invoices', items, page)), 200
+    except QueryParamError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error fetching invoices: {e}")
         return jsonify({'error': str(e)}), 500
@@ -3898,11 +5156,18 @@ def delete_invoice(invoice_id):
 US_STATES = ['AL','AK','AZ','AR','CA','CO','CT','DE','FL','GA','HI','ID','IL','IN','IA','KS','KY','LA','ME','MD','MA','MI','MN','MS','MO','MT','NE','NV','NH','NJ','NM','NY','NC','ND','OH','OK','OR','PA','RI','SC','SD','TN','TX','UT','VT','VA','WA','WV','WI','WY','DC']
 
 @app.route('/api/cobra', methods=['GET'])
+@conditional_list(CobraCoverage)
 def get_cobra_coverages():
     session = Session()
     try:
-        coverages = session.query(CobraCoverage).order_by(CobraCoverage.created_at.desc()).all()
-        return jsonify([c.to_dict() for c in coverages]), 200
+        fields = parse_fields(CobraCoverage, request.args)
+        # Bare list unless paginated, for backward compatibility.
+        if not request.args.get('limit'):
+            return stream_list(CobraCoverage, None, request.args, fields)
+        items, page = fetch_list(session, CobraCoverage, request.args, fields)
+        return jsonify(list_payload('cobra', items, page)), 200
+    except QueryParamError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
@@ -4075,14 +5340,14 @@ def generate_individual_id(session):
 
 @app.route('/api/individuals', methods=['GET'])
 def get_individuals():
-    """Get all individuals."""
+    """Get individuals. Supports the LIST_SPECS filter/sort/page params and ?fields=."""
     session = Session()
     try:
-        individuals = session.query(Individual).all()
-        return jsonify({
-            'individuals': [i.to_dict() for i in individuals],
-            'total': len(individuals)
-        })
+        fields = parse_fields(Individual, request.args)
+        individuals, page = fetch_list(session, Individual, request.args, fields)
+        return jsonify(list_payload('individuals', individuals, page))
+    except QueryParamError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error fetching individuals: {e}")
         return jsonify({'error': str(e)}), 500
@@ -4239,15 +5504,18 @@ PERSONAL_FIELDS = {
 
 
 @app.route('/api/personal', methods=['GET'])
+@conditional_list(PersonalInsurance)
 def get_personal():
-    """Get all personal insurance records."""
+    """Get personal insurance records. Supports the LIST_SPECS filter/sort/page params and ?fields=."""
     session = Session()
     try:
-        records = session.query(PersonalInsurance).all()
-        return jsonify({
-            'personal': [r.to_dict() for r in records],
-            'total': len(records)
-        })
+        fields = parse_fields(PersonalInsurance, request.args)
+        if not request.args.get('limit'):
+            return stream_list(PersonalInsurance, 'personal', request.args, fields)
+        records, page = fetch_list(session, PersonalInsurance, request.args, fields)
+        return jsonify(list_payload('personal', records, page))
+    except QueryParamError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error fetching personal insurance: {e}")
         return jsonify({'error': str(e)}), 500
@@ -4257,13 +5525,19 @@ def get_personal():
 
 @app.route('/api/personal/<int:personal_id>', methods=['GET'])
 def get_personal_by_id(personal_id):
-    """Get single personal insurance record."""
+    """Get single personal insurance record. Supports ?fields= (see FIELD_SPECS)."""
     session = Session()
     try:
-        record = session.query(PersonalInsurance).filter_by(id=personal_id).first()
+        fields = parse_fields(PersonalInsurance, request.args)
+        query = session.query(PersonalInsurance)
+        if fields is not None:
+            query = query.options(*field_options(PersonalInsurance, fields))
+        record = query.filter_by(id=personal_id).first()
         if not record:
             return jsonify({'error': 'Personal insurance not found'}), 404
-        return jsonify({'personal': record.to_dict()})
+        return jsonify({'personal': serialize(record, fields)})
+    except QueryParamError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
@@ -4433,10 +5707,232 @@ def clone_personal(personal_id):
         session.close()
 
 
+# ===========================================================================
+# SYNC ENDPOINT
+# ===========================================================================
+
+@app.route('/api/sync', methods=['GET'])
+def sync_changes():
+    """Rows changed and deleted since ?since=<token>; see DELTA SYNC.
+
+    Optional ?entities=clients,benefits limits the response to those
+    entities (default: all of SYNC_ENTITIES). Response:
+      {"token": "...", "<entity>": {"changed": [...], "deleted": [ids], "reset": bool}, ...}
+    """
+    user = getattr(request, 'current_user', None) or _current_user()
+    if not user:
+        return jsonify({'error': 'Authentication required'}), 401
+    now = datetime.utcnow()
+    session = Session()
+    try:
+        names = [n.strip() for n in request.args.get('entities', '').split(',') if n.strip()]
+        unknown = [n for n in names if n not in SYNC_ENTITIES]
+        if unknown:
+            raise QueryParamError(f"Unknown entities: {', '.join(unknown)}. "
+                                  f"Allowed: {', '.join(SYNC_ENTITIES)}")
+        since = _decode_sync_token(request.args['since']) if request.args.get('since') else None
+        if since is not None and since < now - DELETION_LOG_RETENTION:
+            since = None  # tombstones that old are gone; start over
+        window = since - SYNC_OVERLAP if since is not None else None
+
+        deleted, resets = {}, set()
+        if window is not None:
+            log = session.query(DeletionLog.table_name, DeletionLog.row_id).filter(
+                DeletionLog.deleted_at > window)
+            for table, row_id in log:
+                if row_id is None:
+                    resets.add(table)
+                else:
+                    deleted.setdefault(table, []).append(row_id)
+
+        payload = {'token': _encode_sync_token(now)}
+        for name in names or SYNC_ENTITIES:
+            model = SYNC_ENTITIES[name]
+            table = model.__tablename__
+            reset = window is None or table in resets
+            rows_since = None if reset else window
+            gone = [] if reset else deleted.get(table, [])
+            if model is Task:
+                rows, hidden = _sync_tasks(session, rows_since, user)
+                gone = gone + hidden
+            else:
+                rows = _sync_rows(session, model, rows_since)
+            payload[name] = {'changed': rows, 'deleted': sorted(set(gone)), 'reset': reset}
+        return jsonify(payload), 200
+    except QueryParamError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logging.error(f"Error building sync response: {e}")
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
+
+
+# ===========================================================================
+# BOOTSTRAP
+# ===========================================================================
+# GET /api/bootstrap returns everything the app loads at startup — the five
+# main lists, feedback, /api/me, the notification count and health — in one
+# response, read in one transaction (REPEATABLE READ on Postgres, so the
+# lists agree with each other).
+#
+# The list rows match the list endpoints. The client_name / client_status
+# and individual_name / individual_status keys, which the list endpoints
+# join per list, are filled from lookup maps built off the clients and
+# individuals lists already in hand.
+
+# model: (lookup key column, lookup map, ((serialized key, map value index), ...))
+BOOTSTRAP_REFS = {
+    EmployeeBenefit: ('tax_id', 'clients', (('client_name', 0), ('client_status', 1))),
+    CommercialInsurance: ('tax_id', 'clients', (('client_name', 0), ('client_status', 1))),
+    PersonalInsurance: ('individual_id', 'individuals', (('individual_name', 0), ('individual_status', 1))),
+}
+
+
+def _bootstrap_list(session, model, lookups):
+    ref = BOOTSTRAP_REFS.get(model)
+    if ref is None:
+        items, _ = fetch_list(session, model, {})
+        return items
+    column, lookup, keys = ref
+    skipped = {key for key, _ in keys}
+    fields = {key: None for key in FIELD_SPECS[model].fields if key not in skipped}
+    items, _ = fetch_list(session, model, {}, fields)
+    names = lookups[lookup]
+    for item in items:
+        values = names.get(item[column])
+        for key, index in keys:
+            item[key] = values[index] if values else None
+    return items
+
+
+@app.route('/api/bootstrap', methods=['GET'])
+def get_bootstrap():
+    """Everything the app fetches on load, in one round trip:
+      {"clients": [...], "individuals": [...], "benefits": [...], "commercial": [...],
+       "personal": [...], "feedback": [...], "me": {...}, "notifications": {...},
+       "health": {...}, "backup": {...}}
+    """
+    session = Session()
+    try:
+        if session.get_bind().dialect.name == 'postgresql':
+            session.connection(execution_options={'isolation_level': 'REPEATABLE READ'})
+        clients = _bootstrap_list(session, Client, None)
+        individuals = _bootstrap_list(session, Individual, None)
+        lookups = {
+            'clients': {c['tax_id']: (c['client_name'], c['status']) for c in clients},
+            'individuals': {i['individual_id']: (i['full_name'], i['status']) for i in individuals},
+        }
+        feedback = session.query(Feedback).order_by(Feedback.created_at.desc()).all()
+        user = getattr(request, 'current_user', None) or _current_user()
+        payload = {
+            'clients': clients,
+            'individuals': individuals,
+            'benefits': _bootstrap_list(session, EmployeeBenefit, lookups),
+            'commercial': _bootstrap_list(session, CommercialInsurance, lookups),
+            'personal': _bootstrap_list(session, PersonalInsurance, lookups),
+            'feedback': [item.to_dict() for item in feedback],
+            'me': me_payload(),
+            'notifications': {'unseen_task_count': unseen_task_count(session, user)},
+            'health': {
+                'status': 'ok',
+                'database': db_uri.split('?')[0],
+                'static_folder': app.static_folder or 'not configured',
+            },
+            'backup': backup_status_payload(),
+        }
+        return jsonify(payload), 200
+    except Exception as e:
+        logging.error(f"Error building bootstrap payload: {e}")
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
+
+
 # ===========================================================================
 # DASHBOARD ANALYTICS ENDPOINTS
 # ===========================================================================
 
+# Renewals list labels, by line of business and policy_lines.policy_type.
+RENEWAL_LABELS = {
+    'benefits': {
+        'medical': 'Medical', 'dental': 'Dental', 'vision': 'Vision', 'life_adnd': 'Life & AD&D',
+        'ltd': 'LTD', 'std': 'STD', 'k401': '401K', 'critical_illness': 'Critical Illness',
+        'accident': 'Accident', 'hospital': 'Hospital', 'voluntary_life': 'Voluntary Life',
+    },
+    'commercial': {
+        'umbrella': 'Umbrella', 'professional_eo': 'Professional E&O', 'cyber': 'Cyber', 'crime': 'Crime',
+        'general_liability': 'General Liability', 'property': 'Property', 'bop': 'BOP',
+        'workers_comp': 'Workers Comp', 'auto': 'Auto', 'epli': 'EPLI', 'nydbl': 'NYDBL',
+        'surety': 'Surety', 'product_liability': 'Product Liability', 'flood': 'Flood',
+        'directors_officers': 'D&O', 'fiduciary': 'Fiduciary', 'inland_marine': 'Inland Marine',
+    },
+    'personal': {
+        'personal_auto': 'Personal Auto', 'homeowners': 'Homeowners',
+        'personal_umbrella': 'Personal Umbrella', 'event': 'Event Insurance',
+        'visitors_medical': 'Visitors Medical',
+    },
+}
+
+
+RENEWAL_TABLES = (PolicyLine.__tablename__, Client.__tablename__, Individual.__tablename__)
+
+
+def renewal_lines(session, start_date, end_date, limit=None):
+    """(rows, total) for the policy lines renewing in [start_date, end_date].
+
+    One statement: a range scan of policy_lines.renewal_date with the client
+    or individual name joined in, sorted and limited in the database. total
+    counts every line in the window, whatever the limit.
+    """
+    query = (
+        session.query(
+            PolicyLine.line_of_business, PolicyLine.policy_type, PolicyLine.plan_number,
+            PolicyLine.renewal_date, PolicyLine.owner_key, PolicyLine.carrier, PolicyLine.premium,
+            _RefClient.client_name, _RefIndividual.id, _RefIndividual.first_name, _RefIndividual.last_name,
+            func.count().over(),
+        )
+        .outerjoin(_RefClient, and_(PolicyLine.line_of_business != 'personal',
+                                    _RefClient.tax_id == PolicyLine.owner_key))
+        .outerjoin(_RefIndividual, and_(PolicyLine.line_of_business == 'personal',
+                                        _RefIndividual.individual_id == PolicyLine.owner_key))
+        .filter(PolicyLine.renewal_date.between(start_date, end_date),
+                # homeowners_* on personal_insurance already holds the first policy.
+                PolicyLine.source != HomeownersPolicy.__tablename__)
+        .order_by(PolicyLine.renewal_date, PolicyLine.line_of_business, PolicyLine.owner_id, PolicyLine.id)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    rows = query.all()
+    return rows, (rows[0][-1] if rows else 0)
+
+
+def renewals_payload(session, start_date, end_date, limit=None):
+    """GET /api/dashboard/renewals' body for a window."""
+    rows, total = renewal_lines(session, start_date, end_date, limit)
+    renewals = []
+    for (lob, policy_type, plan_number, renewal_date, owner_key, carrier, premium,
+         client_name, individual_pk, first_name, last_name, _) in rows:
+        type_name = RENEWAL_LABELS[lob].get(policy_type, policy_type)
+        renewal = {
+            'type': lob,
+            'policy_type': f"{type_name} Plan {plan_number}" if plan_number > 1 else type_name,
+            'renewal_date': renewal_date.isoformat(),
+            'client_name': client_name,
+            'tax_id': owner_key,
+            'carrier': carrier,
+        }
+        if lob == 'personal':
+            renewal['client_name'] = _full_name(first_name, last_name) if individual_pk else None
+        elif lob == 'commercial':
+            renewal['premium'] = float(premium) if premium else None
+        renewals.append(renewal)
+    return {
+        'renewals': renewals,
+        'total': total
+    }
+
+
 @app.route('/api/dashboard/renewals', methods=['GET'])
 def get_dashboard_renewals():
     """Get renewal data for dashboard.
@@ -4444,6 +5940,10 @@ def get_dashboard_renewals():
     Query params:
         start_date (YYYY-MM-DD, optional): start of date range. Defaults to today.
         end_date (YYYY-MM-DD, optional): end of date range. Defaults to today + 12 months.
+        limit (optional): only the first N renewals; total still counts them all.
+
+    The default window and the Dashboard page's are served from
+    dashboard_snapshots; see DASHBOARD SNAPSHOTS.
     """
     session = Session()
     try:
@@ -4459,217 +5959,287 @@ def get_dashboard_renewals():
             end_date = parse(end_param).date() if end_param else (today + timedelta(days=365))
         except (ValueError, TypeError):
             end_date = today + timedelta(days=365)
+        limit = parse_limit(request.args['limit']) if request.args.get('limit') else None
+
+        payload = snapshot_payload(('renewals', start_date, end_date, limit), RENEWAL_TABLES,
+                                   lambda: renewals_payload(session, start_date, end_date, limit))
+        return jsonify(payload), 200
+    except QueryParamError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logging.error(f"Error fetching dashboard renewals: {e}")
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
 
-        renewals = []
 
-        # Get employee benefits renewals
-        multi_plan_type_names = {'medical': 'Medical', 'dental': 'Dental', 'vision': 'Vision', 'life_adnd': 'Life & AD&D'}
-        benefits = session.query(EmployeeBenefit).all()
-        for benefit in benefits:
-            # Multi-plan types: read from benefit_plans child table
-            for plan in benefit.plans:
-                if plan.renewal_date and start_date <= plan.renewal_date <= end_date:
-                    type_name = multi_plan_type_names.get(plan.plan_type, plan.plan_type)
-                    label = f"{type_name} Plan {plan.plan_number}" if plan.plan_number > 1 else type_name
-                    renewals.append({
-                        'type': 'benefits',
-                        'policy_type': label,
-                        'renewal_date': plan.renewal_date.isoformat(),
-                        'client_name': benefit.client.client_name if benefit.client else None,
-                        'tax_id': benefit.tax_id,
-                        'carrier': plan.carrier
-                    })
-
-            # Single-plan types: read from flat fields
-            single_plan_fields = [
-                ('ltd_renewal_date', 'LTD'),
-                ('std_renewal_date', 'STD'),
-                ('k401_renewal_date', '401K'),
-                ('critical_illness_renewal_date', 'Critical Illness'),
-                ('accident_renewal_date', 'Accident'),
-                ('hospital_renewal_date', 'Hospital'),
-                ('voluntary_life_renewal_date', 'Voluntary Life')
-            ]
-
-            for field_name, policy_type in single_plan_fields:
-                renewal_date = getattr(benefit, field_name)
-                if renewal_date and start_date <= renewal_date <= end_date:
-                    carrier = getattr(benefit, field_name.replace('_renewal_date', '_carrier'), None)
-                    renewals.append({
-                        'type': 'benefits',
-                        'policy_type': policy_type,
-                        'renewal_date': renewal_date.isoformat(),
-                        'client_name': benefit.client.client_name if benefit.client else None,
-                        'tax_id': benefit.tax_id,
-                        'carrier': carrier
-                    })
-
-        # Get commercial renewals
-        multi_plan_commercial_names = {'umbrella': 'Umbrella', 'professional_eo': 'Professional E&O', 'cyber': 'Cyber', 'crime': 'Crime'}
-        commercial = session.query(CommercialInsurance).all()
-        for comm in commercial:
-            # Multi-plan types: read from commercial_plans child table
-            for plan in comm.commercial_plans:
-                if plan.renewal_date and start_date <= plan.renewal_date <= end_date:
-                    type_name = multi_plan_commercial_names.get(plan.plan_type, plan.plan_type)
-                    label = f"{type_name} Plan {plan.plan_number}" if plan.plan_number > 1 else type_name
-                    renewals.append({
-                        'type': 'commercial',
-                        'policy_type': label,
-                        'renewal_date': plan.renewal_date.isoformat(),
-                        'client_name': comm.client.client_name if comm.client else None,
-                        'tax_id': comm.tax_id,
-                        'carrier': plan.carrier,
-                        'premium': float(plan.premium) if plan.premium else None
-                    })
-
-            # Single-plan types: read from flat fields
-            single_plan_fields = [
-                ('general_liability_renewal_date', 'General Liability'),
-                ('property_renewal_date', 'Property'),
-                ('bop_renewal_date', 'BOP'),
-                ('workers_comp_renewal_date', 'Workers Comp'),
-                ('auto_renewal_date', 'Auto'),
-                ('epli_renewal_date', 'EPLI'),
-                ('nydbl_renewal_date', 'NYDBL'),
-                ('surety_renewal_date', 'Surety'),
-                ('product_liability_renewal_date', 'Product Liability'),
-                ('flood_renewal_date', 'Flood'),
-                ('directors_officers_renewal_date', 'D&O'),
-                ('fiduciary_renewal_date', 'Fiduciary'),
-                ('inland_marine_renewal_date', 'Inland Marine')
-            ]
-
-            for field_name, policy_type in single_plan_fields:
-                renewal_date = getattr(comm, field_name)
-                if renewal_date and start_date <= renewal_date <= end_date:
-                    premium_val = getattr(comm, field_name.replace('_renewal_date', '_premium'), None)
-                    renewals.append({
-                        'type': 'commercial',
-                        'policy_type': policy_type,
-                        'renewal_date': renewal_date.isoformat(),
-                        'client_name': comm.client.client_name if comm.client else None,
-                        'tax_id': comm.tax_id,
-                        'carrier': getattr(comm, field_name.replace('_renewal_date', '_carrier'), None),
-                        'premium': float(premium_val) if premium_val else None
-                    })
-
-        # Get personal insurance renewals
-        personal_renewal_fields = [
-            ('personal_auto_renewal_date', 'Personal Auto'),
-            ('homeowners_renewal_date', 'Homeowners'),
-            ('personal_umbrella_renewal_date', 'Personal Umbrella'),
-            ('event_start_date', 'Event Insurance'),
-            ('visitors_medical_start_date', 'Visitors Medical')
-        ]
-        personal_records = session.query(PersonalInsurance).all()
-        for pers in personal_records:
-            for field_name, policy_type in personal_renewal_fields:
-                renewal_date = getattr(pers, field_name)
-                if renewal_date and start_date <= renewal_date <= end_date:
-                    carrier_field = field_name.replace('_renewal_date', '_carrier').replace('_start_date', '_carrier')
-                    ind = pers.individual
-                    ind_name = f"{ind.first_name or ''} {ind.last_name or ''}".strip() if ind else None
-                    renewals.append({
-                        'type': 'personal',
-                        'policy_type': policy_type,
-                        'renewal_date': renewal_date.isoformat(),
-                        'client_name': ind_name,
-                        'tax_id': pers.individual_id,
-                        'carrier': getattr(pers, carrier_field, None)
-                    })
-
-        # Sort by renewal date
-        renewals.sort(key=lambda x: x['renewal_date'])
+# Renewal calendar: policy_lines renewing in a window, bucketed by week
+# (starting Monday, as date_trunc does) or month and split by one key.
+# Postgres buckets with date_trunc; other dialects (the SQLite test
+# database) with the equivalent strftime / date arithmetic. Flat lines that
+# mirror plan rows are left out (superseded_policy_lines()), so the totals
+# match /api/analytics/premiums.
+CALENDAR_GRANULARITIES = ('week', 'month')
+CALENDAR_SPLITS = {
+    'line_of_business': lambda: PolicyLine.line_of_business,
+    'carrier': lambda: func.nullif(func.trim(PolicyLine.carrier), ''),
+    'poc': lambda: case(
+        (PolicyLine.line_of_business == 'benefits', EmployeeBenefit.enrollment_poc),
+        (PolicyLine.line_of_business == 'commercial', CommercialInsurance.assigned_to),
+    ),
+}
+CALENDAR_TABLES = (PolicyLine.__tablename__, EmployeeBenefit.__tablename__,
+                   CommercialInsurance.__tablename__, CommercialPlan.__tablename__,
+                   HomeownersPolicy.__tablename__)
+CALENDAR_MAX_DAYS = 3653  # ten years of buckets
+
+
+def _calendar_bucket(session, granularity):
+    """SQL expression for the first day of renewal_date's week / month."""
+    column = PolicyLine.renewal_date
+    if session.get_bind().dialect.name == 'postgresql':
+        return cast(func.date_trunc(granularity, column), db.Date)
+    if granularity == 'month':
+        bucket = func.strftime('%Y-%m-01', column)
+    else:
+        weekday = cast(func.strftime('%w', column), db.Integer)  # 0 = Sunday
+        bucket = func.date(column, func.printf('-%d days', (weekday + 6) % 7))
+    return type_coerce(bucket, db.Date)
 
-        return jsonify({
-            'renewals': renewals,
-            'total': len(renewals)
-        }), 200
+
+def _calendar_starts(start_date, end_date, granularity):
+    """First day of every bucket that overlaps [start_date, end_date]."""
+    if granularity == 'week':
+        current = start_date - timedelta(days=start_date.weekday())
+    else:
+        current = start_date.replace(day=1)
+    while current <= end_date:
+        yield current
+        if granularity == 'week':
+            current += timedelta(days=7)
+        else:
+            current = (current + timedelta(days=32)).replace(day=1)
+
+
+def renewal_calendar(session, start_date, end_date, granularity, split):
+    """Buckets of {start, count, premium, groups: [{key, count, premium}]}.
+
+    One GROUP BY (bucket, split key) over the renewal_date range; every
+    bucket in the window is listed, empty ones with zero counts.
+    """
+    bucket = _calendar_bucket(session, granularity).label('bucket')
+    key = CALENDAR_SPLITS[split]().label('key')
+    query = session.query(bucket, key, func.count(), func.sum(PolicyLine.premium)).select_from(PolicyLine)
+    if split == 'poc':
+        query = (
+            query.outerjoin(EmployeeBenefit, and_(PolicyLine.line_of_business == 'benefits',
+                                                  EmployeeBenefit.id == PolicyLine.owner_id))
+            .outerjoin(CommercialInsurance, and_(PolicyLine.line_of_business == 'commercial',
+                                                 CommercialInsurance.id == PolicyLine.owner_id))
+        )
+    rows = (
+        query.filter(PolicyLine.renewal_date.between(start_date, end_date), ~superseded_policy_lines())
+        .group_by(bucket, key)
+        .all()
+    )
+
+    buckets = {start: {'start': start.isoformat(), 'count': 0, 'premium': 0.0, 'groups': []}
+               for start in _calendar_starts(start_date, end_date, granularity)}
+    for start, group, count, premium in rows:
+        entry = buckets[start]
+        premium = float(premium or 0)
+        entry['count'] += count
+        entry['premium'] += premium
+        entry['groups'].append({'key': group, 'count': count, 'premium': premium})
+    for entry in buckets.values():
+        entry['premium'] = round(entry['premium'], 2)
+        entry['groups'].sort(key=lambda g: (-g['count'], g['key'] is None, str(g['key'])))
+    return list(buckets.values())
+
+
+@app.route('/api/dashboard/renewal-calendar', methods=['GET'])
+def get_renewal_calendar():
+    """Renewal counts and summed premiums per week or month.
+
+    Query params:
+        granularity (optional): week or month (default).
+        start / end (YYYY-MM-DD, optional): the window. Defaults to today .. today + 12 months.
+        by (optional): line_of_business (default), carrier or poc, the key each bucket is split by.
+    """
+    session = Session()
+    try:
+        granularity = request.args.get('granularity') or 'month'
+        if granularity not in CALENDAR_GRANULARITIES:
+            raise QueryParamError(f"Invalid value for 'granularity': {granularity}")
+        split = request.args.get('by') or 'line_of_business'
+        if split not in CALENDAR_SPLITS:
+            raise QueryParamError(f"Unsupported split '{split}'. Allowed: {', '.join(CALENDAR_SPLITS)}")
+        today = datetime.now().date()
+        try:
+            start_date = parse(request.args['start']).date() if request.args.get('start') else today
+            end_date = (parse(request.args['end']).date() if request.args.get('end')
+                        else today + timedelta(days=365))
+        except (ValueError, OverflowError):
+            raise QueryParamError('start / end must be dates (YYYY-MM-DD)')
+        if end_date < start_date:
+            raise QueryParamError('end must not be before start')
+        if (end_date - start_date).days > CALENDAR_MAX_DAYS:
+            raise QueryParamError('The window may span at most ten years')
+
+        def compute():
+            return {
+                'granularity': granularity,
+                'by': split,
+                'start': start_date.isoformat(),
+                'end': end_date.isoformat(),
+                'buckets': renewal_calendar(session, start_date, end_date, granularity, split),
+            }
+
+        key = ('renewal-calendar', granularity, split, start_date, end_date)
+        return jsonify(dashboard_payload(key, CALENDAR_TABLES, compute)), 200
+    except QueryParamError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        logging.error(f"Error fetching dashboard renewals: {e}")
+        logging.error(f"Error fetching renewal calendar: {e}")
         return jsonify({'error': str(e)}), 500
     finally:
         session.close()
 
 
+# Each segment: clients holding the first coverage but not the second. The
+# earliest renewal is the MIN over that line of business in policy_lines.
+CROSS_SELL_SEGMENTS = {
+    'benefits_only': ('benefits', EmployeeBenefit, CommercialInsurance),
+    'commercial_only': ('commercial', CommercialInsurance, EmployeeBenefit),
+}
+# Renewal dates before 2000 are placeholders from old imports; they sort
+# with the undated clients at the end.
+CROSS_SELL_DATED_FROM = date(2000, 1, 1)
+CROSS_SELL_UNDATED = date(9999, 12, 31)
+CROSS_SELL_TABLES = (Client.__tablename__, EmployeeBenefit.__tablename__,
+                     CommercialInsurance.__tablename__, PolicyLine.__tablename__)
+
+
+def cross_sell_page(session, segment, args):
+    """(rows, next_cursor, total) for one cross-sell segment.
+
+    NOT EXISTS anti-joins pick the segment's clients and a grouped
+    policy_lines subquery supplies each one's earliest renewal, so the
+    filtering, sort and keyset page all happen in SQL. Without ?limit= every
+    row is returned and next_cursor is None. Raises QueryParamError on bad
+    params.
+    """
+    lob, has, lacks = CROSS_SELL_SEGMENTS[segment]
+    earliest = (
+        select(PolicyLine.owner_key, func.min(PolicyLine.renewal_date).label('renewal_date'))
+        .where(PolicyLine.line_of_business == lob, PolicyLine.renewal_date.isnot(None))
+        .group_by(PolicyLine.owner_key)
+        .subquery()
+    )
+    renewal_key = case(
+        (earliest.c.renewal_date >= CROSS_SELL_DATED_FROM, earliest.c.renewal_date),
+        else_=literal(CROSS_SELL_UNDATED, db.Date),
+    )
+    sorts = {
+        'earliest_renewal': renewal_key,
+        'client_name': Client.client_name,
+        'total_ees': Client.total_ees,
+    }
+    sort = args.get('sort') or 'earliest_renewal'
+    descending = sort.startswith('-')
+    sort_col = sorts.get(sort.lstrip('-'))
+    if sort_col is None:
+        raise QueryParamError(f"Unsupported sort '{sort.lstrip('-')}'. Allowed: {', '.join(sorts)}")
+
+    clauses = [
+        exists().where(has.tax_id == Client.tax_id),
+        ~exists().where(lacks.tax_id == Client.tax_id),
+    ]
+    if args.get('industry'):
+        clauses.append(Client.industry == args['industry'])
+    if args.get('min_employees'):
+        try:
+            clauses.append(Client.total_ees >= int(args['min_employees']))
+        except ValueError:
+            raise QueryParamError(f"Invalid value for 'min_employees': {args['min_employees']}")
+
+    query = (
+        session.query(
+            Client.tax_id, Client.client_name, Client.contact_person, Client.email,
+            earliest.c.renewal_date, Client.id, sort_col,
+        )
+        .outerjoin(earliest, earliest.c.owner_key == Client.tax_id)
+        .filter(*clauses)
+    )
+    order = sort_col.desc() if descending else sort_col.asc()
+    query = query.order_by(order.nulls_last(), Client.id.desc() if descending else Client.id.asc())
+
+    if not args.get('limit'):
+        rows = query.all()
+        return rows, None, len(rows)
+
+    limit = parse_limit(args['limit'])
+    if args.get('after'):
+        value, last_id = _decode_cursor(args['after'], sort_col)
+        query = query.filter(_keyset_clause(sort_col, Client.id, descending, value, last_id))
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1][-1], rows[-1][-2])
+    total = session.query(func.count(Client.id)).filter(*clauses).scalar()
+    return rows, next_cursor, total
+
+
+def cross_sell_payload(session, segment, args):
+    """GET /api/dashboard/cross-sell's body: one segment's list, or both."""
+    result = {}
+    paging = {}
+    total_opportunities = 0
+    for name in ([segment] if segment else CROSS_SELL_SEGMENTS):
+        rows, next_cursor, total = cross_sell_page(session, name, args)
+        result[name] = [{
+            'tax_id': tax_id,
+            'client_name': client_name,
+            'contact_person': contact_person,
+            'email': email,
+            'earliest_renewal': renewal_date.isoformat() if renewal_date else None
+        } for tax_id, client_name, contact_person, email, renewal_date, _, _ in rows]
+        paging[name] = {'next_cursor': next_cursor, 'total': total}
+        total_opportunities += total
+
+    result['total_opportunities'] = total_opportunities
+    if args.get('limit'):
+        result['page'] = paging
+    return result
+
+
 @app.route('/api/dashboard/cross-sell', methods=['GET'])
 def get_cross_sell_opportunities():
     """Get cross-sell opportunities (clients with only one type of insurance).
-    Results sorted by earliest renewal date so the most urgent appear first."""
+    Results sorted by earliest renewal date so the most urgent appear first.
+
+    Query params:
+        segment (optional): benefits_only or commercial_only; only that list is returned.
+        industry (optional): clients in this industry.
+        min_employees (optional): clients with at least this many employees (total_ees).
+        sort (optional): earliest_renewal (default), client_name or total_ees; prefix - to reverse.
+        limit / after (optional): keyset paging, per list. after needs a segment.
+    """
     session = Session()
     try:
-        all_clients = session.query(Client).options(
-            subqueryload(Client.employee_benefits).subqueryload(EmployeeBenefit.plans),
-            subqueryload(Client.commercial_insurance).subqueryload(CommercialInsurance.commercial_plans)
-        ).all()
-
-        def earliest_renewal_benefits(client):
-            dates = []
-            for b in client.employee_benefits:
-                for plan in b.plans:
-                    if plan.renewal_date:
-                        dates.append(plan.renewal_date)
-                for prefix in ['ltd', 'std', 'k401', 'critical_illness', 'accident', 'hospital', 'voluntary_life']:
-                    d = getattr(b, f'{prefix}_renewal_date', None)
-                    if d:
-                        dates.append(d)
-            return min(dates) if dates else None
-
-        def earliest_renewal_commercial(client):
-            dates = []
-            for c in client.commercial_insurance:
-                for plan in c.commercial_plans:
-                    if plan.renewal_date:
-                        dates.append(plan.renewal_date)
-                for prefix in ['general_liability', 'property', 'bop', 'workers_comp', 'auto',
-                               'epli', 'nydbl', 'surety', 'product_liability', 'flood',
-                               'directors_officers', 'fiduciary', 'inland_marine']:
-                    d = getattr(c, f'{prefix}_renewal_date', None)
-                    if d:
-                        dates.append(d)
-            return min(dates) if dates else None
-
-        clients_with_benefits_only = []
-        clients_with_commercial_only = []
-
-        for client in all_clients:
-            has_benefits = len(client.employee_benefits) > 0
-            has_commercial = len(client.commercial_insurance) > 0
-
-            if has_benefits and not has_commercial:
-                er = earliest_renewal_benefits(client)
-                clients_with_benefits_only.append({
-                    'tax_id': client.tax_id,
-                    'client_name': client.client_name,
-                    'contact_person': client.contact_person,
-                    'email': client.email,
-                    'earliest_renewal': er.isoformat() if er else None
-                })
-            elif has_commercial and not has_benefits:
-                er = earliest_renewal_commercial(client)
-                clients_with_commercial_only.append({
-                    'tax_id': client.tax_id,
-                    'client_name': client.client_name,
-                    'contact_person': client.contact_person,
-                    'email': client.email,
-                    'earliest_renewal': er.isoformat() if er else None
-                })
-
-        def _renewal_sort_key(c):
-            d = c.get('earliest_renewal')
-            if d and d[:4] >= '2000':
-                return d
-            return '9999-12-31'
-
-        clients_with_benefits_only.sort(key=_renewal_sort_key)
-        clients_with_commercial_only.sort(key=_renewal_sort_key)
-
-        return jsonify({
-            'benefits_only': clients_with_benefits_only,
-            'commercial_only': clients_with_commercial_only,
-            'total_opportunities': len(clients_with_benefits_only) + len(clients_with_commercial_only)
-        }), 200
+        segment = request.args.get('segment')
+        if segment and segment not in CROSS_SELL_SEGMENTS:
+            raise QueryParamError(f"Unknown segment '{segment}'. Allowed: {', '.join(CROSS_SELL_SEGMENTS)}")
+        if request.args.get('after') and not segment:
+            raise QueryParamError('after requires a segment')
+
+        key = ('cross-sell', tuple(sorted(request.args.items(multi=True))))
+        payload = snapshot_payload(key, CROSS_SELL_TABLES,
+                                   lambda: cross_sell_payload(session, segment, request.args))
+        return jsonify(payload), 200
+    except QueryParamError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error fetching cross-sell opportunities: {e}")
         return jsonify({'error': str(e)}), 500
@@ -4714,197 +6284,592 @@ PERSONAL_SINGLE_LABELS = [
 ]
 
 
+# Section order in the sheet. The import scanner for each type leaked into the
+# sections after it (umbrella into E&O / Cyber / Crime, E&O into Cyber /
+# Crime, Cyber into Crime), so a plan is a phantom when a plan of a later
+# type on the same record has the same carrier.
+DUPLICATE_PLAN_SECTIONS = ('umbrella', 'professional_eo', 'cyber', 'crime')
+
+
+def _duplicate_plan_rank(plan):
+    return case({t: rank for rank, t in enumerate(DUPLICATE_PLAN_SECTIONS)},
+                value=plan.plan_type, else_=None)
+
+
+def duplicate_plans_query(session):
+    """Phantom plans as one SELECT: each one's id, plan_type, client_name,
+    tax_id, carrier and plan_number, by record, section, then plan."""
+    later = aliased(CommercialPlan, name='later_plan')
+    carrier_key = func.lower(func.trim(CommercialPlan.carrier))
+    rank = _duplicate_plan_rank(CommercialPlan)
+    leaked = exists().where(
+        later.commercial_insurance_id == CommercialPlan.commercial_insurance_id,
+        _duplicate_plan_rank(later) > rank,
+        func.lower(func.trim(later.carrier)) == carrier_key,
+    )
+    return (session.query(CommercialPlan.id, CommercialPlan.plan_type, _RefClient.client_name,
+                          CommercialInsurance.tax_id, CommercialPlan.carrier, CommercialPlan.plan_number,
+                          CommercialPlan.commercial_insurance_id)
+            .join(CommercialInsurance, CommercialInsurance.id == CommercialPlan.commercial_insurance_id)
+            .outerjoin(_RefClient, _RefClient.tax_id == CommercialInsurance.tax_id)
+            .filter(CommercialPlan.plan_type.in_(DUPLICATE_PLAN_SECTIONS[:-1]),
+                    CommercialPlan.carrier.isnot(None), CommercialPlan.carrier != '', leaked)
+            .order_by(CommercialInsurance.id, rank, CommercialPlan.id))
+
+
+def delete_duplicate_plan_rows(session):
+    """Delete the phantom plans with one DELETE. Returns the rows deleted."""
+    rows = duplicate_plans_query(session).all()
+    if not rows:
+        return rows
+    phantom_ids = duplicate_plans_query(session).with_entities(CommercialPlan.id).subquery()
+    session.query(CommercialPlan).filter(CommercialPlan.id.in_(select(phantom_ids.c.id))) \
+        .delete(synchronize_session=False)
+    # The bulk delete bypasses the sync hooks: touch the owners and rewrite their lines.
+    owner_ids = sorted({row.commercial_insurance_id for row in rows})
+    now = datetime.utcnow()
+    for start in range(0, len(owner_ids), 500):
+        session.query(CommercialInsurance) \
+            .filter(CommercialInsurance.id.in_(owner_ids[start:start + 500])) \
+            .update({CommercialInsurance.updated_at: now}, synchronize_session=False)
+    sync_policy_lines(session.connection(), {'commercial': owner_ids})
+    return rows
+
+
 @app.route('/api/cleanup/duplicate-plans', methods=['GET'])
 def preview_duplicate_plans():
-    """Preview multi-plan records that are clones from section boundary leak.
-    The import scanner for each type leaked into subsequent sections:
-    umbrella → E&O/Cyber/Crime, E&O → Cyber/Crime, Cyber → Crime.
-    A plan is a phantom if the same carrier exists in a later coverage type for the same client."""
+    """Preview multi-plan records that are clones from section boundary leak
+    (see DUPLICATE_PLAN_SECTIONS)."""
     session = Session()
     try:
-        # Section order in the sheet — earlier types leaked into later ones
-        section_order = ['umbrella', 'professional_eo', 'cyber', 'crime']
-        commercial = session.query(CommercialInsurance).all()
-        dupes = []
-        for comm in commercial:
-            plans_by_type = {}
-            for plan in comm.commercial_plans:
-                plans_by_type.setdefault(plan.plan_type, []).append(plan)
-
-            for i, earlier_type in enumerate(section_order[:-1]):
-                later_carriers = set()
-                for later_type in section_order[i + 1:]:
-                    for p in plans_by_type.get(later_type, []):
-                        if p.carrier:
-                            later_carriers.add(p.carrier.strip().lower())
-
-                for p in plans_by_type.get(earlier_type, []):
-                    if p.carrier and p.carrier.strip().lower() in later_carriers:
-                        dupes.append({
-                            'id': p.id,
-                            'plan_type': earlier_type,
-                            'client_name': comm.client.client_name if comm.client else None,
-                            'tax_id': comm.tax_id,
-                            'carrier': p.carrier,
-                            'plan_number': p.plan_number
-                        })
-
+        dupes = [{'id': row.id, 'plan_type': row.plan_type, 'client_name': row.client_name,
+                  'tax_id': row.tax_id, 'carrier': row.carrier, 'plan_number': row.plan_number}
+                 for row in duplicate_plans_query(session)]
         from collections import Counter
         by_type = Counter(d['plan_type'] for d in dupes)
         return jsonify({'duplicates': dupes, 'count': len(dupes), 'by_type': dict(by_type)}), 200
     except Exception as e:
+        logging.error(f"Error previewing plan cleanup: {e}")
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
+
+
+@app.route('/api/cleanup/duplicate-plans', methods=['DELETE'])
+def delete_duplicate_plans():
+    """Remove multi-plan records that are clones from section boundary leak."""
+    session = Session()
+    try:
+        deleted = [{'plan_type': row.plan_type, 'client_name': row.client_name,
+                    'tax_id': row.tax_id, 'carrier': row.carrier}
+                   for row in delete_duplicate_plan_rows(session)]
+        session.commit()
+        from collections import Counter
+        by_type = Counter(d['plan_type'] for d in deleted)
+        logging.info(f"[CLEANUP] Removed {len(deleted)} duplicate plans: {dict(by_type)}")
+        return jsonify({'deleted': len(deleted), 'by_type': dict(by_type), 'details': deleted}), 200
+    except Exception as e:
+        session.rollback()
+        logging.error(f"Error in plan cleanup: {e}")
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
+
+
+# Chart label by line of business and policy_lines.policy_type. Plan and flat
+# types share a label where they name the same coverage (workers_comp).
+COVERAGE_LABELS = {
+    'benefits': {**BENEFIT_PLAN_LABELS,
+                 **{f.removesuffix('_carrier'): label for f, label in BENEFIT_SINGLE_LABELS}},
+    'commercial': {**COMMERCIAL_PLAN_LABELS,
+                   **{f.removesuffix('_carrier'): label for f, label in COMMERCIAL_SINGLE_LABELS}},
+    'personal': {f.removesuffix('_carrier'): label for f, label in PERSONAL_SINGLE_LABELS},
+}
+
+# Every policy write rewrites policy_lines, which bumps its version (see
+# POLICY LINES); clients carries industry.
+POLICY_AGGREGATION_TABLES = (PolicyLine.__tablename__, Client.__tablename__)
+
+
+def policy_aggregations(session):
+    """by_industry / by_coverage_type / by_carrier counts, grouped in SQL."""
+    carried = and_(PolicyLine.carrier.isnot(None), PolicyLine.carrier != '',
+                   # homeowners_* on personal_insurance already holds the first policy.
+                   PolicyLine.source != HomeownersPolicy.__tablename__)
+
+    industry = func.coalesce(func.nullif(Client.industry, ''), 'Unspecified')
+    by_industry = (
+        session.query(industry, func.count())
+        .select_from(PolicyLine)
+        .outerjoin(Client, Client.tax_id == PolicyLine.owner_key)
+        .filter(carried, PolicyLine.line_of_business != 'personal')
+        .group_by(industry)
+        .all()
+    )
+
+    coverage_counts = {}
+    for lob, policy_type, count in (
+        session.query(PolicyLine.line_of_business, PolicyLine.policy_type, func.count())
+        .filter(carried)
+        .group_by(PolicyLine.line_of_business, PolicyLine.policy_type)
+    ):
+        key = (lob, COVERAGE_LABELS[lob].get(policy_type, policy_type))
+        coverage_counts[key] = coverage_counts.get(key, 0) + count
+
+    carrier = func.trim(PolicyLine.carrier)
+    by_carrier = (
+        session.query(carrier, func.count())
+        .filter(carried, carrier != '')
+        .group_by(carrier)
+        .all()
+    )
+
+    def ranked(rows):
+        return sorted(rows, key=lambda r: (-r['count'], str(next(iter(r.values())))))
+
+    return {
+        'by_industry': ranked([{'industry': k, 'count': v} for k, v in by_industry]),
+        'by_coverage_type': ranked([{'coverage_type': label, 'category': category, 'count': v}
+                                    for (category, label), v in coverage_counts.items()]),
+        'by_carrier': ranked([{'carrier': k, 'count': v} for k, v in by_carrier]),
+    }
+
+
+@app.route('/api/dashboard/policy-aggregations', methods=['GET'])
+def get_policy_aggregations():
+    """Return policy counts grouped by client industry, by coverage type, and by carrier.
+
+    A "policy" = one coverage line with a non-null carrier (matches the
+    convention used by the renewals endpoint). Personal policies are not
+    owned by a client and so are excluded from the industry breakdown.
+    Served from dashboard_snapshots while a policy table or a client hasn't
+    changed since the last refresh.
+    """
+    session = Session()
+    try:
+        payload = snapshot_payload(('policy-aggregations',), POLICY_AGGREGATION_TABLES,
+                                   lambda: policy_aggregations(session))
+        return jsonify(payload), 200
+    except Exception as e:
+        logging.error(f"Error fetching policy aggregations: {e}")
         return jsonify({'error': str(e)}), 500
     finally:
         session.close()
 
 
-@app.route('/api/cleanup/duplicate-plans', methods=['DELETE'])
-def delete_duplicate_plans():
-    """Remove multi-plan records that are clones from section boundary leak."""
-    session = Session()
+# ===========================================================================
+# DASHBOARD SNAPSHOTS
+# ===========================================================================
+# The renewals, cross-sell and aggregations payloads the Dashboard page asks
+# for by default are computed ahead of time into dashboard_snapshots, one
+# row per DASHBOARD_CACHE key, stamped with the table_versions they were
+# computed at. Postgres and SQLite use the same table: the payloads are
+# built in Python (labels, ranking), so a materialized view couldn't hold
+# them.
+#
+# snapshot_payload() serves a stored payload while its stamp still matches
+# and otherwise computes live, as dashboard_payload() does; either way the
+# body carries 'snapshot': {refreshed_at, age_seconds}, or null when it was
+# computed live. A snapshot is never served stale.
+#
+# Snapshots are refreshed
+#   - every DASHBOARD_SNAPSHOT_MINUTES by a thread the server starts (0 turns
+#     it off; set it on one process only when running several);
+#   - right after POST /api/import commits;
+#   - by POST /api/admin/dashboard-snapshots/refresh, or
+#         flask --app api.customer_api refresh-dashboard-snapshots
+# The refresh bumps dashboard_snapshots' version, which every cached
+# snapshot payload is stamped with, so each worker picks the new rows up.
+
+DASHBOARD_SNAPSHOT_MINUTES = int(os.environ.get('DASHBOARD_SNAPSHOT_MINUTES', '15'))
+SNAPSHOT_TABLE = DashboardSnapshot.__tablename__
+
+
+def dashboard_snapshots(today):
+    """(key, tables, compute(session)) for every payload kept as a snapshot."""
+    # The Dashboard page shows the 12 months from the start of next month.
+    next_month = (today.replace(day=1) + timedelta(days=32)).replace(day=1)
+    windows = [
+        (today, today + timedelta(days=365)),   # the endpoint's own default
+        (next_month, next_month + relativedelta(months=12) - timedelta(days=1)),
+    ]
+    specs = [(('renewals', start, end, None), RENEWAL_TABLES,
+              lambda session, start=start, end=end: renewals_payload(session, start, end))
+             for start, end in windows]
+    specs.append((('cross-sell', ()), CROSS_SELL_TABLES,
+                  lambda session: cross_sell_payload(session, None, {})))
+    specs.append((('policy-aggregations',), POLICY_AGGREGATION_TABLES, policy_aggregations))
+    return specs
+
+
+def _snapshot_key(key):
+    return json.dumps(key, default=str)
+
+
+def _snapshot_age(refreshed_at):
+    if refreshed_at is None:
+        return None
+    return {'refreshed_at': refreshed_at.isoformat(),
+            'age_seconds': int((datetime.utcnow() - refreshed_at).total_seconds())}
+
+
+def snapshot_payload(key, tables, compute):
+    """dashboard_payload() served from the snapshot for `key` when it is current.
+
+    Returns the payload with a 'snapshot' entry giving the snapshot's age.
+    """
     try:
-        section_order = ['umbrella', 'professional_eo', 'cyber', 'crime']
-        commercial = session.query(CommercialInsurance).all()
-        deleted = []
-        for comm in commercial:
-            plans_by_type = {}
-            for plan in comm.commercial_plans:
-                plans_by_type.setdefault(plan.plan_type, []).append(plan)
+        versions = read_table_versions([*tables, SNAPSHOT_TABLE])
+    except Exception as e:
+        logging.warning(f"Could not read table versions for {key[0]}: {e}")
+        return {**compute(), 'snapshot': None}
+
+    def load():
+        row = db.session.get(DashboardSnapshot, _snapshot_key(key))
+        if row is not None and json.loads(row.versions) == {t: versions[t] for t in tables}:
+            return app.json.loads(row.payload), row.refreshed_at
+        return compute(), None
 
-            for i, earlier_type in enumerate(section_order[:-1]):
-                later_carriers = set()
-                for later_type in section_order[i + 1:]:
-                    for p in plans_by_type.get(later_type, []):
-                        if p.carrier:
-                            later_carriers.add(p.carrier.strip().lower())
-
-                for p in plans_by_type.get(earlier_type, []):
-                    if p.carrier and p.carrier.strip().lower() in later_carriers:
-                        deleted.append({
-                            'plan_type': earlier_type,
-                            'client_name': comm.client.client_name if comm.client else None,
-                            'tax_id': comm.tax_id,
-                            'carrier': p.carrier
-                        })
-                        session.delete(p)
+    payload, refreshed_at = DASHBOARD_CACHE.get_or_compute(key, versions, load)
+    return {**payload, 'snapshot': _snapshot_age(refreshed_at)}
 
+
+def refresh_dashboard_snapshots():
+    """Recompute every snapshot and drop the ones no longer kept. Returns their keys."""
+    session = Session()
+    try:
+        now = datetime.utcnow()
+        keys = []
+        for key, tables, compute in dashboard_snapshots(datetime.now().date()):
+            # Versions first: a write landing mid-compute leaves the row stale, not wrong.
+            versions = read_table_versions(tables)
+            session.merge(DashboardSnapshot(
+                key=_snapshot_key(key), payload=app.json.dumps(compute(session)),
+                versions=json.dumps(versions), refreshed_at=now))
+            keys.append(key)
+        session.query(DashboardSnapshot) \
+            .filter(DashboardSnapshot.key.notin_([_snapshot_key(key) for key in keys])) \
+            .delete(synchronize_session=False)
         session.commit()
-        from collections import Counter
-        by_type = Counter(d['plan_type'] for d in deleted)
-        logging.info(f"[CLEANUP] Removed {len(deleted)} duplicate plans: {dict(by_type)}")
-        return jsonify({'deleted': len(deleted), 'by_type': dict(by_type), 'details': deleted}), 200
-    except Exception as e:
+        return keys
+    except Exception:
         session.rollback()
-        logging.error(f"Error in plan cleanup: {e}")
-        return jsonify({'error': str(e)}), 500
+        raise
     finally:
         session.close()
 
 
-@app.route('/api/dashboard/policy-aggregations', methods=['GET'])
-def get_policy_aggregations():
-    """Return policy counts grouped by client industry, by coverage type, and by carrier.
+def _refresh_dashboard_snapshots_forever(minutes):
+    while True:
+        with app.app_context():
+            try:
+                keys = refresh_dashboard_snapshots()
+                logging.info(f"[SNAPSHOTS] Refreshed {len(keys)} dashboard snapshots")
+            except Exception as e:
+                logging.error(f"Error refreshing dashboard snapshots: {e}")
+        time.sleep(minutes * 60)
 
-    A "policy" = one coverage line with a non-null carrier (matches the
-    convention used by the renewals endpoint). Personal policies are not
-    owned by a client and so are excluded from the industry breakdown.
+
+def start_dashboard_snapshot_refresher(minutes=DASHBOARD_SNAPSHOT_MINUTES):
+    """Refresh the snapshots now and every `minutes` on a daemon thread."""
+    if minutes <= 0:
+        return None
+    thread = threading.Thread(target=_refresh_dashboard_snapshots_forever, args=(minutes,),
+                              name='dashboard-snapshots', daemon=True)
+    thread.start()
+    return thread
+
+
+@app.cli.command('refresh-dashboard-snapshots')
+def refresh_dashboard_snapshots_command():
+    """Recompute the dashboard snapshots."""
+    print(f'Refreshed {len(refresh_dashboard_snapshots())} dashboard snapshots.')
+
+
+@app.route('/api/admin/dashboard-snapshots', methods=['GET'])
+@require_admin
+def list_dashboard_snapshots():
+    """Each snapshot's key, age and whether it is still current."""
+    snapshots = []
+    for row in db.session.query(DashboardSnapshot).order_by(DashboardSnapshot.key):
+        versions = json.loads(row.versions)
+        snapshots.append({'key': json.loads(row.key), **_snapshot_age(row.refreshed_at),
+                          'current': read_table_versions(list(versions)) == versions})
+    return jsonify({'snapshots': snapshots, 'refresh_minutes': DASHBOARD_SNAPSHOT_MINUTES}), 200
+
+
+@app.route('/api/admin/dashboard-snapshots/refresh', methods=['POST'])
+@require_admin
+def refresh_dashboard_snapshots_endpoint():
+    """Recompute the dashboard snapshots now."""
+    try:
+        return jsonify({'refreshed': refresh_dashboard_snapshots()}), 200
+    except Exception as e:
+        logging.error(f"Error refreshing dashboard snapshots: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+# ===========================================================================
+# OUTSTANDING ITEMS
+# ===========================================================================
+# The Dashboard Actions tab: every coverage line with an open outstanding
+# item, soonest due first. Read from policy_lines, which carries each flat
+# <prefix>_outstanding_item and each plan row's outstanding_item. Rows
+# carry what POST /api/actions/clear-outstanding needs to clear them:
+# plan_id for a plan row, else prefix plus tax_id / individual_id.
+#
+# Which lines are listed follows what the app shows for a record:
+#   - benefit / commercial plan rows of the MULTI_PLAN_* types; a type
+#     with several plans numbers them ("Medical 2") in plan_number order;
+#   - the flat benefit, commercial and personal prefixes, except flat
+#     workers_comp, which stands in for a plan only while the record has
+#     no WC plan rows (see commercial_plans_dict);
+#   - not homeowners_policies: the flat homeowners_* columns are the ones
+#     that carry the outstanding item.
+
+OUTSTANDING_CLEARED = ('', 'None', 'Complete')  # recordHasOutstanding() in App.js
+OUTSTANDING_SOURCES = {'benefits': 'Benefits', 'commercial': 'Commercial', 'personal': 'Personal'}
+OUTSTANDING_LABELS = {
+    'benefits': {**RENEWAL_LABELS['benefits'], 'voluntary_life': 'Vol Life'},
+    'commercial': COVERAGE_LABELS['commercial'],
+    'personal': RENEWAL_LABELS['personal'],
+}
+OUTSTANDING_TABLES = (PolicyLine.__tablename__, Client.__tablename__, Individual.__tablename__,
+                      EmployeeBenefit.__tablename__, CommercialInsurance.__tablename__,
+                      CommercialPlan.__tablename__)
+_PLAN_LINE_SOURCES = (BenefitPlan.__tablename__, CommercialPlan.__tablename__)
+
+
+def _outstanding_clauses():
+    """WHERE clauses for the lines the Actions tab lists (CommercialInsurance joined)."""
+    line = PolicyLine
+    has_wc_plans = exists().where(CommercialPlan.commercial_insurance_id == line.owner_id,
+                                  CommercialPlan.plan_type == 'workers_comp')
+    legacy_wc = and_(
+        line.source == CommercialInsurance.__tablename__, line.policy_type == 'workers_comp', ~has_wc_plans,
+        or_(func.coalesce(line.carrier, '') != '', line.premium != 0, line.renewal_date.isnot(None),
+            func.coalesce(CommercialInsurance.workers_comp_policy_number, '') != ''),
+    )
+    return [
+        line.outstanding_item.isnot(None),
+        line.outstanding_item.notin_(OUTSTANDING_CLEARED),
+        or_(
+            line.source.in_((EmployeeBenefit.__tablename__, PersonalInsurance.__tablename__)),
+            and_(line.source == CommercialInsurance.__tablename__, line.policy_type != 'workers_comp'),
+            and_(line.source == BenefitPlan.__tablename__, line.policy_type.in_(MULTI_PLAN_TYPES)),
+            and_(line.source == CommercialPlan.__tablename__,
+                 line.policy_type.in_(MULTI_PLAN_COMMERCIAL_TYPES)),
+            legacy_wc,
+        ),
+    ]
+
+
+def outstanding_items(session, args):
+    """(items, page, counts) for the Actions tab.
+
+    ?source= (benefits | commercial | personal) and ?outstanding_item=
+    narrow the items; counts ({'by_source', 'by_status'}) always cover the
+    whole list so the tab badges stay right. page is None without ?limit=,
+    else keyset paging over (due date, NULLs last; line id). Raises
+    QueryParamError on bad params.
+    """
+    clauses = _outstanding_clauses()
+
+    def joined(query):
+        return query.outerjoin(CommercialInsurance, and_(
+            PolicyLine.line_of_business == 'commercial', CommercialInsurance.id == PolicyLine.owner_id))
+
+    counts = {'by_source': dict.fromkeys(OUTSTANDING_SOURCES, 0), 'by_status': {}}
+    for lob, item, count in joined(
+        session.query(PolicyLine.line_of_business, PolicyLine.outstanding_item, func.count())
+    ).filter(*clauses).group_by(PolicyLine.line_of_business, PolicyLine.outstanding_item):
+        counts['by_source'][lob] += count
+        counts['by_status'][item] = counts['by_status'].get(item, 0) + count
+
+    source = args.get('source')
+    if source:
+        if source not in OUTSTANDING_SOURCES:
+            raise QueryParamError(f"Invalid value for 'source': {source}")
+        clauses.append(PolicyLine.line_of_business == source)
+    if args.get('outstanding_item'):
+        clauses.append(PolicyLine.outstanding_item == args['outstanding_item'])
+
+    siblings = aliased(PolicyLine)
+    same_type = and_(siblings.line_of_business == PolicyLine.line_of_business,
+                     siblings.owner_id == PolicyLine.owner_id,
+                     siblings.source == PolicyLine.source,
+                     siblings.policy_type == PolicyLine.policy_type)
+    earlier = or_(siblings.plan_number < PolicyLine.plan_number,
+                  and_(siblings.plan_number == PolicyLine.plan_number,
+                       siblings.source_id <= PolicyLine.source_id))
+    due = PolicyLine.outstanding_item_due_date
+    query = (
+        joined(session.query(
+            PolicyLine.line_of_business, PolicyLine.source, PolicyLine.source_id, PolicyLine.owner_key,
+            PolicyLine.policy_type, PolicyLine.renewal_date, PolicyLine.outstanding_item, due,
+            select(func.count()).where(same_type).scalar_subquery(),
+            select(func.count()).where(same_type, earlier).scalar_subquery(),
+            _RefClient.client_name, EmployeeBenefit.enrollment_poc, CommercialInsurance.assigned_to,
+            _RefIndividual.id, _RefIndividual.first_name, _RefIndividual.last_name,
+            PolicyLine.id,
+        ))
+        .outerjoin(EmployeeBenefit, and_(PolicyLine.line_of_business == 'benefits',
+                                         EmployeeBenefit.id == PolicyLine.owner_id))
+        .outerjoin(_RefClient, and_(PolicyLine.line_of_business != 'personal',
+                                    _RefClient.tax_id == PolicyLine.owner_key))
+        .outerjoin(_RefIndividual, and_(PolicyLine.line_of_business == 'personal',
+                                        _RefIndividual.individual_id == PolicyLine.owner_key))
+        .filter(*clauses)
+        .order_by(due.asc().nulls_last(), PolicyLine.id)
+    )
+
+    page = None
+    if args.get('limit'):
+        limit = parse_limit(args['limit'])
+        total = session.query(func.count(PolicyLine.id)).select_from(PolicyLine)
+        total = joined(total).filter(*clauses).scalar()
+        if args.get('after'):
+            value, last_id = _decode_cursor(args['after'], due)
+            query = query.filter(_keyset_clause(due, PolicyLine.id, False, value, last_id))
+        rows = query.limit(limit + 1).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1][7], rows[-1][-1])
+        page = {'next_cursor': next_cursor, 'total': total, 'total_is_estimate': False}
+    else:
+        rows = query.all()
+
+    items = []
+    for (lob, source, source_id, owner_key, policy_type, renewal_date, outstanding_item, due_date,
+         plan_count, plan_index, client_name, enrollment_poc, assigned_to,
+         individual_pk, first_name, last_name, _) in rows:
+        label = OUTSTANDING_LABELS[lob].get(policy_type, policy_type)
+        item = {
+            'client_name': client_name,
+            'tax_id': owner_key,
+            'source': OUTSTANDING_SOURCES[lob],
+            'prefix': policy_type,
+            'policy': f"{label} {plan_index}" if plan_count > 1 else label,
+            'assigned_to': enrollment_poc if lob == 'benefits' else assigned_to,
+            'renewal_date': renewal_date.isoformat() if renewal_date else None,
+            'outstanding_item': outstanding_item,
+            'due_date': due_date.isoformat() if due_date else None,
+        }
+        if source in _PLAN_LINE_SOURCES:
+            item['plan_id'] = source_id
+        if lob == 'personal':
+            item.update(client_name=_full_name(first_name, last_name) if individual_pk else None,
+                        tax_id=None, individual_id=owner_key, assigned_to='')
+        items.append(item)
+    return items, page, counts
+
+
+@app.route('/api/dashboard/outstanding', methods=['GET'])
+def get_dashboard_outstanding():
+    """Open outstanding items for the Dashboard Actions tab, soonest due first.
+
+    Query params:
+        source (optional): benefits, commercial or personal.
+        outstanding_item (optional): one status, e.g. 'Premium Due'.
+        limit / after (optional): keyset paging.
     """
     session = Session()
     try:
-        industry_counts = {}
-        coverage_counts = {}  # {(category, label): count}
-        carrier_counts = {}
-
-        def bump_industry(key, n=1):
-            if not key:
-                return
-            industry_counts[key] = industry_counts.get(key, 0) + n
-
-        def bump_coverage(category, label, n=1):
-            if not label:
-                return
-            k = (category, label)
-            coverage_counts[k] = coverage_counts.get(k, 0) + n
-
-        def bump_carrier(carrier, n=1):
-            if not carrier:
-                return
-            key = str(carrier).strip()
-            if not key:
-                return
-            carrier_counts[key] = carrier_counts.get(key, 0) + n
-
-        # --- Employee Benefits ---
-        benefits = session.query(EmployeeBenefit).all()
-        for benefit in benefits:
-            industry = benefit.client.industry if benefit.client else None
-            industry_key = industry if industry else 'Unspecified'
+        def compute():
+            items, page, counts = outstanding_items(session, request.args)
+            return {**list_payload('outstanding', items, page), **counts}
+
+        key = ('outstanding', tuple(sorted(request.args.items(multi=True))))
+        return jsonify(dashboard_payload(key, OUTSTANDING_TABLES, compute)), 200
+    except QueryParamError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logging.error(f"Error fetching outstanding items: {e}")
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
 
-            for plan in benefit.plans:
-                if plan.carrier:
-                    bump_industry(industry_key)
-                    bump_coverage('benefits', BENEFIT_PLAN_LABELS.get(plan.plan_type, plan.plan_type))
-                    bump_carrier(plan.carrier)
-
-            for field_name, label in BENEFIT_SINGLE_LABELS:
-                carrier = getattr(benefit, field_name, None)
-                if carrier:
-                    bump_industry(industry_key)
-                    bump_coverage('benefits', label)
-                    bump_carrier(carrier)
-
-        # --- Commercial ---
-        commercial = session.query(CommercialInsurance).all()
-        for comm in commercial:
-            industry = comm.client.industry if comm.client else None
-            industry_key = industry if industry else 'Unspecified'
 
-            for plan in comm.commercial_plans:
-                if plan.carrier:
-                    bump_industry(industry_key)
-                    bump_coverage('commercial', COMMERCIAL_PLAN_LABELS.get(plan.plan_type, plan.plan_type))
-                    bump_carrier(plan.carrier)
-
-            for field_name, label in COMMERCIAL_SINGLE_LABELS:
-                carrier = getattr(comm, field_name, None)
-                if carrier:
-                    bump_industry(industry_key)
-                    bump_coverage('commercial', label)
-                    bump_carrier(carrier)
-
-        # --- Personal (coverage only; no client → no industry) ---
-        personal_records = session.query(PersonalInsurance).all()
-        for pers in personal_records:
-            for field_name, label in PERSONAL_SINGLE_LABELS:
-                carrier = getattr(pers, field_name, None)
-                if carrier:
-                    bump_coverage('personal', label)
-                    bump_carrier(carrier)
-
-        by_industry = sorted(
-            [{'industry': k, 'count': v} for k, v in industry_counts.items()],
-            key=lambda r: r['count'],
-            reverse=True
-        )
-        by_coverage_type = sorted(
-            [{'coverage_type': label, 'category': category, 'count': v}
-             for (category, label), v in coverage_counts.items()],
-            key=lambda r: r['count'],
-            reverse=True
-        )
-        by_carrier = sorted(
-            [{'carrier': k, 'count': v} for k, v in carrier_counts.items()],
-            key=lambda r: r['count'],
-            reverse=True
-        )
+# ===========================================================================
+# PREMIUM ANALYTICS
+# ===========================================================================
+# Premium totals, means, percentiles and year-over-year totals over the
+# whole book, split by carrier, client industry, line of business and POC.
+# The premium lines come out of policy_lines as columns in one SELECT and
+# the statistics are computed vectorized in api/analytics.py.
+#
+# A line counts when its premium is above zero. Flat columns that only
+# mirror plan rows are left out so nothing is counted twice:
+#   - flat workers_comp_* when the record has WC plan rows;
+#   - flat homeowners_* when the record has homeowners_policies rows.
+# The year of a line is its renewal year.
+
+PREMIUM_SPLITS = {
+    'carrier': CALENDAR_SPLITS['carrier'],
+    'industry': lambda: func.nullif(func.trim(_RefClient.industry), ''),
+    'line_of_business': lambda: PolicyLine.line_of_business,
+    'poc': lambda: func.nullif(func.trim(CALENDAR_SPLITS['poc']()), ''),
+}
+PREMIUM_TABLES = (PolicyLine.__tablename__, Client.__tablename__, EmployeeBenefit.__tablename__,
+                  CommercialInsurance.__tablename__, CommercialPlan.__tablename__,
+                  HomeownersPolicy.__tablename__)
+PREMIUM_MIN_YEAR, PREMIUM_MAX_YEAR = 1900, 9999
+
+
+def premium_columns(session):
+    """{name: list} of every counted premium line: premium, year and each split key."""
+    names = ['premium', 'year', *PREMIUM_SPLITS]
+    query = (
+        select(cast(PolicyLine.premium, db.Float), db.extract('year', PolicyLine.renewal_date),
+               *(split() for split in PREMIUM_SPLITS.values()))
+        .select_from(PolicyLine)
+        .outerjoin(_RefClient, and_(PolicyLine.line_of_business != 'personal',
+                                    _RefClient.tax_id == PolicyLine.owner_key))
+        .outerjoin(EmployeeBenefit, and_(PolicyLine.line_of_business == 'benefits',
+                                         EmployeeBenefit.id == PolicyLine.owner_id))
+        .outerjoin(CommercialInsurance, and_(PolicyLine.line_of_business == 'commercial',
+                                             CommercialInsurance.id == PolicyLine.owner_id))
+        .where(PolicyLine.premium > 0, ~superseded_policy_lines())
+    )
+    rows = session.execute(query).all()
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    return dict(zip(names, (list(c) for c in columns)))
 
-        return jsonify({
-            'by_industry': by_industry,
-            'by_coverage_type': by_coverage_type,
-            'by_carrier': by_carrier
-        }), 200
+
+def premium_analytics(session, year):
+    """{'summary': {...}, 'by_<split>': [...]} for the book; see analytics.group_stats()."""
+    columns = premium_columns(session)
+    premiums = np.array(columns['premium'], dtype=np.float64)
+    years = np.array([y or 0 for y in columns['year']], dtype=np.int64)
+    summary = analytics.group_stats(np.zeros(len(premiums), dtype=np.int64), [None], premiums, years, year)
+    payload = {'year': year, 'summary': summary[0] if summary else None}
+    for split in PREMIUM_SPLITS:
+        codes, labels = analytics.encode_keys(columns[split])
+        payload[f'by_{split}'] = analytics.group_stats(codes, labels, premiums, years, year)
+    return payload
+
+
+@app.route('/api/analytics/premiums', methods=['GET'])
+def get_premium_analytics():
+    """Premium statistics by carrier, industry, line of business and POC.
+
+    Query params:
+        year (optional): the year compared against the one before, 1900-9999. Defaults to this year.
+    """
+    session = Session()
+    try:
+        year = request.args.get('year') or str(datetime.now().year)
+        if not year.isdigit() or not PREMIUM_MIN_YEAR <= int(year) <= PREMIUM_MAX_YEAR:
+            raise QueryParamError(f"Invalid value for 'year': {year}")
+        year = int(year)
+        payload = dashboard_payload(('analytics-premiums', year), PREMIUM_TABLES,
+                                    lambda: premium_analytics(session, year))
+        return jsonify(payload), 200
+    except QueryParamError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        logging.error(f"Error fetching policy aggregations: {e}")
+        logging.error(f"Error computing premium analytics: {e}")
         return jsonify({'error': str(e)}), 500
     finally:
         session.close()
@@ -5473,1019 +7438,691 @@ def export_to_excel():
         session.close()
 
 
-@app.route('/api/import', methods=['POST'])
-@require_admin
-def import_from_excel():
-    """Import data from an Excel file matching the Data Sheet.xlsx format."""
-    session = Session()
+# entity: (sheet, model, key columns, child relationship, child model), in load order
+IMPORT_TARGETS = {
+    'clients': ('Clients', Client, ('tax_id',), 'contacts', ClientContact),
+    'individuals': ('Individuals', Individual, ('individual_id',), None, None),
+    'benefits': ('Employee Benefits', EmployeeBenefit, ('tax_id',), 'plans', BenefitPlan),
+    'commercial': ('Commercial', CommercialInsurance, ('tax_id',), 'commercial_plans', CommercialPlan),
+    'personal': ('Personal', PersonalInsurance, ('individual_id',), None, None),
+    'invoices': ('Invoices', Invoice, ('invoice_number',), None, None),
+    'cobra': ('Cobra', CobraCoverage, ('tax_id', 'first_name', 'last_name'), None, None),
+}
+IMPORT_MODES = ('replace', 'merge')
+IMPORT_PROGRESS_ROWS = 500  # parse progress reported, and cancellation checked, every this many rows
+# Sheets are parsed in up to this many worker processes once a workbook declares
+# IMPORT_PARALLEL_MIN_ROWS data rows; below that, starting them costs more than it saves.
+IMPORT_PARSE_PROCESSES = int(os.environ.get('IMPORT_PARSE_PROCESSES', str(os.cpu_count() or 1)))
+IMPORT_PARALLEL_MIN_ROWS = int(os.environ.get('IMPORT_PARALLEL_MIN_ROWS', '5000'))
+# The parsed sheet whose keys a sheet's rows are checked against.
+IMPORT_KEY_SOURCES = {'benefits': 'clients', 'commercial': 'clients', 'personal': 'individuals'}
+IMPORT_JOBS = ImportJobQueue(max_workers=int(os.environ.get('IMPORT_JOB_WORKERS', '2')))
+
+
+def _reporting_rows(rows, sheet_name, progress):
+    """rows, calling progress(sheet_name, rows so far) every IMPORT_PROGRESS_ROWS and at the end."""
+    n = 0
+    for n, row in enumerate(rows, 1):
+        if n % IMPORT_PROGRESS_ROWS == 0:
+            progress(sheet_name, n)
+        yield row
+    progress(sheet_name, n)
+
+
+def parse_import_workbook(wb, known_clients=frozenset(), known_individuals=frozenset(), progress=None):
+    """{entity: SheetRecords} for the sheets wb (opened read_only) has, in load order.
+
+    Benefits and Commercial rows resolve their client against the sheet's
+    clients plus known_clients; Personal rows their individual likewise.
+    Each SheetRecords keeps its sheet's header rows for the errors workbook.
+    progress(sheet name, rows read), if given, is called as the rows go by.
+    """
+    def parse(entity, sheet_name, parser, *keys):
+        header_rows, rows = import_sheet_rows(wb[sheet_name])
+        if progress is not None:
+            rows = _reporting_rows(rows, sheet_name, progress)
+        sheets[entity] = parser(header_rows, rows, *keys)
+        sheets[entity].header_rows = header_rows
+
+    def keys(entity):
+        return {r.key for r in sheets[entity].records()} if entity in sheets else set()
+
+    present = set(wb.sheetnames)
+    sheets = {}
+    if 'Clients' in present:
+        parse('clients', 'Clients', importer.parse_clients)
+    if 'Individuals' in present:
+        parse('individuals', 'Individuals', importer.parse_individuals)
+    client_keys = keys('clients') | set(known_clients)
+    if 'Employee Benefits' in present:
+        parse('benefits', 'Employee Benefits', importer.parse_benefits, client_keys)
+    if 'Commercial' in present:
+        parse('commercial', 'Commercial', importer.parse_commercial, client_keys)
+    if 'Personal' in present:
+        parse('personal', 'Personal', importer.parse_personal, keys('individuals') | set(known_individuals))
+    if 'Invoices' in present:
+        parse('invoices', 'Invoices', importer.parse_invoices)
+    if 'Cobra' in present:
+        parse('cobra', 'Cobra', importer.parse_cobra)
+    return sheets
+
+
+def parse_import_workbook_parallel(data, sheet_names, known_clients=frozenset(), known_individuals=frozenset(),
+                                   progress=None, checkpoint=None, processes=None):
+    """parse_import_workbook() for the xlsx bytes `data`, a sheet per worker process.
+
+    Each worker opens its own copy of the workbook. A sheet whose rows are
+    checked against another's keys (IMPORT_KEY_SOURCES) is submitted once
+    that one is back; the rest start straight away. progress(sheet name,
+    rows), if given, is called as each sheet comes back, and checkpoint()
+    every second or so in between; either may raise to abandon the parse.
+    """
+    known = {'clients': set(known_clients), 'individuals': set(known_individuals)}
+    pending = [entity for entity, target in IMPORT_TARGETS.items() if target[0] in sheet_names]
+    sheets, running = {}, {}
+    # spawn, not fork: the server is threaded. spawn re-runs the main script in
+    # each worker, hence the run_customer_api.py stub; workers then import only
+    # importer (no models, no app).
+    pool = ProcessPoolExecutor(max_workers=max(min(processes or IMPORT_PARSE_PROCESSES, len(pending)), 1),
+                               mp_context=multiprocessing.get_context('spawn'))
     try:
-        if 'file' not in request.files:
-            return jsonify({'error': 'No file provided'}), 400
+        while pending or running:
+            for entity in list(pending):
+                source = IMPORT_KEY_SOURCES.get(entity)
+                if source in pending or source in running.values():
+                    continue
+                keys = ()
+                if source:
+                    parsed = {r.key for r in sheets[source].records()} if source in sheets else set()
+                    keys = (parsed | known[source],)
+                future = pool.submit(importer.parse_workbook_sheet, data, IMPORT_TARGETS[entity][0], *keys)
+                running[future] = entity
+                pending.remove(entity)
+            done, _ = wait(running, timeout=1, return_when=FIRST_COMPLETED)
+            if checkpoint is not None:
+                checkpoint()
+            for future in done:
+                entity = running.pop(future)
+                sheets[entity] = future.result()
+                if progress is not None:
+                    progress(IMPORT_TARGETS[entity][0], len(sheets[entity].rows))
+    except BaseException:
+        # Cancelled or failed: don't wait on the sheets still being parsed.
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    return {entity: sheets[entity] for entity in IMPORT_TARGETS if entity in sheets}
+
+
+def insert_rows(session, table, rows, key=None):
+    """INSERT rows (dicts with the same keys) into table in as few statements as the driver allows.
+
+    With `key`, returns {row[key]: id}: from a batched multi-row INSERT ...
+    RETURNING where the dialect supports one (Postgres, SQLite 3.35+), else
+    from an executemany and a SELECT of the keys back.
+    """
+    if not rows:
+        return {}
+    if key is None:
+        session.execute(table.insert(), rows)
+        return None
+    if session.get_bind().dialect.insert_executemany_returning:
+        # RETURNING the key too: asking for the rows back in parameter order
+        # makes SQLAlchemy send them one at a time unless the table has a
+        # sentinel column.
+        return dict(session.execute(table.insert().returning(table.c[key], table.c.id), rows).all())
+    session.execute(table.insert(), rows)
+    keys = [row[key] for row in rows]
+    ids = {}
+    for start in range(0, len(keys), 500):
+        ids.update(session.execute(
+            select(table.c[key], table.c.id).where(table.c[key].in_(keys[start:start + 500]))).all())
+    return ids
+
+
+def _insert_params(model, fields, values):
+    """values as INSERT parameters: every field present, the missing ones at the column default."""
+    columns = model.__mapper__.columns
+    return {name: values[name] if name in values else _import_default(columns[name]) for name in fields}
+
+
+def replace_import(session, sheets, progress=None):
+    """Clear every imported table and bulk-insert the parsed records.
+
+    Parents go in first, a sheet per statement batch; their ids come back
+    keyed by natural key, so the children are inserted in bulk too rather
+    than after a flush per parent. Core inserts don't pass through the
+    flush hooks, so policy_lines is rebuilt at the end. progress(sheet
+    name, records), if given, is called as each sheet is done.
+
+    Returns {entity: rows inserted}.
+    """
+    logging.info("[IMPORT] Clearing existing data...")
+    session.query(CobraCoverage).delete()
+    session.query(Invoice).delete()
+    session.query(HomeownersPolicy).delete()
+    session.query(BenefitPlan).delete()
+    session.query(CommercialPlan).delete()
+    session.query(PersonalInsurance).delete()
+    session.query(EmployeeBenefit).delete()
+    session.query(CommercialInsurance).delete()
+    session.query(ClientContact).delete()
+    session.query(Individual).delete()
+    session.query(Client).delete()
+    session.flush()
+    logging.info("[IMPORT] Existing data cleared")
+
+    created = {}
+    for entity, sheet in sheets.items():
+        _, model, key_columns, relationship, child_model = IMPORT_TARGETS[entity]
+        records = sheet.records()
+        rows = [_insert_params(model, sheet.fields, record.fields) for record in records]
+        ids = insert_rows(session, model.__table__, rows, key_columns[0] if relationship else None)
+        if relationship:
+            parent_fk = next(iter(getattr(model, relationship).property.remote_side)).name
+            insert_rows(session, child_model.__table__, [
+                {**_insert_params(child_model, sheet.child_fields, child), parent_fk: ids[record.key]}
+                for record in records for child in record.children
+            ])
+        created[entity] = len(records)
+        logging.info(f"[IMPORT] {sheet.label} done: {len(records)} records")
+        if progress is not None:
+            progress(sheet.label, len(records))
+    rebuild_policy_lines(session.connection())
+    return created
+
+
+def _import_value(column, value):
+    """value as `column` stores it, so a parsed cell compares equal to the row loaded back."""
+    if value is None:
+        return None
+    column_type = column.type
+    if isinstance(column_type, db.Numeric):
+        value = Decimal(str(value))
+        return value.quantize(Decimal(1).scaleb(-column_type.scale)) if column_type.scale is not None else value
+    if isinstance(column_type, db.Boolean):
+        return bool(value)
+    if isinstance(column_type, db.Integer):
+        return int(value)
+    if isinstance(column_type, db.String):
+        return str(value)
+    if isinstance(column_type, db.Date) and isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _import_default(column):
+    default = column.default
+    return default.arg if default is not None and default.is_scalar else None
+
+
+def _merge_fields(obj, values, fields):
+    """Set the fields of obj whose stored value differs from values'; True if any did."""
+    columns = type(obj).__mapper__.columns
+    changed = False
+    for name in fields:
+        column = columns[name]
+        value = values[name] if name in values else _import_default(column)
+        if _import_value(column, value) != _import_value(column, getattr(obj, name)):
+            setattr(obj, name, value)
+            changed = True
+    return changed
+
+
+def _merge_children(obj, record, sheet, relationship, child_model):
+    """Replace obj's children of the sheet's plan types if they differ from the record's."""
+    from collections import Counter
+    columns = child_model.__mapper__.columns
+    fields = sheet.child_fields
+    collection = getattr(obj, relationship)
+    managed = [child for child in collection
+               if sheet.plan_types is None or child.plan_type in sheet.plan_types]
+    stored = Counter(tuple(_import_value(columns[f], getattr(child, f)) for f in fields) for child in managed)
+    parsed = Counter(tuple(_import_value(columns[f], child[f] if f in child else _import_default(columns[f]))
+                           for f in fields)
+                     for child in record.children)
+    if stored == parsed:
+        return False
+    for child in managed:
+        collection.remove(child)
+    collection.extend(child_model(**child) for child in record.children)
+    return True
 
-        file = request.files['file']
-        if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
 
-        if not file.filename.endswith(('.xlsx', '.xls')):
-            return jsonify({'error': 'Invalid file format. Please upload an Excel file (.xlsx or .xls)'}), 400
+def merge_import(session, sheets, deletes=(), progress=None):
+    """Match each parsed record to the stored row with its natural key.
 
-        try:
-            wb = load_workbook(file)
-        except Exception as e:
-            return jsonify({'error': f'Unable to read Excel file: {e}'}), 400
-
-        # ========== VALIDATE WORKBOOK STRUCTURE ==========
-        # Verify the file has the expected sheets and column headers BEFORE
-        # deleting any data — uploading a random spreadsheet must not wipe
-        # the database.
-        EXPECTED_SHEETS = ['Clients', 'Individuals', 'Employee Benefits', 'Commercial', 'Personal', 'Invoices', 'Cobra']
-        REQUIRED_HEADERS = {
-            'Clients': ['Tax ID', 'Client Name'],
-            'Individuals': ['Individual ID', 'First Name', 'Last Name'],
-            'Employee Benefits': ['Tax ID', 'Client Name'],
-            'Commercial': ['Tax ID', 'Client Name'],
-            'Personal': ['Individual ID', 'Individual Name'],
-            'Invoices': ['Invoice Number', 'Tax ID'],
-            'Cobra': ['First Name', 'Last Name'],
-        }
+    Changed rows are updated in place, unchanged ones left alone and new
+    ones inserted. Stored rows missing from a sheet are deleted only for
+    the entities in `deletes`. Cobra rows have no unique key: records with
+    the same (tax_id, name) match the stored ones in id order.
+    progress(sheet name, records), if given, is called as each sheet is done.
 
-        present_sheets = [s for s in EXPECTED_SHEETS if s in wb.sheetnames]
-        if not present_sheets:
-            return jsonify({
-                'error': f'No recognized sheets found. Expected at least one of: {", ".join(EXPECTED_SHEETS)}. '
-                         f'Found: {", ".join(wb.sheetnames)}'
-            }), 400
-
-        validation_errors = []
-        for sheet_name in present_sheets:
-            ws = wb[sheet_name]
-            header_row = [str(c.value).strip() if c.value else '' for c in ws[2]]
-            required = REQUIRED_HEADERS[sheet_name]
-            for idx, expected_col in enumerate(required):
-                actual = header_row[idx] if idx < len(header_row) else ''
-                if actual.lower() != expected_col.lower():
-                    validation_errors.append(
-                        f'Sheet "{sheet_name}": expected column {idx+1} to be "{expected_col}", '
-                        f'got "{actual or "(empty)"}"'
-                    )
+    Returns {entity: {'inserted', 'updated', 'unchanged', 'deleted'}}.
+    """
+    counts = {}
+    leftovers = {}
+    for entity, sheet in sheets.items():
+        _, model, key_columns, relationship, child_model = IMPORT_TARGETS[entity]
+        unique = entity != 'cobra'
+        query = session.query(model).order_by(model.id)
+        if relationship:
+            query = query.options(selectinload(getattr(model, relationship)))
+        stored = {}
+        for obj in query:
+            key = tuple(getattr(obj, c) for c in key_columns)
+            stored.setdefault(key[0] if unique else key, []).append(obj)
+
+        entity_counts = counts[entity] = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'deleted': 0}
+        seen = set()
+        for record in sheet.records():
+            if unique and record.key in seen:
+                record.summary = f"Duplicate {key_columns[0]} {record.key}"
+                record.error = f"{record.summary} — first occurrence kept, this row skipped"
+                continue
+            seen.add(record.key)
+            matches = stored.get(record.key)
+            if not matches:
+                obj = model(**record.fields)
+                if relationship:
+                    getattr(obj, relationship).extend(child_model(**child) for child in record.children)
+                session.add(obj)
+                entity_counts['inserted'] += 1
+                continue
+            obj = matches.pop(0)
+            changed = _merge_fields(obj, record.fields, sheet.fields)
+            if relationship and _merge_children(obj, record, sheet, relationship, child_model):
+                changed = True
+            entity_counts['updated' if changed else 'unchanged'] += 1
+        session.flush()
 
-        if validation_errors:
-            return jsonify({
-                'error': 'Excel structure validation failed',
-                'details': validation_errors
-            }), 400
-
-        # Shared helpers for all import sections — defined once, not per-row.
-        def parse_excel_date(val):
-            if val is None or val == '' or val == 'N/A':
-                return None
-            if isinstance(val, datetime):
-                return val.date()
-            try:
-                return parse(str(val)).date()
-            except Exception:
-                return None
+        # A row that failed to parse still names its stored row: keep it.
+        kept = {r.key for r in sheet.rows if r.error is not None and r.key is not None}
+        leftovers[entity] = [obj for key, objs in stored.items() if key not in kept for obj in objs]
+        logging.info(f"[IMPORT] {sheet.label} merged: {entity_counts}")
+        if progress is not None:
+            progress(sheet.label, sum(entity_counts.values()))
+
+    # Children before parents, so a cascade never deletes what was counted.
+    for entity in reversed(list(sheets)):
+        if entity not in deletes:
+            continue
+        for obj in leftovers[entity]:
+            session.delete(obj)
+        counts[entity]['deleted'] = len(leftovers[entity])
+        session.flush()
+    return counts
+
+
+IMPORT_EXPECTED_SHEETS = ['Clients', 'Individuals', 'Employee Benefits', 'Commercial', 'Personal', 'Invoices', 'Cobra']
+IMPORT_REQUIRED_HEADERS = {
+    'Clients': ['Tax ID', 'Client Name'],
+    'Individuals': ['Individual ID', 'First Name', 'Last Name'],
+    'Employee Benefits': ['Tax ID', 'Client Name'],
+    'Commercial': ['Tax ID', 'Client Name'],
+    'Personal': ['Individual ID', 'Individual Name'],
+    'Invoices': ['Invoice Number', 'Tax ID'],
+    'Cobra': ['First Name', 'Last Name'],
+}
 
-        def safe_int(val):
-            if val is None or val == '':
-                return None
-            try:
-                return int(val)
-            except (TypeError, ValueError):
-                return None
-
-        def clean_remarks(val):
-            """Replace date/timestamp values in remarks with N/A.
-            Excel auto-formatting can silently convert text to dates."""
-            if val is None or val == '':
-                return None
-            if isinstance(val, (datetime, date)):
-                return 'N/A'
-            s = str(val).strip()
-            if parse_excel_date(s) is not None and not any(c.isalpha() for c in s):
-                return 'N/A'
-            return s if s else None
-
-        def clean_premium_vs_agg(premium_val, agg_limit_val):
-            """If premium equals agg limit, the value was likely pasted wrong — zero it.
-            Agg limit may be in millions ('4') or dollars ('4,000,000')."""
-            if premium_val is None or agg_limit_val is None:
-                return premium_val
-            try:
-                p = float(premium_val)
-                a = float(str(agg_limit_val).replace(',', ''))
-                if p > 0 and (p == a or p == a * 1_000_000):
-                    return 0
-            except (TypeError, ValueError):
-                pass
-            return premium_val
 
-        def safe_decimal(val):
-            if val is None or val == '' or val == 'N/A':
-                return None
-            try:
-                return float(val)
-            except (TypeError, ValueError):
-                return None
+class ImportRequestError(ValueError):
+    """An import request refused before any data is touched; details lists header problems."""
 
-        stats = {
-            'clients_created': 0,
-            'individuals_created': 0,
-            'benefits_created': 0,
-            'commercial_created': 0,
-            'personal_created': 0,
-            'errors': []
-        }
+    def __init__(self, message, details=None):
+        super().__init__(message)
+        self.details = details
 
-        # Error row collectors for errors.xlsx generation
-        error_rows_clients = []      # [(row_tuple, error_msg), ...]
-        error_rows_individuals = []
-        error_rows_benefits = []
-        error_rows_commercial = []
-        error_rows_personal = []
-
-        # ========== DELETE ALL EXISTING DATA ==========
-        logging.info("[IMPORT] Clearing existing data...")
-        session.query(CobraCoverage).delete()
-        session.query(Invoice).delete()
-        session.query(HomeownersPolicy).delete()
-        session.query(BenefitPlan).delete()
-        session.query(CommercialPlan).delete()
-        session.query(PersonalInsurance).delete()
-        session.query(EmployeeBenefit).delete()
-        session.query(CommercialInsurance).delete()
-        session.query(ClientContact).delete()
-        session.query(Individual).delete()
-        session.query(Client).delete()
-        session.flush()
-        logging.info("[IMPORT] Existing data cleared")
-
-        import time as _time
-        _import_start = _time.time()
-
-        # ========== IMPORT CLIENTS ==========
-        logging.info("[IMPORT] Starting Clients sheet...")
-        imported_clients = {}  # tax_id -> Client object (for handling duplicates in xlsx)
-        if 'Clients' in wb.sheetnames:
-            ws_clients = wb['Clients']
-            for row_idx, row in enumerate(ws_clients.iter_rows(min_row=3, values_only=True), start=3):
-                if not row[0]:  # Skip empty rows
-                    continue
-                try:
-                    tax_id = str(row[0]).strip() if row[0] else None
-                    if not tax_id:
-                        continue
-
-                    # New column order: Tax ID(0), Client Name(1), DBA(2), Industry(3), Status(4), Gross Revenue(5), Total EEs(6)
-                    # Then contacts starting at col 7, each contact has 9 columns
-                    contact_cols_per = 9
-                    contact_start_col = 7
-
-                    def parse_contacts_from_row(r):
-                        contacts_list = []
-                        ci = contact_start_col
-                        sort = 0
-                        while ci + contact_cols_per - 1 < len(r):
-                            cp = r[ci] if r[ci] else None
-                            em = r[ci+1] if len(r) > ci+1 and r[ci+1] else None
-                            ph = str(r[ci+2]) if len(r) > ci+2 and r[ci+2] else None
-                            ext = str(r[ci+3]) if len(r) > ci+3 and r[ci+3] else None
-                            a1 = r[ci+4] if len(r) > ci+4 else None
-                            a2 = r[ci+5] if len(r) > ci+5 else None
-                            ct = r[ci+6] if len(r) > ci+6 else None
-                            st = r[ci+7] if len(r) > ci+7 else None
-                            zp = str(int(r[ci+8])).zfill(5) if len(r) > ci+8 and r[ci+8] else None
-                            if cp or em or ph or a1:
-                                contacts_list.append({'contact_person': cp, 'email': em, 'phone_number': ph, 'phone_extension': ext, 'address_line_1': a1, 'address_line_2': a2, 'city': ct, 'state': st, 'zip_code': zp, 'sort_order': sort})
-                                sort += 1
-                            ci += contact_cols_per
-                        return contacts_list
-
-                    parsed_contacts = parse_contacts_from_row(row)
-                    fc = parsed_contacts[0] if parsed_contacts else {}
-
-                    if tax_id in imported_clients:
-                        error_rows_clients.append((row, f"Duplicate tax_id {tax_id} — first occurrence kept, this row skipped"))
-                        stats['errors'].append(f"Clients row {row_idx}: Duplicate tax_id {tax_id}")
-                        continue
-
-                    client = Client(
-                        tax_id=tax_id,
-                        client_name=row[1] if len(row) > 1 else None,
-                        dba=row[2] if len(row) > 2 else None,
-                        industry=row[3] if len(row) > 3 else None,
-                        status=row[4] if len(row) > 4 and row[4] else 'Active',
-                        gross_revenue=float(row[5]) if len(row) > 5 and row[5] else None,
-                        total_ees=int(row[6]) if len(row) > 6 and row[6] else None,
-                        contact_person=fc.get('contact_person'),
-                        email=fc.get('email'),
-                        phone_number=fc.get('phone_number'),
-                        address_line_1=fc.get('address_line_1'),
-                        address_line_2=fc.get('address_line_2'),
-                        city=fc.get('city'),
-                        state=fc.get('state'),
-                        zip_code=fc.get('zip_code')
-                    )
-                    session.add(client)
-                    session.flush()
-                    imported_clients[tax_id] = client
-                    for cd in parsed_contacts:
-                        session.add(ClientContact(client_id=client.id, **cd))
-                    stats['clients_created'] += 1
-                    if stats['clients_created'] % 100 == 0:
-                        logging.info(f"[IMPORT] Clients: {stats['clients_created']} imported...")
-                except Exception as e:
-                    error_rows_clients.append((row, str(e)))
-                    stats['errors'].append(f"Clients row {row_idx}: {str(e)}")
+    def body(self):
+        body = {'error': str(self)}
+        if self.details:
+            body['details'] = self.details
+        return body
 
-        session.flush()
-        logging.info(f"[IMPORT] Clients done: {stats['clients_created']} records")
-
-        # Pre-build lookup dicts so benefits/commercial/personal don't
-        # issue a per-row DB query to resolve FKs (the main perf bottleneck).
-        client_by_tax_id = {c.tax_id: c for c in session.query(Client).all()}
-
-        # ========== IMPORT INDIVIDUALS ==========
-        logging.info("[IMPORT] Starting Individuals sheet...")
-        if 'Individuals' in wb.sheetnames:
-            ws_individuals = wb['Individuals']
-            for row_idx, row in enumerate(ws_individuals.iter_rows(min_row=3, values_only=True), start=3):
-                if not row[0]:
-                    continue
-                try:
-                    individual_id = str(row[0]).strip() if row[0] else None
-                    if not individual_id:
-                        continue
-
-                    zip_code = str(int(row[9])).zfill(5) if row[9] else None
-
-                    individual = Individual(
-                        individual_id=individual_id,
-                        first_name=row[1] if len(row) > 1 else None,
-                        last_name=row[2] if len(row) > 2 else None,
-                        email=row[3] if len(row) > 3 else None,
-                        phone_number=str(row[4]) if len(row) > 4 and row[4] else None,
-                        address_line_1=row[5] if len(row) > 5 else None,
-                        address_line_2=row[6] if len(row) > 6 else None,
-                        city=row[7] if len(row) > 7 else None,
-                        state=row[8] if len(row) > 8 else None,
-                        zip_code=zip_code,
-                        status=row[10] if len(row) > 10 and row[10] else 'Active'
-                    )
-                    session.add(individual)
-                    stats['individuals_created'] += 1
-                except Exception as e:
-                    error_rows_individuals.append((row, str(e)))
-                    stats['errors'].append(f"Individuals row {row_idx}: {str(e)}")
 
-        session.flush()
-        logging.info(f"[IMPORT] Individuals done: {stats['individuals_created']} records")
-        individual_by_id = {ind.individual_id: ind for ind in session.query(Individual).all()}
-
-        # ========== IMPORT EMPLOYEE BENEFITS ==========
-        logging.info("[IMPORT] Starting Employee Benefits sheet...")
-        _imported_benefits = set()
-        if 'Employee Benefits' in wb.sheetnames:
-            ws_benefits = wb['Employee Benefits']
-
-            # Read headers from row 2 to detect multi-plan columns dynamically
-            headers = []
-            for cell in ws_benefits[2]:
-                headers.append(str(cell.value).strip() if cell.value else '')
-
-            # Detect multi-plan column positions by header pattern
-            multi_plan_header_map = {
-                'medical': 'MEDICAL',
-                'dental': 'DENTAL',
-                'vision': 'VISION',
-                'life_adnd': 'Life & AD&D'
-            }
+def import_request_options(args):
+    """(mode, deletes) from the ?mode= and ?delete= of an import request."""
+    mode = args.get('mode', 'replace')
+    if mode not in IMPORT_MODES:
+        raise ImportRequestError(f"Unsupported mode '{mode}'. Allowed: {', '.join(IMPORT_MODES)}")
+    deletes = {d.strip() for d in args.get('delete', '').split(',') if d.strip()}
+    if deletes == {'all'}:
+        deletes = set(IMPORT_TARGETS)
+    unknown = deletes - set(IMPORT_TARGETS)
+    if unknown:
+        raise ImportRequestError(f"Unknown delete '{', '.join(sorted(unknown))}'. "
+                                 f"Allowed: {', '.join(IMPORT_TARGETS)}, all")
+    if deletes and mode != 'merge':
+        raise ImportRequestError('delete requires mode=merge')
+    return mode, deletes
 
-            # Find column indices for each multi-plan type (carrier/renewal/waiting_period/remarks/outstanding_item groups)
-            multi_plan_cols = {}  # plan_type -> [(carrier_col, renewal_col, wp_col, remarks_col, outstanding_item_col), ...]
-            for plan_type, label in multi_plan_header_map.items():
-                cols = []
-                for i, h in enumerate(headers):
-                    if h and label.upper() in h.upper() and 'CARRIER' in h.upper():
-                        renewal_col = i + 1 if i + 1 < len(headers) and 'RENEWAL' in headers[i + 1].upper() else None
-                        wp_col = i + 2 if i + 2 < len(headers) and 'WAITING' in headers[i + 2].upper() else None
-                        remarks_col = i + 3 if i + 3 < len(headers) and 'REMARKS' in headers[i + 3].upper() else None
-                        oi_col = i + 4 if i + 4 < len(headers) and 'OUTSTANDING' in headers[i + 4].upper() else None
-                        cols.append((i, renewal_col, wp_col, remarks_col, oi_col))
-                multi_plan_cols[plan_type] = cols
-
-            # Find single-plan type columns by header
-            single_plan_col_map = {}  # prefix -> (renewal_col, carrier_col, remarks_col, outstanding_item_col)
-            single_plan_labels = {
-                'ltd': 'LTD', 'std': 'STD', 'k401': '401K',
-                'critical_illness': 'Critical Illness', 'accident': 'Accident',
-                'hospital': 'Hospital', 'voluntary_life': 'Voluntary Life'
-            }
-            for prefix, label in single_plan_labels.items():
-                for i, h in enumerate(headers):
-                    if h and label.upper() in h.upper() and 'RENEWAL' in h.upper():
-                        is_multi = any(label.upper() == ml.upper() for ml in multi_plan_header_map.values())
-                        if not is_multi:
-                            carrier_col = i + 1 if i + 1 < len(headers) and 'CARRIER' in headers[i + 1].upper() else None
-                            remarks_col = i + 2 if i + 2 < len(headers) and 'REMARKS' in headers[i + 2].upper() else None
-                            oi_col = i + 3 if i + 3 < len(headers) and 'OUTSTANDING' in headers[i + 3].upper() else None
-                            single_plan_col_map[prefix] = (i, carrier_col, remarks_col, oi_col)
-                            break
-
-            # Find fixed column indices
-            def find_col(name):
-                name_upper = name.upper()
-                for i, h in enumerate(headers):
-                    if h.upper().strip() == name_upper:
-                        return i
-                return None
-
-            col_employer_contribution = None
-            col_employee_contribution = None
-            for i, h in enumerate(headers):
-                if h and 'EMPLOYER CONTRIBUTION' in h.upper():
-                    col_employer_contribution = i
-                elif h and 'EMPLOYEE CONTRIBUTION' in h.upper():
-                    col_employee_contribution = i
-
-            for row_idx, row in enumerate(ws_benefits.iter_rows(min_row=3, values_only=True), start=3):
-                if not row[0]:
-                    continue
-                try:
-                    tax_id = str(row[0]).strip() if row[0] else None
-                    if not tax_id:
-                        continue
-
-                    if tax_id in _imported_benefits:
-                        error_rows_benefits.append((row, f"Duplicate tax_id {tax_id} — first occurrence kept, this row skipped"))
-                        stats['errors'].append(f"Benefits row {row_idx}: Duplicate tax_id {tax_id}")
-                        continue
-
-                    client = client_by_tax_id.get(tax_id)
-                    if not client:
-                        error_rows_benefits.append((row, f"Client with tax_id {tax_id} not found"))
-                        stats['errors'].append(f"Benefits row {row_idx}: Client with tax_id {tax_id} not found")
-                        continue
-
-                    def safe_val(idx):
-                        return row[idx] if len(row) > idx and row[idx] else None
-
-                    # Skip row if no carrier is populated in any coverage
-                    _has_any_carrier = False
-                    for _, (_, carrier_col, _, _) in single_plan_col_map.items():
-                        if carrier_col is not None and is_valid_carrier(safe_val(carrier_col)):
-                            _has_any_carrier = True
-                            break
-                    if not _has_any_carrier:
-                        for _, cols_list in multi_plan_cols.items():
-                            for _, (carrier_col, *_rest) in enumerate(cols_list, 1):
-                                if is_valid_carrier(safe_val(carrier_col)):
-                                    _has_any_carrier = True
-                                    break
-                            if _has_any_carrier:
-                                break
-                    if not _has_any_carrier:
-                        error_rows_benefits.append((row, f"No carrier found in any coverage — row skipped"))
-                        stats['errors'].append(f"Benefits row {row_idx}: No carrier in any coverage for {tax_id}")
-                        continue
-
-                    _imported_benefits.add(tax_id)
-
-                    benefit_data = {
-                        'tax_id': tax_id,
-                        'parent_client': safe_val(2),
-                        'form_fire_code': safe_val(3),
-                        'enrollment_poc': safe_val(4),
-                        'funding': safe_val(6),
-                        'num_employees_at_renewal': safe_int(safe_val(7)),
-                        'enrolled_ees': safe_int(safe_val(8)),
-                        'waiting_period': safe_val(9),
-                        'deductible_accumulation': safe_val(10),
-                        'previous_carrier': safe_val(11),
-                        'cobra_carrier': safe_val(12),
-                        'employer_contribution': str(row[col_employer_contribution]) if col_employer_contribution is not None and len(row) > col_employer_contribution and row[col_employer_contribution] else None,
-                        'employee_contribution': str(row[col_employee_contribution]) if col_employee_contribution is not None and len(row) > col_employee_contribution and row[col_employee_contribution] else None
-                    }
-
-                    # Single-plan types — skip if carrier is empty
-                    for prefix, (renewal_col, carrier_col, remarks_col, oi_col) in single_plan_col_map.items():
-                        carrier_val = safe_val(carrier_col) if carrier_col is not None else None
-                        if not is_valid_carrier(carrier_val):
-                            continue
-                        benefit_data[f'{prefix}_carrier'] = carrier_val
-                        if renewal_col is not None:
-                            benefit_data[f'{prefix}_renewal_date'] = parse_excel_date(safe_val(renewal_col))
-                        if remarks_col is not None:
-                            benefit_data[f'{prefix}_remarks'] = clean_remarks(safe_val(remarks_col))
-                        if oi_col is not None:
-                            benefit_data[f'{prefix}_outstanding_item'] = safe_val(oi_col)
-
-                    benefit_obj = EmployeeBenefit(**benefit_data)
-                    session.add(benefit_obj)
-                    session.flush()
-                    stats['benefits_created'] += 1
-                    if stats['benefits_created'] % 100 == 0:
-                        logging.info(f"[IMPORT] Benefits: {stats['benefits_created']} imported...")
-
-                    # Multi-plan types: create BenefitPlan child records (deduplicate by carrier)
-                    for plan_type, cols_list in multi_plan_cols.items():
-                        seen_carriers = set()
-                        actual_plan_num = 0
-                        for _, (carrier_col, renewal_col, wp_col, remarks_col, oi_col) in enumerate(cols_list, 1):
-                            carrier = safe_val(carrier_col)
-                            renewal = parse_excel_date(safe_val(renewal_col)) if renewal_col is not None else None
-                            wp_val = safe_val(wp_col) if wp_col is not None else None
-                            remarks_val = clean_remarks(safe_val(remarks_col)) if remarks_col is not None else None
-                            oi_val = safe_val(oi_col) if oi_col is not None else None
-                            if carrier and str(carrier).strip():
-                                dedup_key = str(carrier).strip().lower()
-                                if dedup_key in seen_carriers:
-                                    continue
-                                seen_carriers.add(dedup_key)
-                                actual_plan_num += 1
-                                plan = BenefitPlan(
-                                    employee_benefit_id=benefit_obj.id,
-                                    plan_type=plan_type,
-                                    plan_number=actual_plan_num,
-                                    carrier=carrier,
-                                    renewal_date=renewal,
-                                    waiting_period=wp_val,
-                                    remarks=remarks_val,
-                                    outstanding_item=oi_val
-                                )
-                                session.add(plan)
-                                # Also set flat fields from first plan
-                                if actual_plan_num == 1:
-                                    if plan_type == 'medical':
-                                        benefit_obj.current_carrier = carrier
-                                        benefit_obj.renewal_date = renewal
-                                    else:
-                                        setattr(benefit_obj, f'{plan_type}_carrier', carrier)
-                                        setattr(benefit_obj, f'{plan_type}_renewal_date', renewal)
-
-                except Exception as e:
-                    error_rows_benefits.append((row, str(e)))
-                    stats['errors'].append(f"Benefits row {row_idx}: {str(e)}")
-
-        logging.info(f"[IMPORT] Benefits done: {stats['benefits_created']} records, "
-                     f"{len(_imported_benefits)} unique, skipped {len(error_rows_benefits)} duplicates/errors")
-
-        # ========== IMPORT COMMERCIAL INSURANCE ==========
-        logging.info("[IMPORT] Starting Commercial sheet...")
-        _imported_commercial = set()
-        if 'Commercial' in wb.sheetnames:
-            ws_commercial = wb['Commercial']
-
-            # Read headers from row 2 to detect column positions dynamically
-            comm_headers = []
-            for cell in ws_commercial[2]:
-                comm_headers.append(str(cell.value).strip() if cell.value else '')
-
-            # Read section headers from row 1 to identify product type boundaries
-            section_headers = []
-            for cell in ws_commercial[1]:
-                section_headers.append(str(cell.value).strip() if cell.value else '')
-
-            # Single-plan types: 8 cols each (Carrier, Agency, Occ Limit, Agg Limit, Premium, Renewal Date, Remarks, Outstanding Item)
-            commercial_single_import_defs = [
-                ('general_liability', 'Commercial General Liability'),
-                ('property', 'Commercial Property'),
-                ('bop', 'Business Owners Policy'),
-                ('workers_comp', 'Workers Compensation'),
-                ('auto', 'Commercial Auto'),
-                ('epli', 'EPLI'),
-                ('nydbl', 'NYDBL'),
-                ('surety', 'Surety Bond'),
-                ('product_liability', 'Product Liability'),
-                ('flood', 'Flood'),
-                ('directors_officers', 'Directors & Officers'),
-                ('fiduciary', 'Fiduciary Bond'),
-                ('inland_marine', 'Inland Marine')
-            ]
-
-            # Multi-plan types: dynamic cols (Carrier, Agency, Occ Limit, Agg Limit, Premium, Renewal Date, Remarks, Outstanding Item per plan)
-            commercial_multi_import_defs = [
-                ('umbrella', 'Umbrella Liability'),
-                ('professional_eo', 'Professional or E&O'),
-                ('cyber', 'Cyber Liability'),
-                ('crime', 'Crime or Fidelity Bond')
-            ]
-
-            # Find section start columns from row 1
-            section_col_map = {}
-            for i, sh in enumerate(section_headers):
-                if sh and sh != 'None':
-                    section_col_map[sh] = i
-
-            # Build column maps for single-plan types
-            comm_single_col_map = {}  # prefix -> start_col (0-based)
-            for prefix, label in commercial_single_import_defs:
-                if label in section_col_map:
-                    comm_single_col_map[prefix] = section_col_map[label]
-
-            # Detect the insured-entities column per single-plan coverage (header-based, backward-compat).
-            # Scans within each section's column range for a header containing "INSURED ENTIT" (current)
-            # or "CO INSURER" (legacy exports).
-            comm_single_co_ins_col = {}  # prefix -> col index (0-based) or None
-            sorted_sections = sorted(section_col_map.items(), key=lambda kv: kv[1])
-            for prefix, label in commercial_single_import_defs:
-                if label not in section_col_map:
-                    continue
-                section_start = section_col_map[label]
-                # Determine section end: col before the next section's start, or end of row
-                section_end = len(comm_headers)
-                for _, other_start in sorted_sections:
-                    if other_start > section_start:
-                        section_end = other_start
-                        break
-                for col_i in range(section_start, section_end):
-                    h = (comm_headers[col_i] or '').upper().replace('-', ' ').strip()
-                    if 'INSURED ENTIT' in h or 'CO INSURER' in h:
-                        comm_single_co_ins_col[prefix] = col_i
-                        break
-
-            # Build column maps for multi-plan types — detect how many plans per type
-            comm_multi_col_map = {}  # plan_type -> [(carrier_col, agency_col, policy_col, occ_limit_col, agg_limit_col, premium_col, renewal_col, remarks_col, oi_col, endorsement_cols), ...]
-            for plan_type, label in commercial_multi_import_defs:
-                if label in section_col_map:
-                    start = section_col_map[label]
-                    # Find section end: where the next section starts
-                    section_end = len(comm_headers)
-                    for _, other_start in sorted_sections:
-                        if other_start > start:
-                            section_end = other_start
-                            break
-                    plans = []
-                    i = start
-                    while i < section_end:
-                        h = comm_headers[i].upper()
-                        if 'CARRIER' in h:
-                            j = i + 1
-                            agency_col = j if j < len(comm_headers) and 'AGENCY' in comm_headers[j].upper() else None
-                            if agency_col is not None:
-                                j += 1
-                            policy_col = j if j < len(comm_headers) and 'POLICY' in comm_headers[j].upper() else None
-                            if policy_col is not None:
-                                j += 1
-                            occ_limit_col = j if j < len(comm_headers) and 'OCC' in comm_headers[j].upper() else None
-                            if occ_limit_col is not None:
-                                j += 1
-                            agg_limit_col = j if j < len(comm_headers) and 'AGG' in comm_headers[j].upper() else None
-                            if agg_limit_col is not None:
-                                j += 1
-                            premium_col = j if j < len(comm_headers) and 'PREMIUM' in comm_headers[j].upper() else None
-                            if premium_col is not None:
-                                j += 1
-                            renewal_col = j if j < len(comm_headers) and 'RENEWAL' in comm_headers[j].upper() else None
-                            if renewal_col is not None:
-                                j += 1
-                            remarks_col = j if j < len(comm_headers) and 'REMARKS' in comm_headers[j].upper() else None
-                            if remarks_col is not None:
-                                j += 1
-                            oi_col = j if j < len(comm_headers) and 'OUTSTANDING' in comm_headers[j].upper() else None
-                            if oi_col is not None:
-                                j += 1
-                            # Detect endorsement columns for professional_eo
-                            endorsement_cols = {}
-                            if plan_type == 'professional_eo':
-                                for ek, ekey in [('TECH', 'endorsement_tech_eo'), ('STAFFING', 'endorsement_staffing'), ('ALLIED', 'endorsement_allied_healthcare'), ('MEDICAL MALPRACTICE', 'endorsement_medical_malpractice')]:
-                                    if j < len(comm_headers) and 'ENDORSEMENT' in comm_headers[j].upper() and ek in comm_headers[j].upper():
-                                        endorsement_cols[ekey] = j
-                                        j += 1
-                            # Insured Entities column (optional; accepts legacy "Co-Insurers" header too)
-                            co_ins_col = None
-                            if j < len(comm_headers):
-                                h_next = (comm_headers[j] or '').upper().replace('-', ' ').strip()
-                                if 'INSURED ENTIT' in h_next or 'CO INSURER' in h_next:
-                                    co_ins_col = j
-                                    j += 1
-                            plans.append((i, agency_col, policy_col, occ_limit_col, agg_limit_col, premium_col, renewal_col, remarks_col, oi_col, endorsement_cols, co_ins_col))
-                            i = j
-                        else:
-                            break
-                    comm_multi_col_map[plan_type] = plans
-
-            for row_idx, row in enumerate(ws_commercial.iter_rows(min_row=3, values_only=True), start=3):
-                if not row[0]:
-                    continue
-                try:
-                    tax_id = str(row[0]).strip() if row[0] else None
-                    if not tax_id:
-                        continue
-
-                    if tax_id in _imported_commercial:
-                        error_rows_commercial.append((row, f"Duplicate tax_id {tax_id} — first occurrence kept, this row skipped"))
-                        stats['errors'].append(f"Commercial row {row_idx}: Duplicate tax_id {tax_id}")
-                        continue
-
-                    client = client_by_tax_id.get(tax_id)
-                    if not client:
-                        error_rows_commercial.append((row, f"Client with tax_id {tax_id} not found"))
-                        stats['errors'].append(f"Commercial row {row_idx}: Client with tax_id {tax_id} not found")
-                        continue
-
-                    def safe_val(idx):
-                        return row[idx] if len(row) > idx and row[idx] else None
-
-                    # Skip row if no carrier is populated in any coverage
-                    _has_any_carrier = False
-                    for prefix in comm_single_col_map:
-                        if is_valid_carrier(safe_val(comm_single_col_map[prefix])):
-                            _has_any_carrier = True
-                            break
-                    if not _has_any_carrier:
-                        for _, cols_list in comm_multi_col_map.items():
-                            for _, (carrier_col, *_rest) in enumerate(cols_list, 1):
-                                if is_valid_carrier(safe_val(carrier_col)):
-                                    _has_any_carrier = True
-                                    break
-                            if _has_any_carrier:
-                                break
-                    if not _has_any_carrier:
-                        error_rows_commercial.append((row, f"No carrier found in any coverage — row skipped"))
-                        stats['errors'].append(f"Commercial row {row_idx}: No carrier in any coverage for {tax_id}")
-                        continue
-
-                    _imported_commercial.add(tax_id)
-
-                    commercial_data = {
-                        'tax_id': tax_id,
-                        'parent_client': row[2] if len(row) > 2 else None,
-                        'assigned_to': row[3] if len(row) > 3 else None
-                    }
-
-                    # Single-plan types — skip if carrier is empty
-                    for prefix, label in commercial_single_import_defs:
-                        if prefix in comm_single_col_map:
-                            sc = comm_single_col_map[prefix]
-                            carrier = safe_val(sc)
-                            if not is_valid_carrier(carrier):
-                                continue
-                            commercial_data[f'{prefix}_carrier'] = carrier
-                            commercial_data[f'{prefix}_agency'] = safe_val(sc + 1)
-                            commercial_data[f'{prefix}_policy_number'] = safe_val(sc + 2)
-                            occ_limit_val = safe_val(sc + 3)
-                            if occ_limit_val and str(occ_limit_val) == 'N/A':
-                                occ_limit_val = None
-                            agg_limit_val = safe_val(sc + 4)
-                            if agg_limit_val and str(agg_limit_val) == 'N/A':
-                                agg_limit_val = None
-                            # Property uses absolute dollar amounts (Building Limit, Personal Property), not millions
-                            if prefix == 'property':
-                                commercial_data[f'{prefix}_occ_limit'] = str(occ_limit_val) if occ_limit_val is not None else None
-                                commercial_data[f'{prefix}_agg_limit'] = str(agg_limit_val) if agg_limit_val is not None else None
-                            else:
-                                commercial_data[f'{prefix}_occ_limit'] = format_limit(occ_limit_val)
-                                commercial_data[f'{prefix}_agg_limit'] = format_limit(agg_limit_val)
-                            raw_premium = safe_decimal(safe_val(sc + 5))
-                            commercial_data[f'{prefix}_premium'] = clean_premium_vs_agg(raw_premium, agg_limit_val)
-                            commercial_data[f'{prefix}_renewal_date'] = parse_excel_date(safe_val(sc + 6))
-                            commercial_data[f'{prefix}_remarks'] = clean_remarks(safe_val(sc + 7))
-                            commercial_data[f'{prefix}_outstanding_item'] = safe_val(sc + 8)
-                            # GL endorsements (7 extra columns after the base 9)
-                            if prefix == 'general_liability':
-                                commercial_data['general_liability_endorsement_bop'] = str(safe_val(sc + 9)).strip().upper() == 'YES' if safe_val(sc + 9) else False
-                                commercial_data['general_liability_endorsement_marine'] = str(safe_val(sc + 10)).strip().upper() == 'YES' if safe_val(sc + 10) else False
-                                commercial_data['general_liability_endorsement_foreign'] = str(safe_val(sc + 11)).strip().upper() == 'YES' if safe_val(sc + 11) else False
-                                commercial_data['general_liability_endorsement_molestation'] = str(safe_val(sc + 12)).strip().upper() == 'YES' if safe_val(sc + 12) else False
-                                commercial_data['general_liability_endorsement_staffing'] = str(safe_val(sc + 13)).strip().upper() == 'YES' if safe_val(sc + 13) else False
-                                commercial_data['general_liability_endorsement_accidental_medical'] = str(safe_val(sc + 14)).strip().upper() == 'YES' if safe_val(sc + 14) else False
-                                commercial_data['general_liability_endorsement_liquor_liability'] = str(safe_val(sc + 15)).strip().upper() == 'YES' if safe_val(sc + 15) else False
-                            # BOP property coverage (2 extra columns after the base 9)
-                            elif prefix == 'bop':
-                                commercial_data['bop_building_limit'] = safe_decimal(safe_val(sc + 9))
-                                commercial_data['bop_personal_property'] = safe_decimal(safe_val(sc + 10))
-                            # Auto type (1 extra column after the base 9)
-                            elif prefix == 'auto':
-                                commercial_data['auto_type'] = safe_val(sc + 9)
-                            # Co-Insurers (non-WC only, detected via header scan — position varies)
-                            if prefix != 'workers_comp' and prefix in comm_single_co_ins_col:
-                                commercial_data[f'{prefix}_insured_entities'] = safe_val(comm_single_co_ins_col[prefix])
-
-                    comm_obj = CommercialInsurance(**commercial_data)
-                    session.add(comm_obj)
-                    session.flush()
-                    stats['commercial_created'] += 1
-                    if stats['commercial_created'] % 100 == 0:
-                        logging.info(f"[IMPORT] Commercial: {stats['commercial_created']} imported...")
-
-                    # Multi-plan types: create CommercialPlan child records (deduplicate by carrier+policy_number)
-                    for plan_type, cols_list in comm_multi_col_map.items():
-                        seen_plans = set()  # track (carrier, policy_number) to skip duplicates
-                        actual_plan_num = 0
-                        for _, (carrier_col, agency_col, policy_col, occ_limit_col, agg_limit_col, premium_col, renewal_col, remarks_col, oi_col, endorsement_cols, co_ins_col) in enumerate(cols_list, 1):
-                            carrier = safe_val(carrier_col)
-                            agency = safe_val(agency_col) if agency_col is not None else None
-                            policy_number = safe_val(policy_col) if policy_col is not None else None
-                            occ_limit_val = format_limit(safe_val(occ_limit_col)) if occ_limit_col is not None else None
-                            agg_limit_val = format_limit(safe_val(agg_limit_col)) if agg_limit_col is not None else None
-                            premium = safe_decimal(safe_val(premium_col)) if premium_col is not None else None
-                            premium = clean_premium_vs_agg(premium, agg_limit_val)
-                            renewal = parse_excel_date(safe_val(renewal_col)) if renewal_col is not None else None
-                            remarks_val = clean_remarks(safe_val(remarks_col)) if remarks_col is not None else None
-                            oi_val = safe_val(oi_col) if oi_col is not None else None
-                            co_ins_val = safe_val(co_ins_col) if co_ins_col is not None else None
-                            if carrier and str(carrier).strip():
-                                # Skip duplicate plans (same carrier and policy number)
-                                dedup_key = (str(carrier).strip().lower(), str(policy_number or '').strip().lower())
-                                if dedup_key in seen_plans:
-                                    continue
-                                seen_plans.add(dedup_key)
-                                actual_plan_num += 1
-                                plan = CommercialPlan(
-                                    commercial_insurance_id=comm_obj.id,
-                                    plan_type=plan_type,
-                                    plan_number=actual_plan_num,
-                                    carrier=carrier,
-                                    agency=agency,
-                                    policy_number=policy_number,
-                                    coverage_occ_limit=occ_limit_val if occ_limit_val and str(occ_limit_val) != 'N/A' else None,
-                                    coverage_agg_limit=agg_limit_val if agg_limit_val and str(agg_limit_val) != 'N/A' else None,
-                                    premium=premium,
-                                    renewal_date=renewal,
-                                    remarks=remarks_val,
-                                    outstanding_item=oi_val,
-                                    insured_entities=co_ins_val,
-                                )
-                                # Professional E&O endorsements
-                                if plan_type == 'professional_eo' and endorsement_cols:
-                                    for ekey, ecol in endorsement_cols.items():
-                                        setattr(plan, ekey, str(safe_val(ecol)).strip().upper() == 'YES' if safe_val(ecol) else False)
-                                session.add(plan)
-                                # Set flat fields from first plan for backward compat
-                                if actual_plan_num == 1:
-                                    setattr(comm_obj, f'{plan_type}_carrier', carrier)
-                                    setattr(comm_obj, f'{plan_type}_agency', agency)
-                                    setattr(comm_obj, f'{plan_type}_policy_number', policy_number)
-                                    setattr(comm_obj, f'{plan_type}_occ_limit', occ_limit_val if occ_limit_val and occ_limit_val != 'N/A' else None)
-                                    setattr(comm_obj, f'{plan_type}_agg_limit', agg_limit_val if agg_limit_val and agg_limit_val != 'N/A' else None)
-                                    setattr(comm_obj, f'{plan_type}_premium', premium)
-                                    setattr(comm_obj, f'{plan_type}_renewal_date', renewal)
-
-                except Exception as e:
-                    error_rows_commercial.append((row, str(e)))
-                    stats['errors'].append(f"Commercial row {row_idx}: {str(e)}")
-
-        # Log multi-plan totals with breakdown
-        _mp_totals = {}
-        for r in session.query(CommercialPlan).all():
-            _mp_totals[r.plan_type] = _mp_totals.get(r.plan_type, 0) + 1
-        logging.info(f"[IMPORT] Commercial done: {stats['commercial_created']} records, "
-                     f"{len(_imported_commercial)} unique, skipped {len(error_rows_commercial)} duplicates/errors, "
-                     f"multi-plan totals: {_mp_totals}")
-        # Log per-client umbrella details for debugging
-        _umb_by_client = {}
-        for r in session.query(CommercialPlan).filter_by(plan_type='umbrella').all():
-            comm = session.query(CommercialInsurance).get(r.commercial_insurance_id)
-            key = comm.tax_id if comm else '?'
-            _umb_by_client.setdefault(key, []).append(r.carrier)
-        _multi_umb = {k: v for k, v in _umb_by_client.items() if len(v) > 1}
-        logging.info(f"[IMPORT] Umbrella: {sum(len(v) for v in _umb_by_client.values())} plans, "
-                     f"{len(_umb_by_client)} clients, {len(_multi_umb)} with 2+ plans")
-
-        # ========== IMPORT PERSONAL INSURANCE ==========
-        logging.info("[IMPORT] Starting Personal sheet...")
-        _imported_personal = set()
-        if 'Personal' in wb.sheetnames:
-            ws_personal = wb['Personal']
-
-            # Read headers from row 2
-            pers_headers = []
-            for cell in ws_personal[2]:
-                pers_headers.append(str(cell.value).strip() if cell.value else '')
-
-            # Read section headers from row 1
-            pers_section_headers = []
-            for cell in ws_personal[1]:
-                pers_section_headers.append(str(cell.value).strip() if cell.value else '')
-
-            # Map section label -> start column (0-based)
-            pers_section_col_map = {}
-            for i, sh in enumerate(pers_section_headers):
-                if sh and sh != 'None':
-                    pers_section_col_map[sh] = i
-
-            # Product defs: (prefix, section_label, [db_field_suffixes])
-            pers_import_defs = [
-                ('personal_auto', 'Personal Auto', ['carrier', 'bi_occ_limit', 'bi_agg_limit', 'pd_limit', 'premium', 'renewal_date', 'outstanding_item', 'remarks']),
-                ('homeowners', 'Homeowners', ['carrier', 'dwelling_limit', 'liability_limit', 'premium', 'renewal_date', 'outstanding_item', 'remarks']),
-                ('personal_umbrella', 'Personal Umbrella', ['carrier', 'liability_limit', 'deductible', 'premium', 'renewal_date', 'outstanding_item', 'remarks']),
-                ('event', 'Event Insurance', ['carrier', 'type', 'location', 'start_date', 'end_date', 'entry_fee', 'audience_count', 'premium', 'outstanding_item', 'remarks']),
-                ('visitors_medical', 'Visitors Medical', ['carrier', 'start_date', 'end_date', 'destination_country', 'premium', 'outstanding_item', 'remarks']),
-            ]
-
-            # Determine column start for each product from section headers
-            pers_product_col_map = {}
-            for prefix, label, fields in pers_import_defs:
-                if label in pers_section_col_map:
-                    pers_product_col_map[prefix] = (pers_section_col_map[label], fields)
-
-            premium_fields = {'premium', 'deductible', 'entry_fee'}
-            date_fields = {'renewal_date', 'start_date', 'end_date'}
-            integer_fields = {'audience_count'}
-
-            for row_idx, row in enumerate(ws_personal.iter_rows(min_row=3, values_only=True), start=3):
-                if not row[0]:
-                    continue
-                try:
-                    ind_id = str(row[0]).strip() if row[0] else None
-                    if not ind_id:
-                        continue
-
-                    if ind_id in _imported_personal:
-                        error_rows_personal.append((row, f"Duplicate individual_id {ind_id} — first occurrence kept, this row skipped"))
-                        stats['errors'].append(f"Personal row {row_idx}: Duplicate individual_id {ind_id}")
-                        continue
-
-                    ind = individual_by_id.get(ind_id)
-                    if not ind:
-                        error_rows_personal.append((row, f"Individual with id {ind_id} not found"))
-                        stats['errors'].append(f"Personal row {row_idx}: Individual with id {ind_id} not found")
-                        continue
-
-                    _imported_personal.add(ind_id)
-
-                    def safe_val_p(idx):
-                        return row[idx] if len(row) > idx and row[idx] else None
-
-                    personal_data = {
-                        'individual_id': ind_id,
-                    }
-
-                    for prefix, label, fields in pers_import_defs:
-                        if prefix in pers_product_col_map:
-                            start_col, field_list = pers_product_col_map[prefix]
-                            for fi, field_suffix in enumerate(field_list):
-                                val = safe_val_p(start_col + fi)
-                                key = f'{prefix}_{field_suffix}'
-                                if field_suffix in date_fields:
-                                    personal_data[key] = parse_excel_date(val)
-                                elif field_suffix in premium_fields:
-                                    personal_data[key] = safe_decimal(val)
-                                elif field_suffix in integer_fields:
-                                    personal_data[key] = int(val) if val else None
-                                else:
-                                    personal_data[key] = val
-
-                    pers_obj = PersonalInsurance(**personal_data)
-                    session.add(pers_obj)
-                    stats['personal_created'] += 1
-
-                except Exception as e:
-                    error_rows_personal.append((row, str(e)))
-                    stats['errors'].append(f"Personal row {row_idx}: {str(e)}")
-
-        logging.info(f"[IMPORT] Personal done: {stats['personal_created']} records")
-
-        # ========== IMPORT INVOICES ==========
-        logging.info("[IMPORT] Starting Invoices sheet...")
-        if 'Invoices' in wb.sheetnames:
-            ws_inv = wb['Invoices']
-            for row_idx, row in enumerate(ws_inv.iter_rows(min_row=3, values_only=True), start=3):
-                if not row[0]:
-                    continue
-                try:
-                    inv = Invoice(
-                        invoice_number=int(row[0]),
-                        tax_id=str(row[1]).strip() if row[1] else None,
-                        invoice_date=parse_excel_date(row[3]) if len(row) > 3 else None,
-                        amount=safe_decimal(row[4]) if len(row) > 4 else None,
-                        recipient_email=row[5] if len(row) > 5 else None,
-                        cc_email=row[6] if len(row) > 6 else None,
-                        status=row[7] if len(row) > 7 and row[7] else 'pending',
-                        payment_date=parse_excel_date(row[8]) if len(row) > 8 else None,
-                        payment_notes=row[9] if len(row) > 9 else None,
-                        policies_description=row[10] if len(row) > 10 else None,
-                        is_binding=str(row[11]).strip().upper() == 'YES' if len(row) > 11 and row[11] else False,
-                    )
-                    session.add(inv)
-                    stats['invoices_created'] = stats.get('invoices_created', 0) + 1
-                except Exception as e:
-                    stats['errors'].append(f"Invoices row {row_idx}: {str(e)}")
-        logging.info(f"[IMPORT] Invoices done: {stats.get('invoices_created', 0)} records")
-
-        # ========== IMPORT COBRA ==========
-        logging.info("[IMPORT] Starting Cobra sheet...")
-        if 'Cobra' in wb.sheetnames:
-            ws_cobra = wb['Cobra']
-            for row_idx, row in enumerate(ws_cobra.iter_rows(min_row=3, values_only=True), start=3):
-                if not row[0] and not row[1]:
-                    continue
-                try:
-                    cov = CobraCoverage(
-                        first_name=row[0] if row[0] else None,
-                        last_name=row[1] if len(row) > 1 else None,
-                        tax_id=str(row[2]).strip() if len(row) > 2 and row[2] else None,
-                        state=row[4] if len(row) > 4 else None,
-                        start_date=parse_excel_date(row[5]) if len(row) > 5 else None,
-                        end_date=parse_excel_date(row[6]) if len(row) > 6 else None,
-                        status=row[7] if len(row) > 7 and row[7] else 'active',
-                        termination_date=parse_excel_date(row[8]) if len(row) > 8 else None,
-                        termination_reason=row[9] if len(row) > 9 else None,
-                    )
-                    session.add(cov)
-                    stats['cobra_created'] = stats.get('cobra_created', 0) + 1
-                except Exception as e:
-                    stats['errors'].append(f"Cobra row {row_idx}: {str(e)}")
-        logging.info(f"[IMPORT] Cobra done: {stats.get('cobra_created', 0)} records")
 
+def import_upload(files):
+    """The uploaded workbook of an import request."""
+    if 'file' not in files:
+        raise ImportRequestError('No file provided')
+
+    file = files['file']
+    if file.filename == '':
+        raise ImportRequestError('No file selected')
+
+    if not file.filename.endswith(('.xlsx', '.xls')):
+        raise ImportRequestError('Invalid file format. Please upload an Excel file (.xlsx or .xls)')
+    return file
+
+
+def open_import_workbook(file):
+    """(workbook, {sheet name: rows it declares}) for an upload whose structure checks out.
+
+    Verifies the file has the expected sheets and column headers BEFORE any
+    data is deleted — uploading a random spreadsheet must not wipe the
+    database. The row counts come from the sheets' <dimension> tags, so
+    they are only estimates (None where a sheet has none).
+    """
+    try:
+        # Streamed: a full load builds every cell, style and merged range in memory.
+        wb = load_workbook(file, read_only=True)
+    except Exception as e:
+        raise ImportRequestError(f'Unable to read Excel file: {e}')
+
+    present_sheets = [s for s in IMPORT_EXPECTED_SHEETS if s in wb.sheetnames]
+    if not present_sheets:
+        raise ImportRequestError(
+            f'No recognized sheets found. Expected at least one of: {", ".join(IMPORT_EXPECTED_SHEETS)}. '
+            f'Found: {", ".join(wb.sheetnames)}'
+        )
+
+    # Read before import_header_rows() drops the declared dimensions.
+    expected = {name: max(wb[name].max_row - 2, 0) if wb[name].max_row else None for name in present_sheets}
+
+    validation_errors = []
+    for sheet_name in present_sheets:
+        header_row = [str(v).strip() if v else '' for v in import_header_rows(wb[sheet_name])[1]]
+        required = IMPORT_REQUIRED_HEADERS[sheet_name]
+        for idx, expected_col in enumerate(required):
+            actual = header_row[idx] if idx < len(header_row) else ''
+            if actual.lower() != expected_col.lower():
+                validation_errors.append(
+                    f'Sheet "{sheet_name}": expected column {idx+1} to be "{expected_col}", '
+                    f'got "{actual or "(empty)"}"'
+                )
+
+    if validation_errors:
+        raise ImportRequestError('Excel structure validation failed', validation_errors)
+    return wb, expected
+
+
+def import_errors_workbook(sheets):
+    """(base64 xlsx, filename) listing the rows that failed to import, or None if none did.
+
+    Each sheet with errors is copied with its two header rows and an "Error"
+    column. The source was streamed, so its header rows come from the parse
+    rather than the sheet.
+    """
+    error_sheets = [(IMPORT_TARGETS[entity][0], sheets[entity].header_rows,
+                     [(r.row, r.error) for r in sheets[entity].rows if r.error])
+                    for entity in ('clients', 'individuals', 'benefits', 'commercial', 'personal')
+                    if entity in sheets]
+    if not any(error_rows for _, _, error_rows in error_sheets):
+        return None
+    error_wb = Workbook()
+    error_wb.remove(error_wb.active)  # Remove default sheet
+
+    for source_sheet_name, (section_row, header_row), error_rows in error_sheets:
+        if not error_rows:
+            continue
+        err_ws = error_wb.create_sheet(source_sheet_name)
+
+        # Find the max column used in row 2 (column headers)
+        max_col = 0
+        for col, value in enumerate(header_row, 1):
+            if value is not None:
+                max_col = col
+
+        # Copy row 1 (section headers)
+        section_cols = [col for col, value in enumerate(section_row, 1) if value is not None]
+        for col in section_cols:
+            err_ws.cell(row=1, column=col, value=section_row[col - 1])
+            err_ws.cell(row=1, column=col).font = Font(bold=True, size=11)
+            err_ws.cell(row=1, column=col).fill = PatternFill(start_color="DDDDDD", end_color="DDDDDD", fill_type="solid")
+
+        # Merge each titled section up to the next one, as the export lays
+        # them out (a read-only sheet doesn't expose its merged ranges)
+        titled = [col for col in section_cols if section_row[col - 1] != '']
+        for col, end_col in zip(titled, [c - 1 for c in titled[1:]] + [max_col]):
+            if end_col > col:
+                err_ws.merge_cells(start_row=1, start_column=col, end_row=1, end_column=end_col)
+
+        # Copy row 2 (column headers)
+        for col, value in enumerate(header_row, 1):
+            if value is not None:
+                err_ws.cell(row=2, column=col, value=value)
+                err_ws.cell(row=2, column=col).font = Font(bold=True)
+
+        # Append "Error" column header
+        error_col = max_col + 1
+        err_ws.cell(row=2, column=error_col, value='Error')
+        err_ws.cell(row=2, column=error_col).font = Font(bold=True, color="FF0000")
+
+        # Write errored rows
+        for data_row_idx, (row_data, error_msg) in enumerate(error_rows, 3):
+            for col_idx, val in enumerate(row_data, 1):
+                # Convert date/datetime objects to string for safe writing
+                if isinstance(val, datetime):
+                    val = val.strftime('%m/%d/%Y')
+                elif hasattr(val, 'strftime'):
+                    val = val.strftime('%m/%d/%Y')
+                err_ws.cell(row=data_row_idx, column=col_idx, value=val)
+            err_ws.cell(row=data_row_idx, column=error_col, value=error_msg)
+
+    # Encode as base64
+    error_output = io.BytesIO()
+    error_wb.save(error_output)
+    error_output.seek(0)
+    errors_b64 = base64.b64encode(error_output.read()).decode('utf-8')
+    return errors_b64, f'Import_Errors_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+
+
+def run_import(wb, mode, deletes, job=None, data=None):
+    """Parse wb, load it in `mode` and commit; returns the /api/import response body.
+
+    Progress goes to `job` (an ImportJob), whose checkpoints may raise
+    ImportCancelled up to the commit; everything is rolled back then.
+    Given the workbook's bytes as `data`, a workbook whose sheets declare
+    IMPORT_PARALLEL_MIN_ROWS rows between them is parsed in parallel.
+    """
+    job = job or ImportJob(mode)
+    session = Session()
+    try:
+        _import_start = time.time()
+
+        # ========== PARSE ==========
+        # Every sheet is read into records before the database is touched;
+        # replace and merge load the same records.
+        job.set_phase('parsing')
+        known_clients, known_individuals = set(), set()
+        if mode == 'merge':
+            # Rows may refer to stored clients the workbook doesn't list,
+            # unless those are about to be deleted.
+            if not ('clients' in deletes and 'Clients' in wb.sheetnames):
+                known_clients = {k for (k,) in session.query(Client.tax_id)}
+            if not ('individuals' in deletes and 'Individuals' in wb.sheetnames):
+                known_individuals = {k for (k,) in session.query(Individual.individual_id)}
+        declared_rows = sum(n or 0 for n in job.expected.values())
+        if data is not None and IMPORT_PARSE_PROCESSES > 1 and declared_rows >= IMPORT_PARALLEL_MIN_ROWS:
+            sheets = parse_import_workbook_parallel(data, wb.sheetnames, known_clients, known_individuals,
+                                                    progress=job.rows_parsed, checkpoint=job.checkpoint)
+        else:
+            sheets = parse_import_workbook(wb, known_clients, known_individuals, progress=job.rows_parsed)
+        wb.close()
+        logging.info(f"[IMPORT] Parsed {', '.join(f'{s.label}: {len(s.rows)} rows' for s in sheets.values())}")
+
+        # ========== LOAD ==========
+        job.set_phase('loading')
+        if mode == 'merge':
+            counts = merge_import(session, sheets, deletes, progress=job.rows_loaded)
+            created = {entity: c['inserted'] for entity, c in counts.items()}
+        else:
+            created = replace_import(session, sheets, progress=job.rows_loaded)
+
+        stats = {
+            'clients_created': created.get('clients', 0),
+            'individuals_created': created.get('individuals', 0),
+            'benefits_created': created.get('benefits', 0),
+            'commercial_created': created.get('commercial', 0),
+            'personal_created': created.get('personal', 0),
+            'errors': [f"{sheet.label} row {r.row_idx}: {r.summary}"
+                       for sheet in sheets.values() for r in sheet.rows if r.error is not None],
+        }
+        for entity in ('invoices', 'cobra'):
+            if created.get(entity):
+                stats[f'{entity}_created'] = created[entity]
+
+        if 'commercial' in sheets:
+            # Log multi-plan totals with breakdown
+            from collections import Counter
+            _mp_totals = Counter()
+            _umb_by_client = {}
+            for r in sheets['commercial'].records():
+                _mp_totals.update(plan['plan_type'] for plan in r.children)
+                umbrellas = sum(plan['plan_type'] == 'umbrella' for plan in r.children)
+                if umbrellas:
+                    _umb_by_client[r.key] = umbrellas
+            logging.info(f"[IMPORT] Commercial multi-plan totals: {dict(_mp_totals)}; "
+                         f"Umbrella: {sum(_umb_by_client.values())} plans, {len(_umb_by_client)} clients, "
+                         f"{sum(n > 1 for n in _umb_by_client.values())} with 2+ plans")
+
+        # Last chance to cancel: past the commit the import finishes.
+        job.checkpoint()
+        job.set_phase('committing')
         session.commit()
-        elapsed = _time.time() - _import_start
-        logging.info(f"[IMPORT] Complete in {elapsed:.1f}s — "
+        elapsed = time.time() - _import_start
+        logging.info(f"[IMPORT] {mode.capitalize()} complete in {elapsed:.1f}s — "
                      f"clients={stats['clients_created']}, individuals={stats['individuals_created']}, "
                      f"benefits={stats['benefits_created']}, commercial={stats['commercial_created']}, "
                      f"personal={stats['personal_created']}, invoices={stats.get('invoices_created', 0)}, "
                      f"cobra={stats.get('cobra_created', 0)}, errors={len(stats['errors'])}")
+        job.set_phase('refreshing dashboards')
+        try:
+            refresh_dashboard_snapshots()
+        except Exception as e:
+            logging.warning(f"Could not refresh dashboard snapshots after import: {e}")
 
         # ========== BUILD ERRORS WORKBOOK ==========
         response_data = {
             'message': 'Import completed successfully',
             'stats': stats
         }
-
-        has_errors = error_rows_clients or error_rows_individuals or error_rows_benefits or error_rows_commercial or error_rows_personal
-        if has_errors:
-            error_wb = Workbook()
-            error_wb.remove(error_wb.active)  # Remove default sheet
-
-            # Helper: copy headers from source sheet to error sheet, append "Error" column
-            def copy_headers_and_write_errors(source_sheet_name, error_rows):
-                if not error_rows:
-                    return
-                src_ws = wb[source_sheet_name]
-                err_ws = error_wb.create_sheet(source_sheet_name)
-
-                # Find the max column used in row 2 (column headers)
-                max_col = 0
-                for cell in src_ws[2]:
-                    if cell.value is not None:
-                        max_col = cell.column
-
-                # Copy row 1 (section headers) with merged cells
-                for cell in src_ws[1]:
-                    if cell.value is not None:
-                        err_ws.cell(row=1, column=cell.column, value=cell.value)
-                        err_ws.cell(row=1, column=cell.column).font = Font(bold=True, size=11)
-                        err_ws.cell(row=1, column=cell.column).fill = PatternFill(start_color="DDDDDD", end_color="DDDDDD", fill_type="solid")
-
-                # Copy merged cells from row 1
-                for merged_range in src_ws.merged_cells.ranges:
-                    if merged_range.min_row == 1 and merged_range.max_row == 1:
-                        err_ws.merge_cells(start_row=1, start_column=merged_range.min_col,
-                                           end_row=1, end_column=merged_range.max_col)
-
-                # Copy row 2 (column headers)
-                for cell in src_ws[2]:
-                    if cell.value is not None:
-                        err_ws.cell(row=2, column=cell.column, value=cell.value)
-                        err_ws.cell(row=2, column=cell.column).font = Font(bold=True)
-
-                # Append "Error" column header
-                error_col = max_col + 1
-                err_ws.cell(row=2, column=error_col, value='Error')
-                err_ws.cell(row=2, column=error_col).font = Font(bold=True, color="FF0000")
-
-                # Write errored rows
-                for data_row_idx, (row_data, error_msg) in enumerate(error_rows, 3):
-                    for col_idx, val in enumerate(row_data, 1):
-                        # Convert date/datetime objects to string for safe writing
-                        if isinstance(val, datetime):
-                            val = val.strftime('%m/%d/%Y')
-                        elif hasattr(val, 'strftime'):
-                            val = val.strftime('%m/%d/%Y')
-                        err_ws.cell(row=data_row_idx, column=col_idx, value=val)
-                    err_ws.cell(row=data_row_idx, column=error_col, value=error_msg)
-
-            # Build error sheets for each tab that has errors
-            if 'Clients' in wb.sheetnames:
-                copy_headers_and_write_errors('Clients', error_rows_clients)
-            if 'Individuals' in wb.sheetnames:
-                copy_headers_and_write_errors('Individuals', error_rows_individuals)
-            if 'Employee Benefits' in wb.sheetnames:
-                copy_headers_and_write_errors('Employee Benefits', error_rows_benefits)
-            if 'Commercial' in wb.sheetnames:
-                copy_headers_and_write_errors('Commercial', error_rows_commercial)
-                if 'Personal' in wb.sheetnames:
-                    copy_headers_and_write_errors('Personal', error_rows_personal)
-
-            # Encode as base64
-            error_output = io.BytesIO()
-            error_wb.save(error_output)
-            error_output.seek(0)
-            errors_b64 = base64.b64encode(error_output.read()).decode('utf-8')
-
-            response_data['errors_file'] = errors_b64
-            response_data['errors_filename'] = f'Import_Errors_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-
-        return jsonify(response_data), 200
-    except Exception as e:
+        if mode == 'merge':
+            response_data['mode'] = mode
+            response_data['counts'] = counts
+
+        job.set_phase('writing errors file')
+        errors_file = import_errors_workbook(sheets)
+        if errors_file:
+            response_data['errors_file'], response_data['errors_filename'] = errors_file
+        return response_data
+    except Exception:
         session.rollback()
-        logging.error(f"Error importing from Excel: {e}")
-        return jsonify({'error': str(e)}), 500
+        raise
     finally:
         session.close()
 
 
+@app.route('/api/import', methods=['POST'])
+@require_admin
+def import_from_excel():
+    """Import data from an Excel file matching the Data Sheet.xlsx format.
+
+    ?mode=replace (the default) clears the imported tables and loads the
+    workbook. ?mode=merge matches rows by natural key instead, updating
+    only the ones that changed; ?delete=clients,invoices,... (or all)
+    also deletes the stored rows those sheets no longer list.
+
+    Runs as an import job the request waits for, so the same 409 as
+    POST /api/import/jobs applies when it would run alongside another
+    import it can't.
+    """
+    try:
+        mode, deletes = import_request_options(request.args)
+        data = import_upload(request.files).read()
+        wb, expected = open_import_workbook(io.BytesIO(data))
+    except ImportRequestError as e:
+        return jsonify(e.body()), 400
+    job = ImportJob(mode, destructive=mode == 'replace' or bool(deletes), expected=expected)
+    try:
+        IMPORT_JOBS.submit(job, lambda job: _run_import_job(job, wb, mode, deletes, data))
+    except ImportJobConflict as e:
+        wb.close()
+        return jsonify({'error': str(e)}), 409
+    job = IMPORT_JOBS.wait(job.id)
+    if job.status == 'done':
+        return jsonify(job.result), 200
+    if job.status == 'cancelled':
+        return jsonify({'error': 'Import cancelled'}), 409
+    return jsonify({'error': job.error}), 500
+
+
+def _run_import_job(job, wb, mode, deletes, data):
+    with app.app_context():
+        try:
+            return run_import(wb, mode, deletes, job, data)
+        except ImportCancelled:
+            logging.info(f"[IMPORT] Job {job.id} cancelled")
+            raise
+        except Exception as e:
+            logging.error(f"Error importing from Excel (job {job.id}): {e}")
+            raise
+
+
+@app.route('/api/import/jobs', methods=['POST'])
+@require_admin
+def submit_import_job():
+    """Start an import in the background; takes what /api/import takes.
+
+    The upload is validated up front (400 as for /api/import) and the job
+    queued; 202 with the job to poll at /api/import/jobs/<id>. 409 while a
+    replace, or a merge with ?delete=, would run alongside another import.
+    """
+    try:
+        mode, deletes = import_request_options(request.args)
+        # The request's upload stream doesn't outlive the request.
+        data = import_upload(request.files).read()
+        wb, expected = open_import_workbook(io.BytesIO(data))
+    except ImportRequestError as e:
+        return jsonify(e.body()), 400
+    job = ImportJob(mode, destructive=mode == 'replace' or bool(deletes), expected=expected)
+    try:
+        IMPORT_JOBS.submit(job, lambda job: _run_import_job(job, wb, mode, deletes, data))
+    except ImportJobConflict as e:
+        wb.close()
+        return jsonify({'error': str(e)}), 409
+    logging.info(f"[IMPORT] Job {job.id} queued ({mode})")
+    return jsonify(job.to_dict()), 202, {'Location': f'/api/import/jobs/{job.id}'}
+
+
+@app.route('/api/import/jobs/<job_id>', methods=['GET'])
+@require_admin
+def get_import_job(job_id):
+    """Status, phase, rows per sheet, ETA and, once done, the import's response."""
+    job = IMPORT_JOBS.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Import job not found'}), 404
+    return jsonify(job.to_dict()), 200
+
+
+@app.route('/api/import/jobs/<job_id>/cancel', methods=['POST'])
+@require_admin
+def cancel_import_job(job_id):
+    """Cancel a queued or running import; it rolls back at its next checkpoint."""
+    job = IMPORT_JOBS.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Import job not found'}), 404
+    if not IMPORT_JOBS.cancel(job_id):
+        return jsonify({'error': f'Import job is already {job.status}'}), 409
+    return jsonify(job.to_dict()), 202
+
+
 # ===========================================================================
 # FEEDBACK ENDPOINTS
 # ===========================================================================
@@ -6624,7 +8261,7 @@ def list_tasks():
     if not user:
         return jsonify({'error': 'Authentication required'}), 401
 
-    q = Task.query
+    q = Task.query.options(*LOADER_PROFILES[Task])
     if _can_manage_tasks(user):
         req_assignee = request.args.get('assignee_id', type=int)
         if req_assignee is not None:
@@ -6901,14 +8538,18 @@ def my_notifications():
     reassigned to them).
     """
     user = getattr(request, 'current_user', None) or _current_user()
+    return jsonify({'unseen_task_count': unseen_task_count(db.session, user)}), 200
+
+
+def unseen_task_count(session, user):
     if not user or not getattr(user, 'id', None):
-        return jsonify({'unseen_task_count': 0}), 200
+        return 0
     count = (
-        db.session.query(func.count(Task.id))
+        session.query(func.count(Task.id))
         .filter(Task.assignee_id == user.id, Task.assignee_seen_at.is_(None))
         .scalar()
     ) or 0
-    return jsonify({'unseen_task_count': int(count)}), 200
+    return int(count)
 
 
 @app.route('/api/me/notifications/tasks/mark-seen', methods=['POST'])
@@ -7050,32 +8691,37 @@ def backup_status():
 
     Considers the scheduler healthy if the heartbeat is less than 30 minutes old.
     """
+    payload = backup_status_payload()
+    return jsonify(payload), 500 if payload['status'] == 'error' else 200
+
+
+def backup_status_payload():
     heartbeat_file = os.environ.get('BACKUP_HEARTBEAT_FILE',
         os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.backup_heartbeat'))
     try:
         if not os.path.exists(heartbeat_file):
-            return jsonify({
+            return {
                 'status': 'down',
                 'reason': 'No heartbeat file found',
                 'last_heartbeat': None
-            })
+            }
         with open(heartbeat_file, 'r') as f:
             last_heartbeat_str = f.read().strip()
         last_heartbeat = datetime.fromisoformat(last_heartbeat_str)
         age_seconds = (datetime.now() - last_heartbeat).total_seconds()
         is_healthy = age_seconds < 1800  # 30 minutes
-        return jsonify({
+        return {
             'status': 'ok' if is_healthy else 'down',
             'last_heartbeat': last_heartbeat_str,
             'age_seconds': int(age_seconds),
             'reason': None if is_healthy else f'Heartbeat is {int(age_seconds / 60)} minutes old'
-        })
+        }
     except Exception as e:
-        return jsonify({
+        return {
             'status': 'error',
             'last_heartbeat': None,
             'reason': str(e)
-        }), 500
+        }
 
 
 # ===========================================================================
@@ -7209,20 +8855,46 @@ def chat_endpoint():
 # SERVE REACT APP (production mode)
 # ===========================================================================
 
+# Build files are sent from .br / .gz siblings when the client accepts one;
+# send_compressed_file() writes them next to the originals on first request
+# (a fresh build invalidates them by mtime).
+
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve_react(path):
     """Serve React build files. API routes take priority (registered first)."""
     if app.static_folder and os.path.isdir(app.static_folder):
-        file_path = os.path.join(app.static_folder, path)
-        if path and os.path.isfile(file_path):
-            return send_file(file_path)
+        file_path = safe_join(app.static_folder, path)
+        if path and file_path and os.path.isfile(file_path):
+            return send_compressed_file(file_path, negotiate(request), STATIC_COMPRESSION_CACHE)
         index = os.path.join(app.static_folder, 'index.html')
         if os.path.isfile(index):
-            return send_file(index)
+            return send_compressed_file(index, negotiate(request), STATIC_COMPRESSION_CACHE)
     return jsonify({'error': 'Not found'}), 404
 
 
+def send_static_asset(filename):
+    """Flask's static view (static_url_path='' routes build files here first)."""
+    path = safe_join(app.static_folder, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    return send_compressed_file(path, negotiate(request), STATIC_COMPRESSION_CACHE)
+
+
+app.view_functions['static'] = send_static_asset
+
+
+def serve():
+    """Run the development server (host / port from API_HOST / API_PORT)."""
+    host = os.environ.get('API_HOST', '127.0.0.1')
+    port = int(os.environ.get('API_PORT', '5001'))
+    debug = os.environ.get('API_DEBUG', 'true').lower() == 'true'
+    # With the reloader on, only the child process serves requests.
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_dashboard_snapshot_refresher()
+    app.run(debug=debug, host=host, port=port)
+
+
 # ===========================================================================
 # DATABASE INITIALIZATION
 # ===========================================================================
@@ -7247,6 +8919,8 @@ with app.app_context():
         ('tasks', 'client_id',
          'ALTER TABLE tasks ADD COLUMN client_id INTEGER '
          'REFERENCES clients(id) ON DELETE SET NULL'),
+        ('cobra_coverages', 'updated_at',
+         'ALTER TABLE cobra_coverages ADD COLUMN updated_at TIMESTAMP'),
     ]
     _newly_added_columns = set()
     try:
@@ -7281,6 +8955,53 @@ with app.app_context():
 
     db.create_all()
 
+    # Superseded by ix_policy_lines_outstanding and ix_policy_lines_lob_carrier.
+    for _name in ('ix_policy_lines_outstanding_item', 'ix_policy_lines_carrier'):
+        try:
+            with db.engine.begin() as _conn:
+                _conn.execute(db.text(f'DROP INDEX IF EXISTS {_name}'))
+        except Exception as _e:
+            logging.warning(f"Could not drop {_name}: {_e}")
+
+    # create_all() only builds indexes for tables it creates, so indexes
+    # added to existing models (index=True) are created here. checkfirst
+    # makes this a no-op once they exist.
+    for _table in db.metadata.sorted_tables:
+        for _index in _table.indexes:
+            try:
+                _index.create(bind=db.engine, checkfirst=True)
+            except Exception as _e:
+                logging.warning(f"Could not create index {_index.name}: {_e}")
+
+    # Tombstones older than any token /api/sync still honours.
+    try:
+        with db.engine.begin() as _conn:
+            _conn.execute(DeletionLog.__table__.delete().where(
+                DeletionLog.deleted_at < datetime.utcnow() - DELETION_LOG_RETENTION))
+    except Exception as _e:
+        logging.warning(f"Could not prune deletion_log: {_e}")
+
+    # One table_versions row per table, so writes only ever UPDATE it.
+    try:
+        with db.engine.begin() as _conn:
+            _versioned = set(_conn.execute(select(TableVersion.table_name)).scalars())
+            _missing = [{'table_name': _t.name, 'version': 0} for _t in db.metadata.sorted_tables
+                        if _t.name not in _versioned and _t.name not in UNVERSIONED_TABLES]
+            if _missing:
+                _conn.execute(TableVersion.__table__.insert(), _missing)
+    except Exception as _e:
+        logging.warning(f"Could not seed table_versions: {_e}")
+
+    # Backfill policy_lines the first time it exists next to policy data.
+    try:
+        with db.engine.begin() as _conn:
+            if _conn.execute(select(PolicyLine.id).limit(1)).first() is None:
+                _count = rebuild_policy_lines(_conn)
+                if _count:
+                    logging.info(f"Built {_count} policy lines.")
+    except Exception as _e:
+        logging.warning(f"Could not build policy_lines: {_e}")
+
     # Seed a default admin if no users exist yet, so a fresh install can be logged into.
     # Credentials can be overridden via DEFAULT_ADMIN_USERNAME / DEFAULT_ADMIN_PASSWORD env vars.
     if User.query.count() == 0:
@@ -7302,8 +9023,10 @@ with app.app_context():
         )
 
 if __name__ == '__main__':
-    # Run app (host/port configurable via env vars)
-    host = os.environ.get('API_HOST', '127.0.0.1')
-    port = int(os.environ.get('API_PORT', '5001'))
-    debug = os.environ.get('API_DEBUG', 'true').lower() == 'true'
-    app.run(debug=debug, host=host, port=port)
+    # Start the server with run_customer_api.py. Run as the main script, this
+    # module would be re-run whole (app, engine, log handler) in every import
+    # parse worker, so sheets are parsed in this process instead.
+    IMPORT_PARSE_PROCESSES = 1
+    logging.warning("Import sheets are parsed serially; start the API with run_customer_api.py "
+                    "to parse them in parallel")
+    serve()
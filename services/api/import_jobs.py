@@ -0,0 +1,194 @@
+"""
+Background import jobs.
+
+customer_api validates an upload, submits the import as a job and returns
+its id; the client polls the job instead of holding a request open for
+the whole run. A job reports:
+
+  status    queued, running, done, failed or cancelled
+  phase     what the import is doing (parsing, loading, committing, ...)
+  sheets    rows parsed and loaded so far per sheet, against the row count
+            the sheet declared (an estimate: writers get it wrong)
+  eta       seconds left, extrapolated from the rows done so far
+  result    the import's response body once done; error once failed
+
+ImportJobQueue runs the jobs on a thread pool. A destructive job (one that
+deletes rows) is refused while any other import is queued or running, and
+every job is refused while a destructive one is. cancel() is honoured at
+the import's next checkpoint; once it has committed it finishes anyway.
+
+Kept free of model imports.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+ACTIVE = ('queued', 'running')
+
+
+class ImportCancelled(Exception):
+    """Raised at a checkpoint of a job that has been cancelled."""
+
+
+class ImportJobConflict(Exception):
+    """A job can't be submitted next to the imports already active."""
+
+
+class ImportJob:
+    """One import's progress. Updated by the worker, read by whoever polls."""
+
+    def __init__(self, mode, destructive=False, expected=None):
+        self.id = uuid.uuid4().hex
+        self.mode = mode
+        self.destructive = destructive
+        self.status = 'queued'
+        self.phase = 'queued'
+        self.expected = dict(expected or {})  # {sheet: rows}
+        self.parsed = {}
+        self.loaded = {}
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    def request_cancel(self):
+        self._cancel.set()
+
+    def checkpoint(self):
+        if self._cancel.is_set():
+            raise ImportCancelled(f'Import {self.id} cancelled')
+
+    def set_phase(self, phase):
+        self.phase = phase
+
+    def rows_parsed(self, sheet, rows):
+        with self._lock:
+            self.parsed[sheet] = rows
+        self.checkpoint()
+
+    def rows_loaded(self, sheet, rows):
+        with self._lock:
+            self.loaded[sheet] = rows
+        self.checkpoint()
+
+    def eta(self):
+        """Seconds left, or None before there is anything to go on.
+
+        Parsing and loading a row are taken to cost the same; the commit,
+        snapshot refresh and errors workbook after them are not counted.
+        """
+        if self.status != 'running' or self.started_at is None:
+            return None
+        with self._lock:
+            sheets = self.expected.keys() | self.parsed.keys()
+            total = 2 * sum(max(self.expected.get(s, 0), self.parsed.get(s, 0)) for s in sheets)
+            done = sum(self.parsed.values()) + sum(self.loaded.values())
+        if not total or not done:
+            return None
+        elapsed = time.time() - self.started_at
+        return round(elapsed * max(total - done, 0) / done, 1)
+
+    def to_dict(self):
+        with self._lock:
+            sheets = {sheet: {'expected': self.expected.get(sheet), 'parsed': self.parsed.get(sheet, 0),
+                              'loaded': self.loaded.get(sheet, 0)}
+                      for sheet in {**self.expected, **self.parsed}}
+        end = self.finished_at or time.time()
+        data = {
+            'id': self.id,
+            'mode': self.mode,
+            'destructive': self.destructive,
+            'status': self.status,
+            'phase': self.phase,
+            'sheets': sheets,
+            'elapsed': round(end - self.started_at, 1) if self.started_at else None,
+            'eta': self.eta(),
+            'cancel_requested': self._cancel.is_set(),
+        }
+        if self.status == 'done':
+            data['result'] = self.result
+        if self.status == 'failed':
+            data['error'] = self.error
+        return data
+
+
+class ImportJobQueue:
+    """Jobs by id, run on `max_workers` threads; the last `keep` finished ones are kept."""
+
+    def __init__(self, max_workers, keep=20):
+        self.keep = keep
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='import-job')
+        self._jobs = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def submit(self, job, run):
+        """Queue run(job); its return value becomes job.result. ImportJobConflict if refused."""
+        with self._lock:
+            active = [j for j in self._jobs.values() if j.status in ACTIVE]
+            if active and (job.destructive or any(j.destructive for j in active)):
+                blocking = next((j for j in active if j.destructive), active[0])
+                raise ImportJobConflict(f'Import {blocking.id} is still {blocking.status}; '
+                                        'a destructive import runs alone')
+            self._jobs[job.id] = job
+            self._prune()
+            self._futures[job.id] = self._executor.submit(self._run, job, run)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Ask the job to stop. False if it has already finished."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status not in ACTIVE:
+                return False
+            job.request_cancel()
+            if job.status == 'queued':
+                self._finish(job, 'cancelled')
+            return True
+
+    def wait(self, job_id, timeout=None):
+        """Block until the job has finished; returns it."""
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout)
+        return self.get(job_id)
+
+    def _run(self, job, run):
+        with self._lock:
+            if job.status != 'queued':
+                return
+            job.status = job.phase = 'running'
+            job.started_at = time.time()
+        try:
+            result = run(job)
+        except ImportCancelled:
+            status, result = 'cancelled', None
+        except Exception as e:
+            status, result = 'failed', None
+            job.error = str(e)
+        else:
+            status = 'done'
+        with self._lock:
+            job.result = result
+            self._finish(job, status)
+
+    def _finish(self, job, status):
+        job.status = job.phase = status
+        job.finished_at = time.time()
+        self._futures.pop(job.id, None)
+
+    def _prune(self):
+        finished = sorted((j for j in self._jobs.values() if j.status not in ACTIVE),
+                          key=lambda j: j.finished_at)
+        for job in finished[:max(len(finished) - self.keep, 0)]:
+            del self._jobs[job.id]
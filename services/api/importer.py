@@ -0,0 +1,936 @@
+"""
+Excel import parsing.
+
+POST /api/import reads each sheet of the workbook into plain records here,
+then customer_api writes them: replacing the imported tables, or merging
+into the existing rows by natural key (?mode=merge). Parsing never touches
+the database, so both modes see the same records and report the same row
+errors.
+
+  parse_clients()      Clients: clients with their contacts
+  parse_individuals()  Individuals
+  parse_benefits()     Employee Benefits: records with their plans
+  parse_commercial()   Commercial: records with their plans
+  parse_personal()     Personal
+  parse_invoices()     Invoices
+  parse_cobra()        Cobra
+
+Each takes the sheet's header rows (rows 1 and 2) and its data rows (row 3
+on, as value tuples) and returns a SheetRecords. Benefits and Commercial
+rows need their client, Personal rows their individual: those parsers take
+the keys that will exist once the load is done.
+
+  import_sheet_rows()     a read-only sheet's header rows and streamed data rows
+  parse_workbook_sheet()  one sheet of an xlsx, start to finish; what the
+                          parse pool's worker processes run
+
+Kept free of model imports (so workers start without the app).
+"""
+
+import io
+from datetime import date, datetime
+
+from dateutil.parser import parse
+from openpyxl import load_workbook
+
+
+class ParsedRow:
+    """One data row of a sheet: a record to write, or why it was skipped.
+
+    fields: {column: value} for the sheet's model; children: [{column:
+    value}] for its contacts or plans. error is the message for the errors
+    workbook, summary the one for stats['errors'].
+    """
+
+    def __init__(self, row_idx, row, key=None, fields=None, children=(), error=None, summary=None):
+        self.row_idx = row_idx
+        self.row = row
+        self.key = key
+        self.fields = fields
+        self.children = children
+        self.error = error
+        self.summary = summary or error
+
+
+class SheetRecords:
+    """A parsed sheet.
+
+    fields: the model columns the sheet sets. A record leaves the ones it
+    doesn't mention at their defaults, as a freshly inserted row would.
+    child_fields: likewise for its children. plan_types: the plan types the
+    sheet has columns for, when its children are plans. rows: a ParsedRow
+    per non-blank data row, in sheet order; skipped rows keep their key
+    when it could be read.
+    """
+
+    def __init__(self, label, fields, child_fields=(), plan_types=None):
+        self.label = label  # as in "<label> row <n>: ..." in stats['errors']
+        self.fields = tuple(fields)
+        self.child_fields = child_fields
+        self.plan_types = plan_types
+        self.rows = []
+        self.header_rows = ((), ())  # set by the caller, for the errors workbook
+
+    def add(self, row_idx, row, key, fields, children=()):
+        self.rows.append(ParsedRow(row_idx, row, key, fields, children))
+
+    def skip(self, row_idx, row, error, summary=None, key=None):
+        self.rows.append(ParsedRow(row_idx, row, key, error=error, summary=summary))
+
+    def records(self):
+        return [r for r in self.rows if r.error is None]
+
+
+# ---------------------------------------------------------------------------
+# Cell values
+# ---------------------------------------------------------------------------
+
+def is_valid_carrier(val):
+    """Check if a carrier value is a real name, not empty/None/'None'."""
+    if val is None:
+        return False
+    s = str(val).strip()
+    return bool(s) and s.lower() != 'none'
+
+
+def format_limit(val):
+    """Convert a limit value to millions for storage.
+    '1,000,000' or 1000000 → '1'
+    '2,000,000' or 2000000 → '2'
+    '5,000,000' or 5000000 → '5'
+    '500,000' or 500000 → '0.5'
+    Already in millions (e.g. '1', '2', '5') → kept as-is.
+    Non-numeric strings (e.g. 'N/A') → kept as-is."""
+    if val is None or val == '':
+        return None
+    s = str(val).strip()
+    if s.upper() == 'N/A':
+        return None
+    # Remove commas to get raw number
+    raw = s.replace(',', '')
+    try:
+        num = float(raw)
+        # If >= 100000, assume it's in raw dollars — convert to millions
+        if num >= 100000:
+            m = num / 1000000
+            return str(int(m)) if m == int(m) else str(m)
+        # Otherwise already in millions or a small value — keep as-is
+        return str(int(num)) if num == int(num) else str(num)
+    except (ValueError, TypeError):
+        return s
+
+
+def parse_excel_date(val):
+    if val is None or val == '' or val == 'N/A':
+        return None
+    if isinstance(val, datetime):
+        return val.date()
+    try:
+        return parse(str(val)).date()
+    except Exception:
+        return None
+
+
+def safe_int(val):
+    if val is None or val == '':
+        return None
+    try:
+        return int(val)
+    except (TypeError, ValueError):
+        return None
+
+
+def safe_decimal(val):
+    if val is None or val == '' or val == 'N/A':
+        return None
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return None
+
+
+def clean_remarks(val):
+    """Replace date/timestamp values in remarks with N/A.
+    Excel auto-formatting can silently convert text to dates."""
+    if val is None or val == '':
+        return None
+    if isinstance(val, (datetime, date)):
+        return 'N/A'
+    s = str(val).strip()
+    if parse_excel_date(s) is not None and not any(c.isalpha() for c in s):
+        return 'N/A'
+    return s if s else None
+
+
+def clean_premium_vs_agg(premium_val, agg_limit_val):
+    """If premium equals agg limit, the value was likely pasted wrong — zero it.
+    Agg limit may be in millions ('4') or dollars ('4,000,000')."""
+    if premium_val is None or agg_limit_val is None:
+        return premium_val
+    try:
+        p = float(premium_val)
+        a = float(str(agg_limit_val).replace(',', ''))
+        if p > 0 and (p == a or p == a * 1_000_000):
+            return 0
+    except (TypeError, ValueError):
+        pass
+    return premium_val
+
+
+def _header_texts(header_row):
+    return [str(v).strip() if v else '' for v in header_row]
+
+
+def _section_columns(section_row):
+    """{section label: start column} from a sheet's row 1."""
+    return {h: i for i, h in enumerate(_header_texts(section_row)) if h and h != 'None'}
+
+
+def _yes(val):
+    return str(val).strip().upper() == 'YES' if val else False
+
+
+# ---------------------------------------------------------------------------
+# Clients / Individuals
+# ---------------------------------------------------------------------------
+
+# Tax ID(0), Client Name(1), DBA(2), Industry(3), Status(4), Gross Revenue(5),
+# Total EEs(6), then contacts from column 7, 9 columns each.
+CONTACT_START_COL = 7
+CONTACT_COLS = 9
+CLIENT_FIELDS = ('tax_id', 'client_name', 'dba', 'industry', 'status', 'gross_revenue', 'total_ees',
+                 'contact_person', 'email', 'phone_number', 'address_line_1', 'address_line_2',
+                 'city', 'state', 'zip_code')
+CONTACT_FIELDS = ('contact_person', 'email', 'phone_number', 'phone_extension', 'address_line_1', 'address_line_2',
+                  'city', 'state', 'zip_code', 'sort_order')
+INDIVIDUAL_FIELDS = ('individual_id', 'first_name', 'last_name', 'email', 'phone_number',
+                     'address_line_1', 'address_line_2', 'city', 'state', 'zip_code', 'status')
+
+
+def _client_contacts(r):
+    contacts_list = []
+    ci = CONTACT_START_COL
+    sort = 0
+    while ci + CONTACT_COLS - 1 < len(r):
+        cp = r[ci] if r[ci] else None
+        em = r[ci+1] if len(r) > ci+1 and r[ci+1] else None
+        ph = str(r[ci+2]) if len(r) > ci+2 and r[ci+2] else None
+        ext = str(r[ci+3]) if len(r) > ci+3 and r[ci+3] else None
+        a1 = r[ci+4] if len(r) > ci+4 else None
+        a2 = r[ci+5] if len(r) > ci+5 else None
+        ct = r[ci+6] if len(r) > ci+6 else None
+        st = r[ci+7] if len(r) > ci+7 else None
+        zp = str(int(r[ci+8])).zfill(5) if len(r) > ci+8 and r[ci+8] else None
+        if cp or em or ph or a1:
+            contacts_list.append({'contact_person': cp, 'email': em, 'phone_number': ph, 'phone_extension': ext,
+                                  'address_line_1': a1, 'address_line_2': a2, 'city': ct, 'state': st,
+                                  'zip_code': zp, 'sort_order': sort})
+            sort += 1
+        ci += CONTACT_COLS
+    return contacts_list
+
+
+def parse_clients(header_rows, rows):
+    sheet = SheetRecords('Clients', CLIENT_FIELDS, CONTACT_FIELDS)
+    seen = set()
+    for row_idx, row in enumerate(rows, start=3):
+        if not row[0]:  # Skip empty rows
+            continue
+        try:
+            tax_id = str(row[0]).strip() if row[0] else None
+            if not tax_id:
+                continue
+
+            contacts = _client_contacts(row)
+            fc = contacts[0] if contacts else {}
+
+            if tax_id in seen:
+                sheet.skip(row_idx, row, f"Duplicate tax_id {tax_id} — first occurrence kept, this row skipped",
+                           f"Duplicate tax_id {tax_id}", tax_id)
+                continue
+
+            fields = {
+                'tax_id': tax_id,
+                'client_name': row[1] if len(row) > 1 else None,
+                'dba': row[2] if len(row) > 2 else None,
+                'industry': row[3] if len(row) > 3 else None,
+                'status': row[4] if len(row) > 4 and row[4] else 'Active',
+                'gross_revenue': float(row[5]) if len(row) > 5 and row[5] else None,
+                'total_ees': int(row[6]) if len(row) > 6 and row[6] else None,
+                'contact_person': fc.get('contact_person'),
+                'email': fc.get('email'),
+                'phone_number': fc.get('phone_number'),
+                'address_line_1': fc.get('address_line_1'),
+                'address_line_2': fc.get('address_line_2'),
+                'city': fc.get('city'),
+                'state': fc.get('state'),
+                'zip_code': fc.get('zip_code'),
+            }
+            seen.add(tax_id)
+            sheet.add(row_idx, row, tax_id, fields, contacts)
+        except Exception as e:
+            sheet.skip(row_idx, row, str(e), key=str(row[0]).strip())
+    return sheet
+
+
+def parse_individuals(header_rows, rows):
+    sheet = SheetRecords('Individuals', INDIVIDUAL_FIELDS)
+    for row_idx, row in enumerate(rows, start=3):
+        if not row[0]:
+            continue
+        try:
+            individual_id = str(row[0]).strip() if row[0] else None
+            if not individual_id:
+                continue
+
+            zip_code = str(int(row[9])).zfill(5) if row[9] else None
+
+            sheet.add(row_idx, row, individual_id, {
+                'individual_id': individual_id,
+                'first_name': row[1] if len(row) > 1 else None,
+                'last_name': row[2] if len(row) > 2 else None,
+                'email': row[3] if len(row) > 3 else None,
+                'phone_number': str(row[4]) if len(row) > 4 and row[4] else None,
+                'address_line_1': row[5] if len(row) > 5 else None,
+                'address_line_2': row[6] if len(row) > 6 else None,
+                'city': row[7] if len(row) > 7 else None,
+                'state': row[8] if len(row) > 8 else None,
+                'zip_code': zip_code,
+                'status': row[10] if len(row) > 10 and row[10] else 'Active',
+            })
+        except Exception as e:
+            sheet.skip(row_idx, row, str(e), key=str(row[0]).strip())
+    return sheet
+
+
+# ---------------------------------------------------------------------------
+# Employee Benefits
+# ---------------------------------------------------------------------------
+
+BENEFIT_FIELDS = ('tax_id', 'parent_client', 'form_fire_code', 'enrollment_poc', 'funding',
+                  'num_employees_at_renewal', 'enrolled_ees', 'waiting_period', 'deductible_accumulation',
+                  'previous_carrier', 'cobra_carrier', 'employer_contribution', 'employee_contribution')
+BENEFIT_PLAN_FIELDS = ('plan_type', 'plan_number', 'carrier', 'renewal_date', 'waiting_period', 'remarks',
+                       'outstanding_item')
+BENEFIT_MULTI_PLAN_HEADERS = {
+    'medical': 'MEDICAL',
+    'dental': 'DENTAL',
+    'vision': 'VISION',
+    'life_adnd': 'Life & AD&D'
+}
+BENEFIT_SINGLE_PLAN_HEADERS = {
+    'ltd': 'LTD', 'std': 'STD', 'k401': '401K',
+    'critical_illness': 'Critical Illness', 'accident': 'Accident',
+    'hospital': 'Hospital', 'voluntary_life': 'Voluntary Life'
+}
+
+
+def _benefit_flat_fields(plan_type):
+    """The record columns mirroring a multi-plan type's first plan."""
+    if plan_type == 'medical':
+        return 'current_carrier', 'renewal_date'
+    return f'{plan_type}_carrier', f'{plan_type}_renewal_date'
+
+
+def parse_benefits(header_rows, rows, client_keys):
+    # Read headers from row 2 to detect multi-plan columns dynamically
+    headers = _header_texts(header_rows[1])
+
+    # Find column indices for each multi-plan type (carrier/renewal/waiting_period/remarks/outstanding_item groups)
+    multi_plan_cols = {}  # plan_type -> [(carrier_col, renewal_col, wp_col, remarks_col, outstanding_item_col), ...]
+    for plan_type, label in BENEFIT_MULTI_PLAN_HEADERS.items():
+        cols = []
+        for i, h in enumerate(headers):
+            if h and label.upper() in h.upper() and 'CARRIER' in h.upper():
+                renewal_col = i + 1 if i + 1 < len(headers) and 'RENEWAL' in headers[i + 1].upper() else None
+                wp_col = i + 2 if i + 2 < len(headers) and 'WAITING' in headers[i + 2].upper() else None
+                remarks_col = i + 3 if i + 3 < len(headers) and 'REMARKS' in headers[i + 3].upper() else None
+                oi_col = i + 4 if i + 4 < len(headers) and 'OUTSTANDING' in headers[i + 4].upper() else None
+                cols.append((i, renewal_col, wp_col, remarks_col, oi_col))
+        multi_plan_cols[plan_type] = cols
+
+    # Find single-plan type columns by header
+    single_plan_col_map = {}  # prefix -> (renewal_col, carrier_col, remarks_col, outstanding_item_col)
+    for prefix, label in BENEFIT_SINGLE_PLAN_HEADERS.items():
+        for i, h in enumerate(headers):
+            if h and label.upper() in h.upper() and 'RENEWAL' in h.upper():
+                is_multi = any(label.upper() == ml.upper() for ml in BENEFIT_MULTI_PLAN_HEADERS.values())
+                if not is_multi:
+                    carrier_col = i + 1 if i + 1 < len(headers) and 'CARRIER' in headers[i + 1].upper() else None
+                    remarks_col = i + 2 if i + 2 < len(headers) and 'REMARKS' in headers[i + 2].upper() else None
+                    oi_col = i + 3 if i + 3 < len(headers) and 'OUTSTANDING' in headers[i + 3].upper() else None
+                    single_plan_col_map[prefix] = (i, carrier_col, remarks_col, oi_col)
+                    break
+
+    col_employer_contribution = None
+    col_employee_contribution = None
+    for i, h in enumerate(headers):
+        if h and 'EMPLOYER CONTRIBUTION' in h.upper():
+            col_employer_contribution = i
+        elif h and 'EMPLOYEE CONTRIBUTION' in h.upper():
+            col_employee_contribution = i
+
+    fields = list(BENEFIT_FIELDS)
+    for prefix, (_, _, remarks_col, oi_col) in single_plan_col_map.items():
+        fields += [f'{prefix}_carrier', f'{prefix}_renewal_date']
+        if remarks_col is not None:
+            fields.append(f'{prefix}_remarks')
+        if oi_col is not None:
+            fields.append(f'{prefix}_outstanding_item')
+    plan_types = tuple(plan_type for plan_type, cols in multi_plan_cols.items() if cols)
+    for plan_type in plan_types:
+        fields += _benefit_flat_fields(plan_type)
+    sheet = SheetRecords('Benefits', fields, BENEFIT_PLAN_FIELDS, plan_types)
+
+    seen = set()
+    for row_idx, row in enumerate(rows, start=3):
+        if not row[0]:
+            continue
+        try:
+            tax_id = str(row[0]).strip() if row[0] else None
+            if not tax_id:
+                continue
+
+            if tax_id in seen:
+                sheet.skip(row_idx, row, f"Duplicate tax_id {tax_id} — first occurrence kept, this row skipped",
+                           f"Duplicate tax_id {tax_id}", tax_id)
+                continue
+
+            if tax_id not in client_keys:
+                sheet.skip(row_idx, row, f"Client with tax_id {tax_id} not found", key=tax_id)
+                continue
+
+            def safe_val(idx):
+                return row[idx] if len(row) > idx and row[idx] else None
+
+            # Skip row if no carrier is populated in any coverage
+            _has_any_carrier = any(carrier_col is not None and is_valid_carrier(safe_val(carrier_col))
+                                   for _, carrier_col, _, _ in single_plan_col_map.values())
+            if not _has_any_carrier:
+                _has_any_carrier = any(is_valid_carrier(safe_val(cols[0]))
+                                       for cols_list in multi_plan_cols.values() for cols in cols_list)
+            if not _has_any_carrier:
+                sheet.skip(row_idx, row, "No carrier found in any coverage — row skipped",
+                           f"No carrier in any coverage for {tax_id}", tax_id)
+                continue
+
+            seen.add(tax_id)
+
+            benefit_data = {
+                'tax_id': tax_id,
+                'parent_client': safe_val(2),
+                'form_fire_code': safe_val(3),
+                'enrollment_poc': safe_val(4),
+                'funding': safe_val(6),
+                'num_employees_at_renewal': safe_int(safe_val(7)),
+                'enrolled_ees': safe_int(safe_val(8)),
+                'waiting_period': safe_val(9),
+                'deductible_accumulation': safe_val(10),
+                'previous_carrier': safe_val(11),
+                'cobra_carrier': safe_val(12),
+                'employer_contribution': str(row[col_employer_contribution]) if col_employer_contribution is not None and len(row) > col_employer_contribution and row[col_employer_contribution] else None,
+                'employee_contribution': str(row[col_employee_contribution]) if col_employee_contribution is not None and len(row) > col_employee_contribution and row[col_employee_contribution] else None
+            }
+
+            # Single-plan types — skip if carrier is empty
+            for prefix, (renewal_col, carrier_col, remarks_col, oi_col) in single_plan_col_map.items():
+                carrier_val = safe_val(carrier_col) if carrier_col is not None else None
+                if not is_valid_carrier(carrier_val):
+                    continue
+                benefit_data[f'{prefix}_carrier'] = carrier_val
+                if renewal_col is not None:
+                    benefit_data[f'{prefix}_renewal_date'] = parse_excel_date(safe_val(renewal_col))
+                if remarks_col is not None:
+                    benefit_data[f'{prefix}_remarks'] = clean_remarks(safe_val(remarks_col))
+                if oi_col is not None:
+                    benefit_data[f'{prefix}_outstanding_item'] = safe_val(oi_col)
+
+            # Multi-plan types: BenefitPlan children (deduplicated by carrier)
+            plans = []
+            for plan_type, cols_list in multi_plan_cols.items():
+                seen_carriers = set()
+                actual_plan_num = 0
+                for carrier_col, renewal_col, wp_col, remarks_col, oi_col in cols_list:
+                    carrier = safe_val(carrier_col)
+                    renewal = parse_excel_date(safe_val(renewal_col)) if renewal_col is not None else None
+                    wp_val = safe_val(wp_col) if wp_col is not None else None
+                    remarks_val = clean_remarks(safe_val(remarks_col)) if remarks_col is not None else None
+                    oi_val = safe_val(oi_col) if oi_col is not None else None
+                    if carrier and str(carrier).strip():
+                        dedup_key = str(carrier).strip().lower()
+                        if dedup_key in seen_carriers:
+                            continue
+                        seen_carriers.add(dedup_key)
+                        actual_plan_num += 1
+                        plans.append({
+                            'plan_type': plan_type,
+                            'plan_number': actual_plan_num,
+                            'carrier': carrier,
+                            'renewal_date': renewal,
+                            'waiting_period': wp_val,
+                            'remarks': remarks_val,
+                            'outstanding_item': oi_val,
+                        })
+                        # Also set flat fields from first plan
+                        if actual_plan_num == 1:
+                            carrier_field, renewal_field = _benefit_flat_fields(plan_type)
+                            benefit_data[carrier_field] = carrier
+                            benefit_data[renewal_field] = renewal
+
+            sheet.add(row_idx, row, tax_id, benefit_data, plans)
+        except Exception as e:
+            sheet.skip(row_idx, row, str(e), key=str(row[0]).strip())
+    return sheet
+
+
+# ---------------------------------------------------------------------------
+# Commercial
+# ---------------------------------------------------------------------------
+
+# Single-plan types: 9 base cols each (Carrier, Agency, Policy Number, Occ Limit,
+# Agg Limit, Premium, Renewal Date, Remarks, Outstanding Item)
+COMMERCIAL_SINGLE_SECTIONS = [
+    ('general_liability', 'Commercial General Liability'),
+    ('property', 'Commercial Property'),
+    ('bop', 'Business Owners Policy'),
+    ('workers_comp', 'Workers Compensation'),
+    ('auto', 'Commercial Auto'),
+    ('epli', 'EPLI'),
+    ('nydbl', 'NYDBL'),
+    ('surety', 'Surety Bond'),
+    ('product_liability', 'Product Liability'),
+    ('flood', 'Flood'),
+    ('directors_officers', 'Directors & Officers'),
+    ('fiduciary', 'Fiduciary Bond'),
+    ('inland_marine', 'Inland Marine')
+]
+COMMERCIAL_SINGLE_SUFFIXES = ('carrier', 'agency', 'policy_number', 'occ_limit', 'agg_limit', 'premium',
+                              'renewal_date', 'remarks', 'outstanding_item')
+GL_ENDORSEMENTS = ('bop', 'marine', 'foreign', 'molestation', 'staffing', 'accidental_medical',
+                   'liquor_liability')
+
+# Multi-plan types: dynamic cols (Carrier, Agency, Occ Limit, Agg Limit, Premium, Renewal Date, Remarks, Outstanding Item per plan)
+COMMERCIAL_MULTI_SECTIONS = [
+    ('umbrella', 'Umbrella Liability'),
+    ('professional_eo', 'Professional or E&O'),
+    ('cyber', 'Cyber Liability'),
+    ('crime', 'Crime or Fidelity Bond')
+]
+# Record columns mirroring a multi-plan type's first plan
+COMMERCIAL_FLAT_SUFFIXES = ('carrier', 'agency', 'policy_number', 'occ_limit', 'agg_limit', 'premium',
+                            'renewal_date')
+COMMERCIAL_PLAN_FIELDS = ('plan_type', 'plan_number', 'carrier', 'agency', 'policy_number', 'coverage_occ_limit',
+                          'coverage_agg_limit', 'premium', 'renewal_date', 'remarks', 'outstanding_item',
+                          'insured_entities', 'endorsement_tech_eo', 'endorsement_staffing',
+                          'endorsement_allied_healthcare', 'endorsement_medical_malpractice')
+EO_ENDORSEMENTS = [('TECH', 'endorsement_tech_eo'), ('STAFFING', 'endorsement_staffing'),
+                   ('ALLIED', 'endorsement_allied_healthcare'),
+                   ('MEDICAL MALPRACTICE', 'endorsement_medical_malpractice')]
+
+
+def _is_insured_entities_header(h):
+    # "Insured Entities" (current) or "Co-Insurers" (legacy exports)
+    h = (h or '').upper().replace('-', ' ').strip()
+    return 'INSURED ENTIT' in h or 'CO INSURER' in h
+
+
+def parse_commercial(header_rows, rows, client_keys):
+    # Row 2: column headers; row 1: section headers marking product boundaries
+    comm_headers = _header_texts(header_rows[1])
+    section_col_map = _section_columns(header_rows[0])
+    sorted_sections = sorted(section_col_map.items(), key=lambda kv: kv[1])
+
+    def section_end(start):
+        """Column where the section starting at `start` ends: the next one's start, or end of row."""
+        for _, other_start in sorted_sections:
+            if other_start > start:
+                return other_start
+        return len(comm_headers)
+
+    # Build column maps for single-plan types
+    comm_single_col_map = {}  # prefix -> start_col (0-based)
+    for prefix, label in COMMERCIAL_SINGLE_SECTIONS:
+        if label in section_col_map:
+            comm_single_col_map[prefix] = section_col_map[label]
+
+    # The insured-entities column per single-plan coverage, found by header
+    # within the section (its position varies).
+    comm_single_co_ins_col = {}  # prefix -> col index (0-based)
+    for prefix, start in comm_single_col_map.items():
+        for col_i in range(start, section_end(start)):
+            if _is_insured_entities_header(comm_headers[col_i]):
+                comm_single_co_ins_col[prefix] = col_i
+                break
+
+    # Build column maps for multi-plan types — detect how many plans per type
+    comm_multi_col_map = {}  # plan_type -> [(carrier_col, agency_col, policy_col, occ_limit_col, agg_limit_col, premium_col, renewal_col, remarks_col, oi_col, endorsement_cols, co_ins_col), ...]
+    for plan_type, label in COMMERCIAL_MULTI_SECTIONS:
+        if label not in section_col_map:
+            continue
+        start = section_col_map[label]
+        end = section_end(start)
+        plans = []
+        i = start
+        while i < end:
+            if 'CARRIER' not in comm_headers[i].upper():
+                break
+            j = i + 1
+            found = []
+            for marker in ('AGENCY', 'POLICY', 'OCC', 'AGG', 'PREMIUM', 'RENEWAL', 'REMARKS', 'OUTSTANDING'):
+                if j < len(comm_headers) and marker in comm_headers[j].upper():
+                    found.append(j)
+                    j += 1
+                else:
+                    found.append(None)
+            # Detect endorsement columns for professional_eo
+            endorsement_cols = {}
+            if plan_type == 'professional_eo':
+                for ek, ekey in EO_ENDORSEMENTS:
+                    if j < len(comm_headers) and 'ENDORSEMENT' in comm_headers[j].upper() and ek in comm_headers[j].upper():
+                        endorsement_cols[ekey] = j
+                        j += 1
+            # Insured Entities column (optional; accepts legacy "Co-Insurers" header too)
+            co_ins_col = None
+            if j < len(comm_headers) and _is_insured_entities_header(comm_headers[j]):
+                co_ins_col = j
+                j += 1
+            plans.append((i, *found, endorsement_cols, co_ins_col))
+            i = j
+        comm_multi_col_map[plan_type] = plans
+
+    fields = ['tax_id', 'parent_client', 'assigned_to']
+    for prefix in comm_single_col_map:
+        fields += [f'{prefix}_{suffix}' for suffix in COMMERCIAL_SINGLE_SUFFIXES]
+        if prefix == 'general_liability':
+            fields += [f'general_liability_endorsement_{e}' for e in GL_ENDORSEMENTS]
+        elif prefix == 'bop':
+            fields += ['bop_building_limit', 'bop_personal_property']
+        elif prefix == 'auto':
+            fields.append('auto_type')
+        if prefix != 'workers_comp' and prefix in comm_single_co_ins_col:
+            fields.append(f'{prefix}_insured_entities')
+    plan_types = tuple(plan_type for plan_type, cols in comm_multi_col_map.items() if cols)
+    for plan_type in plan_types:
+        fields += [f'{plan_type}_{suffix}' for suffix in COMMERCIAL_FLAT_SUFFIXES]
+    sheet = SheetRecords('Commercial', fields, COMMERCIAL_PLAN_FIELDS, plan_types)
+
+    seen = set()
+    for row_idx, row in enumerate(rows, start=3):
+        if not row[0]:
+            continue
+        try:
+            tax_id = str(row[0]).strip() if row[0] else None
+            if not tax_id:
+                continue
+
+            if tax_id in seen:
+                sheet.skip(row_idx, row, f"Duplicate tax_id {tax_id} — first occurrence kept, this row skipped",
+                           f"Duplicate tax_id {tax_id}", tax_id)
+                continue
+
+            if tax_id not in client_keys:
+                sheet.skip(row_idx, row, f"Client with tax_id {tax_id} not found", key=tax_id)
+                continue
+
+            def safe_val(idx):
+                return row[idx] if len(row) > idx and row[idx] else None
+
+            # Skip row if no carrier is populated in any coverage
+            _has_any_carrier = any(is_valid_carrier(safe_val(sc)) for sc in comm_single_col_map.values())
+            if not _has_any_carrier:
+                _has_any_carrier = any(is_valid_carrier(safe_val(cols[0]))
+                                       for cols_list in comm_multi_col_map.values() for cols in cols_list)
+            if not _has_any_carrier:
+                sheet.skip(row_idx, row, "No carrier found in any coverage — row skipped",
+                           f"No carrier in any coverage for {tax_id}", tax_id)
+                continue
+
+            seen.add(tax_id)
+
+            commercial_data = {
+                'tax_id': tax_id,
+                'parent_client': row[2] if len(row) > 2 else None,
+                'assigned_to': row[3] if len(row) > 3 else None
+            }
+
+            # Single-plan types — skip if carrier is empty
+            for prefix, sc in comm_single_col_map.items():
+                carrier = safe_val(sc)
+                if not is_valid_carrier(carrier):
+                    continue
+                commercial_data[f'{prefix}_carrier'] = carrier
+                commercial_data[f'{prefix}_agency'] = safe_val(sc + 1)
+                commercial_data[f'{prefix}_policy_number'] = safe_val(sc + 2)
+                occ_limit_val = safe_val(sc + 3)
+                if occ_limit_val and str(occ_limit_val) == 'N/A':
+                    occ_limit_val = None
+                agg_limit_val = safe_val(sc + 4)
+                if agg_limit_val and str(agg_limit_val) == 'N/A':
+                    agg_limit_val = None
+                # Property uses absolute dollar amounts (Building Limit, Personal Property), not millions
+                if prefix == 'property':
+                    commercial_data[f'{prefix}_occ_limit'] = str(occ_limit_val) if occ_limit_val is not None else None
+                    commercial_data[f'{prefix}_agg_limit'] = str(agg_limit_val) if agg_limit_val is not None else None
+                else:
+                    commercial_data[f'{prefix}_occ_limit'] = format_limit(occ_limit_val)
+                    commercial_data[f'{prefix}_agg_limit'] = format_limit(agg_limit_val)
+                raw_premium = safe_decimal(safe_val(sc + 5))
+                commercial_data[f'{prefix}_premium'] = clean_premium_vs_agg(raw_premium, agg_limit_val)
+                commercial_data[f'{prefix}_renewal_date'] = parse_excel_date(safe_val(sc + 6))
+                commercial_data[f'{prefix}_remarks'] = clean_remarks(safe_val(sc + 7))
+                commercial_data[f'{prefix}_outstanding_item'] = safe_val(sc + 8)
+                # GL endorsements (7 extra columns after the base 9)
+                if prefix == 'general_liability':
+                    for offset, endorsement in enumerate(GL_ENDORSEMENTS, 9):
+                        commercial_data[f'general_liability_endorsement_{endorsement}'] = _yes(safe_val(sc + offset))
+                # BOP property coverage (2 extra columns after the base 9)
+                elif prefix == 'bop':
+                    commercial_data['bop_building_limit'] = safe_decimal(safe_val(sc + 9))
+                    commercial_data['bop_personal_property'] = safe_decimal(safe_val(sc + 10))
+                # Auto type (1 extra column after the base 9)
+                elif prefix == 'auto':
+                    commercial_data['auto_type'] = safe_val(sc + 9)
+                # Co-Insurers (non-WC only, detected via header scan — position varies)
+                if prefix != 'workers_comp' and prefix in comm_single_co_ins_col:
+                    commercial_data[f'{prefix}_insured_entities'] = safe_val(comm_single_co_ins_col[prefix])
+
+            # Multi-plan types: CommercialPlan children (deduplicated by carrier+policy_number)
+            plans = []
+            for plan_type, cols_list in comm_multi_col_map.items():
+                seen_plans = set()  # track (carrier, policy_number) to skip duplicates
+                actual_plan_num = 0
+                for (carrier_col, agency_col, policy_col, occ_limit_col, agg_limit_col, premium_col, renewal_col,
+                     remarks_col, oi_col, endorsement_cols, co_ins_col) in cols_list:
+                    carrier = safe_val(carrier_col)
+                    agency = safe_val(agency_col) if agency_col is not None else None
+                    policy_number = safe_val(policy_col) if policy_col is not None else None
+                    occ_limit_val = format_limit(safe_val(occ_limit_col)) if occ_limit_col is not None else None
+                    agg_limit_val = format_limit(safe_val(agg_limit_col)) if agg_limit_col is not None else None
+                    premium = safe_decimal(safe_val(premium_col)) if premium_col is not None else None
+                    premium = clean_premium_vs_agg(premium, agg_limit_val)
+                    renewal = parse_excel_date(safe_val(renewal_col)) if renewal_col is not None else None
+                    remarks_val = clean_remarks(safe_val(remarks_col)) if remarks_col is not None else None
+                    oi_val = safe_val(oi_col) if oi_col is not None else None
+                    co_ins_val = safe_val(co_ins_col) if co_ins_col is not None else None
+                    if not (carrier and str(carrier).strip()):
+                        continue
+                    # Skip duplicate plans (same carrier and policy number)
+                    dedup_key = (str(carrier).strip().lower(), str(policy_number or '').strip().lower())
+                    if dedup_key in seen_plans:
+                        continue
+                    seen_plans.add(dedup_key)
+                    actual_plan_num += 1
+                    occ_limit_val = occ_limit_val if occ_limit_val and str(occ_limit_val) != 'N/A' else None
+                    agg_limit_val = agg_limit_val if agg_limit_val and str(agg_limit_val) != 'N/A' else None
+                    plan = {
+                        'plan_type': plan_type,
+                        'plan_number': actual_plan_num,
+                        'carrier': carrier,
+                        'agency': agency,
+                        'policy_number': policy_number,
+                        'coverage_occ_limit': occ_limit_val,
+                        'coverage_agg_limit': agg_limit_val,
+                        'premium': premium,
+                        'renewal_date': renewal,
+                        'remarks': remarks_val,
+                        'outstanding_item': oi_val,
+                        'insured_entities': co_ins_val,
+                    }
+                    # Professional E&O endorsements
+                    if plan_type == 'professional_eo':
+                        for ekey, ecol in endorsement_cols.items():
+                            plan[ekey] = _yes(safe_val(ecol))
+                    plans.append(plan)
+                    # Set flat fields from first plan for backward compat
+                    if actual_plan_num == 1:
+                        commercial_data.update({
+                            f'{plan_type}_carrier': carrier,
+                            f'{plan_type}_agency': agency,
+                            f'{plan_type}_policy_number': policy_number,
+                            f'{plan_type}_occ_limit': occ_limit_val,
+                            f'{plan_type}_agg_limit': agg_limit_val,
+                            f'{plan_type}_premium': premium,
+                            f'{plan_type}_renewal_date': renewal,
+                        })
+
+            sheet.add(row_idx, row, tax_id, commercial_data, plans)
+        except Exception as e:
+            sheet.skip(row_idx, row, str(e), key=str(row[0]).strip())
+    return sheet
+
+
+# ---------------------------------------------------------------------------
+# Personal / Invoices / Cobra
+# ---------------------------------------------------------------------------
+
+# (prefix, section label, column suffixes in sheet order)
+PERSONAL_SECTIONS = [
+    ('personal_auto', 'Personal Auto', ['carrier', 'bi_occ_limit', 'bi_agg_limit', 'pd_limit', 'premium', 'renewal_date', 'outstanding_item', 'remarks']),
+    ('homeowners', 'Homeowners', ['carrier', 'dwelling_limit', 'liability_limit', 'premium', 'renewal_date', 'outstanding_item', 'remarks']),
+    ('personal_umbrella', 'Personal Umbrella', ['carrier', 'liability_limit', 'deductible', 'premium', 'renewal_date', 'outstanding_item', 'remarks']),
+    ('event', 'Event Insurance', ['carrier', 'type', 'location', 'start_date', 'end_date', 'entry_fee', 'audience_count', 'premium', 'outstanding_item', 'remarks']),
+    ('visitors_medical', 'Visitors Medical', ['carrier', 'start_date', 'end_date', 'destination_country', 'premium', 'outstanding_item', 'remarks']),
+]
+PERSONAL_PREMIUM_SUFFIXES = {'premium', 'deductible', 'entry_fee'}
+PERSONAL_DATE_SUFFIXES = {'renewal_date', 'start_date', 'end_date'}
+PERSONAL_INTEGER_SUFFIXES = {'audience_count'}
+
+INVOICE_FIELDS = ('invoice_number', 'tax_id', 'invoice_date', 'amount', 'recipient_email', 'cc_email',
+                  'status', 'payment_date', 'payment_notes', 'policies_description', 'is_binding')
+COBRA_FIELDS = ('first_name', 'last_name', 'tax_id', 'state', 'start_date', 'end_date', 'status',
+                'termination_date', 'termination_reason')
+
+
+def parse_personal(header_rows, rows, individual_keys):
+    section_col_map = _section_columns(header_rows[0])
+    # Determine column start for each product from section headers
+    product_cols = [(prefix, section_col_map[label], suffixes)
+                    for prefix, label, suffixes in PERSONAL_SECTIONS if label in section_col_map]
+    fields = ['individual_id'] + [f'{prefix}_{s}' for prefix, _, suffixes in product_cols for s in suffixes]
+    sheet = SheetRecords('Personal', fields)
+
+    seen = set()
+    for row_idx, row in enumerate(rows, start=3):
+        if not row[0]:
+            continue
+        try:
+            ind_id = str(row[0]).strip() if row[0] else None
+            if not ind_id:
+                continue
+
+            if ind_id in seen:
+                sheet.skip(row_idx, row, f"Duplicate individual_id {ind_id} — first occurrence kept, this row skipped",
+                           f"Duplicate individual_id {ind_id}", ind_id)
+                continue
+
+            if ind_id not in individual_keys:
+                sheet.skip(row_idx, row, f"Individual with id {ind_id} not found", key=ind_id)
+                continue
+
+            seen.add(ind_id)
+
+            def safe_val_p(idx):
+                return row[idx] if len(row) > idx and row[idx] else None
+
+            personal_data = {'individual_id': ind_id}
+            for prefix, start_col, suffixes in product_cols:
+                for fi, field_suffix in enumerate(suffixes):
+                    val = safe_val_p(start_col + fi)
+                    key = f'{prefix}_{field_suffix}'
+                    if field_suffix in PERSONAL_DATE_SUFFIXES:
+                        personal_data[key] = parse_excel_date(val)
+                    elif field_suffix in PERSONAL_PREMIUM_SUFFIXES:
+                        personal_data[key] = safe_decimal(val)
+                    elif field_suffix in PERSONAL_INTEGER_SUFFIXES:
+                        personal_data[key] = int(val) if val else None
+                    else:
+                        personal_data[key] = val
+
+            sheet.add(row_idx, row, ind_id, personal_data)
+        except Exception as e:
+            sheet.skip(row_idx, row, str(e), key=str(row[0]).strip())
+    return sheet
+
+
+def parse_invoices(header_rows, rows):
+    sheet = SheetRecords('Invoices', INVOICE_FIELDS)
+    for row_idx, row in enumerate(rows, start=3):
+        if not row[0]:
+            continue
+        try:
+            fields = {
+                'invoice_number': int(row[0]),
+                'tax_id': str(row[1]).strip() if row[1] else None,
+                'invoice_date': parse_excel_date(row[3]) if len(row) > 3 else None,
+                'amount': safe_decimal(row[4]) if len(row) > 4 else None,
+                'recipient_email': row[5] if len(row) > 5 else None,
+                'cc_email': row[6] if len(row) > 6 else None,
+                'status': row[7] if len(row) > 7 and row[7] else 'pending',
+                'payment_date': parse_excel_date(row[8]) if len(row) > 8 else None,
+                'payment_notes': row[9] if len(row) > 9 else None,
+                'policies_description': row[10] if len(row) > 10 else None,
+                'is_binding': str(row[11]).strip().upper() == 'YES' if len(row) > 11 and row[11] else False,
+            }
+            sheet.add(row_idx, row, fields['invoice_number'], fields)
+        except Exception as e:
+            sheet.skip(row_idx, row, str(e))
+    return sheet
+
+
+def parse_cobra(header_rows, rows):
+    """Cobra rows have no natural key of their own; they match on
+    (tax_id, first name, last name)."""
+    sheet = SheetRecords('Cobra', COBRA_FIELDS)
+    for row_idx, row in enumerate(rows, start=3):
+        if not row[0] and not row[1]:
+            continue
+        try:
+            fields = {
+                'first_name': row[0] if row[0] else None,
+                'last_name': row[1] if len(row) > 1 else None,
+                'tax_id': str(row[2]).strip() if len(row) > 2 and row[2] else None,
+                'state': row[4] if len(row) > 4 else None,
+                'start_date': parse_excel_date(row[5]) if len(row) > 5 else None,
+                'end_date': parse_excel_date(row[6]) if len(row) > 6 else None,
+                'status': row[7] if len(row) > 7 and row[7] else 'active',
+                'termination_date': parse_excel_date(row[8]) if len(row) > 8 else None,
+                'termination_reason': row[9] if len(row) > 9 else None,
+            }
+            sheet.add(row_idx, row, (fields['tax_id'], fields['first_name'], fields['last_name']), fields)
+        except Exception as e:
+            sheet.skip(row_idx, row, str(e))
+    return sheet
+
+
+# ---------------------------------------------------------------------------
+# Workbooks
+# ---------------------------------------------------------------------------
+
+def import_header_rows(ws):
+    """Rows 1 (section titles) and 2 (column headers) of a read-only sheet, as value tuples.
+
+    The sheet's <dimension> tag is ignored (writers get it wrong), so rows
+    come back as long as their last stored cell.
+    """
+    ws.reset_dimensions()
+    header_rows = tuple(tuple(row) for row in ws.iter_rows(max_row=2, values_only=True))
+    return header_rows + ((),) * (2 - len(header_rows))
+
+
+def import_sheet_rows(ws):
+    """(header rows, data rows) of a read-only sheet; data rows are streamed from row 3.
+
+    Each data row is padded with None to the header width, as a fully
+    loaded sheet would pad it.
+    """
+    header_rows = import_header_rows(ws)
+    width = max(len(row) for row in header_rows)
+    rows = (tuple(row) + (None,) * (width - len(row)) for row in ws.iter_rows(min_row=3, values_only=True))
+    return header_rows, rows
+
+
+SHEET_PARSERS = {
+    'Clients': parse_clients,
+    'Individuals': parse_individuals,
+    'Employee Benefits': parse_benefits,
+    'Commercial': parse_commercial,
+    'Personal': parse_personal,
+    'Invoices': parse_invoices,
+    'Cobra': parse_cobra,
+}
+
+
+def parse_workbook_sheet(data, sheet_name, *keys):
+    """Parse sheet_name of the xlsx bytes `data`, passing its parser *keys.
+
+    Opens its own read-only copy of the workbook, so any number can run at
+    once, each in its own process.
+    """
+    wb = load_workbook(io.BytesIO(data), read_only=True)
+    try:
+        header_rows, rows = import_sheet_rows(wb[sheet_name])
+        sheet = SHEET_PARSERS[sheet_name](header_rows, rows, *keys)
+        sheet.header_rows = header_rows
+        return sheet
+    finally:
+        wb.close()
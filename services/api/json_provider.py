@@ -0,0 +1,103 @@
+"""
+JSON provider for the Flask app.
+
+Responses are encoded with orjson when it is installed — several times
+faster than the stdlib encoder on the list payloads, and it writes UTF-8
+bytes directly instead of building a str first. Without it the stdlib
+encoder is used; the output is the same JSON either way:
+
+  compact separators, sorted keys, trailing newline (as jsonify always did)
+  date / datetime  -> ISO 8601 string (Flask's default is an RFC 822 date)
+  Decimal          -> float
+  non-ASCII text   -> raw UTF-8 (jsonify used to escape it)
+  NaN / Infinity   -> null (a Postgres numeric can hold NaN; jsonify wrote
+                      the invalid bare NaN)
+
+With orjson the list endpoints' row encoders hand date columns over as
+they come out of the database (NATIVE_DATES).
+"""
+
+import math
+from datetime import date
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider, _default as _flask_default
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+# orjson writes date/datetime in C. The stdlib encoder would need a Python
+# callback per value, slower than converting them while building the dict.
+NATIVE_DATES = orjson is not None
+
+
+def _default(o):
+    if isinstance(o, date):
+        return o.isoformat()
+    if isinstance(o, Decimal):
+        return float(o)
+    return _flask_default(o)
+
+
+def _finite(o):
+    """o with every NaN / Infinity float or Decimal replaced by None, as orjson writes them."""
+    if isinstance(o, dict):
+        return {k: _finite(v) for k, v in o.items()}
+    if isinstance(o, (list, tuple)):
+        return [_finite(v) for v in o]
+    if isinstance(o, float) and not math.isfinite(o):
+        return None
+    if isinstance(o, Decimal) and not o.is_finite():
+        return None
+    return o
+
+
+def _orjson_default(o):
+    # orjson encodes date/datetime natively; Decimal and the Flask extras
+    # (UUID, dataclasses, __html__) come through here.
+    if isinstance(o, Decimal):
+        return float(o)
+    return _flask_default(o)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with orjson underneath when available.
+
+    dumps() with no options is compact; passing any json.dumps keyword
+    (indent, separators, ...) goes through the stdlib encoder instead.
+    """
+
+    default = staticmethod(_default)
+    ensure_ascii = False
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=_orjson_default, option=ORJSON_OPTIONS).decode()
+        if 'indent' not in kwargs:
+            kwargs.setdefault('separators', (',', ':'))
+        if 'allow_nan' in kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return super().dumps(obj, allow_nan=False, **kwargs)
+        except ValueError:
+            # Rare, so only then is the payload walked for NaN / Infinity.
+            return super().dumps(_finite(obj), allow_nan=False, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        pretty = not (self.compact or (self.compact is None and not self._app.debug))
+        if orjson is None or pretty:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_orjson_default,
+                            option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
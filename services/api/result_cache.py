@@ -0,0 +1,85 @@
+"""
+Computed-result cache.
+
+customer_api keeps the dashboard payloads here, keyed by endpoint and
+parameters. Each entry is tagged with the tables it was computed from and
+stamped with their change versions at the time:
+
+  get_or_compute()  the cached value while the stamp still matches the
+                    versions passed in, else compute() and store it
+  invalidate()      drop the entries tagged with any of the given tables
+  stats()           hit / miss / invalidation counters
+
+The versions are the caller's (shared between workers), so a stamp check
+alone is enough to stay correct; invalidate() only frees entries early
+when this process sees the write.
+
+Kept free of model imports.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    """Values by key, least recently used evicted past max_entries."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key: (tables, versions, value)
+        self._lock = threading.Lock()
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_or_compute(self, key, versions, compute):
+        """The value for `key` computed at `versions` ({table: version}).
+
+        The entry is tagged with the tables in `versions`. compute() runs
+        outside the lock; if it raises, nothing is stored.
+        """
+        stamp = tuple(sorted(versions.items()))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            self._entries[key] = (frozenset(versions), stamp, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, tables):
+        """Drop every entry that read one of `tables`."""
+        tables = set(tables)
+        with self._lock:
+            stale = [key for key, (tags, _, _) in self._entries.items() if tags & tables]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+                'invalidations': self.invalidations,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._reset_counters()
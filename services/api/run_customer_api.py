@@ -0,0 +1,13 @@
+"""
+Start the API server: python services/api/run_customer_api.py
+
+The import parse pool starts its workers with spawn, which re-runs the main
+script in each of them. Kept to this stub so that re-run imports nothing:
+customer_api (the app, the engine, the log file handler) is only imported
+under the __main__ guard, and workers import just api/importer.py.
+"""
+
+if __name__ == '__main__':
+    import customer_api
+
+    customer_api.serve()
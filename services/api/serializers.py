@@ -0,0 +1,77 @@
+"""
+Compiled record serializers.
+
+customer_api.py describes each model's JSON shape once (FIELD_SPECS). This
+module turns such a description into a specialised encoder function — a
+single dict display with the key names baked in as constants and the
+date/money/flag conversions inlined — instead of walking the fields with
+per-field method calls on every row.
+
+Two encoder flavours are generated from the same field list:
+  attribute encoders read an ORM instance (o.renewal_date)
+  row encoders read a Core Row / tuple by position (r[17])
+
+Attribute encoders back to_dict(), whose callers (invoices, chat tools)
+expect ISO strings. Row encoders only feed response bodies; with
+native_dates they leave date values for the JSON provider to encode.
+
+Kept free of model imports; customer_api passes the field lists in.
+"""
+
+import itertools
+
+_TEMPLATES = {
+    'raw': '{ref}',
+    'date': '(v.isoformat() if (v := {ref}) else None)',
+    'money': '(float(v) if (v := {ref}) else None)',
+    'flag': '({ref} or False)',
+    'text': "({ref} or '')",
+}
+
+_NATIVE_DATE_TEMPLATES = {**_TEMPLATES, 'date': '{ref}'}
+
+_counter = itertools.count()
+
+
+def _compile(name, params, fields, ref, call, templates=_TEMPLATES):
+    # fields are (key, kind, source): kind is a _TEMPLATES key or 'computed';
+    # source is an attribute name (attribute encoders), a row index (row
+    # encoders) or, for 'computed', a callable.
+    env = {}
+    items = []
+    for key, kind, source in fields:
+        if kind == 'computed':
+            fn = f'_f{len(env)}'
+            env[fn] = source
+            expr = call.format(fn=fn)
+        elif kind in templates:
+            expr = templates[kind].format(ref=ref.format(source=source))
+        else:
+            raise ValueError(f'Unknown field kind {kind!r} for {key!r}')
+        items.append(f'        {key!r}: {expr},')
+    func_name = f'encode_{name}_{next(_counter)}'
+    source_code = f'def {func_name}({params}):\n    return {{\n' + '\n'.join(items) + '\n    }\n'
+    exec(compile(source_code, f'<serializer {name}>', 'exec'), env)
+    encoder = env[func_name]
+    encoder.keys = tuple(key for key, _, _ in fields)
+    encoder.source = source_code
+    return encoder
+
+
+def compile_attr_encoder(name, fields):
+    """Encoder taking one ORM instance. Computed sources are called as fn(obj)."""
+    for _, kind, source in fields:
+        if kind != 'computed' and not str(source).isidentifier():
+            raise ValueError(f'Not an attribute name: {source!r}')
+    return _compile(name, 'o', fields, 'o.{source}', '{fn}(o)')
+
+
+def compile_row_encoder(name, fields, native_dates=False):
+    """Encoder taking (row, children). Column sources are row indexes;
+    computed sources are called as fn(row, children). native_dates passes
+    dates through unconverted, for an encoder that handles them itself."""
+    for _, kind, source in fields:
+        if kind != 'computed' and not isinstance(source, int):
+            raise ValueError(f'Not a row index: {source!r}')
+    return _compile(name, 'r, ch', fields, 'r[{source}]', '{fn}(r, ch)',
+                    _NATIVE_DATE_TEMPLATES if native_dates else _TEMPLATES)
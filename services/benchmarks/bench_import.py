@@ -0,0 +1,158 @@
+"""
+Import load benchmark: writing N parsed clients' sheets, replace mode.
+
+  row at a time   session.add() and a flush per client / benefits / commercial
+                  record to get its id for the children (how the importer
+                  used to load)
+  staged bulk     replace_import(): a multi-row INSERT ... RETURNING per
+                  parent sheet, children inserted in bulk against the ids
+
+Each client has two contacts, a benefits record with three plans and a
+commercial record with General Liability and two umbrella plans, so a
+client is ten rows. Sheets are parsed once from generated rows (no xlsx
+involved) and loaded into a fresh throwaway SQLite file per run.
+Statements are counted at the cursor: a batch of an executemany counts once.
+
+    python benchmarks/bench_import.py [--clients 1000 10000 50000] [--reference-max 10000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+_db_file = os.path.join(tempfile.mkdtemp(prefix='bench_import_'), 'bench.db')
+os.environ['DATABASE_URI'] = f'sqlite:///{_db_file}'
+os.environ.setdefault('LAN_ONLY', 'false')
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event  # noqa: E402
+
+from api import importer  # noqa: E402
+from api.customer_api import (  # noqa: E402
+    app, db, engine, IMPORT_TARGETS, replace_import, Session,
+)
+
+CONTACT_HEADERS = ['Contact Person', 'Email', 'Phone Number', 'Ext', 'Address Line 1', 'Address Line 2',
+                   'City', 'State', 'Zip Code']
+BENEFIT_PLAN_HEADERS = ['Carrier', 'Renewal Date', 'Waiting Period', 'Remarks', 'Outstanding Item']
+COMMERCIAL_PLAN_HEADERS = ['Carrier', 'Agency', 'Policy Number', 'Occ Limit (M)', 'Agg Limit (M)', 'Premium',
+                           'Renewal Date', 'Remarks', 'Outstanding Item']
+GL_ENDORSEMENT_HEADERS = ['BOP Endorsement', 'Marine Endorsement', 'Foreign Endorsement',
+                          'Molestation Endorsement', 'Staffing Endorsement', 'Accidental Medical Endorsement',
+                          'Liquor Liability Endorsement']
+
+
+def sheets_for(clients):
+    """{entity: SheetRecords} for `clients` generated clients."""
+    tax_ids = [f'{n % 100:02d}-{n:07d}' for n in range(clients)]
+    renewal = date(2026, 6, 1)
+
+    client_headers = ((None,), ('Tax ID', 'Client Name', 'DBA', 'Industry', 'Status', 'Gross Revenue',
+                                'Total EEs', *CONTACT_HEADERS * 2))
+    client_rows = [
+        (tax_id, f'Client {n}', None, f'Industry {n % 40}', 'Active', 250000 + n, 25,
+         f'Owner {n}', f'owner{n}@example.com', '555-0100', None, f'{n} Main St', None, 'Albany', 'NY', 12207,
+         f'Office {n}', f'office{n}@example.com', '555-0101', '12', f'{n} Main St', 'Suite 2', 'Albany', 'NY', 12207)
+        for n, tax_id in enumerate(tax_ids)
+    ]
+
+    benefit_headers = ((None,), ('Tax ID', 'Client Name', 'Parent Client', 'Form Fire Code', 'Assigned To',
+                                 'Other Broker', 'Funding', '# of Emp at renewal', 'Enrolled EEs',
+                                 'Waiting Period', 'Deductible Accumulation', 'Previous Carrier',
+                                 'Cobra Administrator',
+                                 *(f'MEDICAL {h}' for h in BENEFIT_PLAN_HEADERS),
+                                 *(f'MEDICAL {h}' for h in BENEFIT_PLAN_HEADERS),
+                                 *(f'DENTAL {h}' for h in BENEFIT_PLAN_HEADERS)))
+    benefit_rows = [
+        (tax_id, f'Client {n}', None, f'FF{n}', f'POC {n % 20}', None, 'Fully Insured', 25, 20, '30 days',
+         'Calendar Year', None, None,
+         f'Medical Carrier {n % 30}', renewal, '30 days', None, None,
+         f'Medical Carrier {n % 30 + 1}', renewal, '60 days', None, None,
+         f'Dental Carrier {n % 10}', renewal, None, None, None)
+        for n, tax_id in enumerate(tax_ids)
+    ]
+
+    commercial_headers = (
+        ('', '', '', '', 'Commercial General Liability', *[None] * 15, 'Umbrella Liability', *[None] * 17),
+        ('Tax ID', 'Client Name', 'Parent Client', 'Assigned To',
+         *COMMERCIAL_PLAN_HEADERS, *GL_ENDORSEMENT_HEADERS, *COMMERCIAL_PLAN_HEADERS * 2),
+    )
+    commercial_rows = [
+        (tax_id, f'Client {n}', None, f'POC {n % 20}',
+         f'GL Carrier {n % 50}', 'Agency', f'GL-{n}', '1', '2', 1000 + n % 5000, renewal, None, None,
+         *['No'] * 7,
+         f'Umbrella Carrier {n % 25}', 'Agency', f'UM-{n}', '5', '5', 2000 + n % 3000, renewal, None, None,
+         f'Umbrella Carrier {n % 25 + 1}', 'Agency', f'UX-{n}', '5', '5', 2500 + n % 3000, renewal, None, None)
+        for n, tax_id in enumerate(tax_ids)
+    ]
+
+    sheets = {'clients': importer.parse_clients(client_headers, client_rows)}
+    client_keys = {r.key for r in sheets['clients'].records()}
+    sheets['benefits'] = importer.parse_benefits(benefit_headers, benefit_rows, client_keys)
+    sheets['commercial'] = importer.parse_commercial(commercial_headers, commercial_rows, client_keys)
+    for sheet in sheets.values():
+        assert all(r.error is None for r in sheet.rows), sheet.rows[0].error
+    return sheets
+
+
+def row_at_a_time(session, sheets):
+    """The reference: ORM objects, a flush per parent so its children get the id."""
+    for entity, sheet in sheets.items():
+        _, model, _, relationship, child_model = IMPORT_TARGETS[entity]
+        parent_fk = next(iter(getattr(model, relationship).property.remote_side)).name
+        for record in sheet.records():
+            obj = model(**record.fields)
+            session.add(obj)
+            session.flush()
+            for child in record.children:
+                session.add(child_model(**child, **{parent_fk: obj.id}))
+        session.flush()
+
+
+def timed_load(load, sheets):
+    """(seconds, statements) for load(session, sheets) and the commit, on fresh tables."""
+    db.drop_all()
+    db.create_all()
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    session = Session()
+    event.listen(engine, 'before_cursor_execute', count)
+    try:
+        start = time.perf_counter()
+        load(session, sheets)
+        session.commit()
+        return time.perf_counter() - start, statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--reference-max', type=int, default=10000,
+                        help='skip the row-at-a-time load above this many clients')
+    args = parser.parse_args()
+
+    with app.app_context():
+        print(f'{"clients":>8} {"rows":>8}  {"loader":<15} {"time":>9} {"statements":>11}')
+        for clients in args.clients:
+            sheets = sheets_for(clients)
+            rows = sum(1 + len(r.children) for sheet in sheets.values() for r in sheet.records())
+            runs = [('staged bulk', replace_import)]
+            if clients <= args.reference_max:
+                runs.insert(0, ('row at a time', row_at_a_time))
+            for name, load in runs:
+                seconds, statements = timed_load(load, sheets)
+                print(f'{clients:>8} {rows:>8}  {name:<15} {seconds:>8.2f}s {statements:>11}')
+    os.remove(_db_file)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+JSON encoder benchmark: the unpaginated /api/commercial response, built three ways.
+
+  flask default   Flask's stdlib provider on to_dict()-style items (dates and
+                  Decimals already converted), as before FastJSONProvider
+  stdlib          FastJSONProvider without orjson (the row encoders then
+                  convert dates themselves, so the same items)
+  orjson          FastJSONProvider with orjson, on row-path items that still
+                  hold date objects
+
+Each run is provider.response(payload), i.e. what jsonify() does. Reports
+the best time and the tracemalloc peak of one run. Seeds the same throwaway
+SQLite file as bench_serializers.py.
+
+    python benchmarks/bench_json.py [--rows 10000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_serializers import _db_file, seed  # noqa: E402  (sets DATABASE_URI first)
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from api import json_provider  # noqa: E402
+from api.customer_api import (  # noqa: E402
+    app, db, CommercialInsurance, FIELD_SPECS, fetch_list, list_payload,
+)
+
+
+def measure(repeat, fn):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    response = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, response.content_length
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        seed(args.rows)
+        items, _ = fetch_list(db.session, CommercialInsurance, {})
+        converted = [FIELD_SPECS[CommercialInsurance].encode(o)
+                     for o in db.session.query(CommercialInsurance).order_by(CommercialInsurance.id)]
+        payload = list_payload('commercial', items, None)
+        converted_payload = list_payload('commercial', converted, None)
+
+        default = DefaultJSONProvider(app)
+        fast = json_provider.FastJSONProvider(app)
+        orjson = json_provider.orjson
+
+        def without_orjson():
+            json_provider.orjson = None
+            try:
+                return fast.response(converted_payload)
+            finally:
+                json_provider.orjson = orjson
+
+        runs = [('flask default', lambda: default.response(converted_payload)),
+                ('stdlib', without_orjson)]
+        if orjson is not None:
+            runs.append(('orjson', lambda: fast.response(payload)))
+
+        print(f'/api/commercial body, {len(items)} rows')
+        baseline = None
+        for name, fn in runs:
+            elapsed, peak, size = measure(args.repeat, fn)
+            baseline = baseline or elapsed
+            print(f'  {name:14s} {elapsed * 1000:8.0f} ms  peak {peak / 2**20:7.1f} MB  '
+                  f'{size / 2**20:6.1f} MB out  ({baseline / elapsed:.1f}x)')
+    os.remove(_db_file)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Premium analytics benchmark: /api/analytics/premiums' computation over N policy lines.
+
+  columnar fetch   premium_columns(): one SELECT over policy_lines into columns
+  numpy group-by   premium_analytics()'s statistics over those columns
+  python loops     the same statistics with per-group lists and sorted()
+                   (the approach get_policy_aggregations used to take)
+
+Runs against a throwaway SQLite file. Lines are commercial plans with
+premiums spread over a few hundred carriers and POCs, so every split has
+many groups.
+
+    python benchmarks/bench_premiums.py [--lines 100000] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date
+from decimal import Decimal
+
+_db_file = os.path.join(tempfile.mkdtemp(prefix='bench_premiums_'), 'bench.db')
+os.environ['DATABASE_URI'] = f'sqlite:///{_db_file}'
+os.environ.setdefault('LAN_ONLY', 'false')
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np  # noqa: E402
+
+from api.customer_api import (  # noqa: E402
+    app, db, Client, CommercialInsurance, CommercialPlan, PREMIUM_SPLITS,
+    premium_analytics, premium_columns, rebuild_policy_lines,
+)
+
+PLANS_PER_RECORD = 5
+PLAN_TYPES = ('umbrella', 'professional_eo', 'cyber', 'crime', 'workers_comp')
+
+
+def seed(lines):
+    rng = random.Random(7)
+    records = lines // PLANS_PER_RECORD
+    tax_ids = [f'{n % 100:02d}-{n:07d}' for n in range(records)]
+    with db.engine.begin() as conn:
+        conn.execute(Client.__table__.insert(), [
+            {'id': n + 1, 'tax_id': tax_ids[n], 'client_name': f'Client {n}',
+             'industry': f'Industry {n % 40}'} for n in range(records)])
+        conn.execute(CommercialInsurance.__table__.insert(), [
+            {'id': n + 1, 'tax_id': tax_ids[n], 'assigned_to': f'POC {n % 200}'} for n in range(records)])
+        conn.execute(CommercialPlan.__table__.insert(), [
+            {'commercial_insurance_id': n + 1, 'plan_type': plan_type, 'plan_number': 1,
+             'carrier': f'Carrier {rng.randrange(300)}',
+             'premium': Decimal(rng.randrange(100, 500000)) / 100,
+             'renewal_date': date(rng.choice((2025, 2026)), rng.randrange(1, 13), 1)}
+            for n in range(records) for plan_type in PLAN_TYPES])
+        return rebuild_policy_lines(conn)
+
+
+def python_stats(columns, year):
+    """The reference: group lists in dicts, percentiles from sorted()."""
+    def percentile(values, q):
+        position = (len(values) - 1) * q / 100
+        lower = int(position)
+        upper = min(lower + 1, len(values) - 1)
+        return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+    result = {}
+    for split in PREMIUM_SPLITS:
+        groups = {}
+        for key, premium, line_year in zip(columns[split], columns['premium'], columns['year']):
+            groups.setdefault(key, []).append((premium, line_year))
+        rows = []
+        for key, entries in groups.items():
+            values = sorted(p for p, _ in entries)
+            current = sum(p for p, y in entries if y == year)
+            prior = sum(p for p, y in entries if y == year - 1)
+            rows.append({'key': key, 'count': len(values), 'total': sum(values),
+                         'mean': sum(values) / len(values),
+                         **{f'p{q}': percentile(values, q) for q in (25, 50, 75, 90)},
+                         'yoy_delta': current - prior})
+        result[split] = rows
+    return result
+
+
+def best_of(repeat, fn):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        count = seed(args.lines)
+        session = db.session
+        fetch, columns = best_of(args.repeat, lambda: premium_columns(session))
+        total, payload = best_of(args.repeat, lambda: premium_analytics(session, 2026))
+        loops, reference = best_of(args.repeat, lambda: python_stats(columns, 2026))
+
+        for split, rows in reference.items():
+            expected = {r['key']: r for r in rows}
+            for row in payload[f'by_{split}']:
+                ref = expected[row['key']]
+                assert row['count'] == ref['count']
+                assert np.isclose(row['total'], ref['total'], atol=0.01)
+                assert np.isclose(row['p90'], ref['p90'], atol=0.01)
+
+        compute = total - fetch
+        print(f'{count} policy lines, {len(columns["premium"])} with a premium')
+        print(f'  columnar fetch  {fetch * 1000:8.0f} ms')
+        print(f'  numpy group-by  {compute * 1000:8.0f} ms   (4 splits, fetch excluded)')
+        print(f'  python loops    {loops * 1000:8.0f} ms   ({loops / compute:.1f}x vs numpy)')
+    os.remove(_db_file)
+
+
+if __name__ == '__main__':
+    main()
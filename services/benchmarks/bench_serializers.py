@@ -0,0 +1,122 @@
+"""
+Serializer benchmark: encode N benefit and N commercial records three ways.
+
+  orm+to_dict   list_query(...).all() then [o.to_dict() for o in rows]
+  attr encoder  the same ORM rows through the spec's compiled attribute encoder
+                (timed separately from the load, so it is the encode cost only)
+  row path      fetch_list(): Core tuples straight into the compiled row encoder
+
+Runs against a throwaway SQLite file with every column populated, so the
+numbers are dominated by Python-side work rather than the database.
+
+    python benchmarks/bench_serializers.py [--rows 10000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+_db_file = os.path.join(tempfile.mkdtemp(prefix='bench_serializers_'), 'bench.db')
+os.environ['DATABASE_URI'] = f'sqlite:///{_db_file}'
+os.environ.setdefault('LAN_ONLY', 'false')
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.customer_api import (  # noqa: E402
+    app, db, Client, EmployeeBenefit, BenefitPlan, CommercialInsurance, CommercialPlan,
+    FIELD_SPECS, fetch_list, list_query,
+)
+
+
+def column_values(model, n, **overrides):
+    """Row dict with every non-key column filled in."""
+    row = dict(overrides)
+    for column in model.__table__.columns:
+        if column.primary_key or column.key in row:
+            continue
+        if isinstance(column.type, db.DateTime):
+            row[column.key] = datetime(2025, n % 12 + 1, n % 28 + 1, 9, 30)
+        elif isinstance(column.type, db.Date):
+            row[column.key] = date(2025, n % 12 + 1, n % 28 + 1)
+        elif isinstance(column.type, db.Numeric):
+            row[column.key] = Decimal(n % 5000) + Decimal('0.25')
+        elif isinstance(column.type, db.Boolean):
+            row[column.key] = n % 2 == 0
+        elif isinstance(column.type, db.Integer):
+            row[column.key] = n % 100
+        else:
+            row[column.key] = f'{column.key} {n}'
+    return row
+
+
+def seed(rows):
+    tax_ids = [f'{n:02d}-{n:07d}' for n in range(rows)]
+    with db.engine.begin() as conn:
+        conn.execute(Client.__table__.insert(), [
+            column_values(Client, n, id=n + 1, tax_id=tax_ids[n]) for n in range(rows)])
+        conn.execute(EmployeeBenefit.__table__.insert(), [
+            column_values(EmployeeBenefit, n, id=n + 1, tax_id=tax_ids[n]) for n in range(rows)])
+        conn.execute(BenefitPlan.__table__.insert(), [
+            column_values(BenefitPlan, n, employee_benefit_id=n + 1, plan_type=plan_type, plan_number=1)
+            for n in range(rows) for plan_type in ('medical', 'dental', 'vision')])
+        conn.execute(CommercialInsurance.__table__.insert(), [
+            column_values(CommercialInsurance, n, id=n + 1, tax_id=tax_ids[n]) for n in range(rows)])
+        conn.execute(CommercialPlan.__table__.insert(), [
+            column_values(CommercialPlan, n, commercial_insurance_id=n + 1, plan_type=plan_type, plan_number=1)
+            for n in range(rows) for plan_type in ('umbrella', 'cyber')])
+
+
+def best_of(repeat, fn):
+    best = None
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench(model, repeat):
+    session = db.session
+    spec = FIELD_SPECS[model]
+    encoder = spec.attr_encoder(spec.keys_for(None))
+
+    load, objs = best_of(repeat, lambda: list_query(session, model).all())
+    to_dict, expected = best_of(repeat, lambda: [o.to_dict() for o in list_query(session, model).all()])
+    objs = list_query(session, model).all()
+    attr = min(_timed(lambda: [encoder(o) for o in objs]) for _ in range(repeat))
+    rows, (items, _) = best_of(repeat, lambda: fetch_list(session, model, {}))
+
+    assert sorted(items, key=lambda d: d['id']) == sorted(expected, key=lambda d: d['id'])
+    print(f'{model.__name__} ({len(objs)} rows)')
+    print(f'  orm load only   {load * 1000:8.0f} ms')
+    print(f'  orm+to_dict     {to_dict * 1000:8.0f} ms')
+    print(f'  attr encoder    {attr * 1000:8.0f} ms   (encode only, instances already loaded)')
+    print(f'  row path        {rows * 1000:8.0f} ms   ({to_dict / rows:.1f}x vs orm+to_dict)')
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        seed(args.rows)
+        for model in (EmployeeBenefit, CommercialInsurance):
+            bench(model, args.repeat)
+    os.remove(_db_file)
+
+
+if __name__ == '__main__':
+    main()
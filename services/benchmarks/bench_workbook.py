@@ -0,0 +1,202 @@
+"""
+Import workbook benchmark: peak memory and time to open and parse an upload.
+
+  full        load_workbook(file): every cell, style and merged range of every
+              sheet built in memory before the first row is parsed (how the
+              importer used to read)
+  streamed    load_workbook(file, read_only=True) + parse_import_workbook():
+              header rows read on their own, data rows streamed as values
+  parallel    parse_import_workbook_parallel(): a sheet per worker process
+              (--processes, default IMPORT_PARSE_PROCESSES); Employee
+              Benefits and Commercial wait for Clients, Personal for
+              Individuals
+
+The workbook has an empty export's sheets and headers (so every column the
+importer knows about is present) and N generated rows per keyed sheet, all
+of which parse. Each sheet declares its <dimension>, as Excel writes it
+(without one, every read-only open scans every sheet); strings are inline
+rather than in Excel's shared strings table, which each parse worker would
+read in full.
+Each mode runs in its own process; peak RSS is the process's maxrss above
+what it held after imports, so the modes are comparable. Parse workers are
+reported apart, as the largest one's maxrss. The app is imported inside the
+functions, not at the top: spawn re-runs this script in each parse worker.
+
+    python benchmarks/bench_workbook.py [--rows 5000 20000] [--processes N]
+"""
+import argparse
+import io
+import json
+import os
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from openpyxl import Workbook, load_workbook  # noqa: E402
+from openpyxl.utils import get_column_letter  # noqa: E402
+
+KEYED_SHEETS = ('Clients', 'Individuals', 'Employee Benefits', 'Commercial', 'Personal')
+
+
+def load_app(directory):
+    """customer_api, on a scratch SQLite database in `directory`."""
+    os.environ['DATABASE_URI'] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    os.environ.setdefault('LAN_ONLY', 'false')
+    os.environ.setdefault('AUTH_DISABLED', 'true')
+    from api import customer_api
+    return customer_api
+
+
+def export_headers(customer_api):
+    """{sheet: (row 1, row 2)} of an export of an empty database."""
+    app = customer_api.app
+    with app.app_context():
+        customer_api.db.create_all()
+        data = app.test_client().get('/api/export').data
+    wb = load_workbook(io.BytesIO(data), read_only=True)
+    headers = {ws.title: tuple(ws.iter_rows(max_row=2, values_only=True)) for ws in wb}
+    wb.close()
+    return headers
+
+
+def cell_value(header, n):
+    """A plausible value for column `header` of generated row n."""
+    header = (header or '').lower()
+    if header == 'tax id':
+        return f'{n % 100:02d}-{n:07d}'
+    if header == 'individual id':
+        return f'I-{n:07d}'
+    if header == 'zip code':
+        return 10000 + n % 90000
+    if header in ('client name', 'individual name'):
+        return f'Client {n}'
+    if header == 'first name':
+        return f'First {n}'
+    if header == 'last name':
+        return f'Last {n}'
+    if 'revenue' in header or 'count' in header or 'ees' in header.split() or header.startswith('#'):
+        return 25 + n % 500
+    if 'date' in header:
+        return date(2026, n % 12 + 1, n % 28 + 1)
+    if 'endorsement' in header:
+        return 'No'
+    if 'premium' in header:
+        return 1000 + n % 5000
+    if 'limit' in header:
+        return '1'
+    if 'carrier' in header:
+        return f'Carrier {n % 40}'
+    return f'{header} {n % 97}'
+
+
+def write_workbook(customer_api, path, rows):
+    headers = export_headers(customer_api)
+    wb = Workbook(write_only=True)
+    dimensions = []
+    for title, (section_row, header_row) in headers.items():
+        ws = wb.create_sheet(title)
+        ws.append(section_row)
+        ws.append(header_row)
+        for n in range(rows if title in KEYED_SHEETS else 0):
+            ws.append([cell_value(h, n) for h in header_row])
+        last_row = 2 + (rows if title in KEYED_SHEETS else 0)
+        dimensions.append(f'A1:{get_column_letter(max(len(section_row), len(header_row)))}{last_row}')
+    wb.save(path)
+
+    # A write-only workbook declares no dimensions; add them where Excel puts them.
+    with zipfile.ZipFile(path) as src:
+        items = [(item, src.read(item.filename)) for item in src.infolist()]
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as dst:
+        for item, data in items:
+            match = re.fullmatch(r'xl/worksheets/sheet(\d+)\.xml', item.filename)
+            if match:
+                ref = dimensions[int(match.group(1)) - 1]
+                data = data.replace(b'<sheetViews>', f'<dimension ref="{ref}" /><sheetViews>'.encode(), 1)
+            dst.writestr(item, data)
+
+
+def full_sheet_rows(ws):
+    """The old sheet read: header rows indexed off a fully loaded sheet."""
+    header_rows = (tuple(c.value for c in ws[1]), tuple(c.value for c in ws[2]))
+    return header_rows, ws.iter_rows(min_row=3, values_only=True)
+
+
+def parse_full(customer_api, path, processes):
+    wb = load_workbook(path)
+    customer_api.import_sheet_rows = full_sheet_rows
+    sheets = customer_api.parse_import_workbook(wb)
+    return sum(len(sheet.rows) for sheet in sheets.values())
+
+
+def parse_streamed(customer_api, path, processes):
+    wb = load_workbook(path, read_only=True)
+    sheets = customer_api.parse_import_workbook(wb)
+    wb.close()
+    return sum(len(sheet.rows) for sheet in sheets.values())
+
+
+def parse_parallel(customer_api, path, processes):
+    with open(path, 'rb') as f:
+        data = f.read()
+    wb = load_workbook(io.BytesIO(data), read_only=True)
+    sheets = customer_api.parse_import_workbook_parallel(data, wb.sheetnames, processes=processes)
+    wb.close()
+    return sum(len(sheet.rows) for sheet in sheets.values())
+
+
+MODES = {'full': parse_full, 'streamed': parse_streamed, 'parallel': parse_parallel}
+
+
+def measure(mode, path, processes):
+    """Run one mode in this process; print {seconds, peak_mb, worker_mb, rows} as JSON."""
+    customer_api = load_app(os.path.dirname(path))
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with customer_api.app.app_context():
+        rows = MODES[mode](customer_api, path, processes)
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    worker = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    print(json.dumps({'seconds': seconds, 'peak_mb': peak / 1024, 'worker_mb': worker / 1024, 'rows': rows}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[5000, 20000])
+    parser.add_argument('--processes', type=int, help='parse workers (default: IMPORT_PARSE_PROCESSES)')
+    parser.add_argument('--measure', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure, args.processes)
+        return
+
+    directory = tempfile.mkdtemp(prefix='bench_workbook_')
+    customer_api = load_app(directory)
+    processes = ['--processes', str(args.processes)] if args.processes else []
+    print(f'{"rows/sheet":>10} {"file":>8}  {"mode":<9} {"time":>8} {"peak RSS":>10} {"worker RSS":>11}')
+    for rows in args.rows:
+        path = os.path.join(directory, f'import_{rows}.xlsx')
+        write_workbook(customer_api, path, rows)
+        size = os.path.getsize(path) / 2**20
+        for mode in MODES:
+            out = subprocess.run([sys.executable, __file__, '--measure', mode, path, *processes],
+                                 check=True, capture_output=True, text=True).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            worker = f'{result["worker_mb"]:>9.0f}MB' if mode == 'parallel' else f'{"":>11}'
+            print(f'{rows:>10} {size:>7.1f}M  {mode:<9} {result["seconds"]:>7.2f}s {result["peak_mb"]:>8.0f}MB '
+                  f'{worker}')
+        os.remove(path)
+    shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Tests for premium analytics: the vectorized group statistics, and
+/api/analytics/premiums over the policy_lines index.
+"""
+
+import os
+import sys
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+os.environ['DATABASE_URI'] = 'sqlite:///:memory:'
+os.environ['LAN_ONLY'] = 'false'
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.customer_api import (
+    app, db, Client, Individual, CommercialInsurance, CommercialPlan, PersonalInsurance, HomeownersPolicy,
+)
+from api import customer_api
+from api import analytics
+
+
+@pytest.fixture(scope='function')
+def client():
+    """Create a test client with isolated in-memory database."""
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    customer_api.DASHBOARD_CACHE.clear()
+
+    with app.app_context():
+        customer_api.Session = customer_api.sessionmaker(bind=db.engine)
+        db.create_all()
+        yield app.test_client()
+        db.session.remove()
+        db.drop_all()
+
+
+class TestGroupStats:
+
+    def test_matches_numpy_per_group(self):
+        rng = np.random.default_rng(3)
+        keys = [rng.choice(['a', 'b', 'c', None]) for _ in range(500)]
+        premiums = rng.uniform(10, 5000, 500).round(2)
+        years = rng.choice([2025, 2026, 0], 500)
+        codes, labels = analytics.encode_keys(keys)
+        rows = {r['key']: r for r in analytics.group_stats(codes, labels, premiums, years, 2026)}
+        assert set(rows) == {'a', 'b', 'c', None}
+        for key, row in rows.items():
+            mask = np.array([k == key for k in keys])
+            values = premiums[mask]
+            assert row['count'] == mask.sum()
+            assert row['total'] == pytest.approx(values.sum(), abs=0.01)
+            assert row['mean'] == pytest.approx(values.mean(), abs=0.01)
+            for q in analytics.PERCENTILES:
+                assert row[f'p{q}'] == pytest.approx(np.percentile(values, q), abs=0.01)
+            current = premiums[mask & (years == 2026)].sum()
+            prior = premiums[mask & (years == 2025)].sum()
+            assert row['yoy_delta'] == pytest.approx(current - prior, abs=0.01)
+            assert row['yoy_pct'] == pytest.approx((current - prior) / prior * 100, abs=0.01)
+
+    def test_sorted_by_total(self):
+        codes, labels = analytics.encode_keys(['x', 'y', 'y'])
+        rows = analytics.group_stats(codes, labels, np.array([5.0, 1.0, 2.0]), np.zeros(3, int), 2026)
+        assert [r['key'] for r in rows] == ['x', 'y']
+        assert rows[0]['yoy_pct'] is None
+
+    def test_empty(self):
+        codes, labels = analytics.encode_keys([])
+        assert analytics.group_stats(codes, labels, np.array([]), np.array([], int), 2026) == []
+
+
+def seed():
+    ci = CommercialInsurance(tax_id='00-0000001', assigned_to='Kim',
+                             general_liability_carrier='Hartford', general_liability_premium=Decimal('1000'),
+                             general_liability_renewal_date=date(2026, 3, 1),
+                             property_carrier='Travelers', property_premium=Decimal('0'),
+                             # Superseded by the WC plan row.
+                             workers_comp_carrier='Old', workers_comp_premium=Decimal('999'))
+    ci.commercial_plans = [CommercialPlan(plan_type='workers_comp', plan_number=1, carrier='Employers',
+                                          premium=Decimal('500'), renewal_date=date(2025, 3, 1))]
+    legacy = CommercialInsurance(tax_id='00-0000002', workers_comp_carrier='Legacy',
+                                 workers_comp_premium=Decimal('300'), workers_comp_renewal_date=date(2026, 5, 1))
+    pi = PersonalInsurance(individual_id='IND-1', homeowners_carrier='Allstate',
+                           homeowners_premium=Decimal('800'))
+    pi.homeowners_policies = [
+        HomeownersPolicy(policy_number=1, carrier='Allstate', premium=Decimal('800')),
+        HomeownersPolicy(policy_number=2, carrier='Chubb', premium=Decimal('1200')),
+    ]
+    db.session.add_all([
+        Client(tax_id='00-0000001', client_name='Acme', industry='Retail'),
+        Client(tax_id='00-0000002', client_name='Beta', industry=''),
+        Individual(individual_id='IND-1', first_name='Sam', last_name='Lee'), ci, legacy, pi,
+    ])
+    db.session.commit()
+
+
+def premiums(client, **params):
+    response = client.get('/api/analytics/premiums', query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+class TestPremiumEndpoint:
+
+    def test_splits(self, client):
+        seed()
+        data = premiums(client, year=2026)
+        assert data['summary']['count'] == 5
+        assert data['summary']['total'] == 3800.0
+        assert (data['summary']['year_total'], data['summary']['prior_year_total']) == (1300.0, 500.0)
+        assert {r['key']: r['total'] for r in data['by_carrier']} == {
+            'Hartford': 1000.0, 'Employers': 500.0, 'Legacy': 300.0, 'Allstate': 800.0, 'Chubb': 1200.0}
+        assert {r['key']: r['count'] for r in data['by_industry']} == {'Retail': 2, None: 3}
+        assert {r['key']: r['total'] for r in data['by_line_of_business']} == {
+            'commercial': 1800.0, 'personal': 2000.0}
+        assert {r['key']: r['total'] for r in data['by_poc']} == {'Kim': 1500.0, None: 2300.0}
+
+    def test_empty_book(self, client):
+        data = premiums(client)
+        assert data['summary'] is None
+        assert data['by_carrier'] == []
+
+    def test_bad_year(self, client):
+        for year in ('last', '1899', '10000', '99999999999999999999'):
+            assert client.get(f'/api/analytics/premiums?year={year}').status_code == 400, year
+
+    def test_cached_until_a_write(self, client):
+        seed()
+        premiums(client, year=2026)
+        premiums(client, year=2026)
+        assert customer_api.DASHBOARD_CACHE.stats()['hits'] == 1
+        db.session.query(Client).filter_by(tax_id='00-0000002').one().industry = 'Tech'
+        db.session.commit()
+        assert {r['key'] for r in premiums(client, year=2026)['by_industry']} == {'Retail', 'Tech', None}
@@ -0,0 +1,113 @@
+"""
+Tests for /api/bootstrap: one response matching the endpoints the app
+otherwise calls separately on load.
+"""
+
+import pytest
+import os
+import sys
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+os.environ['DATABASE_URI'] = 'sqlite:///:memory:'
+os.environ['LAN_ONLY'] = 'false'
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.customer_api import (
+    app, db, Client, Individual, EmployeeBenefit, CommercialInsurance, PersonalInsurance,
+    Feedback,
+)
+from api import customer_api
+
+
+@pytest.fixture(scope='function')
+def client():
+    """Create a test client with isolated in-memory database."""
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+
+    with app.app_context():
+        customer_api.Session = customer_api.sessionmaker(bind=db.engine)
+        db.create_all()
+        yield app.test_client()
+        db.session.remove()
+        db.drop_all()
+
+
+def seed(start, count):
+    for i in range(start, start + count):
+        tax_id = f'00-{i:07d}'
+        ind_id = f'IND-{i:05d}'
+        db.session.add_all([
+            Client(tax_id=tax_id, client_name=f'Client {i}', status='Active' if i % 2 else 'Inactive'),
+            EmployeeBenefit(tax_id=tax_id),
+            CommercialInsurance(tax_id=tax_id),
+            Individual(individual_id=ind_id, first_name='Sam', last_name=f'Lee{i}', status='Active'),
+            PersonalInsurance(individual_id=ind_id),
+            Feedback(type='Bug', subject=f'Issue {i}', description='...'),
+        ])
+    # Orphans: no matching client / individual.
+    db.session.add_all([
+        EmployeeBenefit(tax_id=f'99-{start:07d}'),
+        PersonalInsurance(individual_id=f'NOBODY-{start}'),
+    ])
+    db.session.commit()
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def test_matches_individual_endpoints(client):
+    seed(0, 4)
+    data = client.get('/api/bootstrap').get_json()
+    for key in ('clients', 'individuals', 'benefits', 'commercial', 'personal'):
+        assert data[key] == client.get(f'/api/{key}').get_json()[key], key
+    assert data['feedback'] == client.get('/api/feedback').get_json()['feedback']
+    assert data['me'] == client.get('/api/me').get_json()
+    assert data['notifications'] == client.get('/api/me/notifications').get_json()
+    assert data['health']['status'] == 'ok'
+    assert data['backup'] == client.get('/api/backup/status').get_json()
+
+
+def test_names_from_lookup_maps(client):
+    seed(0, 2)
+    data = client.get('/api/bootstrap').get_json()
+    by_tax_id = {b['tax_id']: b for b in data['benefits']}
+    assert by_tax_id['00-0000001']['client_name'] == 'Client 1'
+    assert by_tax_id['00-0000001']['client_status'] == 'Active'
+    assert by_tax_id['99-0000000']['client_name'] is None
+    by_ind = {p['individual_id']: p for p in data['personal']}
+    assert by_ind['IND-00000']['individual_name'] == 'Sam Lee0'
+    assert by_ind['NOBODY-0']['individual_name'] is None
+
+
+def test_query_count_independent_of_rows(client):
+    seed(0, 2)
+    with count_queries() as small:
+        assert client.get('/api/bootstrap').status_code == 200
+    seed(2, 20)
+    with count_queries() as large:
+        assert client.get('/api/bootstrap').status_code == 200
+    assert len(large) == len(small)
+
+
+def test_no_client_join(client):
+    seed(0, 1)
+    with count_queries() as statements:
+        client.get('/api/bootstrap')
+    benefit_selects = [s for s in statements if 'FROM employee_benefits' in s]
+    assert benefit_selects
+    assert not any('ref_client' in s for s in benefit_selects)
@@ -128,6 +128,28 @@ class TestExecuteTool:
             assert 'total_opportunities' in result
             session.close()
 
+    def test_get_renewals_scans_in_batches(self, client, monkeypatch):
+        from datetime import date, timedelta
+        from api import chat
+        from api.customer_api import Client, EmployeeBenefit, CommercialInsurance, PersonalInsurance, Individual
+        monkeypatch.setattr(chat, 'TOOL_SCAN_BATCH_ROWS', 2)
+        soon = date.today() + timedelta(days=30)
+        with app.app_context():
+            for i in range(5):
+                tax_id = f'12-000000{i}'
+                db.session.add(Client(tax_id=tax_id, client_name=f'Client {i}'))
+                db.session.add(CommercialInsurance(tax_id=tax_id, general_liability_carrier='Hartford',
+                                                   general_liability_renewal_date=soon))
+            db.session.commit()
+            session = customer_api.Session()
+            models = {'Client': Client, 'EmployeeBenefit': EmployeeBenefit,
+                      'CommercialInsurance': CommercialInsurance, 'PersonalInsurance': PersonalInsurance,
+                      'Individual': Individual}
+            result = execute_tool('get_renewals', {}, session, models)
+            assert sorted(r['client_name'] for r in result) == [f'Client {i}' for i in range(5)]
+            assert {r['policy_type'] for r in result} == {'General Liability'}
+            session.close()
+
     def test_unknown_tool(self, client):
         with app.app_context():
             session = customer_api.Session()
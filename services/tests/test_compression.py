@@ -0,0 +1,173 @@
+"""
+Tests for response compression: /api/ JSON bodies per Accept-Encoding, and
+precompressed static files from the React build.
+"""
+
+import gzip
+import os
+import sys
+
+import pytest
+
+os.environ['DATABASE_URI'] = 'sqlite:///:memory:'
+os.environ['LAN_ONLY'] = 'false'
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.customer_api import app, db, Client
+from api import customer_api
+from api import compression
+
+GZIP = {'Accept-Encoding': 'gzip'}
+# Flask derives static_url_path from the folder name, so fix it before the
+# tests point static_folder at a temp directory.
+STATIC_URL = app.static_url_path
+
+
+@pytest.fixture(scope='function')
+def client():
+    """Create a test client with isolated in-memory database."""
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    customer_api.API_COMPRESSION_CACHE.clear()
+    customer_api.STATIC_COMPRESSION_CACHE.clear()
+
+    with app.app_context():
+        customer_api.Session = customer_api.sessionmaker(bind=db.engine)
+        db.create_all()
+        yield app.test_client()
+        db.session.remove()
+        db.drop_all()
+
+
+def seed(count=40):
+    db.session.add_all(Client(tax_id=f'00-{i:07d}', client_name=f'Client {i}') for i in range(count))
+    db.session.commit()
+
+
+class TestApiCompression:
+
+    def test_large_body_gzipped(self, client):
+        seed()
+        plain = client.get('/api/clients?limit=100')
+        response = client.get('/api/clients?limit=100', headers=GZIP)
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.vary
+        assert int(response.headers['Content-Length']) < len(plain.data)
+        assert gzip.decompress(response.data) == plain.data
+
+    def test_identity_without_accept_encoding(self, client):
+        seed()
+        response = client.get('/api/clients?limit=100')
+        assert 'Content-Encoding' not in response.headers
+        assert 'Accept-Encoding' in response.vary
+
+    def test_refused_encoding(self, client):
+        seed()
+        response = client.get('/api/clients?limit=100', headers={'Accept-Encoding': 'gzip;q=0'})
+        assert 'Content-Encoding' not in response.headers
+
+    def test_small_body_left_alone(self, client):
+        response = client.get('/api/clients?limit=5', headers=GZIP)
+        assert 'Content-Encoding' not in response.headers
+
+    def test_streamed_list_gzipped(self, client):
+        seed()
+        plain = client.get('/api/clients')
+        response = client.get('/api/clients', headers=GZIP)
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Content-Length' not in response.headers
+        assert gzip.decompress(response.data) == plain.data
+
+    def test_repeat_payload_served_from_cache(self, client, monkeypatch):
+        seed()
+        first = client.get('/api/clients', headers=GZIP).data
+        monkeypatch.setattr(customer_api, 'compress', None)
+        monkeypatch.setattr(customer_api, 'compress_chunks', None)
+        again = client.get('/api/clients', headers=GZIP)
+        assert again.data == first
+        assert 'Content-Length' in again.headers
+
+    def test_etag_weak_when_compressed(self, client):
+        seed()
+        response = client.get('/api/clients', headers=GZIP)
+        etag, weak = response.get_etag()
+        assert weak
+        revalidated = client.get('/api/clients', headers={**GZIP, 'If-None-Match': f'W/"{etag}"'})
+        assert revalidated.status_code == 304
+        assert revalidated.get_etag() == (etag, True)
+        # A client holding the identity body's strong tag still validates.
+        assert client.get('/api/clients', headers={'If-None-Match': f'"{etag}"'}).status_code == 304
+
+    def test_changed_data_not_served_stale(self, client):
+        seed()
+        client.get('/api/clients', headers=GZIP).close()
+        db.session.add(Client(tax_id='99-0000001', client_name='Newcomer'))
+        db.session.commit()
+        response = client.get('/api/clients', headers=GZIP)
+        assert b'Newcomer' in gzip.decompress(response.data)
+
+    @pytest.mark.skipif(compression.brotli is None, reason='brotli not installed')
+    def test_brotli_preferred(self, client):
+        seed()
+        plain = client.get('/api/clients')
+        response = client.get('/api/clients', headers={'Accept-Encoding': 'gzip, br'})
+        assert response.headers['Content-Encoding'] == 'br'
+        assert compression.brotli.decompress(response.data) == plain.data
+
+
+class TestStaticCompression:
+
+    @pytest.fixture
+    def build(self, tmp_path, monkeypatch):
+        (tmp_path / 'app.js').write_text('console.log("portal");\n' * 200)
+        (tmp_path / 'logo.png').write_bytes(b'\x89PNG' + b'\0' * 4000)
+        (tmp_path / 'index.html').write_text('<html>' + '<div></div>' * 200 + '</html>')
+        monkeypatch.setattr(app, 'static_folder', str(tmp_path))
+        return tmp_path
+
+    def static_url(self, name):
+        return f'{STATIC_URL}/{name}'
+
+    def test_sibling_written_and_served(self, client, build):
+        response = client.get(self.static_url('app.js'), headers=GZIP)
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.mimetype == 'text/javascript'
+        assert 'Accept-Encoding' in response.vary
+        assert gzip.decompress(response.data) == (build / 'app.js').read_bytes()
+        assert (build / 'app.js.gz').is_file()
+
+    def test_identity_without_accept_encoding(self, client, build):
+        response = client.get(self.static_url('app.js'))
+        assert 'Content-Encoding' not in response.headers
+        assert response.data == (build / 'app.js').read_bytes()
+
+    def test_binary_types_not_compressed(self, client, build):
+        response = client.get(self.static_url('logo.png'), headers=GZIP)
+        assert 'Content-Encoding' not in response.headers
+        assert not (build / 'logo.png.gz').exists()
+
+    def test_stale_sibling_rewritten(self, client, build):
+        client.get(self.static_url('app.js'), headers=GZIP).close()
+        sibling = build / 'app.js.gz'
+        os.utime(sibling, (0, 0))
+        (build / 'app.js').write_text('console.log("rebuilt");\n' * 200)
+        response = client.get(self.static_url('app.js'), headers=GZIP)
+        assert gzip.decompress(response.data) == (build / 'app.js').read_bytes()
+
+    def test_read_only_build_uses_cache(self, client, build, monkeypatch):
+        def refuse(*args):
+            raise PermissionError('read-only')
+        monkeypatch.setattr(compression, '_write_sibling', refuse)
+        response = client.get(self.static_url('app.js'), headers=GZIP)
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.data) == (build / 'app.js').read_bytes()
+        assert not (build / 'app.js.gz').exists()
+
+    def test_index_compressed(self, client, build):
+        response = client.get('/', headers=GZIP)
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.data) == (build / 'index.html').read_bytes()
+
+    def test_missing_file(self, client, build):
+        assert client.get(self.static_url('nope.js'), headers=GZIP).status_code == 404
@@ -830,6 +830,311 @@ class TestImport:
         assert data['stats']['benefits_created'] == 0
         assert len(data['stats']['errors']) > 0
 
+    def test_import_without_insert_returning(self, client, monkeypatch):
+        """Drivers without batched INSERT ... RETURNING get their ids from a SELECT instead."""
+        monkeypatch.setattr(db.engine.dialect, 'insert_executemany_returning', False)
+        xlsx = self._build_import_workbook(
+            clients=[
+                ['11-1111111', 'Company A', None, None, 'Active', None, None,
+                 'Alice', 'alice@a.com', None, None, None, None, None, None, None],
+                ['22-2222222', 'Company B', None, None, 'Active', None, None,
+                 'Bob', 'bob@b.com', None, None, None, None, None, None, None],
+            ]
+        )
+        resp = client.post('/api/import', data={'file': (xlsx, 'test.xlsx')}, content_type='multipart/form-data')
+        assert json.loads(resp.data)['stats']['clients_created'] == 2
+        contacts = {c.tax_id: [contact.contact_person for contact in c.contacts] for c in db.session.query(Client)}
+        assert contacts == {'11-1111111': ['Alice'], '22-2222222': ['Bob']}
+
+    def test_import_ignores_wrong_dimension_tag(self, client):
+        """Uploads are streamed; a sheet's <dimension> tag understating its size doesn't truncate rows."""
+        import re
+        import zipfile
+        xlsx = self._build_import_workbook(
+            clients=[
+                ['11-1111111', 'Company A', None, 'Tech', 'Active', None, None,
+                 'Alice', 'alice@a.com', None, None, None, None, None, None, None],
+                ['22-2222222', 'Company B'],
+            ]
+        )
+        patched = io.BytesIO()
+        with zipfile.ZipFile(xlsx) as src, zipfile.ZipFile(patched, 'w') as dst:
+            for item in src.infolist():
+                data = src.read(item.filename)
+                if item.filename.startswith('xl/worksheets/'):
+                    data = re.sub(rb'<dimension ref="[^"]*"', b'<dimension ref="A1:B2"', data)
+                dst.writestr(item, data)
+        patched.seek(0)
+        resp = client.post('/api/import', data={'file': (patched, 'test.xlsx')}, content_type='multipart/form-data')
+        assert resp.status_code == 200, resp.data
+        assert json.loads(resp.data)['stats']['clients_created'] == 2
+        clients = {c.tax_id: (c.industry, [contact.contact_person for contact in c.contacts])
+                   for c in db.session.query(Client)}
+        assert clients == {'11-1111111': ('Tech', ['Alice']), '22-2222222': (None, [])}
+
+    # ---- ?mode=merge ----
+
+    MERGE_CLIENTS = [
+        ['11-1111111', 'Company A', None, 'Tech', 'Active', 500000, 25,
+         'Alice', 'alice@a.com', '555-0001', None, '1 Main', None, 'NYC', 'NY', 10001],
+        ['22-2222222', 'Company B', None, 'Finance', 'Active', None, None,
+         'Bob', 'bob@b.com', None, None, None, None, None, None, None],
+    ]
+    MERGE_COMMERCIAL = [
+        ['11-1111111', 'Company A', None, 'Agent Smith',
+         'Hartford', 'ABC Agency', 'POL-001', '1', '2', 5000, '2025-06-01', None, None],
+    ]
+
+    def _import(self, client, xlsx, query=''):
+        resp = client.post(f'/api/import{query}', data={'file': (xlsx, 'test.xlsx')},
+                           content_type='multipart/form-data')
+        return resp.status_code, json.loads(resp.data)
+
+    def _client_ids(self):
+        return {c.tax_id: c.id for c in db.session.query(Client)}
+
+    def test_merge_unchanged_workbook(self, client):
+        """Merging the workbook that was just imported changes nothing."""
+        self._import(client, self._build_import_workbook(clients=self.MERGE_CLIENTS,
+                                                         commercial=self.MERGE_COMMERCIAL))
+        ids = self._client_ids()
+
+        status, data = self._import(client, self._build_import_workbook(clients=self.MERGE_CLIENTS,
+                                                                        commercial=self.MERGE_COMMERCIAL),
+                                    '?mode=merge')
+        assert status == 200
+        assert data['mode'] == 'merge'
+        assert data['counts']['clients'] == {'inserted': 0, 'updated': 0, 'unchanged': 2, 'deleted': 0}
+        assert data['counts']['commercial'] == {'inserted': 0, 'updated': 0, 'unchanged': 1, 'deleted': 0}
+        assert data['stats']['clients_created'] == 0
+        db.session.expire_all()
+        assert self._client_ids() == ids
+
+    def test_merge_updates_and_inserts(self, client):
+        """Changed rows are updated in place, new ones inserted, unlisted ones kept."""
+        self._import(client, self._build_import_workbook(clients=self.MERGE_CLIENTS))
+        ids = self._client_ids()
+
+        renamed = [['11-1111111', 'Company A Renamed'] + self.MERGE_CLIENTS[0][2:],
+                   ['33-3333333', 'Company C', None, None, 'Active', None, None,
+                    'Carol', None, None, None, None, None, None, None, None]]
+        status, data = self._import(client, self._build_import_workbook(clients=renamed), '?mode=merge')
+        assert status == 200
+        assert data['counts']['clients'] == {'inserted': 1, 'updated': 1, 'unchanged': 0, 'deleted': 0}
+        assert data['stats']['clients_created'] == 1
+
+        db.session.expire_all()
+        updated = db.session.get(Client, ids['11-1111111'])
+        assert updated.client_name == 'Company A Renamed'
+        assert [c.contact_person for c in updated.contacts] == ['Alice']
+        assert set(self._client_ids()) == {'11-1111111', '22-2222222', '33-3333333'}
+
+    def test_merge_replaces_changed_plans(self, client):
+        """A record whose plans changed gets the sheet's plans; its id stays."""
+        benefits_row = ['11-1111111', 'Company A', None, None, None, None, None,
+                        None, None, None, None, None, None,
+                        'BlueCross', '2025-06-01', None, None, None] + [None] * 46
+        self._import(client, self._build_import_workbook(clients=self.MERGE_CLIENTS, benefits=[benefits_row]))
+        benefit_id = db.session.query(EmployeeBenefit.id).scalar()
+
+        benefits_row[13] = 'Aetna'
+        status, data = self._import(client, self._build_import_workbook(clients=self.MERGE_CLIENTS,
+                                                                        benefits=[benefits_row]),
+                                    '?mode=merge')
+        assert status == 200
+        assert data['counts']['benefits']['updated'] == 1
+        db.session.expire_all()
+        benefit = db.session.get(EmployeeBenefit, benefit_id)
+        assert benefit.current_carrier == 'Aetna'
+        assert [(p.plan_type, p.carrier) for p in benefit.plans] == [('medical', 'Aetna')]
+
+    def test_merge_delete(self, client):
+        """?delete= removes the stored rows the sheet no longer lists."""
+        self._import(client, self._build_import_workbook(clients=self.MERGE_CLIENTS,
+                                                         commercial=self.MERGE_COMMERCIAL))
+
+        status, data = self._import(client, self._build_import_workbook(clients=self.MERGE_CLIENTS[:1]),
+                                    '?mode=merge&delete=clients')
+        assert status == 200
+        assert data['counts']['clients'] == {'inserted': 0, 'updated': 0, 'unchanged': 1, 'deleted': 1}
+        db.session.expire_all()
+        assert set(self._client_ids()) == {'11-1111111'}
+        assert db.session.query(CommercialInsurance).count() == 1
+
+    def test_merge_rows_may_refer_to_stored_clients(self, client):
+        """In merge mode a Commercial row's client need not be on the Clients sheet."""
+        self._import(client, self._build_import_workbook(clients=self.MERGE_CLIENTS))
+
+        status, data = self._import(client, self._build_import_workbook(commercial=self.MERGE_COMMERCIAL),
+                                    '?mode=merge')
+        assert status == 200
+        assert data['counts']['commercial']['inserted'] == 1
+        assert data['stats']['errors'] == []
+
+    def test_import_rejects_bad_mode(self, client):
+        """Unknown modes and deletes, or a delete outside merge mode, are 400s."""
+        xlsx = self._build_import_workbook()
+        assert self._import(client, xlsx, '?mode=upsert')[0] == 400
+        assert self._import(client, self._build_import_workbook(), '?delete=clients')[0] == 400
+        assert self._import(client, self._build_import_workbook(), '?mode=merge&delete=everything')[0] == 400
+
+    def test_parallel_parse_matches_serial(self, client, monkeypatch):
+        """Sheets parsed in worker processes give the same import as parsing them in turn."""
+        clients = self.MERGE_CLIENTS + [self.MERGE_CLIENTS[0]]  # a duplicate row
+        commercial = self.MERGE_COMMERCIAL + [
+            ['99-9999999', 'Unknown Co', None, None, 'Hartford', None, 'POL-9', '1', '1', 100, None, None, None],
+        ]
+
+        def run():
+            status, data = self._import(client, self._build_import_workbook(clients=clients, commercial=commercial))
+            rows = sorted((c.tax_id, c.client_name, len(c.contacts)) for c in db.session.query(Client))
+            return status, data['stats'], rows
+
+        serial = run()
+        monkeypatch.setattr(customer_api, 'IMPORT_PARSE_PROCESSES', 2)
+        monkeypatch.setattr(customer_api, 'IMPORT_PARALLEL_MIN_ROWS', 0)
+        calls = []
+        parse_parallel = customer_api.parse_import_workbook_parallel
+        monkeypatch.setattr(customer_api, 'parse_import_workbook_parallel',
+                            lambda *args, **kwargs: calls.append(args) or parse_parallel(*args, **kwargs))
+        parallel = run()
+        assert calls and parallel == serial
+        assert serial[1]['commercial_created'] == 1 and len(serial[1]['errors']) == 2
+
+        from api.import_jobs import ImportCancelled
+
+        def cancelled():
+            raise ImportCancelled('cancelled')
+
+        data = self._build_import_workbook(clients=clients, commercial=commercial).getvalue()
+        with pytest.raises(ImportCancelled):
+            customer_api.parse_import_workbook_parallel(data, ['Clients', 'Commercial'], checkpoint=cancelled)
+
+    def test_parse_worker_skips_the_app(self):
+        """spawn re-runs the launcher in each worker as __mp_main__; that re-run imports no app."""
+        import subprocess
+        api_dir = os.path.dirname(customer_api.__file__)
+        probe = ("import runpy, sys; runpy.run_path('run_customer_api.py', run_name='__mp_main__'); "
+                 "import importer; print(sorted(m for m in ('customer_api', 'flask', 'sqlalchemy') "
+                 "if m in sys.modules))")
+        out = subprocess.run([sys.executable, '-c', probe], cwd=api_dir, check=True,
+                             capture_output=True, text=True).stdout
+        assert out.strip() == '[]'
+
+    # ---- background jobs ----
+
+    def _submit_job(self, client, xlsx, query=''):
+        resp = client.post(f'/api/import/jobs{query}', data={'file': (xlsx, 'test.xlsx')},
+                           content_type='multipart/form-data')
+        return resp.status_code, json.loads(resp.data)
+
+    def test_import_job(self, client):
+        """An import job is polled until done; its result is what /api/import returns."""
+        status, job = self._submit_job(client, self._build_import_workbook(clients=self.MERGE_CLIENTS))
+        assert status == 202
+        assert job['status'] in ('queued', 'running', 'done') and job['destructive']
+        customer_api.IMPORT_JOBS.wait(job['id'], timeout=30)
+
+        job = json.loads(client.get(f"/api/import/jobs/{job['id']}").data)
+        assert job['status'] == 'done' and job['phase'] == 'done'
+        assert job['result']['stats']['clients_created'] == 2
+        assert job['sheets']['Clients'] == {'expected': 2, 'parsed': 2, 'loaded': 2}
+        assert self._client_ids().keys() == {'11-1111111', '22-2222222'}
+
+    def test_import_job_validates_upfront(self, client):
+        """A bad upload or option is refused at submit; unknown jobs are 404s."""
+        assert self._submit_job(client, self._build_import_workbook(), '?mode=upsert')[0] == 400
+        wb = Workbook()
+        wb.active.title = 'Sheet1'
+        xlsx = io.BytesIO()
+        wb.save(xlsx)
+        xlsx.seek(0)
+        assert self._submit_job(client, xlsx)[0] == 400
+        assert client.get('/api/import/jobs/nope').status_code == 404
+        assert client.post('/api/import/jobs/nope/cancel').status_code == 404
+
+    def test_destructive_import_job_runs_alone(self, client):
+        """A replace is refused while another import is active, and a merge while a replace is."""
+        import threading
+        from api.import_jobs import ImportJob
+        release = threading.Event()
+        blocker = customer_api.IMPORT_JOBS.submit(ImportJob('merge'), lambda job: release.wait(30))
+        try:
+            status, body = self._submit_job(client, self._build_import_workbook(clients=self.MERGE_CLIENTS))
+            assert status == 409 and blocker.id in body['error']
+            status, job = self._submit_job(client, self._build_import_workbook(clients=self.MERGE_CLIENTS),
+                                           '?mode=merge')
+            assert status == 202
+        finally:
+            release.set()
+        customer_api.IMPORT_JOBS.wait(blocker.id, timeout=30)
+        customer_api.IMPORT_JOBS.wait(job['id'], timeout=30)
+
+        hold = threading.Event()
+        destructive = customer_api.IMPORT_JOBS.submit(ImportJob('replace', destructive=True),
+                                                      lambda job: hold.wait(30))
+        try:
+            status, _ = self._submit_job(client, self._build_import_workbook(clients=self.MERGE_CLIENTS),
+                                         '?mode=merge')
+            assert status == 409
+        finally:
+            hold.set()
+        customer_api.IMPORT_JOBS.wait(destructive.id, timeout=30)
+
+    def test_sync_import_uses_job_queue(self, client):
+        """/api/import goes through the job queue: a replace is refused while a job is active."""
+        import threading
+        from api.import_jobs import ImportJob
+        release = threading.Event()
+        blocker = customer_api.IMPORT_JOBS.submit(ImportJob('merge'), lambda job: release.wait(30))
+        try:
+            resp = client.post('/api/import', data={'file': (self._build_import_workbook(
+                clients=self.MERGE_CLIENTS), 'test.xlsx')}, content_type='multipart/form-data')
+            assert resp.status_code == 409 and blocker.id in json.loads(resp.data)['error']
+            assert client.get('/api/clients').get_json()['total'] == 0
+        finally:
+            release.set()
+        customer_api.IMPORT_JOBS.wait(blocker.id, timeout=30)
+        resp = client.post('/api/import', data={'file': (self._build_import_workbook(
+            clients=self.MERGE_CLIENTS), 'test.xlsx')}, content_type='multipart/form-data')
+        assert resp.status_code == 200
+        assert client.get('/api/clients').get_json()['total'] == len(self.MERGE_CLIENTS)
+
+    def test_cancel_import_job(self, client):
+        """Cancelling a running job stops it at its next checkpoint; finished jobs can't be cancelled."""
+        import threading
+        from api.import_jobs import ImportJob
+        started, release = threading.Event(), threading.Event()
+
+        def run(job):
+            started.set()
+            release.wait(30)
+            job.checkpoint()
+
+        job = customer_api.IMPORT_JOBS.submit(ImportJob('replace', destructive=True), run)
+        started.wait(30)
+        resp = client.post(f'/api/import/jobs/{job.id}/cancel')
+        assert resp.status_code == 202 and json.loads(resp.data)['cancel_requested']
+        release.set()
+        customer_api.IMPORT_JOBS.wait(job.id, timeout=30)
+        assert json.loads(client.get(f'/api/import/jobs/{job.id}').data)['status'] == 'cancelled'
+        assert client.post(f'/api/import/jobs/{job.id}/cancel').status_code == 409
+
+    def test_cancelled_import_rolls_back(self, client):
+        """An import cancelled mid-load leaves the stored data as it was."""
+        from api.import_jobs import ImportCancelled, ImportJob
+        self._import(client, self._build_import_workbook(clients=self.MERGE_CLIENTS[:1]))
+
+        class CancelWhileLoading(ImportJob):
+            def rows_loaded(self, sheet, rows):
+                self.request_cancel()
+                super().rows_loaded(sheet, rows)
+
+        wb, _ = customer_api.open_import_workbook(self._build_import_workbook(clients=self.MERGE_CLIENTS[1:]))
+        with pytest.raises(ImportCancelled):
+            customer_api.run_import(wb, 'replace', set(), CancelWhileLoading('replace'))
+        assert self._client_ids().keys() == {'11-1111111'}
+
 
 # ============================================================================
 # EXPORT -> IMPORT ROUNDTRIP TESTS
@@ -987,6 +1292,68 @@ class TestDashboard:
         assert resp.status_code == 200
 
 
+# ============================================================================
+# DUPLICATE PLAN CLEANUP TESTS
+# ============================================================================
+
+def seed_duplicate_plans():
+    """Acme: umbrella and E&O leaked into Cyber; Beta (no client row): clean."""
+    db.session.add(Client(tax_id='00-0000001', client_name='Acme'))
+    acme = CommercialInsurance(tax_id='00-0000001')
+    acme.commercial_plans = [
+        CommercialPlan(plan_type='umbrella', plan_number=1, carrier='Chubb'),
+        CommercialPlan(plan_type='umbrella', plan_number=2, carrier='Travelers'),
+        CommercialPlan(plan_type='professional_eo', plan_number=1, carrier=' chubb '),
+        CommercialPlan(plan_type='cyber', plan_number=1, carrier='CHUBB'),
+        CommercialPlan(plan_type='crime', plan_number=1, carrier=''),
+        CommercialPlan(plan_type='workers_comp', plan_number=1, carrier='Travelers'),
+    ]
+    beta = CommercialInsurance(tax_id='00-0000002')
+    beta.commercial_plans = [
+        CommercialPlan(plan_type='cyber', plan_number=1, carrier='Coalition'),
+        CommercialPlan(plan_type='umbrella', plan_number=1, carrier=''),
+        CommercialPlan(plan_type='crime', plan_number=1, carrier=''),
+    ]
+    db.session.add_all([acme, beta])
+    db.session.commit()
+    return acme, beta
+
+
+class TestDuplicatePlanCleanup:
+    """Tests for /api/cleanup/duplicate-plans."""
+
+    def test_preview(self, client):
+        acme, _ = seed_duplicate_plans()
+        resp = client.get('/api/cleanup/duplicate-plans')
+        assert resp.status_code == 200
+        data = resp.get_json()
+        # Carriers match trimmed and case-insensitively, only against later
+        # sections; workers' comp and blank carriers never count.
+        assert [(d['plan_type'], d['carrier']) for d in data['duplicates']] == [
+            ('umbrella', 'Chubb'), ('professional_eo', ' chubb ')]
+        assert data['duplicates'][0] == {
+            'id': acme.commercial_plans[0].id, 'plan_type': 'umbrella', 'client_name': 'Acme',
+            'tax_id': '00-0000001', 'carrier': 'Chubb', 'plan_number': 1}
+        assert data['count'] == 2
+        assert data['by_type'] == {'umbrella': 1, 'professional_eo': 1}
+
+    def test_delete(self, client):
+        acme, _ = seed_duplicate_plans()
+        acme_id = acme.id
+        resp = client.delete('/api/cleanup/duplicate-plans')
+        assert resp.status_code == 200
+        data = resp.get_json()
+        assert data['deleted'] == 2
+        assert data['details'][1] == {'plan_type': 'professional_eo', 'client_name': 'Acme',
+                                      'tax_id': '00-0000001', 'carrier': ' chubb '}
+        db.session.expire_all()
+        remaining = {(p.plan_type, p.carrier) for p in db.session.query(CommercialPlan).filter_by(
+            commercial_insurance_id=acme_id)}
+        assert remaining == {('umbrella', 'Travelers'), ('cyber', 'CHUBB'), ('crime', ''),
+                             ('workers_comp', 'Travelers')}
+        assert client.get('/api/cleanup/duplicate-plans').get_json()['count'] == 0
+
+
 # ============================================================================
 # HEALTH CHECK
 # ============================================================================
@@ -0,0 +1,633 @@
+"""
+Tests for the dashboard analytics endpoints, which read the policy_lines
+index rather than walking the policy tables.
+"""
+
+import io
+import os
+import sys
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+os.environ['DATABASE_URI'] = 'sqlite:///:memory:'
+os.environ['LAN_ONLY'] = 'false'
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.customer_api import (
+    app, db, Client, Individual, EmployeeBenefit, BenefitPlan,
+    CommercialInsurance, CommercialPlan, PersonalInsurance, HomeownersPolicy,
+)
+from api import customer_api
+
+
+@pytest.fixture(scope='function')
+def client():
+    """Create a test client with isolated in-memory database."""
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    customer_api.DASHBOARD_CACHE.clear()
+
+    with app.app_context():
+        customer_api.Session = customer_api.sessionmaker(bind=db.engine)
+        db.create_all()
+        yield app.test_client()
+        db.session.remove()
+        db.drop_all()
+
+
+def seed():
+    acme = Client(tax_id='00-0000001', client_name='Acme', industry='Retail')
+    eb = EmployeeBenefit(tax_id='00-0000001', ltd_carrier='Guardian', ltd_renewal_date=date(2026, 3, 1))
+    eb.plans = [
+        BenefitPlan(plan_type='medical', plan_number=1, carrier='Aetna', renewal_date=date(2026, 1, 15)),
+        BenefitPlan(plan_type='medical', plan_number=2, carrier='Cigna', renewal_date=date(2026, 2, 1)),
+    ]
+    ci = CommercialInsurance(tax_id='00-0000001', general_liability_carrier='Hartford',
+                             general_liability_renewal_date=date(2026, 1, 20),
+                             general_liability_premium=Decimal('1200.00'))
+    ci.commercial_plans = [
+        CommercialPlan(plan_type='professional_eo', plan_number=1, carrier='Beazley',
+                       renewal_date=date(2026, 5, 1), premium=Decimal('0')),
+        CommercialPlan(plan_type='workers_comp', plan_number=1, carrier='Employers',
+                       renewal_date=date(2026, 6, 1), premium=Decimal('900.50')),
+    ]
+    ind = Individual(individual_id='IND-1', first_name='Sam', last_name='Lee')
+    pi = PersonalInsurance(individual_id='IND-1', homeowners_carrier='Allstate',
+                           homeowners_renewal_date=date(2026, 4, 1), event_carrier='Markel',
+                           event_start_date=date(2026, 2, 10))
+    pi.homeowners_policies = [
+        HomeownersPolicy(policy_number=1, carrier='Allstate', renewal_date=date(2026, 4, 1)),
+        HomeownersPolicy(policy_number=2, carrier='Chubb', renewal_date=date(2026, 4, 2)),
+    ]
+    orphan = PersonalInsurance(individual_id='NOBODY', personal_auto_carrier='Geico',
+                               personal_auto_renewal_date=date(2026, 7, 1))
+    db.session.add_all([acme, eb, ci, ind, pi, orphan])
+    db.session.commit()
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def renewals(client, **params):
+    params.setdefault('start_date', '2026-01-01')
+    params.setdefault('end_date', '2026-12-31')
+    response = client.get('/api/dashboard/renewals', query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+class TestRenewals:
+
+    def test_rows(self, client):
+        seed()
+        data = renewals(client)
+        assert data['total'] == 9
+        assert data['renewals'] == [
+            {'type': 'benefits', 'policy_type': 'Medical', 'renewal_date': '2026-01-15',
+             'client_name': 'Acme', 'tax_id': '00-0000001', 'carrier': 'Aetna'},
+            {'type': 'commercial', 'policy_type': 'General Liability', 'renewal_date': '2026-01-20',
+             'client_name': 'Acme', 'tax_id': '00-0000001', 'carrier': 'Hartford', 'premium': 1200.0},
+            {'type': 'benefits', 'policy_type': 'Medical Plan 2', 'renewal_date': '2026-02-01',
+             'client_name': 'Acme', 'tax_id': '00-0000001', 'carrier': 'Cigna'},
+            {'type': 'personal', 'policy_type': 'Event Insurance', 'renewal_date': '2026-02-10',
+             'client_name': 'Sam Lee', 'tax_id': 'IND-1', 'carrier': 'Markel'},
+            {'type': 'benefits', 'policy_type': 'LTD', 'renewal_date': '2026-03-01',
+             'client_name': 'Acme', 'tax_id': '00-0000001', 'carrier': 'Guardian'},
+            # The flat homeowners columns stand for the first policy; policy 2 isn't listed.
+            {'type': 'personal', 'policy_type': 'Homeowners', 'renewal_date': '2026-04-01',
+             'client_name': 'Sam Lee', 'tax_id': 'IND-1', 'carrier': 'Allstate'},
+            {'type': 'commercial', 'policy_type': 'Professional E&O', 'renewal_date': '2026-05-01',
+             'client_name': 'Acme', 'tax_id': '00-0000001', 'carrier': 'Beazley', 'premium': None},
+            {'type': 'commercial', 'policy_type': 'Workers Comp', 'renewal_date': '2026-06-01',
+             'client_name': 'Acme', 'tax_id': '00-0000001', 'carrier': 'Employers', 'premium': 900.5},
+            {'type': 'personal', 'policy_type': 'Personal Auto', 'renewal_date': '2026-07-01',
+             'client_name': None, 'tax_id': 'NOBODY', 'carrier': 'Geico'},
+        ]
+
+    def test_window_is_inclusive(self, client):
+        seed()
+        data = renewals(client, start_date='2026-02-01', end_date='2026-02-10')
+        assert [r['renewal_date'] for r in data['renewals']] == ['2026-02-01', '2026-02-10']
+
+    def test_limit_keeps_total(self, client):
+        seed()
+        data = renewals(client, limit=2)
+        assert [r['carrier'] for r in data['renewals']] == ['Aetna', 'Hartford']
+        assert data['total'] == 9
+
+    def test_bad_limit(self, client):
+        response = client.get('/api/dashboard/renewals?limit=0')
+        assert response.status_code == 400
+
+    def test_one_query(self, client):
+        seed()
+        with count_queries() as statements:
+            renewals(client)
+        selects = [s for s in statements if 'policy_lines' in s]
+        assert len(selects) == 1
+        assert not any('employee_benefits' in s or 'commercial_insurance' in s for s in statements)
+
+    def test_follows_edits(self, client):
+        seed()
+        eb = db.session.query(EmployeeBenefit).one()
+        eb.ltd_renewal_date = date(2027, 1, 1)
+        db.session.commit()
+        assert 'LTD' not in [r['policy_type'] for r in renewals(client)['renewals']]
+
+
+def aggregations(client):
+    response = client.get('/api/dashboard/policy-aggregations')
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+class TestPolicyAggregations:
+
+    def test_counts(self, client):
+        seed()
+        data = aggregations(client)
+        # Benefits: 2 medical plans + LTD; commercial: GL + E&O + WC plan.
+        assert data['by_industry'] == [{'industry': 'Retail', 'count': 6}]
+        assert data['by_coverage_type'] == [
+            {'coverage_type': 'Med', 'category': 'benefits', 'count': 2},
+            {'coverage_type': 'E&O', 'category': 'commercial', 'count': 1},
+            {'coverage_type': 'Event', 'category': 'personal', 'count': 1},
+            {'coverage_type': 'GL', 'category': 'commercial', 'count': 1},
+            {'coverage_type': 'Home', 'category': 'personal', 'count': 1},
+            {'coverage_type': 'LTD', 'category': 'benefits', 'count': 1},
+            {'coverage_type': 'Personal Auto', 'category': 'personal', 'count': 1},
+            {'coverage_type': 'WC', 'category': 'commercial', 'count': 1},
+        ]
+        carriers = {r['carrier']: r['count'] for r in data['by_carrier']}
+        assert carriers['Allstate'] == 1  # flat homeowners only, not policy 1 again
+        assert 'Chubb' not in carriers
+        assert sum(carriers.values()) == 9
+
+    def test_unspecified_industry_and_blank_carriers(self, client):
+        db.session.add_all([
+            Client(tax_id='00-0000002', client_name='Beta', industry=''),
+            EmployeeBenefit(tax_id='00-0000002', std_carrier=' Unum ', k401_carrier=''),
+            CommercialInsurance(tax_id='99-0000000', bop_carrier='Travelers'),  # no client
+        ])
+        db.session.commit()
+        data = aggregations(client)
+        assert data['by_industry'] == [{'industry': 'Unspecified', 'count': 2}]
+        assert {r['carrier'] for r in data['by_carrier']} == {'Unum', 'Travelers'}
+
+    def test_cached_until_a_write(self, client):
+        seed()
+        first = aggregations(client)
+        with count_queries() as statements:
+            assert aggregations(client) == first
+        assert not any('GROUP BY' in s for s in statements)
+
+        eb = db.session.query(EmployeeBenefit).one()
+        eb.std_carrier = 'MetLife'
+        db.session.commit()
+        carriers = {r['carrier'] for r in aggregations(client)['by_carrier']}
+        assert 'MetLife' in carriers
+
+    def test_industry_change_invalidates(self, client):
+        seed()
+        aggregations(client)
+        acme = db.session.query(Client).one()
+        acme.industry = 'Tech'
+        db.session.commit()
+        assert aggregations(client)['by_industry'] == [{'industry': 'Tech', 'count': 6}]
+
+
+def seed_cross_sell():
+    db.session.add_all([
+        Client(tax_id='00-0000001', client_name='Acme', industry='Retail', total_ees=50),
+        EmployeeBenefit(tax_id='00-0000001', ltd_renewal_date=date(2026, 2, 1), plans=[
+            BenefitPlan(plan_type='medical', plan_number=1, renewal_date=date(2026, 3, 1))]),
+        Client(tax_id='00-0000002', client_name='Beta', industry='Tech', total_ees=5),
+        CommercialInsurance(tax_id='00-0000002', workers_comp_renewal_date=date(2026, 1, 10)),
+        Client(tax_id='00-0000003', client_name='Both', industry='Retail', total_ees=80),
+        EmployeeBenefit(tax_id='00-0000003', ltd_renewal_date=date(2026, 1, 1)),
+        CommercialInsurance(tax_id='00-0000003'),
+        # A pre-2000 date is a placeholder and sorts with the undated clients.
+        Client(tax_id='00-0000004', client_name='Dated', industry='Retail', total_ees=20),
+        EmployeeBenefit(tax_id='00-0000004', std_renewal_date=date(1990, 1, 1)),
+        Client(tax_id='00-0000005', client_name='Undated', industry='Retail', total_ees=200),
+        EmployeeBenefit(tax_id='00-0000005'),
+        Client(tax_id='00-0000006', client_name='Early', industry='Tech'),
+        EmployeeBenefit(tax_id='00-0000006', plans=[
+            BenefitPlan(plan_type='dental', plan_number=1, renewal_date=date(2025, 12, 1))]),
+        Client(tax_id='00-0000007', client_name='Prospect'),
+    ])
+    db.session.commit()
+
+
+def cross_sell(client, **params):
+    response = client.get('/api/dashboard/cross-sell', query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def names(rows):
+    return [r['client_name'] for r in rows]
+
+
+class TestCrossSell:
+
+    def test_segments(self, client):
+        seed_cross_sell()
+        data = cross_sell(client)
+        assert names(data['benefits_only']) == ['Early', 'Acme', 'Dated', 'Undated']
+        assert data['benefits_only'][1] == {
+            'tax_id': '00-0000001', 'client_name': 'Acme', 'contact_person': None, 'email': None,
+            'earliest_renewal': '2026-02-01',
+        }
+        assert [r['earliest_renewal'] for r in data['benefits_only'][2:]] == ['1990-01-01', None]
+        assert data['commercial_only'][0]['earliest_renewal'] == '2026-01-10'
+        assert names(data['commercial_only']) == ['Beta']
+        assert data['total_opportunities'] == 5
+        assert 'page' not in data
+
+    def test_filters(self, client):
+        seed_cross_sell()
+        data = cross_sell(client, industry='Retail', min_employees=20)
+        assert names(data['benefits_only']) == ['Acme', 'Dated', 'Undated']
+        assert data['commercial_only'] == []
+        assert data['total_opportunities'] == 3
+
+    def test_sort(self, client):
+        seed_cross_sell()
+        data = cross_sell(client, sort='-total_ees', segment='benefits_only')
+        # Clients without a headcount come last either way.
+        assert names(data['benefits_only']) == ['Undated', 'Acme', 'Dated', 'Early']
+        assert 'commercial_only' not in data
+
+    def test_pages(self, client):
+        seed_cross_sell()
+        first = cross_sell(client, segment='benefits_only', limit=3)
+        assert names(first['benefits_only']) == ['Early', 'Acme', 'Dated']
+        assert first['page']['benefits_only']['total'] == 4
+        rest = cross_sell(client, segment='benefits_only', limit=3,
+                          after=first['page']['benefits_only']['next_cursor'])
+        assert names(rest['benefits_only']) == ['Undated']
+        assert rest['page']['benefits_only'] == {'next_cursor': None, 'total': 4}
+
+    def test_bad_params(self, client):
+        for params in ({'segment': 'personal_only'}, {'sort': 'carrier'}, {'min_employees': 'ten'},
+                       {'limit': 2, 'after': 'abc'}, {'segment': 'benefits_only', 'limit': 2, 'after': '!!'}):
+            response = client.get('/api/dashboard/cross-sell', query_string=params)
+            assert response.status_code == 400, params
+
+    def test_query_count_independent_of_rows(self, client):
+        seed_cross_sell()
+        with count_queries() as small:
+            cross_sell(client)
+        db.session.add_all(
+            [Client(tax_id=f'11-{i:07d}', client_name=f'Extra {i}') for i in range(20)]
+            + [EmployeeBenefit(tax_id=f'11-{i:07d}', ltd_renewal_date=date(2026, 5, 1)) for i in range(20)]
+        )
+        db.session.commit()
+        with count_queries() as large:
+            assert len(cross_sell(client)['benefits_only']) == 24
+        assert len(large) == len(small)
+
+
+def cache_stats(client):
+    response = client.get('/api/admin/dashboard-cache')
+    assert response.status_code == 200
+    return response.get_json()
+
+
+class TestDashboardCache:
+
+    def test_hits_and_misses(self, client):
+        seed()
+        for _ in range(2):
+            renewals(client)
+            cross_sell(client)
+            aggregations(client)
+        stats = cache_stats(client)
+        assert (stats['hits'], stats['misses'], stats['entries']) == (3, 3, 3)
+        assert stats['hit_rate'] == 0.5
+
+    def test_keyed_by_params(self, client):
+        seed()
+        renewals(client, limit=2)
+        assert len(renewals(client)['renewals']) == 9
+        assert cache_stats(client)['misses'] == 2
+
+    def test_write_drops_only_tagged_entries(self, client):
+        seed()
+        renewals(client)
+        cross_sell(client)
+        aggregations(client)
+        ind = db.session.query(Individual).one()
+        ind.first_name = 'Samantha'
+        db.session.commit()
+        # Only renewals reads individuals.
+        stats = cache_stats(client)
+        assert (stats['entries'], stats['invalidations']) == (2, 1)
+        assert 'Samantha Lee' in [r['client_name'] for r in renewals(client)['renewals']]
+        cross_sell(client)
+        aggregations(client)
+        assert cache_stats(client)['hits'] == 2
+
+    def test_rollback_keeps_entries(self, client):
+        seed()
+        aggregations(client)
+        db.session.query(Client).one().industry = 'Tech'
+        db.session.flush()
+        db.session.rollback()
+        assert aggregations(client)['by_industry'] == [{'industry': 'Retail', 'count': 6}]
+        assert cache_stats(client)['hits'] == 1
+
+    def test_write_from_another_worker(self, client):
+        seed()
+        aggregations(client)
+        # Another process's commit: this one's cache never hears of it, but
+        # the version it bumped is in the shared table_versions row.
+        with db.engine.connect() as conn:
+            conn.execute(db.text("UPDATE clients SET industry = 'Tech'"))
+            conn.execute(db.text(
+                "UPDATE table_versions SET version = version + 1 WHERE table_name = 'clients'"))
+            conn.commit()
+        assert cache_stats(client)['entries'] == 1
+        assert aggregations(client)['by_industry'] == [{'industry': 'Tech', 'count': 6}]
+
+
+def refresh_snapshots(client):
+    response = client.post('/api/admin/dashboard-snapshots/refresh')
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['refreshed']
+
+
+class TestDashboardSnapshots:
+
+    def test_served_from_snapshot(self, client):
+        seed()
+        live = aggregations(client)
+        assert live.pop('snapshot') is None
+        refreshed = refresh_snapshots(client)
+        assert ['policy-aggregations'] in refreshed and ['cross-sell', []] in refreshed
+        # Tamper with the stored body: what comes back is the row, not a recompute.
+        row = db.session.get(customer_api.DashboardSnapshot, '["policy-aggregations"]')
+        row.payload = '{"by_industry": []}'
+        db.session.commit()
+        body = aggregations(client)
+        assert body['by_industry'] == []
+        assert body['snapshot']['age_seconds'] >= 0
+        assert set(body['snapshot']) == {'refreshed_at', 'age_seconds'}
+
+    def test_snapshot_matches_live(self, client):
+        seed()
+        live = {'cross_sell': cross_sell(client), 'aggregations': aggregations(client)}
+        refresh_snapshots(client)
+        customer_api.DASHBOARD_CACHE.clear()
+        for name, body in (('cross_sell', cross_sell(client)), ('aggregations', aggregations(client))):
+            assert body.pop('snapshot') is not None
+            live[name].pop('snapshot')
+            assert body == live[name]
+
+    def test_renewal_windows(self, client):
+        seed()
+        refresh_snapshots(client)
+        # The endpoint's default window, and the Dashboard page's.
+        assert client.get('/api/dashboard/renewals').get_json()['snapshot'] is not None
+        today = date.today()
+        start = (today.replace(day=1) + timedelta(days=32)).replace(day=1)
+        end = date(start.year + 1, start.month, 1) - timedelta(days=1)
+        assert renewals(client, start_date=start.isoformat(), end_date=end.isoformat())['snapshot'] is not None
+        assert renewals(client)['snapshot'] is None
+
+    def test_stale_snapshot_computed_live(self, client):
+        seed()
+        refresh_snapshots(client)
+        assert aggregations(client)['snapshot'] is not None
+        db.session.query(Client).one().industry = 'Tech'
+        db.session.commit()
+        body = aggregations(client)
+        assert body['snapshot'] is None
+        assert body['by_industry'] == [{'industry': 'Tech', 'count': 6}]
+        listed = client.get('/api/admin/dashboard-snapshots').get_json()['snapshots']
+        assert [s['current'] for s in listed if s['key'] == ['policy-aggregations']] == [False]
+        # The refresh reaches payloads already cached live.
+        refresh_snapshots(client)
+        assert aggregations(client)['snapshot'] is not None
+
+    def test_import_refreshes(self, client):
+        seed()
+        xlsx = io.BytesIO(client.get('/api/export').data)
+        response = client.post('/api/import', data={'file': (xlsx, 'export.xlsx')},
+                               content_type='multipart/form-data')
+        assert response.status_code == 200, response.get_json()
+        listed = client.get('/api/admin/dashboard-snapshots').get_json()['snapshots']
+        assert len(listed) == 4
+        assert all(s['current'] for s in listed)
+        assert aggregations(client)['snapshot'] is not None
+
+
+def seed_outstanding():
+    eb = EmployeeBenefit(tax_id='00-0000001', enrollment_poc='Pat',
+                         std_outstanding_item='Premium Due', std_outstanding_item_due_date=date(2026, 2, 1),
+                         ltd_carrier='Guardian', ltd_outstanding_item='Complete', k401_outstanding_item='None')
+    eb.plans = [
+        BenefitPlan(plan_type='medical', plan_number=1, carrier='Aetna'),
+        BenefitPlan(plan_type='medical', plan_number=2, carrier='Cigna', outstanding_item='Cancel Due'),
+    ]
+    ci = CommercialInsurance(tax_id='00-0000001', assigned_to='Kim', general_liability_outstanding_item='In Audit',
+                             # Superseded by the WC plan row, so not listed.
+                             workers_comp_carrier='Old', workers_comp_outstanding_item='Premium Due')
+    ci.commercial_plans = [CommercialPlan(plan_type='workers_comp', plan_number=1, carrier='Employers',
+                                          outstanding_item='Premium Due',
+                                          outstanding_item_due_date=date(2026, 1, 15))]
+    # No WC plan rows: the flat columns are shown as the WC plan.
+    legacy = CommercialInsurance(tax_id='00-0000002', workers_comp_carrier='Legacy',
+                                 workers_comp_outstanding_item='Cancel Due',
+                                 workers_comp_outstanding_item_due_date=date(2026, 3, 1))
+    pi = PersonalInsurance(individual_id='IND-1', homeowners_outstanding_item='In Audit',
+                           homeowners_renewal_date=date(2026, 4, 1))
+    pi.homeowners_policies = [HomeownersPolicy(policy_number=1, outstanding_item='Ignored')]
+    db.session.add_all([
+        Client(tax_id='00-0000001', client_name='Acme'), Client(tax_id='00-0000002', client_name='Beta'),
+        Individual(individual_id='IND-1', first_name='Sam', last_name='Lee'), eb, ci, legacy, pi,
+    ])
+    db.session.commit()
+    return eb, ci
+
+
+def outstanding(client, **params):
+    response = client.get('/api/dashboard/outstanding', query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+class TestOutstanding:
+
+    def test_items(self, client):
+        eb, ci = seed_outstanding()
+        data = outstanding(client)
+        assert [(r['source'], r['policy'], r['due_date']) for r in data['outstanding']] == [
+            ('Commercial', 'WC', '2026-01-15'),
+            ('Benefits', 'STD', '2026-02-01'),
+            ('Commercial', 'WC', '2026-03-01'),
+            ('Benefits', 'Medical 2', None),
+            ('Commercial', 'GL', None),
+            ('Personal', 'Homeowners', None),
+        ]
+        wc_plan, std, legacy_wc, medical, gl, home = data['outstanding']
+        assert wc_plan['plan_id'] == ci.commercial_plans[0].id
+        assert wc_plan['assigned_to'] == 'Kim'
+        assert std == {
+            'client_name': 'Acme', 'tax_id': '00-0000001', 'source': 'Benefits', 'prefix': 'std',
+            'policy': 'STD', 'assigned_to': 'Pat', 'renewal_date': None,
+            'outstanding_item': 'Premium Due', 'due_date': '2026-02-01',
+        }
+        assert 'plan_id' not in legacy_wc and legacy_wc['prefix'] == 'workers_comp'
+        assert medical['plan_id'] == eb.plans[1].id
+        assert home == {
+            'client_name': 'Sam Lee', 'tax_id': None, 'individual_id': 'IND-1', 'source': 'Personal',
+            'prefix': 'homeowners', 'policy': 'Homeowners', 'assigned_to': '', 'renewal_date': '2026-04-01',
+            'outstanding_item': 'In Audit', 'due_date': None,
+        }
+        assert data['total'] == 6
+        assert data['by_source'] == {'benefits': 2, 'commercial': 3, 'personal': 1}
+        assert data['by_status'] == {'Premium Due': 2, 'Cancel Due': 2, 'In Audit': 2}
+
+    def test_filters_keep_counts(self, client):
+        seed_outstanding()
+        data = outstanding(client, source='commercial', outstanding_item='Cancel Due')
+        assert [r['policy'] for r in data['outstanding']] == ['WC']
+        assert data['by_source']['benefits'] == 2
+        response = client.get('/api/dashboard/outstanding?source=cobra')
+        assert response.status_code == 400
+
+    def test_pages(self, client):
+        seed_outstanding()
+        everything = outstanding(client)['outstanding']
+        seen, cursor = [], None
+        while True:
+            data = outstanding(client, limit=4, **({'after': cursor} if cursor else {}))
+            assert data['total'] == 6
+            seen += data['outstanding']
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        assert seen == everything
+
+    def test_clear_removes_each_item(self, client):
+        seed_outstanding()
+        for item in outstanding(client)['outstanding']:
+            # The payload Dashboard.js sends for the row.
+            payload = {'source': item['source'].lower()}
+            if 'plan_id' in item:
+                payload['plan_id'] = item['plan_id']
+            else:
+                payload['prefix'] = item['prefix']
+                if item['source'] == 'Personal':
+                    payload['individual_id'] = item['individual_id']
+                else:
+                    payload['tax_id'] = item['tax_id']
+            response = client.post('/api/actions/clear-outstanding', json=payload)
+            assert response.status_code == 200, response.get_json()
+        data = outstanding(client)
+        assert data['outstanding'] == []
+        assert data['by_status'] == {}
+
+
+def calendar(client, **params):
+    response = client.get('/api/dashboard/renewal-calendar', query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+class TestRenewalCalendar:
+
+    def test_months_by_line_of_business(self, client):
+        seed()
+        data = calendar(client, start='2026-01-01', end='2026-07-31')
+        assert [b['start'] for b in data['buckets']] == [f'2026-0{m}-01' for m in range(1, 8)]
+        january, february = data['buckets'][:2]
+        assert (january['count'], january['premium']) == (2, 1200.0)
+        assert january['groups'] == [
+            {'key': 'benefits', 'count': 1, 'premium': 0.0},
+            {'key': 'commercial', 'count': 1, 'premium': 1200.0},
+        ]
+        assert february['groups'] == [
+            {'key': 'benefits', 'count': 1, 'premium': 0.0},
+            {'key': 'personal', 'count': 1, 'premium': 0.0},
+        ]
+        # Both homeowners_policies rows; the flat columns mirroring policy 1 aren't counted again.
+        assert data['buckets'][3]['count'] == 2
+        # Renewals lists the flat homeowners columns only, so not policy 2.
+        assert sum(b['count'] for b in data['buckets']) == renewals(client)['total'] + 1
+
+    def test_flat_wc_superseded_by_plan_rows(self, client):
+        db.session.add_all([
+            Client(tax_id='00-0000002', client_name='Beta'),
+            CommercialInsurance(
+                tax_id='00-0000002', workers_comp_carrier='Employers',
+                workers_comp_renewal_date=date(2026, 6, 1), workers_comp_premium=Decimal('900.50'),
+                commercial_plans=[CommercialPlan(plan_type='workers_comp', plan_number=1, carrier='Employers',
+                                                 renewal_date=date(2026, 6, 1), premium=Decimal('900.50'))]),
+        ])
+        db.session.commit()
+        june = calendar(client, start='2026-06-01', end='2026-06-30')['buckets'][0]
+        assert (june['count'], june['premium']) == (1, 900.5)
+        summary = client.get('/api/analytics/premiums?year=2026').get_json()['summary']
+        assert (summary['count'], summary['total']) == (june['count'], june['premium'])
+
+    def test_weeks_start_monday(self, client):
+        seed()
+        data = calendar(client, granularity='week', start='2026-01-14', end='2026-01-31')
+        # 2026-01-14 is a Wednesday.
+        assert [(b['start'], b['count']) for b in data['buckets']] == [
+            ('2026-01-12', 1), ('2026-01-19', 1), ('2026-01-26', 0),
+        ]
+
+    def test_split_by_carrier_and_poc(self, client):
+        seed()
+        eb = db.session.query(EmployeeBenefit).one()
+        eb.enrollment_poc = 'Pat'
+        db.session.query(CommercialInsurance).one().assigned_to = 'Kim'
+        db.session.commit()
+        june = calendar(client, start='2026-06-01', end='2026-06-30', by='carrier')['buckets'][0]
+        assert june['groups'] == [{'key': 'Employers', 'count': 1, 'premium': 900.5}]
+        january = calendar(client, start='2026-01-01', end='2026-01-31', by='poc')['buckets'][0]
+        assert january['groups'] == [
+            {'key': 'Kim', 'count': 1, 'premium': 1200.0},
+            {'key': 'Pat', 'count': 1, 'premium': 0.0},
+        ]
+        february = calendar(client, start='2026-02-01', end='2026-02-28', by='poc')['buckets'][0]
+        assert {g['key'] for g in february['groups']} == {'Pat', None}
+
+    def test_bad_params(self, client):
+        for params in ({'granularity': 'day'}, {'by': 'industry'}, {'start': 'soon'},
+                       {'start': '2026-02-01', 'end': '2026-01-01'},
+                       {'granularity': 'week', 'start': '0001-01-01', 'end': '9999-12-31'}):
+            response = client.get('/api/dashboard/renewal-calendar', query_string=params)
+            assert response.status_code == 400, params
+
+    def test_cached_until_a_write(self, client):
+        seed()
+        params = {'start': '2026-01-01', 'end': '2026-12-31'}
+        first = calendar(client, **params)
+        with count_queries() as statements:
+            assert calendar(client, **params) == first
+        assert not any('GROUP BY' in s for s in statements)
+        eb = db.session.query(EmployeeBenefit).one()
+        eb.ltd_renewal_date = date(2027, 1, 1)
+        db.session.commit()
+        assert calendar(client, **params)['buckets'][2]['count'] == 0
@@ -0,0 +1,79 @@
+"""
+Tests for the app's JSON provider: orjson when installed, stdlib otherwise,
+with the same output from both.
+"""
+
+import pytest
+import os
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+
+os.environ['DATABASE_URI'] = 'sqlite:///:memory:'
+os.environ['LAN_ONLY'] = 'false'
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import jsonify
+
+from api.customer_api import app
+from api import json_provider
+
+PAYLOAD = {
+    'name': 'Acme',
+    'renewal_date': date(2025, 6, 1),
+    'created_at': datetime(2024, 3, 4, 5, 6, 7, 890),
+    'premium': Decimal('1250.50'),
+    'items': [{'b': 1, 'a': None}, True, 0.1],
+}
+EXPECTED = ('{"created_at":"2024-03-04T05:06:07.000890","items":[{"a":null,"b":1},true,0.1],'
+            '"name":"Acme","premium":1250.5,"renewal_date":"2025-06-01"}')
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def encoder(request, monkeypatch):
+    if request.param == 'orjson':
+        if json_provider.orjson is None:
+            pytest.skip('orjson not installed')
+    else:
+        monkeypatch.setattr(json_provider, 'orjson', None)
+    return request.param
+
+
+def test_app_uses_provider():
+    assert isinstance(app.json, json_provider.FastJSONProvider)
+
+
+def test_dumps(encoder):
+    assert app.json.dumps(PAYLOAD) == EXPECTED
+
+
+def test_jsonify_response(encoder):
+    with app.test_request_context():
+        response = jsonify(PAYLOAD)
+    assert response.mimetype == 'application/json'
+    assert response.get_data(as_text=True) == EXPECTED + '\n'
+
+
+@pytest.mark.parametrize('obj, expected', [
+    ({'n': 'Café ✓'}, '{"n":"Café ✓"}'),
+    ({'f': float('nan'), 'i': [float('-inf')], 'd': Decimal('NaN'), 'x': 1.5},
+     '{"d":null,"f":null,"i":[null],"x":1.5}'),
+])
+def test_non_ascii_and_nan(encoder, obj, expected):
+    assert app.json.dumps(obj) == expected
+    with app.test_request_context():
+        assert jsonify(obj).get_data(as_text=True) == expected + '\n'
+
+
+def test_loads(encoder):
+    assert app.json.loads(b'{"a":[1,2.5,"x"]}') == {'a': [1, 2.5, 'x']}
+
+
+def test_keyword_options_use_stdlib():
+    assert app.json.dumps({'a': 1}, indent=2) == '{\n  "a": 1\n}'
+
+
+def test_unknown_type_rejected(encoder):
+    with pytest.raises(TypeError):
+        app.json.dumps({'a': object()})
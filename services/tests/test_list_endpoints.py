@@ -0,0 +1,584 @@
+"""
+Tests for the collection (list) endpoints: the number of SQL statements a
+list request issues must not grow with the number of rows returned.
+"""
+
+import json
+import pytest
+import os
+import sys
+from contextlib import contextmanager
+from datetime import date
+
+from sqlalchemy import event
+
+# Ensure test DB is set before importing app
+os.environ['DATABASE_URI'] = 'sqlite:///:memory:'
+os.environ['LAN_ONLY'] = 'false'
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.customer_api import (
+    app, db, Client, ClientContact, Individual, EmployeeBenefit, BenefitPlan,
+    CommercialInsurance, CommercialPlan, PersonalInsurance, HomeownersPolicy,
+    CobraCoverage, Invoice,
+)
+from api import customer_api
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture(scope='function')
+def client():
+    """Create a test client with isolated in-memory database."""
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+
+    with app.app_context():
+        customer_api.Session = customer_api.sessionmaker(bind=db.engine)
+        db.create_all()
+        yield app.test_client()
+        db.session.remove()
+        db.drop_all()
+
+
+def seed(start, count):
+    """Insert `count` clients, each with a full set of related records."""
+    for i in range(start, start + count):
+        tax_id = f'00-{i:07d}'
+        c = Client(tax_id=tax_id, client_name=f'Client {i:03d}',
+                   status='Active' if i % 2 == 0 else 'Inactive')
+        c.contacts = [
+            ClientContact(contact_person=f'Contact {i}', sort_order=0),
+            ClientContact(contact_person=f'Alt {i}', sort_order=1),
+        ]
+        db.session.add(c)
+
+        eb = EmployeeBenefit(tax_id=tax_id, enrollment_poc=f'POC {i}',
+                             renewal_date=date(2025, 1, i % 28 + 1) if i % 3 == 0 else None)
+        eb.plans = [
+            BenefitPlan(plan_type='medical', plan_number=1, carrier='Aetna',
+                        renewal_date=date(2025, i % 12 + 1, 1)),
+            BenefitPlan(plan_type='dental', plan_number=1, carrier='Delta'),
+        ]
+        db.session.add(eb)
+
+        ci = CommercialInsurance(tax_id=tax_id, assigned_to=f'Agent {i % 3}',
+                                 general_liability_carrier='Hartford' if i % 4 == 0 else None)
+        ci.commercial_plans = [
+            CommercialPlan(plan_type='umbrella', plan_number=1, carrier='Chubb'),
+        ]
+        db.session.add(ci)
+
+        db.session.add(CobraCoverage(tax_id=tax_id, first_name='Pat', last_name=f'Doe{i}'))
+        db.session.add(Invoice(invoice_number=i + 1, tax_id=tax_id, invoice_date=date(2025, 1, 1)))
+
+        ind_id = f'IND-{i:05d}'
+        db.session.add(Individual(individual_id=ind_id, first_name='Sam', last_name=f'Lee{i}'))
+        pi = PersonalInsurance(individual_id=ind_id)
+        pi.homeowners_policies = [HomeownersPolicy(policy_number=1, carrier='Allstate')]
+        db.session.add(pi)
+    db.session.commit()
+
+
+@contextmanager
+def count_selects():
+    """Count SELECT statements issued against the test engine."""
+    counter = {'n': 0}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            counter['n'] += 1
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def selects_for(client, url):
+    with count_selects() as counter:
+        response = client.get(url)
+    assert response.status_code == 200
+    return counter['n'], response.get_json()
+
+
+# ============================================================================
+# QUERY COUNT TESTS
+# ============================================================================
+
+LIST_URLS = [
+    '/api/clients',
+    '/api/benefits',
+    '/api/commercial',
+    '/api/personal',
+    '/api/cobra',
+    '/api/invoices',
+]
+
+
+class TestListQueryCounts:
+
+    @pytest.mark.parametrize('url', LIST_URLS)
+    def test_query_count_independent_of_row_count(self, client, url):
+        seed(0, 2)
+        small, _ = selects_for(client, url)
+        seed(2, 20)
+        large, _ = selects_for(client, url)
+        assert large == small
+        assert small <= 4
+
+    def test_client_coverage_flags(self, client):
+        seed(0, 1)
+        db.session.add(Client(tax_id='99-0000000', client_name='Bare Client'))
+        db.session.commit()
+        _, data = selects_for(client, '/api/clients')
+        by_tax_id = {c['tax_id']: c for c in data['clients']}
+        assert by_tax_id['00-0000000']['has_employee_benefits'] is True
+        assert by_tax_id['00-0000000']['has_commercial_insurance'] is True
+        assert by_tax_id['99-0000000']['has_employee_benefits'] is False
+        assert by_tax_id['99-0000000']['has_commercial_insurance'] is False
+
+    def test_eager_loaded_children_serialized(self, client):
+        seed(0, 3)
+        _, data = selects_for(client, '/api/benefits')
+        assert len(data['benefits']) == 3
+        assert all(b['client_name'] for b in data['benefits'])
+
+        _, data = selects_for(client, '/api/cobra')
+        assert {c['assigned_to'] for c in data} == {'POC 0', 'POC 1', 'POC 2'}
+
+
+# ============================================================================
+# FILTERING, SORTING AND PAGINATION
+# ============================================================================
+
+def walk_pages(client, url, key):
+    """Follow next_cursor until the last page; return all items and page count."""
+    items, pages, after = [], 0, None
+    while True:
+        sep = '&' if '?' in url else '?'
+        page_url = url + (f'{sep}after={after}' if after else '')
+        response = client.get(page_url)
+        assert response.status_code == 200
+        data = response.get_json()
+        items.extend(data[key])
+        pages += 1
+        after = data['next_cursor']
+        if not after:
+            return items, pages, data
+
+
+class TestListPagination:
+
+    def test_unpaginated_shape_unchanged(self, client):
+        seed(0, 3)
+        data = client.get('/api/clients').get_json()
+        assert data['total'] == 3
+        assert 'next_cursor' not in data
+        assert isinstance(client.get('/api/cobra').get_json(), list)
+        assert isinstance(client.get('/api/invoices').get_json(), list)
+
+    def test_keyset_pages_cover_every_row_once(self, client):
+        seed(0, 23)
+        items, pages, last = walk_pages(client, '/api/clients?limit=5', 'clients')
+        assert pages == 5
+        assert sorted(c['id'] for c in items) == list(range(1, 24))
+        assert last['total'] == 23
+        assert last['total_is_estimate'] is False
+
+    def test_sort_descending_by_joined_column(self, client):
+        seed(0, 12)
+        items, _, _ = walk_pages(client, '/api/benefits?limit=5&sort=-client_name', 'benefits')
+        names = [b['client_name'] for b in items]
+        assert names == sorted(names, reverse=True)
+        assert len(names) == 12
+
+    @pytest.mark.parametrize('sort', ['renewal_date', '-renewal_date'])
+    def test_sort_with_nulls_pages_cleanly(self, client, sort):
+        seed(0, 9)
+        items, _, _ = walk_pages(client, f'/api/benefits?limit=2&sort={sort}', 'benefits')
+        assert len({b['id'] for b in items}) == 9
+        dates = [b['renewal_date'] for b in items]
+        assert dates[3:] == [None] * 6
+        assert dates[:3] == sorted(dates[:3], reverse=sort.startswith('-'))
+
+    def test_bare_list_endpoints_wrap_when_paginated(self, client):
+        seed(0, 4)
+        items, pages, _ = walk_pages(client, '/api/cobra?limit=3', 'cobra')
+        assert pages == 2 and len(items) == 4
+        items, _, _ = walk_pages(client, '/api/invoices?limit=3&sort=invoice_number', 'invoices')
+        assert [i['invoice_number'] for i in items] == [1, 2, 3, 4]
+
+    def test_total_reflects_filters(self, client):
+        seed(0, 10)
+        data = client.get('/api/clients?limit=2&status=Inactive').get_json()
+        assert len(data['clients']) == 2
+        assert data['total'] == 5
+        assert all(c['status'] == 'Inactive' for c in data['clients'])
+
+
+class TestListFilters:
+
+    def test_carrier_matches_plans_and_flat_columns(self, client):
+        seed(0, 8)
+        assert client.get('/api/benefits?carrier=Delta').get_json()['total'] == 8
+        assert client.get('/api/benefits?carrier=Nobody').get_json()['total'] == 0
+        # Hartford only lives in the flat general_liability_carrier column.
+        data = client.get('/api/commercial?carrier=Hartford').get_json()
+        assert sorted(c['tax_id'] for c in data['commercial']) == ['00-0000000', '00-0000004']
+        assert client.get('/api/personal?carrier=Allstate').get_json()['total'] == 8
+
+    def test_renewal_window(self, client):
+        seed(0, 12)
+        data = client.get('/api/benefits?renewal_from=2025-03-01&renewal_to=2025-05-31').get_json()
+        assert data['total'] == 3
+
+    @pytest.mark.parametrize('url, table, index', [
+        ('/api/benefits?carrier=Delta', 'employee_benefits', 'ix_policy_lines_lob_carrier'),
+        ('/api/commercial?carrier=Hartford', 'commercial_insurance', 'ix_policy_lines_lob_carrier'),
+        ('/api/personal?renewal_from=2025-03-01&renewal_to=2025-05-31', 'personal_insurance',
+         'ix_policy_lines_lob_renewal'),
+    ])
+    def test_policy_filters_use_indexes(self, client, url, table, index):
+        seed(0, 4)
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if 'policy_lines' in statement:
+                statements.append((statement, parameters))
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            assert client.get(url).status_code == 200
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+        # One list query; the filter is a policy_lines index lookup, not a scan.
+        assert len(statements) == 1
+        with db.engine.connect() as conn:
+            plan = ' / '.join(row[-1] for row in conn.exec_driver_sql(
+                'EXPLAIN QUERY PLAN ' + statements[0][0], statements[0][1]))
+        assert f'USING INDEX {index}' in plan
+        assert f'SCAN {table}' not in plan
+
+    def test_poc_and_assigned_to(self, client):
+        seed(0, 6)
+        data = client.get('/api/benefits?enrollment_poc=POC 2').get_json()
+        assert [b['enrollment_poc'] for b in data['benefits']] == ['POC 2']
+        assert client.get('/api/commercial?assigned_to=Agent 1').get_json()['total'] == 2
+        cobra = client.get('/api/cobra?assigned_to=POC 4').get_json()
+        assert [c['assigned_to'] for c in cobra] == ['POC 4']
+
+    def test_invoice_month_filter(self, client):
+        seed(0, 2)
+        assert len(client.get('/api/invoices?month=2025-01').get_json()) == 2
+        assert client.get('/api/invoices?month=2025-02').get_json() == []
+
+    @pytest.mark.parametrize('url', [
+        '/api/clients?sort=password',
+        '/api/clients?limit=0',
+        '/api/clients?limit=abc',
+        '/api/clients?limit=5&after=not-a-cursor',
+        '/api/benefits?renewal_from=someday',
+        '/api/invoices?month=January',
+    ])
+    def test_bad_params_rejected(self, client, url):
+        assert client.get(url).status_code == 400
+
+
+# ============================================================================
+# SPARSE FIELDSETS
+# ============================================================================
+
+def populated(model, **overrides):
+    """Transient instance with every plain column set to a non-empty value."""
+    obj = model(**overrides)
+    for column in model.__table__.columns:
+        if column.primary_key or column.key in overrides:
+            continue
+        if isinstance(column.type, db.DateTime):
+            value = customer_api.datetime(2025, 3, 4, 5, 6, 7)
+        elif isinstance(column.type, db.Date):
+            value = date(2025, 3, 4)
+        elif isinstance(column.type, db.Numeric):
+            value = customer_api.Decimal('1234.50')
+        elif isinstance(column.type, db.Boolean):
+            value = True
+        elif isinstance(column.type, db.Integer):
+            value = 7
+        else:
+            value = f'{column.key}-value'
+        setattr(obj, column.key, value)
+    return obj
+
+
+def all_fields(model):
+    return {key: None for key in customer_api.FIELD_SPECS[model].fields}
+
+
+def store_populated_records():
+    """One client with every column filled in and one with only the keys set."""
+    c = populated(Client, id=1, tax_id='00-1')
+    c.contacts = [populated(ClientContact, client_id=1, sort_order=n) for n in (1, 0)]
+    eb = populated(EmployeeBenefit, id=2, tax_id='00-1')
+    eb.plans = [populated(BenefitPlan, employee_benefit_id=2, plan_type='dental', plan_number=n)
+                for n in (2, 1)]
+    eb.plans.append(populated(BenefitPlan, employee_benefit_id=2, plan_type='medical', plan_number=1))
+    ci = populated(CommercialInsurance, id=3, tax_id='00-1')
+    ci.commercial_plans = [populated(CommercialPlan, commercial_insurance_id=3, plan_type='cyber')]
+    ind = populated(Individual, id=4, individual_id='IND-1')
+    pi = populated(PersonalInsurance, id=5, individual_id='IND-1')
+    pi.homeowners_policies = [populated(HomeownersPolicy, personal_insurance_id=5, policy_number=n)
+                              for n in (2, 1)]
+    db.session.add_all([
+        c, eb, ci, ind, pi,
+        populated(CobraCoverage, id=6, tax_id='00-1'),
+        populated(Invoice, id=7, tax_id='00-1', commercial_id=3, invoice_number=7),
+        Client(id=11, tax_id='00-2'),
+        EmployeeBenefit(id=12, tax_id='00-2'),
+        CommercialInsurance(id=13, tax_id='00-2', workers_comp_carrier='Legacy WC'),
+        Individual(id=14, individual_id='IND-2'),
+        PersonalInsurance(id=15, individual_id='IND-2'),
+        CobraCoverage(id=16, first_name='Pat', last_name='Doe'),
+        Invoice(id=17, tax_id='00-2', invoice_number=17, invoice_date=date(2025, 1, 1)),
+    ])
+    db.session.commit()
+
+
+ROW_ENCODED = [
+    ('/api/clients', 'clients', Client),
+    ('/api/benefits', 'benefits', EmployeeBenefit),
+    ('/api/commercial', 'commercial', CommercialInsurance),
+    ('/api/personal', 'personal', PersonalInsurance),
+    ('/api/cobra', None, CobraCoverage),
+    ('/api/invoices', None, Invoice),
+]
+
+
+def list_items(client, url, key):
+    data = client.get(url).get_json()
+    return sorted(data[key] if key else data, key=lambda item: item['id'])
+
+
+def as_json(items):
+    # Row-encoded items still hold dates and Decimals; the app's provider encodes them.
+    return json.loads(app.json.dumps(items))
+
+
+class TestRowEncoders:
+    """List endpoints encode Core rows; they must match to_dict() exactly."""
+
+    @pytest.mark.parametrize('url,key,model', ROW_ENCODED)
+    def test_rows_match_to_dict(self, client, url, key, model):
+        store_populated_records()
+        objs = customer_api.list_query(db.session, model).order_by(model.id).all()
+        assert len(objs) == 2
+        assert list_items(client, url, key) == as_json([o.to_dict() for o in objs])
+
+    @pytest.mark.parametrize('url,key,model', ROW_ENCODED)
+    def test_sparse_rows_match_instances(self, client, url, key, model):
+        store_populated_records()
+        keys = list(customer_api.FIELD_SPECS[model].fields)[::3] + ['id']
+        fields = {k: None for k in keys}
+        objs = customer_api.list_query(db.session, model).order_by(model.id).all()
+        expected = as_json([customer_api.serialize(o, fields) for o in objs])
+        assert list_items(client, f'{url}?fields={",".join(keys)}', key) == expected
+
+    def test_encoders_are_cached_per_selection(self, client):
+        spec = customer_api.FIELD_SPECS[EmployeeBenefit]
+        keys = spec.keys_for({'tax_id': None, 'client_name': None})
+        assert spec.row_plan(keys) is spec.row_plan(keys)
+        assert spec.attr_encoder(keys) is spec.attr_encoder(keys)
+        assert spec.attr_encoder(keys).keys == keys
+
+
+class TestSparseFields:
+
+    def test_list_returns_only_requested_keys(self, client):
+        seed(0, 3)
+        data = client.get('/api/benefits?fields=tax_id,client_name,enrollment_poc').get_json()
+        assert data['total'] == 3
+        for row in data['benefits']:
+            assert set(row) == {'tax_id', 'client_name', 'enrollment_poc'}
+            assert row['client_name'].startswith('Client ')
+
+    def test_unrequested_columns_not_selected(self, client):
+        seed(0, 2)
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            assert client.get('/api/commercial?fields=tax_id,assigned_to').status_code == 200
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+        sql = ' '.join(statements)
+        assert 'assigned_to' in sql
+        assert 'general_liability_remarks' not in sql
+        assert 'commercial_plans' not in sql
+
+    def test_nested_plan_type_and_plan_field_selectors(self, client):
+        seed(0, 1)
+        data = client.get('/api/benefits?fields=plans.medical,plans.carrier').get_json()
+        assert data['benefits'][0] == {'plans': {'medical': [{'carrier': 'Aetna'}]}}
+
+        data = client.get('/api/benefits?fields=plans.dental').get_json()
+        plans = data['benefits'][0]['plans']
+        assert list(plans) == ['dental']
+        assert plans['dental'][0]['carrier'] == 'Delta'
+
+        data = client.get('/api/clients?fields=tax_id,contacts.contact_person').get_json()
+        assert data['clients'][0]['contacts'] == [
+            {'contact_person': 'Contact 0'}, {'contact_person': 'Alt 0'}]
+
+    def test_fields_with_pagination_and_sort(self, client):
+        seed(0, 5)
+        items, pages, _ = walk_pages(client, '/api/clients?fields=client_name&limit=2&sort=-client_name',
+                                     'clients')
+        assert pages == 3
+        assert [c['client_name'] for c in items] == [f'Client {i:03d}' for i in range(4, -1, -1)]
+
+    def test_cobra_and_invoice_fields(self, client):
+        seed(0, 2)
+        cobra = client.get('/api/cobra?fields=last_name,assigned_to').get_json()
+        assert sorted(cobra, key=lambda c: c['last_name']) == [
+            {'last_name': 'Doe0', 'assigned_to': 'POC 0'},
+            {'last_name': 'Doe1', 'assigned_to': 'POC 1'},
+        ]
+        invoices = client.get('/api/invoices?fields=invoice_number,client_name&sort=invoice_number').get_json()
+        assert invoices == [{'invoice_number': 1, 'client_name': 'Client 000'},
+                            {'invoice_number': 2, 'client_name': 'Client 001'}]
+
+    def test_detail_endpoints(self, client):
+        seed(0, 1)
+        assert client.get('/api/benefits/1?fields=tax_id').get_json() == {'tax_id': '00-0000000'}
+        assert client.get('/api/commercial/1?fields=plans.umbrella,plans.carrier').get_json() == {
+            'plans': {'umbrella': [{'carrier': 'Chubb'}]}}
+        data = client.get('/api/personal/1?fields=individual_name,homeowners_policies_list.carrier').get_json()
+        assert data == {'personal': {'individual_name': 'Sam Lee0',
+                                     'homeowners_policies_list': [{'carrier': 'Allstate'}]}}
+
+    @pytest.mark.parametrize('url', [
+        '/api/clients?fields=password_hash',
+        '/api/benefits?fields=plans.bogus',
+        '/api/benefits?fields=tax_id.sub',
+        '/api/benefits/1?fields=nope',
+        '/api/clients?fields=,',
+    ])
+    def test_unknown_fields_rejected(self, client, url):
+        seed(0, 1)
+        assert client.get(url).status_code == 400
+
+
+# ============================================================================
+# STREAMED RESPONSES
+# ============================================================================
+
+class TestStreamedLists:
+
+    @pytest.mark.parametrize('url,key,model', ROW_ENCODED)
+    def test_unpaginated_lists_stream_in_batches(self, client, monkeypatch, url, key, model):
+        seed(0, 5)
+        with app.test_request_context():
+            expected, _ = customer_api.fetch_list(db.session, model, {})
+        monkeypatch.setattr(customer_api, 'STREAM_BATCH_ROWS', 2)
+        response = client.get(url)
+        assert response.status_code == 200
+        assert 'Content-Length' not in response.headers
+        assert response.mimetype == 'application/json'
+        data = response.get_json()
+        assert (data[key] if key else data) == as_json(expected)
+        if key:
+            assert data['total'] == 5
+
+    def test_empty_table(self, client):
+        assert client.get('/api/benefits').get_json() == {'benefits': [], 'total': 0}
+        assert client.get('/api/cobra').get_json() == []
+
+    def test_paginated_lists_are_not_streamed(self, client):
+        seed(0, 3)
+        response = client.get('/api/benefits?limit=2')
+        assert 'Content-Length' in response.headers
+        assert len(response.get_json()['benefits']) == 2
+
+
+# ============================================================================
+# CONDITIONAL GET
+# ============================================================================
+
+def etag_of(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.headers['ETag']
+
+
+class TestConditionalGet:
+
+    @pytest.mark.parametrize('url', LIST_URLS)
+    def test_matching_etag_skips_the_query(self, client, url):
+        seed(0, 3)
+        etag = etag_of(client, url)
+        with count_selects() as counter:
+            response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+        assert counter['n'] == 1
+
+    def test_stale_etag_gets_full_body(self, client):
+        seed(0, 1)
+        response = client.get('/api/clients', headers={'If-None-Match': '"stale"'})
+        assert response.status_code == 200
+        assert len(response.get_json()['clients']) == 1
+
+    def test_writes_to_dependencies_change_etag(self, client):
+        seed(0, 2)
+        benefits, personal = etag_of(client, '/api/benefits'), etag_of(client, '/api/personal')
+
+        db.session.get(Client, 1).client_name = 'Renamed'
+        db.session.commit()
+        assert etag_of(client, '/api/benefits') != benefits
+        assert etag_of(client, '/api/personal') == personal
+
+        benefits = etag_of(client, '/api/benefits')
+        db.session.query(BenefitPlan).filter_by(plan_type='dental').delete()
+        db.session.commit()
+        assert etag_of(client, '/api/benefits') != benefits
+
+    def test_rolled_back_write_keeps_etag(self, client):
+        seed(0, 1)
+        etag = etag_of(client, '/api/commercial')
+        db.session.add(CommercialPlan(commercial_insurance_id=1, plan_type='cyber', plan_number=1))
+        db.session.flush()
+        db.session.rollback()
+        assert etag_of(client, '/api/commercial') == etag
+
+    def test_versions_bumped_once_at_commit(self, client):
+        seed(0, 1)
+        before = customer_api.read_table_versions(['clients', 'policy_lines'])
+        client_row = db.session.get(Client, 1)
+        client_row.client_name = 'Renamed'
+        db.session.flush()
+        client_row.tax_id = '99-0000000'
+        db.session.flush()
+        # Nothing touched table_versions yet: its rows stay unlocked until commit.
+        assert customer_api.read_table_versions(['clients', 'policy_lines']) == before
+        db.session.commit()
+        assert customer_api.read_table_versions(['clients', 'policy_lines']) == {
+            name: version + 1 for name, version in before.items()}
+
+    def test_query_string_is_part_of_etag(self, client):
+        seed(0, 1)
+        tags = {etag_of(client, url) for url in (
+            '/api/benefits', '/api/benefits?fields=tax_id', '/api/benefits?limit=1')}
+        assert len(tags) == 3
+
+    def test_errors_carry_no_etag(self, client):
+        response = client.get('/api/benefits?sort=bogus')
+        assert response.status_code == 400
+        assert 'ETag' not in response.headers
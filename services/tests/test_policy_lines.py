@@ -0,0 +1,241 @@
+"""
+Tests for the policy_lines index: which coverage lines it holds, and that
+every write path leaves it equal to a rebuild from the policy tables.
+"""
+
+import io
+import os
+import sys
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+os.environ['DATABASE_URI'] = 'sqlite:///:memory:'
+os.environ['LAN_ONLY'] = 'false'
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.customer_api import (
+    app, db, select, Client, Individual, EmployeeBenefit, BenefitPlan,
+    CommercialInsurance, CommercialPlan, PersonalInsurance, HomeownersPolicy, PolicyLine,
+)
+from api import customer_api
+
+
+@pytest.fixture(scope='function')
+def client():
+    """Create a test client with isolated in-memory database."""
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+
+    with app.app_context():
+        customer_api.Session = customer_api.sessionmaker(bind=db.engine)
+        db.create_all()
+        yield app.test_client()
+        db.session.remove()
+        db.drop_all()
+
+
+def seed():
+    c = Client(tax_id='00-0000001', client_name='Acme')
+    eb = EmployeeBenefit(
+        tax_id='00-0000001', ltd_carrier='Guardian', ltd_renewal_date=date(2026, 3, 1),
+        std_outstanding_item='Premium Due', std_outstanding_item_due_date=date(2026, 2, 1),
+        # Mirrors the first medical / dental plan; no line of its own.
+        current_carrier='Aetna', dental_carrier='Delta',
+    )
+    eb.plans = [
+        BenefitPlan(plan_type='medical', plan_number=1, carrier='Aetna', renewal_date=date(2026, 1, 1)),
+        BenefitPlan(plan_type='medical', plan_number=2, carrier='Cigna'),
+    ]
+    ci = CommercialInsurance(tax_id='00-0000001', general_liability_carrier='Hartford',
+                             general_liability_premium=Decimal('1200.00'), umbrella_carrier='Chubb')
+    ci.commercial_plans = [CommercialPlan(plan_type='umbrella', plan_number=1, carrier='Chubb',
+                                          premium=Decimal('800.00'))]
+    ind = Individual(individual_id='IND-1', first_name='Sam', last_name='Lee')
+    pi = PersonalInsurance(individual_id='IND-1', event_carrier='Markel', event_start_date=date(2026, 6, 1))
+    pi.homeowners_policies = [HomeownersPolicy(policy_number=1, carrier='Allstate')]
+    db.session.add_all([c, eb, ci, ind, pi])
+    db.session.commit()
+    return eb, ci, pi
+
+
+def current_lines():
+    table = PolicyLine.__table__
+    columns = [c for c in table.c if c.name != 'id']
+    return sorted(tuple(row) for row in db.session.execute(select(*columns)))
+
+
+def assert_matches_rebuild():
+    lines = current_lines()
+    customer_api.rebuild_policy_lines(db.session.connection())
+    assert lines == current_lines()
+    db.session.rollback()
+
+
+def line(**criteria):
+    rows = db.session.execute(select(PolicyLine).filter_by(**criteria)).scalars().all()
+    assert len(rows) == 1, rows
+    return rows[0]
+
+
+class TestLines:
+
+    def test_one_line_per_coverage(self, client):
+        eb, ci, pi = seed()
+        got = {(l.source, l.policy_type, l.plan_number)
+               for l in db.session.execute(select(PolicyLine)).scalars()}
+        assert got == {
+            ('employee_benefits', 'ltd', 1), ('employee_benefits', 'std', 1),
+            ('benefit_plans', 'medical', 1), ('benefit_plans', 'medical', 2),
+            ('commercial_insurance', 'general_liability', 1), ('commercial_plans', 'umbrella', 1),
+            ('personal_insurance', 'event', 1), ('homeowners_policies', 'homeowners', 1),
+        }
+        assert_matches_rebuild()
+
+    def test_line_columns(self, client):
+        eb, ci, pi = seed()
+        std = line(policy_type='std')
+        assert (std.line_of_business, std.owner_id, std.owner_key) == ('benefits', eb.id, '00-0000001')
+        assert (std.outstanding_item, std.outstanding_item_due_date) == ('Premium Due', date(2026, 2, 1))
+        gl = line(policy_type='general_liability')
+        assert (gl.carrier, gl.premium) == ('Hartford', Decimal('1200.00'))
+        event = line(policy_type='event')
+        assert (event.owner_key, event.renewal_date) == ('IND-1', date(2026, 6, 1))
+        umbrella = line(source='commercial_plans')
+        assert umbrella.source_id == ci.commercial_plans[0].id
+        assert umbrella.owner_id == ci.id
+
+
+class TestWritePaths:
+
+    def test_update_benefit_plans(self, client):
+        eb, _, _ = seed()
+        response = client.put(f'/api/benefits/{eb.id}', json={
+            'plans': {'vision': [{'carrier': 'VSP', 'renewal_date': '2026-04-01'}]},
+            'ltd_carrier': 'Unum',
+        })
+        assert response.status_code == 200
+        assert line(policy_type='ltd').carrier == 'Unum'
+        assert line(source='benefit_plans').policy_type == 'vision'
+        assert_matches_rebuild()
+
+    def test_update_commercial(self, client):
+        _, ci, _ = seed()
+        response = client.put(f'/api/commercial/{ci.id}', json={
+            'general_liability_renewal_date': '2026-09-01',
+            'plans': {'cyber': [{'carrier': 'Coalition', 'premium': '500'}]},
+        })
+        assert response.status_code == 200
+        assert line(policy_type='general_liability').renewal_date == date(2026, 9, 1)
+        assert line(source='commercial_plans').carrier == 'Coalition'
+        assert_matches_rebuild()
+
+    def test_update_personal(self, client):
+        _, _, pi = seed()
+        response = client.put(f'/api/personal/{pi.id}', json={
+            'homeowners_policies_list': [{'carrier': 'Chubb'}, {'carrier': 'Travelers'}],
+        })
+        assert response.status_code == 200
+        carriers = [l.carrier for l in db.session.execute(
+            select(PolicyLine).filter_by(source='homeowners_policies').order_by(PolicyLine.plan_number)
+        ).scalars()]
+        assert carriers == ['Chubb', 'Travelers']
+        assert line(source='personal_insurance', policy_type='homeowners').carrier == 'Chubb'
+        assert_matches_rebuild()
+
+    def test_create_and_delete(self, client):
+        db.session.add(Client(tax_id='00-0000002', client_name='Beta'))
+        db.session.commit()
+        response = client.post('/api/benefits', json={
+            'tax_id': '00-0000002', 'k401_carrier': 'Fidelity',
+            'plans': {'medical': [{'carrier': 'Kaiser'}]},
+        })
+        assert response.status_code == 201
+        benefit_id = response.get_json()['benefit']['id']
+        assert {l.policy_type for l in db.session.execute(select(PolicyLine)).scalars()} == {'k401', 'medical'}
+        assert client.delete(f'/api/benefits/{benefit_id}').status_code == 200
+        assert current_lines() == []
+
+    def test_long_outstanding_note(self, client):
+        """A free-text outstanding item isn't indexed as is: Postgres would reject a long one."""
+        eb, _, _ = seed()
+        note = 'Waiting on census. ' * 280  # ~5 kB
+        response = client.put(f'/api/benefits/{eb.id}', json={'std_outstanding_item': note})
+        assert response.status_code == 200
+        assert line(policy_type='std').outstanding_item == note
+        assert not any('outstanding_item' in index.columns for index in PolicyLine.__table__.indexes)
+        items = client.get('/api/dashboard/outstanding').get_json()['outstanding']
+        assert [item['outstanding_item'] for item in items] == [note]
+
+    def test_clear_outstanding(self, client):
+        seed()
+        response = client.post('/api/actions/clear-outstanding', json={
+            'source': 'benefits', 'tax_id': '00-0000001', 'prefix': 'std'})
+        assert response.status_code == 200
+        # Nothing else was set on STD, so the line goes with the item.
+        assert not db.session.execute(select(PolicyLine).filter_by(policy_type='std')).first()
+        assert line(policy_type='ltd').carrier == 'Guardian'
+        assert_matches_rebuild()
+
+    def test_delete_duplicate_plans(self, client):
+        _, ci, _ = seed()
+        ci.commercial_plans.append(CommercialPlan(plan_type='cyber', plan_number=1, carrier='Chubb'))
+        db.session.commit()
+        response = client.delete('/api/cleanup/duplicate-plans')
+        assert response.status_code == 200
+        assert response.get_json()['deleted'] == 1
+        assert line(source='commercial_plans').policy_type == 'cyber'
+        assert_matches_rebuild()
+
+    def test_owner_key_follows_client_rename(self, client):
+        seed()
+        # Stands in for Postgres' ON UPDATE CASCADE, which SQLite doesn't run.
+        for table in ('employee_benefits', 'commercial_insurance'):
+            db.session.execute(db.text(f"UPDATE {table} SET tax_id = '00-0000009'"))
+        acme = db.session.execute(select(Client)).scalar_one()
+        acme.tax_id = '00-0000009'
+        db.session.commit()
+        keys = {l.owner_key for l in db.session.execute(
+            select(PolicyLine).filter(PolicyLine.line_of_business != 'personal')).scalars()}
+        assert keys == {'00-0000009'}
+
+    def test_import_roundtrip(self, client):
+        seed()
+        xlsx = io.BytesIO(client.get('/api/export').data)
+        response = client.post('/api/import', data={'file': (xlsx, 'export.xlsx')},
+                               content_type='multipart/form-data')
+        assert response.status_code == 200, response.get_json()
+        got = {(l.source, l.policy_type, l.plan_number, l.carrier)
+               for l in db.session.execute(select(PolicyLine)).scalars()}
+        assert got >= {
+            ('employee_benefits', 'ltd', 1, 'Guardian'),
+            ('benefit_plans', 'medical', 1, 'Aetna'), ('benefit_plans', 'medical', 2, 'Cigna'),
+            ('commercial_insurance', 'general_liability', 1, 'Hartford'),
+            ('commercial_plans', 'umbrella', 1, 'Chubb'), ('personal_insurance', 'event', 1, 'Markel'),
+        }
+        assert_matches_rebuild()
+
+
+class TestRebuild:
+
+    def test_endpoint(self, client):
+        seed()
+        expected = current_lines()
+        db.session.execute(PolicyLine.__table__.delete())
+        db.session.commit()
+        response = client.post('/api/admin/policy-lines/rebuild')
+        assert response.status_code == 200
+        assert response.get_json() == {'rebuilt': len(expected)}
+        assert current_lines() == expected
+
+    def test_cli_command(self, client):
+        seed()
+        expected = current_lines()
+        db.session.execute(PolicyLine.__table__.delete())
+        db.session.commit()
+        result = app.test_cli_runner().invoke(args=['rebuild-policy-lines'])
+        assert result.exit_code == 0, result.output
+        assert f'Rebuilt {len(expected)} policy lines.' in result.output
+        assert current_lines() == expected
@@ -0,0 +1,215 @@
+"""
+Tests for the delta sync endpoint (/api/sync): changed rows, tombstones and
+the updated_at bookkeeping behind them.
+"""
+
+import pytest
+import os
+import sys
+from datetime import timedelta
+
+# Ensure test DB is set before importing app
+os.environ['DATABASE_URI'] = 'sqlite:///:memory:'
+os.environ['LAN_ONLY'] = 'false'
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.customer_api import (
+    app, db, Client, ClientContact, Individual, EmployeeBenefit, BenefitPlan,
+    CommercialInsurance, PersonalInsurance, HomeownersPolicy, CobraCoverage,
+    Task, TaskComment, DeletionLog,
+)
+from api import customer_api
+
+
+@pytest.fixture(scope='function')
+def client(monkeypatch):
+    """Create a test client with isolated in-memory database."""
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    # Everything in a test happens within milliseconds; no look-back window.
+    monkeypatch.setattr(customer_api, 'SYNC_OVERLAP', timedelta(0))
+
+    with app.app_context():
+        customer_api.Session = customer_api.sessionmaker(bind=db.engine)
+        db.create_all()
+        yield app.test_client()
+        db.session.remove()
+        db.drop_all()
+
+
+def seed(count=2):
+    for i in range(count):
+        tax_id = f'00-{i:07d}'
+        c = Client(tax_id=tax_id, client_name=f'Client {i}')
+        c.contacts = [ClientContact(contact_person=f'Contact {i}', sort_order=0)]
+        eb = EmployeeBenefit(tax_id=tax_id, enrollment_poc=f'POC {i}')
+        eb.plans = [BenefitPlan(plan_type='medical', plan_number=1, carrier='Aetna')]
+        ind = Individual(individual_id=f'IND-{i}', first_name='Sam', last_name=f'Lee{i}')
+        pi = PersonalInsurance(individual_id=f'IND-{i}')
+        pi.homeowners_policies = [HomeownersPolicy(policy_number=1, carrier='Allstate')]
+        db.session.add_all([
+            c, eb, ind, pi,
+            CommercialInsurance(tax_id=tax_id),
+            CobraCoverage(tax_id=tax_id, first_name='Pat', last_name=f'Doe{i}'),
+            Task(title=f'Task {i}', client=c),
+        ])
+    db.session.commit()
+
+
+def sync(client, token=None, entities=None):
+    params = {}
+    if token:
+        params['since'] = token
+    if entities:
+        params['entities'] = entities
+    response = client.get('/api/sync', query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def changed_ids(data, name):
+    return sorted(row['id'] for row in data[name]['changed'])
+
+
+class TestFullSync:
+
+    def test_first_sync_returns_everything(self, client):
+        seed()
+        data = sync(client)
+        assert data['token']
+        for name in customer_api.SYNC_ENTITIES:
+            assert data[name]['reset'] is True
+            assert data[name]['deleted'] == []
+            assert len(data[name]['changed']) == 2
+
+    def test_rows_match_list_endpoints(self, client):
+        seed()
+        data = sync(client)
+        assert data['benefits']['changed'] == client.get('/api/benefits').get_json()['benefits']
+        cobra = sorted(client.get('/api/cobra').get_json(), key=lambda row: row['id'])
+        assert data['cobra']['changed'] == cobra
+
+    def test_entities_filter(self, client):
+        seed()
+        data = sync(client, entities='clients,tasks')
+        assert set(data) == {'token', 'clients', 'tasks'}
+
+    @pytest.mark.parametrize('params', [
+        {'since': 'not-a-token!'},
+        {'entities': 'clients,bogus'},
+    ])
+    def test_bad_params_rejected(self, client, params):
+        assert client.get('/api/sync', query_string=params).status_code == 400
+
+    def test_expired_token_resets(self, client):
+        seed()
+        stale = customer_api._encode_sync_token(
+            customer_api.datetime.utcnow() - customer_api.DELETION_LOG_RETENTION - timedelta(days=1))
+        data = sync(client, stale)
+        assert data['clients']['reset'] is True
+        assert len(data['clients']['changed']) == 2
+
+
+class TestIncrementalSync:
+
+    def test_nothing_changed(self, client):
+        seed()
+        data = sync(client, sync(client)['token'])
+        for name in customer_api.SYNC_ENTITIES:
+            assert data[name] == {'changed': [], 'deleted': [], 'reset': False}
+
+    def test_updated_row_only(self, client):
+        seed()
+        token = sync(client)['token']
+        db.session.get(Individual, 2).first_name = 'Alex'
+        db.session.commit()
+        data = sync(client, token)
+        assert changed_ids(data, 'individuals') == [2]
+        # individual_name is copied into personal rows
+        assert changed_ids(data, 'personal') == [2]
+        assert data['personal']['changed'][0]['individual_name'] == 'Alex Lee1'
+        assert changed_ids(data, 'clients') == []
+
+    def test_client_rename_resends_rows_showing_client_name(self, client):
+        seed()
+        token = sync(client)['token']
+        db.session.get(Client, 1).client_name = 'Renamed'
+        db.session.commit()
+        data = sync(client, token)
+        for name in ('clients', 'benefits', 'commercial', 'cobra', 'tasks'):
+            assert changed_ids(data, name) == [1], name
+        assert data['tasks']['changed'][0]['client_name'] == 'Renamed'
+
+    def test_child_rows_touch_parent(self, client):
+        seed()
+        token = sync(client)['token']
+        db.session.add(BenefitPlan(employee_benefit_id=2, plan_type='dental', plan_number=1))
+        db.session.get(HomeownersPolicy, 1).carrier = 'Chubb'
+        db.session.add(TaskComment(task_id=1, body='Called the carrier'))
+        db.session.commit()
+        data = sync(client, token)
+        assert changed_ids(data, 'benefits') == [2]
+        assert changed_ids(data, 'personal') == [1]
+        assert changed_ids(data, 'tasks') == [1]
+        assert data['tasks']['changed'][0]['comment_count'] == 1
+
+    def test_collection_change_touches_parent(self, client):
+        seed()
+        token = sync(client)['token']
+        c = db.session.get(Client, 2)
+        c.contacts = []
+        db.session.commit()
+        assert changed_ids(sync(client, token), 'clients') == [2]
+
+    def test_plan_replacement_via_api(self, client):
+        seed()
+        token = sync(client)['token']
+        benefit = client.get('/api/benefits/1').get_json()
+        benefit['plans'] = {'medical': []}
+        assert client.put('/api/benefits/1', json=benefit).status_code == 200
+        data = sync(client, token)
+        assert changed_ids(data, 'benefits') == [1]
+        assert data['benefits']['changed'][0]['plans'].get('medical', []) == []
+
+
+class TestTombstones:
+
+    def test_deleted_rows_reported(self, client):
+        seed()
+        token = sync(client)['token']
+        assert client.delete('/api/benefits/2').status_code == 200
+        assert client.delete('/api/cobra/1').status_code == 200
+        data = sync(client, token)
+        assert data['benefits']['deleted'] == [2]
+        assert data['cobra']['deleted'] == [1]
+        # coverage flag flipped on the client
+        assert changed_ids(data, 'clients') == [2]
+        assert data['clients']['changed'][0]['has_employee_benefits'] is False
+
+    def test_client_delete_cascades(self, client):
+        seed()
+        token = sync(client)['token']
+        assert client.delete('/api/clients/1').status_code == 200
+        data = sync(client, token)
+        assert data['clients']['deleted'] == [1]
+        assert data['benefits']['deleted'] == [1]
+        assert data['commercial']['deleted'] == [1]
+        assert changed_ids(data, 'tasks') == [1]
+
+    def test_bulk_delete_resets_table(self, client):
+        seed()
+        token = sync(client)['token']
+        db.session.query(CobraCoverage).filter(CobraCoverage.id == 1).delete()
+        db.session.commit()
+        data = sync(client, token)
+        assert data['cobra']['reset'] is True
+        assert changed_ids(data, 'cobra') == [2]
+        assert data['clients']['reset'] is False
+
+    def test_rolled_back_delete_not_logged(self, client):
+        seed()
+        db.session.delete(db.session.get(Individual, 1))
+        db.session.flush()
+        db.session.rollback()
+        assert db.session.query(DeletionLog).count() == 0
@@ -83,7 +83,7 @@ if not defined SMTP_FROM set "SMTP_FROM=clientsupport@njgroups.com"
 
 REM --- Start API server (window stays open on crash so you can see errors) ---
 echo [..] Starting API server...
-start "ClientPortal-API" /min cmd /k "cd /d %~dp0 && "%PYTHON%" services\api\customer_api.py || (echo. && echo [!!] API SERVER CRASHED - see error above && pause)"
+start "ClientPortal-API" /min cmd /k "cd /d %~dp0 && "%PYTHON%" services\api\run_customer_api.py || (echo. && echo [!!] API SERVER CRASHED - see error above && pause)"
 
 REM Wait for API to start
 echo [..] Waiting for API to be ready...
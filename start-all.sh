@@ -42,7 +42,7 @@ fi
 
 # Start API service in background
 echo "📡 Starting API service on http://127.0.0.1:5001..."
-/usr/bin/python3 services/api/customer_api.py &
+/usr/bin/python3 services/api/run_customer_api.py &
 API_PID=$!
 
 # Wait a moment for API to start
@@ -1,5 +1,5 @@
 #!/usr/bin/env bash
-# Toggle the API's AUTH_DISABLED flag by restarting the customer_api.py process.
+# Toggle the API's AUTH_DISABLED flag by restarting the API process.
 #
 # Usage:
 #   ./toggle-auth.sh status   # show whether auth is currently bypassed
@@ -8,7 +8,7 @@
 set -euo pipefail
 
 PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
-API_SCRIPT="$PROJECT_ROOT/services/api/customer_api.py"
+API_SCRIPT="$PROJECT_ROOT/services/api/run_customer_api.py"
 API_PORT="${API_PORT:-5001}"
 LOG_FILE="${API_LOG_FILE:-/tmp/client-portal-api.log}"
 PYTHON_BIN="${PYTHON_BIN:-/usr/bin/python3}"
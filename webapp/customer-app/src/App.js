@@ -95,6 +95,7 @@ const API_BENEFITS = '/api/benefits';
 const API_COMMERCIAL = '/api/commercial';
 const API_PERSONAL = '/api/personal';
 const API_FEEDBACK = '/api/feedback';
+const API_BOOTSTRAP = '/api/bootstrap';
 
 // =====================================================================
 // ROTHSCHILD NAVY — formal, structured, unmistakably firm.
@@ -383,16 +384,16 @@ function AppShell() {
   const [apiStatus, setApiStatus] = useState('checking'); // 'up', 'down', 'checking'
   const [backupStatus, setBackupStatus] = useState({ status: 'checking', last_heartbeat: null });
 
+  // The first check comes with the /api/bootstrap response (fetchAllData).
+  const checkHealth = () => {
+    axios.get('/api/health', { timeout: 5000 })
+      .then(() => setApiStatus('up'))
+      .catch(() => setApiStatus('down'));
+    axios.get('/api/backup/status', { timeout: 5000 })
+      .then(res => setBackupStatus(res.data))
+      .catch(() => setBackupStatus({ status: 'down', last_heartbeat: null }));
+  };
   useEffect(() => {
-    const checkHealth = () => {
-      axios.get('/api/health', { timeout: 5000 })
-        .then(() => setApiStatus('up'))
-        .catch(() => setApiStatus('down'));
-      axios.get('/api/backup/status', { timeout: 5000 })
-        .then(res => setBackupStatus(res.data))
-        .catch(() => setBackupStatus({ status: 'down', last_heartbeat: null }));
-    };
-    checkHealth();
     const interval = setInterval(checkHealth, 30000);
     return () => clearInterval(interval);
   }, []);
@@ -402,19 +403,22 @@ function AppShell() {
   // whenever the user opens the Tasks tab (which additionally marks all
   // their unseen tasks seen).
   const [unseenTaskCount, setUnseenTaskCount] = useState(0);
+  const fetchUnseen = (isCancelled = () => false) => {
+    axios.get('/api/me/notifications', { timeout: 5000 })
+      .then(res => {
+        if (!isCancelled()) setUnseenTaskCount(res.data?.unseen_task_count || 0);
+      })
+      .catch(() => { /* ignore — silent if endpoint fails */ });
+  };
+  const bootstrapUserRef = useRef(user?.id);
   useEffect(() => {
     let cancelled = false;
-    const fetchUnseen = () => {
-      axios.get('/api/me/notifications', { timeout: 5000 })
-        .then(res => {
-          if (!cancelled) setUnseenTaskCount(res.data?.unseen_task_count || 0);
-        })
-        .catch(() => { /* ignore — silent if endpoint fails */ });
-    };
-    fetchUnseen();
-    const id = setInterval(fetchUnseen, 15000);
-    const onFocus = () => fetchUnseen();
-    const onVisibility = () => { if (!document.hidden) fetchUnseen(); };
+    const refresh = () => fetchUnseen(() => cancelled);
+    // On mount the count comes with /api/bootstrap; refetch when the user changes.
+    if (user?.id !== bootstrapUserRef.current) refresh();
+    const id = setInterval(refresh, 15000);
+    const onFocus = () => refresh();
+    const onVisibility = () => { if (!document.hidden) refresh(); };
     window.addEventListener('focus', onFocus);
     document.addEventListener('visibilitychange', onVisibility);
     return () => {
@@ -478,6 +482,7 @@ function AppShell() {
 
   // Import/Export states
   const [importing, setImporting] = useState(false);
+  const [importProgress, setImportProgress] = useState('');
   const fileInputRef = useRef(null);
 
   // Data version counter — incremented on every data change to trigger Dashboard refresh
@@ -493,14 +498,33 @@ function AppShell() {
     fetchAllData();
   }, []);
 
-  // Fetch all data
+  // Fetch all data in one round trip. /api/bootstrap also carries the
+  // health, backup and notification status, so those polls skip their
+  // first request. Falls back to the per-collection endpoints on error.
   const fetchAllData = () => {
-    fetchClients();
-    fetchIndividuals();
-    fetchBenefits();
-    fetchCommercial();
-    fetchPersonal();
-    fetchFeedback();
+    axios.get(API_BOOTSTRAP)
+      .then(({ data }) => {
+        setClients(data.clients || []);
+        setIndividuals(data.individuals || []);
+        setBenefits(data.benefits || []);
+        setCommercial(data.commercial || []);
+        setPersonal(data.personal || []);
+        setFeedback(data.feedback || []);
+        setUnseenTaskCount(data.notifications?.unseen_task_count || 0);
+        setApiStatus(data.health?.status === 'ok' ? 'up' : 'down');
+        if (data.backup) setBackupStatus(data.backup);
+      })
+      .catch(error => {
+        console.error('Error fetching bootstrap data:', error);
+        fetchClients();
+        fetchIndividuals();
+        fetchBenefits();
+        fetchCommercial();
+        fetchPersonal();
+        fetchFeedback();
+        checkHealth();
+        fetchUnseen();
+      });
   };
 
   // ========== CLIENT OPERATIONS ==========
@@ -1026,13 +1050,24 @@ function AppShell() {
     formData.append('file', file);
 
     try {
-      const response = await axios.post('/api/import', formData, {
+      // Imports run as background jobs; poll until this one finishes.
+      const response = await axios.post('/api/import/jobs', formData, {
         headers: {
           'Content-Type': 'multipart/form-data'
         }
       });
+      let job = response.data;
+      while (job.status === 'queued' || job.status === 'running') {
+        const eta = job.eta != null ? ` (~${Math.ceil(job.eta)}s left)` : '';
+        setImportProgress(`Importing: ${job.phase}${eta}`);
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        job = (await axios.get(`/api/import/jobs/${job.id}`)).data;
+      }
+      if (job.status !== 'done') {
+        throw new Error(job.error || `import ${job.status}`);
+      }
 
-      const { stats, errors_file, errors_filename } = response.data;
+      const { stats, errors_file, errors_filename } = job.result;
       let message = 'Import completed!\n\n';
       message += `Clients: ${stats.clients_created} created\n`;
       message += `Individuals: ${stats.individuals_created} created\n`;
@@ -1074,6 +1109,7 @@ function AppShell() {
       alert('Import failed: ' + (error.response?.data?.error || error.message));
     } finally {
       setImporting(false);
+      setImportProgress('');
       event.target.value = '';  // Reset file input
     }
   };
@@ -1221,7 +1257,7 @@ function AppShell() {
               size="small"
               sx={{ fontSize: '0.75rem', textTransform: 'none', opacity: 0.85, '&:hover': { opacity: 1, backgroundColor: 'rgba(255,255,255,0.08)' } }}
             >
-              {importing ? 'Importing...' : 'Import'}
+              {importing ? (importProgress || 'Importing...') : 'Import'}
             </Button>
             <Button
               variant="text"
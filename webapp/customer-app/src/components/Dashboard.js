@@ -45,6 +45,7 @@ import axios from 'axios';
 const API_DASHBOARD_RENEWALS = '/api/dashboard/renewals';
 const API_DASHBOARD_CROSS_SELL = '/api/dashboard/cross-sell';
 const API_DASHBOARD_POLICY_AGG = '/api/dashboard/policy-aggregations';
+const API_DASHBOARD_OUTSTANDING = '/api/dashboard/outstanding';
 
 // Parse date string as local time (avoids UTC timezone shift)
 const parseDate = (d) => {
@@ -67,6 +68,9 @@ const NewDashboard = ({ clients = [], benefits = [], commercial = [], personal =
   const [renewals, setRenewals] = useState([]);
   const [crossSell, setCrossSell] = useState({ benefits_only: [], commercial_only: [] });
   const [policyAgg, setPolicyAgg] = useState({ by_industry: [], by_coverage_type: [], by_carrier: [] });
+  // Policies grouped by outstanding item status (Cancel Due, Premium Due, In Audit),
+  // soonest due first; built server-side from the outstanding_item columns.
+  const [outstandingPolicies, setOutstandingPolicies] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [mainTab, setMainTab] = useState(0);
@@ -102,10 +106,11 @@ const NewDashboard = ({ clients = [], benefits = [], commercial = [], personal =
         const endDate = new Date(year, month + 11, 0); // last day of (month + 11)
         const fmt = (d) => `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}-${String(d.getDate()).padStart(2, '0')}`;
 
-        const [renewalsRes, crossSellRes, policyAggRes] = await Promise.all([
+        const [renewalsRes, crossSellRes, policyAggRes, outstandingRes] = await Promise.all([
           axios.get(API_DASHBOARD_RENEWALS, { params: { start_date: fmt(startDate), end_date: fmt(endDate) } }),
           axios.get(API_DASHBOARD_CROSS_SELL),
-          axios.get(API_DASHBOARD_POLICY_AGG)
+          axios.get(API_DASHBOARD_POLICY_AGG),
+          axios.get(API_DASHBOARD_OUTSTANDING)
         ]);
 
         setRenewals(renewalsRes.data.renewals || []);
@@ -115,6 +120,7 @@ const NewDashboard = ({ clients = [], benefits = [], commercial = [], personal =
           by_coverage_type: policyAggRes.data.by_coverage_type || [],
           by_carrier: policyAggRes.data.by_carrier || []
         });
+        setOutstandingPolicies(outstandingRes.data.outstanding || []);
         setLoading(false);
       } catch (err) {
         console.error('Error fetching dashboard data:', err);
@@ -421,143 +427,6 @@ const NewDashboard = ({ clients = [], benefits = [], commercial = [], personal =
     return { benefitGaps, commercialGaps };
   }, [benefits, commercial]);
 
-  // Policies grouped by outstanding item status (Cancel Due, Premium Due, In Audit)
-  const outstandingPolicies = useMemo(() => {
-    // Values that count as an item having been resolved rather than open.
-    // Kept in sync with recordHasOutstanding() in App.js so the list-page
-    // filter and this Actions tab agree on what counts as "outstanding".
-    const OUTSTANDING_CLEARED = new Set(['', 'None', 'Complete']);
-    const isOutstanding = (v) => !!v && !OUTSTANDING_CLEARED.has(v);
-
-    const BENEFIT_MULTI_PLAN_TYPES = ['medical', 'dental', 'vision', 'life_adnd'];
-    const BENEFIT_MULTI_LABELS = { medical: 'Medical', dental: 'Dental', vision: 'Vision', life_adnd: 'Life & AD&D' };
-    const BENEFIT_SINGLE_TYPES = [
-      { prefix: 'ltd', name: 'LTD' }, { prefix: 'std', name: 'STD' },
-      { prefix: 'k401', name: '401K' }, { prefix: 'critical_illness', name: 'Critical Illness' },
-      { prefix: 'accident', name: 'Accident' }, { prefix: 'hospital', name: 'Hospital' },
-      { prefix: 'voluntary_life', name: 'Vol Life' }
-    ];
-    // workers_comp is a multi-plan type since customer_api.py MULTI_PLAN_COMMERCIAL_TYPES
-    // added it; outstanding_item lives on c.plans.workers_comp[i] and is NOT synced
-    // back to the flat workers_comp_outstanding_item column.
-    const COMMERCIAL_MULTI_PLAN_TYPES = ['umbrella', 'professional_eo', 'cyber', 'crime', 'workers_comp'];
-    const COMMERCIAL_MULTI_LABELS = { umbrella: 'Umbrella', professional_eo: 'E&O', cyber: 'Cyber', crime: 'Crime', workers_comp: 'WC' };
-    const COMMERCIAL_SINGLE_TYPES = [
-      { prefix: 'general_liability', name: 'GL' }, { prefix: 'property', name: 'Property' },
-      { prefix: 'bop', name: 'BOP' },
-      { prefix: 'auto', name: 'Auto' }, { prefix: 'epli', name: 'EPLI' },
-      { prefix: 'nydbl', name: 'NYDBL' }, { prefix: 'surety', name: 'Surety' },
-      { prefix: 'product_liability', name: 'Product' }, { prefix: 'flood', name: 'Flood' },
-      { prefix: 'directors_officers', name: 'D&O' }, { prefix: 'fiduciary', name: 'Fiduciary' },
-      { prefix: 'inland_marine', name: 'Inland Marine' }
-    ];
-
-    const result = [];
-
-    // Extract from benefits
-    benefits.forEach(b => {
-      // Multi-plan types
-      BENEFIT_MULTI_PLAN_TYPES.forEach(pt => {
-        const typePlans = (b.plans && b.plans[pt]) || [];
-        typePlans.forEach((plan, idx) => {
-          if (isOutstanding(plan.outstanding_item)) {
-            result.push({
-              client_name: b.client_name, tax_id: b.tax_id, source: 'Benefits',
-              prefix: pt,
-              plan_id: plan.id,
-              policy: typePlans.length > 1 ? `${BENEFIT_MULTI_LABELS[pt]} ${idx + 1}` : BENEFIT_MULTI_LABELS[pt],
-              assigned_to: b.enrollment_poc, renewal_date: plan.renewal_date,
-              outstanding_item: plan.outstanding_item,
-              due_date: plan.outstanding_item_due_date
-            });
-          }
-        });
-      });
-      // Single-plan types
-      BENEFIT_SINGLE_TYPES.forEach(({ prefix, name }) => {
-        const item = b[`${prefix}_outstanding_item`];
-        if (isOutstanding(item)) {
-          result.push({
-            client_name: b.client_name, tax_id: b.tax_id, source: 'Benefits',
-            prefix,
-            policy: name, assigned_to: b.enrollment_poc, renewal_date: b[`${prefix}_renewal_date`],
-            outstanding_item: item,
-            due_date: b[`${prefix}_outstanding_item_due_date`]
-          });
-        }
-      });
-    });
-
-    // Extract from commercial
-    commercial.forEach(c => {
-      // Multi-plan types
-      COMMERCIAL_MULTI_PLAN_TYPES.forEach(pt => {
-        const typePlans = (c.plans && c.plans[pt]) || [];
-        typePlans.forEach((plan, idx) => {
-          if (isOutstanding(plan.outstanding_item)) {
-            result.push({
-              client_name: c.client_name, tax_id: c.tax_id, source: 'Commercial',
-              prefix: pt,
-              plan_id: plan.id,
-              policy: typePlans.length > 1 ? `${COMMERCIAL_MULTI_LABELS[pt]} ${idx + 1}` : COMMERCIAL_MULTI_LABELS[pt],
-              assigned_to: c.assigned_to, renewal_date: plan.renewal_date,
-              outstanding_item: plan.outstanding_item,
-              due_date: plan.outstanding_item_due_date
-            });
-          }
-        });
-      });
-      // Single-plan types
-      COMMERCIAL_SINGLE_TYPES.forEach(({ prefix, name }) => {
-        const item = c[`${prefix}_outstanding_item`];
-        if (isOutstanding(item)) {
-          result.push({
-            client_name: c.client_name, tax_id: c.tax_id, source: 'Commercial',
-            prefix,
-            policy: name, assigned_to: c.assigned_to, renewal_date: c[`${prefix}_renewal_date`],
-            outstanding_item: item,
-            due_date: c[`${prefix}_outstanding_item_due_date`]
-          });
-        }
-      });
-    });
-
-    // Extract from personal
-    const PERSONAL_TYPES = [
-      { prefix: 'personal_auto', name: 'Personal Auto' },
-      { prefix: 'homeowners', name: 'Homeowners' },
-      { prefix: 'personal_umbrella', name: 'Personal Umbrella' },
-      { prefix: 'event', name: 'Event Insurance' },
-      { prefix: 'visitors_medical', name: 'Visitors Medical' }
-    ];
-    personal.forEach(p => {
-      PERSONAL_TYPES.forEach(({ prefix, name }) => {
-        const item = p[`${prefix}_outstanding_item`];
-        if (isOutstanding(item)) {
-          const renewalField = ['event', 'visitors_medical'].includes(prefix) ? `${prefix}_start_date` : `${prefix}_renewal_date`;
-          result.push({
-            client_name: p.client_name, tax_id: p.tax_id, source: 'Personal',
-            individual_id: p.individual_id,
-            prefix,
-            policy: name, assigned_to: '', renewal_date: p[renewalField],
-            outstanding_item: item,
-            due_date: p[`${prefix}_outstanding_item_due_date`]
-          });
-        }
-      });
-    });
-
-    // Sort by due date (soonest first, then items without due date)
-    result.sort((a, b) => {
-      if (a.due_date && b.due_date) return a.due_date.localeCompare(b.due_date);
-      if (a.due_date) return -1;
-      if (b.due_date) return 1;
-      return 0;
-    });
-
-    return result;
-  }, [benefits, commercial, personal]);
-
   // Sub-tab views of the outstanding list, split by source.
   const outstandingCommercial = useMemo(
     () => outstandingPolicies.filter(x => x.source === 'Commercial'),